@@ -0,0 +1,43 @@
+"""
+Helpers shared by the benchmark scripts
+"""
+import json
+import sys
+from pathlib import Path
+from timeit import Timer
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+
+def measure(func: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> float:
+    """
+    Best time of one call in microseconds, the call count per repeat is scaled to last at least min_time
+    """
+    timer = Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def emit(benchmark: str, results: list[dict], as_json: bool) -> None:
+    """
+    Print results as an aligned table or as JSON
+    """
+    if as_json:
+        print(json.dumps({"benchmark": benchmark, "results": results}, indent=2))
+        return
+    if not results:
+        return
+    columns = list(results[0])
+    widths = [max(len(column), *(len(_format(row[column])) for row in results)) for column in columns]
+    print("  ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for row in results:
+        print("  ".join(_format(row[column]).rjust(width) for column, width in zip(columns, widths)))
+
+
+def _format(value: object) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
@@ -0,0 +1,20 @@
+"""
+Copy of the message receiver fan-out shipped before deferred log formatting, kept as benchmark baseline
+
+The f-string arguments are built, CPDLCMessage.__str__ included, whatever the log level
+"""
+from loguru import logger
+
+from python_cpdlc.acars_message import AcarsMessage
+from python_cpdlc.cpdlc import CPDLC
+
+
+class LegacyLoggingCPDLC(CPDLC):
+    def _message_receiver_callback(self, message: AcarsMessage) -> None:
+        logger.trace(f"Message received : {message}")
+        for callback in self._message_receiver_callbacks:
+            try:
+                logger.trace(f"Callback executed: {callback.__name__}")
+                callback(message)
+            except Exception as e:
+                logger.error(f"Exception occurred while calling callback: {e}")
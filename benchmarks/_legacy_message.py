@@ -0,0 +1,48 @@
+"""
+Copy of the AcarsMessage and CPDLCMessage classes shipped up to 1.3.8, kept as benchmark baseline
+
+The message id bookkeeping is left out so the baseline does not touch the package state
+"""
+from datetime import datetime
+
+from python_cpdlc.enums import MessageDirection, PacketType, ReplyTag
+
+
+class AcarsMessage:
+    def __init__(self, target_station: str, msg_type: PacketType, message: str,
+                 direction: MessageDirection = MessageDirection.IN):
+        self._target_station = target_station
+        self._msg_type = msg_type
+        self._message = message
+        self._direction = direction
+        self._timestamp = datetime.now()
+
+    @property
+    def target_station(self) -> str: return self._target_station
+
+    @property
+    def msg_type(self) -> PacketType: return self._msg_type
+
+    @property
+    def message(self) -> str: return self._message
+
+
+class CPDLCMessage(AcarsMessage):
+    def __init__(self, target_station: str, msg_type: PacketType, message: str):
+        super().__init__(target_station, msg_type, message)
+        data = self._message.split("/")
+        self._data_tag = data[1]
+        self._message_id = int(data[2])
+        self._reply_id = int(data[3]) if data[3] != "" else 0
+        self._reply_type = ReplyTag(data[4])
+        self._message = data[5].removesuffix("}")
+        self._replied = False
+
+    @property
+    def message_id(self) -> int: return self._message_id
+
+    @property
+    def reply_id(self) -> int: return self._reply_id
+
+    @property
+    def reply_type(self) -> ReplyTag: return self._reply_type
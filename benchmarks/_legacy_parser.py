@@ -0,0 +1,25 @@
+"""
+Copy of the regex based AcarsMessageFactory.parser_message shipped up to 1.3.8, kept as benchmark baseline
+"""
+from re import compile
+
+from _legacy_message import AcarsMessage, CPDLCMessage
+from python_cpdlc.enums import PacketType
+
+split_pattern = compile(r"\{[\s\S]*?\{[\s\S]*?}}|\{[\s\S]*?}")
+data_pattern = compile(r"\{[\s\S]*?}")
+
+
+def parser_message(text: str) -> list[AcarsMessage]:
+    result: list[AcarsMessage] = []
+    messages = split_pattern.findall(text)
+    for message in messages:
+        message = message[1:-1]
+        temp = message.split(" ")[:2]
+        type_tag = PacketType(temp[1])
+        match type_tag:
+            case PacketType.CPDLC:
+                result.append(CPDLCMessage(temp[0], type_tag, message))
+            case _:
+                result.append(AcarsMessage(temp[0], type_tag, data_pattern.findall(message)[0][1:-1]))
+    return result
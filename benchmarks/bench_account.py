@@ -0,0 +1,50 @@
+"""
+Targeted account.html extractor against the BeautifulSoup parsing it replaced
+
+Every page in benchmarks/fixtures is parsed the way get_network parses it, pages with a notice also the way
+change_network does. A page without network select, e.g. account_invalid.html, falls back to bs4 by design.
+bs4 columns are skipped when bs4 is not installed
+
+Usage:
+    python benchmarks/bench_account.py [--json]
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+
+from _common import emit, measure
+
+from python_cpdlc.account_page import _HAS_BS4, _soup, _soup_selected_network, has_notice, selected_network
+
+_FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def _change_network(text: str) -> tuple:
+    return has_notice(text), selected_network(text)
+
+
+def _soup_change_network(text: str) -> tuple:
+    return _soup(text).find("p", attrs={"class": "notice"}) is not None, _soup_selected_network(text)
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    results = []
+    for fixture in sorted(_FIXTURES.glob("account*.html")):
+        text = fixture.read_text(encoding="utf-8")
+        operations = [("get_network", selected_network, _soup_selected_network)]
+        if has_notice(text):
+            operations.append(("change_network", _change_network, _soup_change_network))
+        for operation, extract, soup_extract in operations:
+            row = {"fixture": fixture.name, "operation": operation, "bytes": len(text.encode()),
+                   "extract_us": measure(lambda: extract(text))}
+            if _HAS_BS4:
+                row["bs4_us"] = measure(lambda: soup_extract(text))
+                row["speedup"] = row["bs4_us"] / row["extract_us"]
+            results.append(row)
+    emit("account", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Run every benchmark script and collect the results into one JSON report
+
+Each bench_*.py runs in a fresh interpreter with --json, the report records the package version, interpreter and
+platform next to the results, so reports of two versions can be compared. With --compare every time column
+(*_us, *_ms) is matched against a previous report row by row and the ratio current / baseline is printed.
+Exits with status 1 when a script fails or a time grows by more than --threshold
+
+Usage:
+    python benchmarks/bench_all.py [--only poll parser] [--output report.json] [--compare baseline.json]
+                                   [--threshold 1.25] [--json]
+"""
+import json
+import platform
+import subprocess
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+from _common import emit
+
+import python_cpdlc
+
+_HERE = Path(__file__).resolve().parent
+
+
+def _scripts(only: Optional[list[str]]) -> list[Path]:
+    scripts = sorted(path for path in _HERE.glob("bench_*.py") if path.name != "bench_all.py")
+    if only:
+        scripts = [path for path in scripts if path.stem.removeprefix("bench_") in only]
+    return scripts
+
+
+def _commit() -> Optional[str]:
+    try:
+        process = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_HERE, capture_output=True, text=True)
+    except OSError:
+        return None
+    return process.stdout.strip() or None
+
+
+def _run(script: Path) -> dict:
+    begin = perf_counter()
+    process = subprocess.run([sys.executable, str(script), "--json"], capture_output=True, text=True)
+    elapsed = perf_counter() - begin
+    try:
+        report = json.loads(process.stdout)
+    except json.JSONDecodeError:
+        report = {"benchmark": script.stem.removeprefix("bench_"), "results": []}
+    report["script"] = script.name
+    report["returncode"] = process.returncode
+    report["elapsed_s"] = round(elapsed, 2)
+    if process.returncode != 0:
+        report["stderr"] = process.stderr[-2000:]
+    return report
+
+
+def _is_time(column: str) -> bool:
+    return not column.startswith("budget") and (column.endswith(("_us", "_ms")) or "_us_per_" in column)
+
+
+def _label(row: dict) -> str:
+    return " ".join(str(value) for value in list(row.values())[:2] if not isinstance(value, float))
+
+
+def compare(report: dict, baseline: dict) -> list[dict]:
+    """
+    Ratio of every time column of report against the same row of baseline
+    """
+    previous = {benchmark["benchmark"]: benchmark["results"] for benchmark in baseline["benchmarks"]}
+    rows = []
+    for benchmark in report["benchmarks"]:
+        for row, old in zip(benchmark["results"], previous.get(benchmark["benchmark"], [])):
+            for column, value in row.items():
+                if not _is_time(column) or not old.get(column):
+                    continue
+                rows.append({
+                    "benchmark": benchmark["benchmark"],
+                    "row": _label(row),
+                    "metric": column,
+                    "baseline": float(old[column]),
+                    "current": float(value),
+                    "ratio": value / old[column]
+                })
+    return rows
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", help="benchmark names to run, e.g. poll parser")
+    parser.add_argument("--output", type=Path, help="write the report to this file")
+    parser.add_argument("--compare", type=Path, help="previous report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="ratio counted as a regression")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    report = {
+        "version": python_cpdlc.__version__,
+        "commit": _commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "benchmarks": [_run(script) for script in _scripts(args.only)]
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+    failed = [benchmark["script"] for benchmark in report["benchmarks"] if benchmark["returncode"] != 0]
+    regressions = []
+    if args.compare is not None:
+        ratios = compare(report, json.loads(args.compare.read_text()))
+        regressions = [row for row in ratios if row["ratio"] > args.threshold]
+        emit("compare", ratios, args.json)
+    elif args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        emit("all", [{"benchmark": benchmark["benchmark"], "rows": len(benchmark["results"]),
+                      "returncode": benchmark["returncode"], "elapsed_s": benchmark["elapsed_s"]}
+                     for benchmark in report["benchmarks"]], False)
+    for script in failed:
+        print(f"{script} failed", file=sys.stderr)
+    for row in regressions:
+        print(f"regression: {row['benchmark']} {row['row']} {row['metric']} x{row['ratio']:.2f}", file=sys.stderr)
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Fan-out cost of message receiver callbacks
+
+Delivers a batch of messages to N receiver callbacks through _message_receiver_callback, inline on the calling
+thread and through both callback dispatchers. Dispatcher times cover queueing and running every callback, so
+they end when the last callback returned
+
+Usage:
+    python benchmarks/bench_dispatch.py [--callbacks 1 4 16] [--messages 2000] [--json]
+"""
+import asyncio
+from argparse import ArgumentParser
+from itertools import count
+from threading import Event
+from time import perf_counter
+
+from loguru import logger
+
+from _common import emit
+
+from python_cpdlc.acars_message_factory import AcarsMessageFactory
+from python_cpdlc.cpdlc import CPDLC
+from python_cpdlc.dispatcher import AsyncioDispatcher, ThreadPoolDispatcher
+
+_MESSAGE = AcarsMessageFactory.parser_message("ok {ZSHA_CTR cpdlc {/data2/1//WU/CLIMB TO @FL350@}}")[0]
+
+
+def _client(callbacks: int, done: Event, total: int) -> CPDLC:
+    client = CPDLC()
+    counter = count(1)
+
+    def callback(message) -> None:
+        if next(counter) == total:
+            done.set()
+
+    for _ in range(callbacks):
+        client.add_message_receiver_callback(callback)
+    return client
+
+
+def _inline(callbacks: int, messages: int) -> float:
+    client = _client(callbacks, Event(), 0)
+    begin = perf_counter()
+    for _ in range(messages):
+        client._message_receiver_callback(_MESSAGE)
+    return (perf_counter() - begin) / messages * 1e6
+
+
+def _thread_pool(callbacks: int, messages: int) -> float:
+    done = Event()
+    client = _client(callbacks, done, callbacks * messages)
+    dispatcher = ThreadPoolDispatcher()
+    client.set_callback_dispatcher(dispatcher)
+    begin = perf_counter()
+    for _ in range(messages):
+        client._message_receiver_callback(_MESSAGE)
+    done.wait()
+    elapsed = perf_counter() - begin
+    dispatcher.close()
+    return elapsed / messages * 1e6
+
+
+async def _asyncio(callbacks: int, messages: int) -> float:
+    done = Event()
+    client = _client(callbacks, done, callbacks * messages)
+    dispatcher = AsyncioDispatcher()
+    dispatcher.start()
+    client.set_callback_dispatcher(dispatcher)
+    # let the workers drain before a queue fills up, the loop thread cannot block on them
+    batch = max(1, dispatcher.queue_size // 2 // callbacks)
+    begin = perf_counter()
+    for index in range(1, messages + 1):
+        client._message_receiver_callback(_MESSAGE)
+        if index % batch == 0:
+            await asyncio.sleep(0)
+    while not done.is_set():
+        await asyncio.sleep(0)
+    elapsed = perf_counter() - begin
+    await dispatcher.aclose()
+    return elapsed / messages * 1e6
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--callbacks", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--messages", type=int, default=2000, help="messages delivered per measurement")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    logger.remove()
+    results = []
+    for callbacks in args.callbacks:
+        results.append({
+            "callbacks": callbacks,
+            "inline_us": min(_inline(callbacks, args.messages) for _ in range(5)),
+            "thread_pool_us": min(_thread_pool(callbacks, args.messages) for _ in range(3)),
+            "asyncio_us": min(asyncio.run(_asyncio(callbacks, args.messages)) for _ in range(3))
+        })
+    emit("dispatch", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
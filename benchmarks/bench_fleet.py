@@ -0,0 +1,85 @@
+"""
+Steady-state cost per callsign of CPDLCFleet
+
+Adds N callsigns to a fleet backed by an in-memory transport, then lets the scheduler poll every
+session once and reports wall time, traced memory and OS thread count per callsign.
+Every session is then stopped and started three times in a row, which must cost exactly one more poll per
+callsign, exits with status 1 when it does not, so restarts leaving extra poll chains behind fail CI
+
+Usage:
+    python benchmarks/bench_fleet.py [--sizes 100 1000 5000] [--json]
+"""
+import asyncio
+import sys
+import threading
+from argparse import ArgumentParser
+from time import monotonic, perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+from loguru import logger
+
+from _common import emit
+
+from python_cpdlc.fleet import CPDLCFleet
+from python_cpdlc.transport import MemoryTransport
+
+_RESTARTS = 3
+
+
+async def run(size: int) -> dict:
+    fleet = CPDLCFleet("BENCH", acars_url="http://bench.invalid", min_interval=3600, max_interval=3600,
+                       transport=MemoryTransport())
+    start()
+    base_memory, _ = get_traced_memory()
+    begin = perf_counter()
+    for i in range(size):
+        await fleet.add_callsign(f"CES{i:05d}")
+    add_elapsed = perf_counter() - begin
+    while fleet.scheduler.polls < size:
+        await asyncio.sleep(0.01)
+    poll_elapsed = perf_counter() - begin - add_elapsed
+    memory, _ = get_traced_memory()
+    stop()
+    threads = threading.active_count()
+    restart_polls = await _restart(fleet) / size
+    await fleet.aclose()
+    return {
+        "callsigns": size,
+        "add_us_per_callsign": add_elapsed / size * 1e6,
+        "first_poll_us_per_callsign": poll_elapsed / size * 1e6,
+        "memory_bytes_per_callsign": (memory - base_memory) / size,
+        "threads": threads,
+        "restart_polls_per_callsign": restart_polls,
+        "ok": restart_polls == 1
+    }
+
+
+async def _restart(fleet: CPDLCFleet) -> int:
+    """
+    Stop and start every session _RESTARTS times, returns the polls this caused once the scheduler settled
+    """
+    scheduler = fleet.scheduler
+    before = scheduler.polls
+    for session in fleet:
+        for _ in range(_RESTARTS):
+            await session.stop_poller()
+            session.start_poller()
+    while scheduler._in_flight or (scheduler._heap and scheduler._heap[0][0] <= monotonic()):
+        await asyncio.sleep(0.01)
+    return scheduler.polls - before
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    logger.remove()
+    results = [asyncio.run(run(size)) for size in args.sizes]
+    emit("fleet", results, args.json)
+    if not all(result["ok"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cold-start cost of importing python_cpdlc, measured with python -X importtime in fresh interpreters
+
+Each target is imported in a new process, the cumulative time of every top-level import from the first
+python_cpdlc import on is summed and the best of --repeat runs is reported.
+Message-only targets must not load the HTTP, HTML or logging stack.
+Exits with status 1 when a target exceeds its budget or loads a forbidden module, so it can gate CI
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5] [--scale 1.0] [--json]
+"""
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from _common import emit
+
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+_HEAVY_MODULES = ("httpx", "loguru", "bs4", "lxml")
+
+# (name, import statement, budget in milliseconds, whether heavy modules may be loaded)
+_TARGETS = [
+    ("package", "import python_cpdlc", 15, False),
+    ("messages", "from python_cpdlc import AcarsMessageFactory, CPDLCMessage", 25, False),
+    ("client", "from python_cpdlc import CPDLC", 400, True),
+    ("fleet", "from python_cpdlc import CPDLCFleet", 400, True),
+]
+
+
+def _run(statement: str) -> tuple[float, list[str]]:
+    """
+    Import in a fresh interpreter, returns milliseconds spent in python_cpdlc imports and heavy modules loaded
+    """
+    code = f"{statement}\nimport sys\nprint(' '.join(m for m in {_HEAVY_MODULES!r} if m in sys.modules))"
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                             env={"PYTHONPATH": _SRC}, check=True)
+    total = 0
+    counting = False
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # top-level entries have no indentation in the name column, modules loaded lazily by the package
+        # show up as top-level entries too, interpreter startup modules come before the package
+        if name.startswith("  "):
+            continue
+        counting = counting or name.startswith(" python_cpdlc")
+        if counting:
+            total += int(cumulative)
+    return total / 1000, process.stdout.split()
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per target, best is kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, for slow machines")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    results = []
+    failed = False
+    for name, statement, budget, heavy_allowed in _TARGETS:
+        runs = [_run(statement) for _ in range(args.repeat)]
+        elapsed = min(run[0] for run in runs)
+        loaded = runs[0][1]
+        budget_ms = budget * args.scale
+        ok = elapsed <= budget_ms and (heavy_allowed or not loaded)
+        failed |= not ok
+        results.append({
+            "target": name,
+            "import_ms": elapsed,
+            "budget_ms": budget_ms,
+            "heavy_modules": ",".join(loaded) or "-",
+            "ok": ok
+        })
+    emit("import", results, args.json)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Cost of the message journal on the poll path and replay speed
+
+record_us is what MessageJournal.record_messages adds to a poll of N parsed messages on the poll thread,
+write_us what the background writer spends encoding and writing them. replay_ms rebuilds state from a journal
+of --records records written by the same polls, replay_records_per_s is the resulting replay throughput
+
+Usage:
+    python benchmarks/bench_journal.py [--sizes 1 10 100] [--records 100000] [--json]
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from loguru import logger
+
+from _common import emit, measure
+
+from bench_parser import build_response
+from python_cpdlc.acars_message_factory import AcarsMessageFactory
+from python_cpdlc.journal import MessageJournal
+
+
+def _replay(path: Path) -> float:
+    begin = perf_counter()
+    MessageJournal.replay(path)
+    return perf_counter() - begin
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--records", type=int, default=100000, help="records in the replayed journal")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    logger.remove()
+    results = []
+    with TemporaryDirectory() as directory:
+        for size in args.sizes:
+            messages = AcarsMessageFactory.parser_message(build_response(size))
+            path = Path(directory) / f"{size}.journal"
+            # the writer never wakes up on its own, so record_us covers the poll thread only
+            with MessageJournal(path, flush_interval=3600, batch_size=1 << 30) as journal:
+                record = measure(lambda: journal.record_messages(messages))
+                write = measure(lambda: (journal.record_messages(messages), journal.flush())) - record
+            path.unlink()
+            with MessageJournal(path, batch_size=1024) as journal:
+                for _ in range(max(1, args.records // size)):
+                    journal.record_messages(messages)
+            records = max(1, args.records // size) * size
+            replay = min(_replay(path) for _ in range(3))
+            results.append({
+                "messages": size,
+                "record_us": record,
+                "write_us": write,
+                "replay_ms": replay * 1e3,
+                "replay_records_per_s": records / replay
+            })
+    emit("journal", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Cost of hot path logging in a full poll cycle of CPDLC on MemoryTransport
+
+The logger has one sink at INFO level, so every trace call is filtered. legacy_us builds the f-string arguments
+of every log call as before, deferred_us passes them to loguru unformatted, off_us turns hot path logging off with
+set_hot_path_logging(False). trace_us emits every record to a sink at TRACE level, for reference
+
+Usage:
+    python benchmarks/bench_logging.py [--sizes 0 1 10 100] [--json]
+"""
+from argparse import ArgumentParser
+
+from loguru import logger
+
+from _common import emit, measure
+
+from _legacy_logging import LegacyLoggingCPDLC
+from bench_parser import build_response
+from python_cpdlc.cpdlc import CPDLC
+from python_cpdlc.logging_mode import set_hot_path_logging
+from python_cpdlc.transport import MemoryTransport
+
+
+def _client(cls: type, text: str) -> CPDLC:
+    client = cls(transport=MemoryTransport(lambda request: text))
+    client.set_acars_url("http://bench.invalid")
+    client.set_callsign("CES2352")
+    client.set_logon_code("BENCH")
+    client.set_message_deduplicator(None)
+    client.add_message_receiver_callback(lambda message: None)
+    return client
+
+
+def _measure(cls: type, text: str, level: str, hot_path: bool) -> float:
+    logger.remove()
+    logger.add(lambda record: None, level=level)
+    set_hot_path_logging(hot_path)
+    try:
+        return measure(_client(cls, text)._poll_message)
+    finally:
+        set_hot_path_logging(True)
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1, 10, 100])
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    results = []
+    for size in args.sizes:
+        text = build_response(size)
+        legacy = _measure(LegacyLoggingCPDLC, text, "INFO", True)
+        off = _measure(CPDLC, text, "INFO", False)
+        results.append({
+            "messages": size,
+            "legacy_us": legacy,
+            "deferred_us": _measure(CPDLC, text, "INFO", True),
+            "off_us": off,
+            "trace_us": _measure(CPDLC, text, "TRACE", True),
+            "saved_us": legacy - off
+        })
+    logger.remove()
+    emit("logging", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
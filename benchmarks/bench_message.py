@@ -0,0 +1,76 @@
+"""
+Per-message memory and construction throughput of AcarsMessage and CPDLCMessage against the 1.3.8 classes
+
+Memory is traced while N messages are held in a list, payload strings are built before tracing starts
+so only what the message objects allocate is counted. CPDLC messages are measured as constructed (lazy)
+and after their fields were read (parsed)
+
+Usage:
+    python benchmarks/bench_message.py [--count 10000] [--json]
+"""
+from argparse import ArgumentParser
+from tracemalloc import get_traced_memory, start, stop
+from typing import Callable
+
+from _common import emit, measure
+
+import _legacy_message as legacy
+from python_cpdlc.acars_message import AcarsMessage
+from python_cpdlc.cpdlc_message import CPDLCMessage
+from python_cpdlc.enums import PacketType
+
+
+def _telex_payloads(count: int) -> list[str]:
+    return [f"PDC {i:03d} CES2352 CLEARED TO ZBAA VIA PIAKS G330 SQUAWK 4512 NEXT FREQ 121.650" for i in range(count)]
+
+
+def _cpdlc_payloads(count: int) -> list[str]:
+    return [f"/data2/{i + 1}//WU/CLIMB TO @FL350@ REPORT REACHING" for i in range(count)]
+
+
+def _traced_bytes(build: Callable[[str], object], payloads: list[str]) -> float:
+    start()
+    base, _ = get_traced_memory()
+    messages = [build(payload) for payload in payloads]
+    memory, _ = get_traced_memory()
+    stop()
+    del messages
+    return (memory - base) / len(payloads)
+
+
+def _parsed(message):
+    _ = message.message_id
+    return message
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000, help="messages held while tracing memory")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    telex = _telex_payloads(args.count)
+    cpdlc = _cpdlc_payloads(args.count)
+    cases = [
+        ("telex", "1.3.8", lambda payload: legacy.AcarsMessage("ZSSS_GND", PacketType.TELEX, payload), telex),
+        ("telex", "current", lambda payload: AcarsMessage("ZSSS_GND", PacketType.TELEX, payload), telex),
+        ("cpdlc", "1.3.8", lambda payload: legacy.CPDLCMessage("ZSHA_CTR", PacketType.CPDLC, payload), cpdlc),
+        ("cpdlc", "current lazy", lambda payload: CPDLCMessage("ZSHA_CTR", PacketType.CPDLC, payload), cpdlc),
+        ("cpdlc", "current parsed",
+         lambda payload: _parsed(CPDLCMessage("ZSHA_CTR", PacketType.CPDLC, payload)), cpdlc),
+    ]
+    results = []
+    for kind, implementation, build, payloads in cases:
+        payload = payloads[0]
+        construct = measure(lambda: build(payload))
+        results.append({
+            "message": kind,
+            "implementation": implementation,
+            "bytes_per_message": _traced_bytes(build, payloads),
+            "construct_us": construct,
+            "messages_per_s": int(1e6 / construct)
+        })
+    emit("message", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Requests a fleet sends through a server outage and right after it, per failure handling
+
+N fleet sessions poll FakeHoppieServer every --interval seconds, the server then refuses every request for
+--outage seconds. policy leaves failed polls to the poll policy as before, backoff waits a jittered exponential
+backoff, circuit adds a CircuitBreaker shared by the fleet. Intervals are scaled down so a run takes seconds.
+outage_requests counts requests sent during the outage, peak_per_s is the highest request rate over 100 ms
+windows in the second after the server came back, recovered_s the time until every session polled successfully
+again. decide_us is the cost of scheduling the next poll after a successful one, the per poll overhead
+
+Usage:
+    python benchmarks/bench_outage.py [--sessions 10 100] [--interval 0.5] [--outage 3] [--json]
+"""
+import asyncio
+from argparse import ArgumentParser
+from time import monotonic
+from typing import Optional
+
+from loguru import logger
+
+from _common import emit, measure
+
+from python_cpdlc.circuit_breaker import BackoffPolicy, CircuitBreaker
+from python_cpdlc.fake_server import FakeHoppieServer
+from python_cpdlc.fleet import CPDLCFleet
+from python_cpdlc.poll_policy import FixedPollPolicy, PollState
+from python_cpdlc.poller import PollerBase
+
+_URL = "http://hoppie.test/acars/system"
+_WINDOW = 0.1
+
+
+async def _run(mode: str, sessions: int, interval: float, outage: float) -> dict:
+    server = FakeHoppieServer()
+    breaker = CircuitBreaker(5, interval, interval * 4) if mode == "circuit" else None
+    backoff = None if mode == "policy" else BackoffPolicy(interval, interval * 8)
+    async with CPDLCFleet("BENCH", acars_url=_URL, transport=server, min_interval=1, max_interval=1,
+                          circuit_breaker=breaker) as fleet:
+        for index in range(sessions):
+            session = await fleet.add_callsign(f"BEN{index}", initialize=False)
+            session.set_poll_policy(FixedPollPolicy(interval, interval))
+            session.set_poll_backoff(backoff)
+        for session in fleet:
+            await session.initialize_service()
+        await asyncio.sleep(interval * 2)
+        server.set_error_rate(1.0)
+        before = server.requests
+        await asyncio.sleep(outage)
+        server.set_error_rate(0)
+        back = monotonic()
+        outage_requests = server.requests - before
+        counts = [server.requests]
+        recovered: Optional[float] = None
+        while monotonic() - back < max(1.0, outage * 4):
+            await asyncio.sleep(_WINDOW)
+            counts.append(server.requests)
+            if recovered is None and not any(session.poll_failures or session.link_degraded for session in fleet):
+                recovered = monotonic() - back
+            if recovered is not None and len(counts) > 1 / _WINDOW:
+                break
+    peak = max(counts[index + 1] - counts[index] for index in range(min(len(counts) - 1, int(1 / _WINDOW))))
+    return {
+        "sessions": sessions,
+        "mode": mode,
+        "outage_requests": outage_requests,
+        "peak_per_s": peak / _WINDOW,
+        "recovered_s": recovered
+    }
+
+
+def _decide_us(backoff: Optional[BackoffPolicy], breaker: Optional[CircuitBreaker]) -> float:
+    poller = PollerBase(15, 30)
+    poller.set_backoff(backoff)
+    poller.set_circuit_breaker(breaker)
+    state = PollState(message_count=1)
+    return measure(lambda: (poller._hold(), poller._decide(state)))
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--interval", type=float, default=0.5, help="poll interval in seconds")
+    parser.add_argument("--outage", type=float, default=3, help="seconds the server refuses requests")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    logger.remove()
+    overhead = {
+        "policy": _decide_us(None, None),
+        "backoff": _decide_us(BackoffPolicy(), None),
+        "circuit": _decide_us(BackoffPolicy(), CircuitBreaker())
+    }
+    results = []
+    for sessions in args.sessions:
+        for mode in ("policy", "backoff", "circuit"):
+            result = asyncio.run(_run(mode, sessions, args.interval, args.outage))
+            result["decide_us"] = overhead[mode]
+            results.append(result)
+    emit("outage", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+AcarsMessageFactory.parser_message against the regex parser shipped up to 1.3.8
+
+Responses contain a realistic mix of CPDLC and TELEX packets, sizes range from the empty "ok" poll to large backlogs.
+decoded_us parses Response.text as received (decode included), bytes_us parses Response.content without decoding it
+
+Usage:
+    python benchmarks/bench_parser.py [--sizes 0 1 10 100 1000] [--json]
+"""
+from argparse import ArgumentParser
+
+from _common import emit, measure
+
+from _legacy_parser import parser_message as legacy_parser_message
+from python_cpdlc.acars_message_factory import AcarsMessageFactory
+from python_cpdlc.acars_tokenizer import tokenize
+
+_PACKETS = [
+    "{ZSHA_CTR cpdlc {/data2/{id}//WU/CLIMB TO @FL350@ REPORT REACHING}}",
+    "{ZSSS_GND telex {PDC 001 CES2352 CLEARED TO ZBAA VIA PIAKS G330 SQUAWK 4512 NEXT FREQ 121.650}}",
+    "{ZSHA_CTR cpdlc {/data2/{id}/{id}/NE/CURRENT ATC UNIT@_@ZSHA_CTR@_@SHANGHAI CONTROL}}",
+    "{ZSHA_CTR cpdlc {/data2/{id}//R/CONTACT @SHANGHAI CONTROL@ @124.525@}}",
+]
+
+
+def build_response(size: int) -> str:
+    if size == 0:
+        return "ok"
+    return "ok " + " ".join(_PACKETS[i % len(_PACKETS)].replace("{id}", str(i + 1)) for i in range(size))
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1, 10, 100, 1000])
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    results = []
+    for size in args.sizes:
+        text = build_response(size)
+        content = text.encode()
+        legacy = measure(lambda: legacy_parser_message(text))
+        current = measure(lambda: AcarsMessageFactory.parser_message(text))
+        results.append({
+            "messages": size,
+            "bytes": len(content),
+            "legacy_us": legacy,
+            "current_us": current,
+            "tokenize_us": measure(lambda: tokenize(text)),
+            "decoded_us": measure(lambda: AcarsMessageFactory.parser_message(content.decode())),
+            "bytes_us": measure(lambda: AcarsMessageFactory.parser_message(content)),
+            "speedup": legacy / current
+        })
+    emit("parser", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
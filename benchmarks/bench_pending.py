@@ -0,0 +1,78 @@
+"""
+Reply timeout checks of PendingReplyIndex against scanning every pending uplink
+
+N pending uplinks arrived evenly spread over one reply timeout and none is answered, the worst case where every
+timer falls due within the next timeout.
+expire_us is one check per poll interval through the timer wheel, including the uplinks it returns, scan_us the
+linear scan of every pending uplink for a passed deadline a caller had to run before. add_pop_us tracks one more
+uplink and removes it again, as a reply does
+
+Usage:
+    python benchmarks/bench_pending.py [--sizes 10 100 1000 10000] [--timeout 120] [--interval 15] [--json]
+"""
+from argparse import ArgumentParser
+from time import monotonic, perf_counter
+
+from _common import emit, measure
+
+from python_cpdlc.cpdlc_message import CPDLCMessage
+from python_cpdlc.enums import PacketType
+from python_cpdlc.pending_replies import PendingReplyIndex
+
+
+def _uplink(message_id: int) -> CPDLCMessage:
+    message = CPDLCMessage("ZSHA_CTR", PacketType.CPDLC, f"/data2/{message_id}//WU/CLIMB TO @FL350@")
+    message.message_id
+    return message
+
+
+def _index(uplinks: list[CPDLCMessage], timeout: float, start: float) -> PendingReplyIndex:
+    index = PendingReplyIndex(timeout)
+    for position, message in enumerate(uplinks):
+        index.add(message, start - timeout + timeout * position / len(uplinks))
+    return index
+
+
+def _checks(uplinks: list[CPDLCMessage], timeout: float, interval: float) -> float:
+    steps = int(timeout // interval)
+    start = monotonic()
+    index = _index(uplinks, timeout, start)
+    begin = perf_counter()
+    for step in range(1, steps + 1):
+        index.expire(start + step * interval)
+    return (perf_counter() - begin) / steps * 1e6
+
+
+def _scans(uplinks: list[CPDLCMessage], timeout: float, interval: float) -> float:
+    steps = int(timeout // interval)
+    deadlines = {message.message_id: timeout * position / len(uplinks) for position, message in enumerate(uplinks)}
+    begin = perf_counter()
+    for step in range(1, steps + 1):
+        now = step * interval
+        [message_id for message_id, deadline in deadlines.items() if deadline <= now]
+    return (perf_counter() - begin) / steps * 1e6
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--timeout", type=float, default=120, help="reply timeout in seconds")
+    parser.add_argument("--interval", type=float, default=15, help="seconds between two checks")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    results = []
+    for size in args.sizes:
+        uplinks = [_uplink(message_id) for message_id in range(1, size + 1)]
+        index = _index(uplinks, args.timeout, monotonic())
+        extra = _uplink(size + 1)
+        results.append({
+            "pending": size,
+            "expire_us": min(_checks(uplinks, args.timeout, args.interval) for _ in range(5)),
+            "scan_us": min(_scans(uplinks, args.timeout, args.interval) for _ in range(5)),
+            "add_pop_us": measure(lambda: (index.add(extra, 0), index.pop(extra.target_station, extra.message_id)))
+        })
+    emit("pending", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
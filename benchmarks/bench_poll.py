@@ -0,0 +1,125 @@
+"""
+Full _poll_message cycle of both clients against an in-memory transport
+
+Every poll is answered with the same response of N messages, so a cycle covers the request, parsing, message
+handling and receiver callbacks. poll_us runs without de-duplication so every message is handled each time,
+dedup_us keeps the default de-duplicator so every poll after the first only filters duplicates.
+metrics_us is poll_us with a MetricsRegistry recording the cycle, tracer_us with the no-op Tracer receiving
+every span, per_message_us is what one message adds to
+an empty poll. ok checks that a malformed CPDLC packet is skipped without losing the rest of its poll,
+the script exits 1 when it is not
+
+Usage:
+    python benchmarks/bench_poll.py [--sizes 0 1 10 100] [--callbacks 1] [--polls 500] [--json]
+"""
+import asyncio
+import sys
+from argparse import ArgumentParser
+from time import perf_counter
+
+from loguru import logger
+
+from _common import emit, measure
+
+from bench_parser import build_response
+from python_cpdlc.async_cpdlc import AsyncCPDLC
+from python_cpdlc.cpdlc import CPDLC
+from python_cpdlc.cpdlc_base import CPDLCBase
+from python_cpdlc.dedup import MessageDeduplicator
+from python_cpdlc.metrics import MetricsRegistry
+from python_cpdlc.tracing import Tracer
+from python_cpdlc.transport import MemoryTransport
+
+_MALFORMED = b"ok {ZSHA cpdlc {/data2/1//WU/CLIMB}} {ZSHA cpdlc {garbage}} {ZSHA telex {HELLO}}"
+
+
+def _setup(client: CPDLCBase, callbacks: int, deduplicate: bool, metrics: bool = False,
+           tracer: bool = False) -> CPDLCBase:
+    client.set_acars_url("http://bench.invalid")
+    client.set_callsign("CES2352")
+    client.set_logon_code("BENCH")
+    client.set_message_deduplicator(MessageDeduplicator() if deduplicate else None)
+    client.set_metrics(MetricsRegistry() if metrics else None)
+    client.set_tracer(Tracer() if tracer else None)
+    for _ in range(callbacks):
+        client.add_message_receiver_callback(lambda message: None)
+    return client
+
+
+def _keeps_poll(client: CPDLCBase) -> bool:
+    """
+    Whether a poll with a malformed CPDLC packet still delivers the packets around it
+    """
+    client = _setup(client, 1, True)
+    try:
+        messages = client._process_poll_response(_MALFORMED)
+    except ValueError:
+        return False
+    return [message.message for message in messages] == ["CLIMB", "HELLO"]
+
+
+def _sync(size: int, callbacks: int) -> dict:
+    text = build_response(size)
+    plain = _setup(CPDLC(transport=MemoryTransport(lambda request: text)), callbacks, False)
+    deduplicated = _setup(CPDLC(transport=MemoryTransport(lambda request: text)), callbacks, True)
+    measured = _setup(CPDLC(transport=MemoryTransport(lambda request: text)), callbacks, False, True)
+    traced = _setup(CPDLC(transport=MemoryTransport(lambda request: text)), callbacks, False, tracer=True)
+    return {
+        "client": "CPDLC",
+        "messages": size,
+        "poll_us": measure(plain._poll_message),
+        "dedup_us": measure(deduplicated._poll_message),
+        "metrics_us": measure(measured._poll_message),
+        "tracer_us": measure(traced._poll_message),
+        "ok": _keeps_poll(CPDLC())
+    }
+
+
+async def _async_time(client: AsyncCPDLC, polls: int) -> float:
+    await client._poll_message()
+    begin = perf_counter()
+    for _ in range(polls):
+        await client._poll_message()
+    return (perf_counter() - begin) / polls * 1e6
+
+
+async def _async(size: int, callbacks: int, polls: int) -> dict:
+    text = build_response(size)
+    plain = _setup(AsyncCPDLC(transport=MemoryTransport(lambda request: text)), callbacks, False)
+    deduplicated = _setup(AsyncCPDLC(transport=MemoryTransport(lambda request: text)), callbacks, True)
+    measured = _setup(AsyncCPDLC(transport=MemoryTransport(lambda request: text)), callbacks, False, True)
+    traced = _setup(AsyncCPDLC(transport=MemoryTransport(lambda request: text)), callbacks, False, tracer=True)
+    result = {
+        "client": "AsyncCPDLC",
+        "messages": size,
+        "poll_us": await _async_time(plain, polls),
+        "dedup_us": await _async_time(deduplicated, polls),
+        "metrics_us": await _async_time(measured, polls),
+        "tracer_us": await _async_time(traced, polls),
+        "ok": _keeps_poll(AsyncCPDLC())
+    }
+    for client in (plain, deduplicated, measured, traced):
+        await client.aclose()
+    return result
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1, 10, 100])
+    parser.add_argument("--callbacks", type=int, default=1, help="message receiver callbacks per client")
+    parser.add_argument("--polls", type=int, default=500, help="polls per async measurement")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    logger.remove()
+    results = [_sync(size, args.callbacks) for size in args.sizes]
+    results += [asyncio.run(_async(size, args.callbacks, args.polls)) for size in args.sizes]
+    empty = {row["client"]: row["poll_us"] for row in (_sync(0, 0), asyncio.run(_async(0, 0, args.polls)))}
+    for row in results:
+        row["per_message_us"] = (row["poll_us"] - empty[row["client"]]) / row["messages"] if row["messages"] else 0.0
+    emit("poll", results, args.json)
+    if not all(result["ok"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
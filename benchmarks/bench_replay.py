@@ -0,0 +1,53 @@
+"""
+Throughput of the inbound pipeline through ReplayEngine
+
+A synthetic recording of --responses poll responses of N messages each is replayed as fast as possible through a
+session with one receiver callback, without de-duplication so every message is parsed, handled and delivered.
+per_message_us is the whole replay per message, parse_us, handle_us and callback_us the time per message in
+each stage of a replay with stages measured
+
+Usage:
+    python benchmarks/bench_replay.py [--sizes 1 10 100] [--responses 1000] [--json]
+"""
+from argparse import ArgumentParser
+
+from loguru import logger
+
+from _common import emit
+
+from bench_parser import build_response
+from python_cpdlc.replay import RecordedResponse, ReplayEngine, replay_session
+
+
+def _engine(stages: bool) -> ReplayEngine:
+    session = replay_session()
+    session.set_message_deduplicator(None)
+    session.add_message_receiver_callback(lambda message: None)
+    return ReplayEngine(session, stages=stages)
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--responses", type=int, default=1000, help="responses per replay")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    logger.remove()
+    results = []
+    for size in args.sizes:
+        recording = [RecordedResponse(build_response(size).encode())] * args.responses
+        plain = min((_engine(False).run(recording) for _ in range(3)), key=lambda report: report.elapsed)
+        staged = min((_engine(True).run(recording) for _ in range(3)), key=lambda report: report.elapsed)
+        results.append({
+            "messages": size,
+            "messages_per_s": plain.messages_per_second,
+            "per_message_us": plain.elapsed / plain.messages * 1e6,
+            "parse_us": staged.stage_seconds["parse"] / staged.messages * 1e6,
+            "handle_us": staged.stage_seconds["handle"] / staged.messages * 1e6,
+            "callback_us": staged.stage_seconds["callback"] / staged.messages * 1e6
+        })
+    emit("replay", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+CPDLCMessage.reply_message per reply tag
+
+reply_us replies to an already parsed uplink with the shared id allocator, session_us with a per-session
+MessageIdManager, first_reply_us includes building the message from its raw packet and the lazy parse the first
+reply triggers
+
+Usage:
+    python benchmarks/bench_reply.py [--json]
+"""
+from argparse import ArgumentParser
+
+from _common import emit, measure
+
+from python_cpdlc.cpdlc_message import CPDLCMessage
+from python_cpdlc.cpdlc_message_id import MessageIdManager
+from python_cpdlc.enums import PacketType
+
+_UPLINKS = [
+    ("WU", "/data2/12//WU/CLIMB TO @FL350@ REPORT REACHING"),
+    ("AN", "/data2/13//AN/CONFIRM ASSIGNED LEVEL @FL350@"),
+    ("R", "/data2/14//R/CONTACT @SHANGHAI CONTROL@ @124.525@"),
+]
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    id_manager = MessageIdManager()
+    results = []
+    for tag, packet in _UPLINKS:
+        message = CPDLCMessage("ZSHA_CTR", PacketType.CPDLC, packet)
+        message.reply_message(True)
+        results.append({
+            "reply_tag": tag,
+            "reply_us": measure(lambda: message.reply_message(True)),
+            "session_us": measure(lambda: message.reply_message(False, id_manager)),
+            "first_reply_us": measure(lambda: CPDLCMessage("ZSHA_CTR", PacketType.CPDLC, packet).reply_message(True))
+        })
+    emit("reply", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Per-message fan-out cost of filtered receiver callbacks, routed through subscriptions or filtering themselves
+
+N consumers each want one packet type from one of --stations stations, half of them only messages starting with
+a prefix. Messages arrive round robin over every station and both packet types, so every consumer matches a
+small share of them. filter_us delivers every message to N plain receiver callbacks which check their filter
+first, as consumers had to before, routed_us delivers through N subscriptions with the same filters.
+Times are per message delivered inline
+
+Usage:
+    python benchmarks/bench_routing.py [--consumers 1 4 16 64] [--stations 16] [--messages 2000] [--json]
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Callable, Optional
+
+from loguru import logger
+
+from _common import emit
+
+from python_cpdlc.acars_message import AcarsMessage
+from python_cpdlc.acars_message_factory import AcarsMessageFactory
+from python_cpdlc.cpdlc import CPDLC
+from python_cpdlc.enums import PacketType
+
+_TYPES = (PacketType.CPDLC, PacketType.TELEX)
+_PREFIXES = {PacketType.CPDLC: "CLIMB", PacketType.TELEX: "REPORT"}
+
+
+def _messages(stations: int, count: int) -> list[AcarsMessage]:
+    packets = []
+    for index in range(count):
+        station = f"ST{index % stations:02d}_CTR"
+        if index // stations % 2:
+            packets.append(f"{{{station} telex {{REPORT LEVEL {index}}}}}")
+        else:
+            packets.append(f"{{{station} cpdlc {{/data2/{index + 1}//WU/CLIMB TO @FL{index % 400:03d}@}}}}")
+    messages = AcarsMessageFactory.parser_message("ok " + " ".join(packets))
+    for message in messages:
+        message.message
+    return messages
+
+
+def _filters(consumers: int, stations: int) -> list[tuple[PacketType, str, Optional[str]]]:
+    filters = []
+    for index in range(consumers):
+        packet_type = _TYPES[index % 2]
+        prefix = None if index % 4 < 2 else _PREFIXES[packet_type]
+        filters.append((packet_type, f"ST{index % stations:02d}_CTR", prefix))
+    return filters
+
+
+def _filtering(packet_type: PacketType, station: str, prefix: Optional[str]) -> Callable[[AcarsMessage], None]:
+    def callback(message: AcarsMessage) -> None:
+        if message.msg_type is not packet_type or message.target_station != station:
+            return
+        if prefix is not None and not message.message.startswith(prefix):
+            return
+
+    return callback
+
+
+def _deliver(client: CPDLC, messages: list[AcarsMessage]) -> float:
+    begin = perf_counter()
+    for message in messages:
+        client._message_receiver_callback(message)
+    return (perf_counter() - begin) / len(messages) * 1e6
+
+
+def _filter(consumers: int, stations: int, messages: list[AcarsMessage]) -> float:
+    client = CPDLC()
+    for packet_type, station, prefix in _filters(consumers, stations):
+        client.add_message_receiver_callback(_filtering(packet_type, station, prefix))
+    return min(_deliver(client, messages) for _ in range(5))
+
+
+def _routed(consumers: int, stations: int, messages: list[AcarsMessage]) -> float:
+    client = CPDLC()
+    for packet_type, station, prefix in _filters(consumers, stations):
+        client.subscribe(lambda message: None, packet_type, station, prefix=prefix)
+    return min(_deliver(client, messages) for _ in range(5))
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--consumers", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--stations", type=int, default=16, help="stations the messages come from")
+    parser.add_argument("--messages", type=int, default=2000, help="messages delivered per measurement")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    logger.remove()
+    messages = _messages(args.stations, args.messages)
+    results = []
+    for consumers in args.consumers:
+        results.append({
+            "consumers": consumers,
+            "filter_us": _filter(consumers, args.stations, messages),
+            "routed_us": _routed(consumers, args.stations, messages)
+        })
+    emit("routing", results, args.json)
+
+
+if __name__ == "__main__":
+    main()
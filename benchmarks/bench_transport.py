@@ -0,0 +1,80 @@
+"""
+Request overhead of the CPDLC clients without the network
+
+Sends an empty poll through CPDLC and AsyncCPDLC backed by MemoryTransport, so the time per request is what httpx
+and the client add on top of the server round trip. The raw httpx client on the same transport is the baseline
+
+Usage:
+    python benchmarks/bench_transport.py [--requests 2000] [--json]
+"""
+import asyncio
+from argparse import ArgumentParser
+from time import perf_counter
+
+from loguru import logger
+
+from _common import emit, measure
+
+from python_cpdlc.async_cpdlc import AsyncCPDLC
+from python_cpdlc.cpdlc import CPDLC
+from python_cpdlc.enums import PacketType
+from python_cpdlc.transport import MemoryTransport, create_async_client, create_client
+
+_URL = "http://bench.invalid"
+
+
+def _sync() -> dict:
+    transport = MemoryTransport()
+    raw = create_client(transport)
+    cpdlc = CPDLC(transport=transport)
+    cpdlc.set_acars_url(_URL)
+    cpdlc.set_callsign("CES2352")
+    cpdlc.set_logon_code("BENCH")
+    data = cpdlc._connect_data("SERVER", PacketType.POLL)
+    return {
+        "client": "CPDLC",
+        "httpx_us": measure(lambda: raw.post(_URL, data=data)),
+        "send_request_us": measure(lambda: cpdlc._send_request(_URL, data)),
+        "poll_us": measure(cpdlc._poll_message),
+        "requests": transport.requests
+    }
+
+
+async def _async_time(func, requests: int) -> float:
+    begin = perf_counter()
+    for _ in range(requests):
+        await func()
+    return (perf_counter() - begin) / requests * 1e6
+
+
+async def _async(requests: int) -> dict:
+    transport = MemoryTransport()
+    raw = create_async_client(transport)
+    cpdlc = AsyncCPDLC(transport=transport)
+    cpdlc.set_acars_url(_URL)
+    cpdlc.set_callsign("CES2352")
+    cpdlc.set_logon_code("BENCH")
+    data = cpdlc._connect_data("SERVER", PacketType.POLL)
+    result = {
+        "client": "AsyncCPDLC",
+        "httpx_us": await _async_time(lambda: raw.post(_URL, data=data), requests),
+        "send_request_us": await _async_time(lambda: cpdlc._send_request(_URL, data), requests),
+        "poll_us": await _async_time(cpdlc._poll_message, requests),
+        "requests": transport.requests
+    }
+    await raw.aclose()
+    await cpdlc.aclose()
+    return result
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per async measurement")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+    logger.remove()
+    emit("transport", [_sync(), asyncio.run(_async(args.requests))], args.json)
+
+
+if __name__ == "__main__":
+    main()
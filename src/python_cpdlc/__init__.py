@@ -1,20 +1,181 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .enums import *
 from .exception import *
-from .acars_message import AcarsMessage
-from .cpdlc_message import CPDLCMessage
-from .cpdlc import CPDLC
+
+if TYPE_CHECKING:
+    from .acars_message import AcarsMessage
+    from .acars_message_factory import AcarsMessageFactory
+    from .cpdlc_message import CPDLCMessage
+    from .cpdlc import CPDLC
+    from .async_cpdlc import AsyncCPDLC
+    from .fleet import CPDLCFleet
+    from .dedup import MessageDeduplicator
+    from .info_cache import InfoCache, InfoCacheStats
+    from .dispatcher import AsyncioDispatcher, CallbackDispatcher, DispatcherStats, ThreadPoolDispatcher
+    from .poll_policy import (AdaptivePollPolicy, FixedPollPolicy, PollDecision, PollPolicy, PollState,
+                              RandomPollPolicy)
+    from .send_queue import AsyncioSendQueue, RetryPolicy, SendQueue, SendQueueStats, ThreadPoolSendQueue
+    from .transport import MemoryTransport, create_async_client, create_client
+    from .fake_server import FakeAtcStation, FakeHoppieServer
+    from .metrics import Histogram, MetricsRegistry
+    from .tracing import Span, SpanContext, SpanRecorder, Tracer
+    from .logging_mode import hot_path_logging, set_hot_path_logging
+    from .journal import JournalRecord, JournalState, MessageJournal
+    from .replay import RecordedResponse, RecordingTransport, ReplayEngine, ReplayReport, read_recording, \
+        write_recording
+    from .pending_replies import PendingReplyIndex, TimerWheel
+    from .dialogue import Dialogue, DialogueEntry, DialogueIndex
+    from .routing import CURRENT_ATC, Subscription, SubscriptionTable
+    from .circuit_breaker import BackoffPolicy, CircuitBreaker, shared_circuit_breaker
+
+# Everything but enums and exceptions is imported on first access,
+# so parsing messages does not load the HTTP client or the logger
+_LAZY_ATTRIBUTES = {
+    "AcarsMessage": ".acars_message",
+    "AcarsMessageFactory": ".acars_message_factory",
+    "CPDLCMessage": ".cpdlc_message",
+    "CPDLC": ".cpdlc",
+    "AsyncCPDLC": ".async_cpdlc",
+    "CPDLCFleet": ".fleet",
+    "MessageDeduplicator": ".dedup",
+    "InfoCache": ".info_cache",
+    "InfoCacheStats": ".info_cache",
+    "CallbackDispatcher": ".dispatcher",
+    "ThreadPoolDispatcher": ".dispatcher",
+    "AsyncioDispatcher": ".dispatcher",
+    "DispatcherStats": ".dispatcher",
+    "PollPolicy": ".poll_policy",
+    "AdaptivePollPolicy": ".poll_policy",
+    "RandomPollPolicy": ".poll_policy",
+    "FixedPollPolicy": ".poll_policy",
+    "PollState": ".poll_policy",
+    "PollDecision": ".poll_policy",
+    "SendQueue": ".send_queue",
+    "ThreadPoolSendQueue": ".send_queue",
+    "AsyncioSendQueue": ".send_queue",
+    "SendQueueStats": ".send_queue",
+    "RetryPolicy": ".send_queue",
+    "MemoryTransport": ".transport",
+    "create_client": ".transport",
+    "create_async_client": ".transport",
+    "FakeHoppieServer": ".fake_server",
+    "FakeAtcStation": ".fake_server",
+    "MetricsRegistry": ".metrics",
+    "Histogram": ".metrics",
+    "Tracer": ".tracing",
+    "SpanContext": ".tracing",
+    "SpanRecorder": ".tracing",
+    "Span": ".tracing",
+    "set_hot_path_logging": ".logging_mode",
+    "hot_path_logging": ".logging_mode",
+    "MessageJournal": ".journal",
+    "JournalRecord": ".journal",
+    "JournalState": ".journal",
+    "ReplayEngine": ".replay",
+    "ReplayReport": ".replay",
+    "RecordedResponse": ".replay",
+    "RecordingTransport": ".replay",
+    "read_recording": ".replay",
+    "write_recording": ".replay",
+    "PendingReplyIndex": ".pending_replies",
+    "TimerWheel": ".pending_replies",
+    "Dialogue": ".dialogue",
+    "DialogueEntry": ".dialogue",
+    "DialogueIndex": ".dialogue",
+    "Subscription": ".routing",
+    "SubscriptionTable": ".routing",
+    "CURRENT_ATC": ".routing",
+    "BackoffPolicy": ".circuit_breaker",
+    "CircuitBreaker": ".circuit_breaker",
+    "shared_circuit_breaker": ".circuit_breaker"
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
+
 
 __version__ = "1.3.8"
 
 __ALL__ = [
     "AcarsMessage",
+    "AcarsMessageFactory",
     "CPDLCMessage",
     "CPDLC",
+    "AsyncCPDLC",
+    "CPDLCFleet",
+    "MessageDeduplicator",
+    "InfoCache",
+    "InfoCacheStats",
+    "CallbackDispatcher",
+    "ThreadPoolDispatcher",
+    "AsyncioDispatcher",
+    "DispatcherStats",
+    "PollPolicy",
+    "AdaptivePollPolicy",
+    "RandomPollPolicy",
+    "FixedPollPolicy",
+    "PollState",
+    "PollDecision",
+    "SendQueue",
+    "ThreadPoolSendQueue",
+    "AsyncioSendQueue",
+    "SendQueueStats",
+    "RetryPolicy",
+    "MemoryTransport",
+    "create_client",
+    "create_async_client",
+    "FakeHoppieServer",
+    "FakeAtcStation",
+    "MetricsRegistry",
+    "Histogram",
+    "Tracer",
+    "SpanContext",
+    "SpanRecorder",
+    "Span",
+    "set_hot_path_logging",
+    "hot_path_logging",
+    "MessageJournal",
+    "JournalRecord",
+    "JournalState",
+    "ReplayEngine",
+    "ReplayReport",
+    "RecordedResponse",
+    "RecordingTransport",
+    "read_recording",
+    "write_recording",
+    "PendingReplyIndex",
+    "TimerWheel",
+    "Dialogue",
+    "DialogueEntry",
+    "DialogueIndex",
+    "Subscription",
+    "SubscriptionTable",
+    "CURRENT_ATC",
+    "BackoffPolicy",
+    "CircuitBreaker",
+    "shared_circuit_breaker",
     "Network",
     "PacketType",
     "InfoType",
     "ReplyTag",
-    "ConnectionState"
+    "OverflowPolicy",
+    "TraceStage",
+    "CircuitState",
+    "ConnectionState",
+    "ServiceLevel",
+    "MessageDirection",
     "ParameterError",
     "InitializationError",
     "NetworkSwitchError",
@@ -30,3 +191,5 @@ __ALL__ = [
     "NotLoginError",
     "AlreadyReplyError"
 ]
+
+__all__ = __ALL__
@@ -1,6 +1,9 @@
 from datetime import datetime
 from hashlib import md5
+from time import time
+from typing import Optional, Union
 
+from .acars_tokenizer import PacketView
 from .enums import MessageDirection, PacketType
 
 
@@ -8,19 +11,26 @@ class AcarsMessage:
     """
     AcarsMessage class, which represents a standard ACARS message
 
-    You can use hash() function to get a unique message id
+    You can use hash() function to get a unique message id,
+    it depends only on station, type, CPDLC message id and payload, so a message received twice has the same identity
+
+    Messages are slotted, the timestamp is kept as epoch seconds and a payload still in the response buffer
+    is decoded on first access, call freeze() to derive every lazy field and release the buffer
 
     Attributes:
         _target_station (str): target station name,
             when direction is IN, this is the name of the sender,
             when direction is OUT, this is the name of the receiver
         _msg_type (PacketType): type of message
-        _message (str): raw message
+        _message (str | PacketView): raw message, a PacketView is decoded on first access
         _direction (MessageDirection): direction of message
-        _timestamp (datetime): timestamp when message was received
+        _timestamp (float): epoch seconds when message was received
+        _identity (Optional[int]): cached identity, None until first computed
+        _hash (Optional[str]): cached hex digest of identity fields, None until first computed
     """
+    __slots__ = ("_target_station", "_msg_type", "_message", "_direction", "_timestamp", "_identity", "_hash")
 
-    def __init__(self, target_station: str, msg_type: PacketType, message: str,
+    def __init__(self, target_station: str, msg_type: PacketType, message: Union[str, PacketView],
                  direction: MessageDirection = MessageDirection.IN):
         """
         Constructor for AcarsMessage class
@@ -29,14 +39,16 @@ class AcarsMessage:
             when direction is IN, this is the name of the sender,
             when direction is OUT, this is the name of the receiver
             msg_type (PacketType): type of the message
-            message (str): raw message
+            message (str | PacketView): raw message, or a view of it in the response buffer
             direction (MessageDirection): direction of message
         """
         self._target_station = target_station
         self._msg_type = msg_type
         self._message = message
         self._direction = direction
-        self._timestamp = datetime.now()
+        self._timestamp = time()
+        self._identity = None
+        self._hash = None
 
     @property
     def target_station(self) -> str: return self._target_station
@@ -45,19 +57,55 @@ class AcarsMessage:
     def msg_type(self) -> PacketType: return self._msg_type
 
     @property
-    def message(self) -> str: return self._message
+    def message(self) -> str:
+        if self._message.__class__ is PacketView:
+            self._message = self._message.payload
+        return self._message
 
     @property
     def direction(self) -> MessageDirection: return self._direction
 
     @property
-    def timestamp(self) -> datetime: return self._timestamp
+    def timestamp(self) -> datetime: return datetime.fromtimestamp(self._timestamp)
+
+    @property
+    def epoch(self) -> float: return self._timestamp
+
+    def _identity_fields(self) -> tuple[str, str, Optional[int], str]:
+        """
+        Fields a message is identified by, for internal use only
+        """
+        return self._target_station, self._msg_type.value, None, self.message
+
+    @property
+    def identity(self) -> int:
+        """
+        Process local identity, cheap to compare and used to detect duplicate messages
+        """
+        if self._identity is None:
+            self._identity = hash(self._identity_fields())
+        return self._identity
 
     @property
     def hash(self) -> str:
-        return md5(f"{self._target_station}{self._message}{self._timestamp.timestamp()}".encode("UTF-8")).hexdigest()
+        """
+        Hex digest of the identity fields, stable across processes
+        """
+        if self._hash is None:
+            station, msg_type, message_id, message = self._identity_fields()
+            self._hash = md5(f"{station}\x1f{msg_type}\x1f{message_id}\x1f{message}".encode("UTF-8")).hexdigest()
+        return self._hash
+
+    def freeze(self) -> "AcarsMessage":
+        """
+        Derive every lazily parsed field now, the message no longer references the poll response afterwards
+        Returns:
+            AcarsMessage: this message
+        """
+        _ = self.message
+        return self
 
     def __str__(self) -> str:
-        return f"AcarsMessage(From: {self._target_station}, Type: {self._msg_type}, Message: {self._message})"
+        return f"AcarsMessage(From: {self._target_station}, Type: {self._msg_type}, Message: {self.message})"
 
     def __repr__(self) -> str: return str(self)
@@ -1,29 +1,39 @@
+from .acars_tokenizer import PacketView as PacketView
 from .enums import MessageDirection as MessageDirection, PacketType as PacketType
 from datetime import datetime
+from typing import Optional, Union
 
 
 class AcarsMessage:
     """
     AcarsMessage class, which represents a standard ACARS message
 
-    You can use hash() function to get a unique message id
+    You can use hash() function to get a unique message id,
+    it depends only on station, type, CPDLC message id and payload, so a message received twice has the same identity
+
+    Messages are slotted, the timestamp is kept as epoch seconds and a payload still in the response buffer
+    is decoded on first access, call freeze() to derive every lazy field and release the buffer
 
     Attributes:
         _target_station (str): target station name,
             when direction is IN, this is the name of the sender,
             when direction is OUT, this is the name of the receiver
         _msg_type (PacketType): type of message
-        _message (str): raw message
+        _message (str | PacketView): raw message, a PacketView is decoded on first access
         _direction (MessageDirection): direction of message
-        _timestamp (datetime): timestamp when message was received
+        _timestamp (float): epoch seconds when message was received
+        _identity (Optional[int]): cached identity, None until first computed
+        _hash (Optional[str]): cached hex digest of identity fields, None until first computed
     """
     _target_station: str
     _msg_type: PacketType
-    _message: str
+    _message: Union[str, PacketView]
     _direction: MessageDirection
-    _timestamp: datetime
+    _timestamp: float
+    _identity: Optional[int]
+    _hash: Optional[str]
 
-    def __init__(self, target_station: str, msg_type: PacketType, message: str,
+    def __init__(self, target_station: str, msg_type: PacketType, message: Union[str, PacketView],
                  direction: MessageDirection = ...) -> None:
         """
         Constructor for AcarsMessage class
@@ -32,7 +42,7 @@ class AcarsMessage:
             when direction is IN, this is the name of the sender,
             when direction is OUT, this is the name of the receiver
             msg_type (PacketType): type of the message
-            message (str): raw message
+            message (str | PacketView): raw message, or a view of it in the response buffer
             direction (MessageDirection): direction of message
         """
         ...
@@ -53,4 +63,32 @@ class AcarsMessage:
     def timestamp(self) -> datetime: ...
 
     @property
-    def hash(self) -> str: ...
+    def epoch(self) -> float: ...
+
+    def _identity_fields(self) -> tuple[str, str, Optional[int], str]:
+        """
+        Fields a message is identified by, for internal use only
+        """
+        ...
+
+    @property
+    def identity(self) -> int:
+        """
+        Process local identity, cheap to compare and used to detect duplicate messages
+        """
+        ...
+
+    @property
+    def hash(self) -> str:
+        """
+        Hex digest of the identity fields, stable across processes
+        """
+        ...
+
+    def freeze(self) -> AcarsMessage:
+        """
+        Derive every lazily parsed field now, the message no longer references the poll response afterwards
+        Returns:
+            AcarsMessage: this message
+        """
+        ...
@@ -1,42 +1,72 @@
-from re import compile, Pattern
+from typing import Union
 
 from .acars_message import AcarsMessage
+from .acars_tokenizer import Buffer, PacketView, _buffer, _scan, _skip
 from .cpdlc_message import CPDLCMessage
 from .enums import PacketType
 
+_PACKET_TYPES: dict[str, PacketType] = {packet_type.value: packet_type for packet_type in PacketType}
+_RAW_PACKET_TYPES: dict[bytes, PacketType] = {packet_type.value.encode(): packet_type for packet_type in PacketType}
+
 
 class AcarsMessageFactory:
     """
     AcarsMessageFactory is used to create AcarsMessage objects.
-
-    Attributes:
-        split_pattern (re.Pattern): A compiled regex pattern used to split the message text.
-        data_pattern (re.Pattern): A compiled regex pattern used to parse the message text.
     """
-    split_pattern: Pattern = compile(r"\{[\s\S]*?\{[\s\S]*?}}|\{[\s\S]*?}")
-    data_pattern: Pattern = compile(r"\{[\s\S]*?}")
 
     @staticmethod
-    def parser_message(text: str) -> list[AcarsMessage]:
+    def parser_message(text: Union[str, Buffer], encoding: str = "utf-8") -> list[AcarsMessage]:
         """
         Parse the message text and return a list of AcarsMessage objects.
 
+        Raw bytes, e.g. httpx Response.content, are scanned without decoding the whole response,
+        only station names are decoded up front, payloads when they are first read.
+        Malformed packets and packets of an unknown type are logged and skipped, the rest of the response is kept.
+
         Args:
-            text (str): The raw message text.
+            text (str | bytes | bytearray | memoryview): The raw message text or response body.
+            encoding (str): encoding of a raw response body, ignored for str.
 
         Returns:
             list[AcarsMessage]: List of AcarsMessage objects.
         """
-        result: list["AcarsMessage"] = []
-        messages = AcarsMessageFactory.split_pattern.findall(text)
-        for message in messages:
-            message = message[1:-1]
-            temp = message.split(" ")[:2]
-            type_tag = PacketType(temp[1])
-            match type_tag:
-                case PacketType.CPDLC:
-                    result.append(CPDLCMessage(temp[0], type_tag, message))
-                case _:
-                    result.append(AcarsMessage(temp[0], type_tag,
-                                               AcarsMessageFactory.data_pattern.findall(message)[0][1:-1]))
+        if isinstance(text, str):
+            return AcarsMessageFactory._parser_text(text)
+        buffer, view = _buffer(text)
+        if buffer == b"ok":
+            return []
+        result: list[AcarsMessage] = []
+        for start, station_end, type_end, payload_end in _scan(buffer, b"{", b"}", b" "):
+            packet_type = _RAW_PACKET_TYPES.get(bytes(buffer[station_end + 1:type_end]))
+            if packet_type is None:
+                _skip(buffer, start, "unknown type")
+                continue
+            station = buffer[start + 1:station_end].decode(encoding, "replace")
+            payload = PacketView(view, start + 1, station_end, type_end,
+                                 type_end + (2 if buffer[type_end + 1] == 0x7B else 1), payload_end, encoding)
+            if packet_type is PacketType.CPDLC:
+                result.append(CPDLCMessage(station, packet_type, payload))
+            else:
+                result.append(AcarsMessage(station, packet_type, payload))
+        return result
+
+    @staticmethod
+    def _parser_text(text: str) -> list[AcarsMessage]:
+        """
+        Parse decoded response text, for internal use only
+        """
+        if text == "ok":
+            return []
+        result: list[AcarsMessage] = []
+        for start, station_end, type_end, payload_end in _scan(text, "{", "}", " "):
+            packet_type = _PACKET_TYPES.get(text[station_end + 1:type_end])
+            if packet_type is None:
+                _skip(text, start, "unknown type")
+                continue
+            station = text[start + 1:station_end]
+            payload = text[type_end + (2 if text[type_end + 1] == "{" else 1):payload_end]
+            if packet_type is PacketType.CPDLC:
+                result.append(CPDLCMessage(station, packet_type, payload))
+            else:
+                result.append(AcarsMessage(station, packet_type, payload))
         return result
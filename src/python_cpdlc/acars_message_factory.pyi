@@ -1,29 +1,39 @@
 from .acars_message import AcarsMessage as AcarsMessage
+from .acars_tokenizer import Buffer as Buffer, PacketView as PacketView
 from .cpdlc_message import CPDLCMessage as CPDLCMessage
 from .enums import PacketType as PacketType
-from re import Pattern
+from typing import Union
+
+_PACKET_TYPES: dict[str, PacketType]
+_RAW_PACKET_TYPES: dict[bytes, PacketType]
 
 
 class AcarsMessageFactory:
     """
     AcarsMessageFactory is used to create AcarsMessage objects.
-
-    Attributes:
-        split_pattern (re.Pattern): A compiled regex pattern used to split the message text.
-        data_pattern (re.Pattern): A compiled regex pattern used to parse the message text.
     """
-    split_pattern: Pattern
-    data_pattern: Pattern
 
     @staticmethod
-    def parser_message(text: str) -> list[AcarsMessage]:
+    def parser_message(text: Union[str, Buffer], encoding: str = "utf-8") -> list[AcarsMessage]:
         """
         Parse the message text and return a list of AcarsMessage objects.
 
+        Raw bytes, e.g. httpx Response.content, are scanned without decoding the whole response,
+        only station names are decoded up front, payloads when they are first read.
+        Malformed packets and packets of an unknown type are logged and skipped, the rest of the response is kept.
+
         Args:
-            text (str): The raw message text.
+            text (str | bytes | bytearray | memoryview): The raw message text or response body.
+            encoding (str): encoding of a raw response body, ignored for str.
 
         Returns:
             list[AcarsMessage]: List of AcarsMessage objects.
         """
         ...
+
+    @staticmethod
+    def _parser_text(text: str) -> list[AcarsMessage]:
+        """
+        Parse decoded response text, for internal use only
+        """
+        ...
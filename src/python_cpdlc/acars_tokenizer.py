@@ -0,0 +1,196 @@
+from typing import AnyStr, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def _skip(buffer: AnyStr, start: int, reason: str) -> None:
+    """
+    Log a packet dropped from a response, for internal use only
+    loguru is imported here so parsing messages does not load the logging stack until a packet is dropped
+    """
+    from loguru import logger
+    logger.warning("Skipping packet at offset {} ({}): {!r}", start, reason, buffer[start:start + 64])
+
+
+def _payload_end(buffer: AnyStr, payload_start: int, brace_open: AnyStr, brace_close: AnyStr) -> int:
+    """
+    Find the brace closing the payload opened at payload_start, -1 when it is never closed, for internal use only
+    """
+    find = buffer.find
+    depth = 1
+    position = payload_start + 1
+    while True:
+        close = find(brace_close, position)
+        if close == -1:
+            return -1
+        nested = find(brace_open, position, close)
+        if nested == -1:
+            depth -= 1
+            if depth == 0:
+                return close
+            position = close + 1
+        else:
+            depth += 1
+            position = nested + 1
+
+
+def _scan(buffer: AnyStr, brace_open: AnyStr, brace_close: AnyStr, space: AnyStr) -> list[tuple[int, int, int, int]]:
+    """
+    Locate every packet of a Hoppie response, for internal use only
+    A malformed packet, e.g. an unbalanced brace in its payload, is logged and skipped, scanning resumes at the next
+    packet boundary ``} {`` so the packets after it are kept
+    Returns:
+        list[tuple[int, int, int, int]]: (packet start, station end, type end, payload end) offsets,
+            station starts at packet start + 1, type at station end + 1,
+            payload at type end + 2 when braced and type end + 1 otherwise
+    """
+    find = buffer.find
+    boundary = brace_close + space + brace_open
+    start = find(brace_open)
+    result: list[tuple[int, int, int, int]] = []
+    while start != -1:
+        station_end = find(space, start + 1)
+        type_end = find(space, station_end + 1) if station_end != -1 else -1
+        packet_end = -1
+        if type_end != -1:
+            if buffer.startswith(brace_open, type_end + 1):
+                payload_end = _payload_end(buffer, type_end + 1, brace_open, brace_close)
+                if payload_end != -1:
+                    packet_end = find(brace_close, payload_end + 1)
+            else:
+                payload_end = packet_end = find(brace_close, type_end + 1)
+        if packet_end == -1:
+            _skip(buffer, start, "malformed")
+            start = find(boundary, start + 1)
+            if start != -1:
+                start += 2
+            continue
+        result.append((start, station_end, type_end, payload_end))
+        start = find(brace_open, packet_end + 1)
+    return result
+
+
+def tokenize(text: str) -> list[tuple[str, str, str]]:
+    """
+    Split a Hoppie response into packets in a single left to right pass
+
+    The response looks like ``ok {STATION type {payload}} {STATION type {payload}}``,
+    payloads may contain balanced braces and a packet without braced payload ``{STATION type text}`` is accepted.
+    A response without any packet, e.g. a plain ``ok``, returns immediately.
+    A truncated packet or one without station and type is logged and skipped.
+
+    Args:
+        text (str): raw response text
+    Returns:
+        list[tuple[str, str, str]]: (station, packet type, payload) of every packet
+    """
+    if text == "ok":
+        return []
+    return [
+        (text[start + 1:station_end], text[station_end + 1:type_end],
+         text[type_end + (2 if text[type_end + 1] == "{" else 1):payload_end])
+        for start, station_end, type_end, payload_end in _scan(text, "{", "}", " ")
+    ]
+
+
+class PacketView:
+    """
+    Offsets of one packet inside a response buffer, fields are decoded only when they are read
+
+    Attributes:
+        _buffer (memoryview): whole response buffer
+        _station_start (int): offset of station
+        _station_end (int): end offset of station
+        _type_end (int): end offset of packet type
+        _payload_start (int): offset of payload
+        _payload_end (int): end offset of payload
+        _encoding (str): encoding used to decode fields
+    """
+    __slots__ = ("_buffer", "_station_start", "_station_end", "_type_end", "_payload_start", "_payload_end",
+                 "_encoding")
+
+    def __init__(self, buffer: memoryview, station_start: int, station_end: int, type_end: int,
+                 payload_start: int, payload_end: int, encoding: str = "utf-8"):
+        """
+        Constructor for PacketView class
+        Args:
+            buffer (memoryview): whole response buffer
+            station_start (int): offset of station
+            station_end (int): end offset of station
+            type_end (int): end offset of packet type
+            payload_start (int): offset of payload
+            payload_end (int): end offset of payload
+            encoding (str): encoding used to decode fields
+        """
+        self._buffer = buffer
+        self._station_start = station_start
+        self._station_end = station_end
+        self._type_end = type_end
+        self._payload_start = payload_start
+        self._payload_end = payload_end
+        self._encoding = encoding
+
+    @property
+    def encoding(self) -> str:
+        return self._encoding
+
+    @property
+    def raw_station(self) -> memoryview:
+        return self._buffer[self._station_start:self._station_end]
+
+    @property
+    def raw_type(self) -> memoryview:
+        return self._buffer[self._station_end + 1:self._type_end]
+
+    @property
+    def raw_payload(self) -> memoryview:
+        return self._buffer[self._payload_start:self._payload_end]
+
+    @property
+    def station(self) -> str:
+        return str(self.raw_station, self._encoding, "replace")
+
+    @property
+    def packet_type(self) -> str:
+        return str(self.raw_type, self._encoding, "replace")
+
+    @property
+    def payload(self) -> str:
+        return str(self.raw_payload, self._encoding, "replace")
+
+    def __repr__(self) -> str:
+        return f"PacketView(station={self.station}, type={self.packet_type}, payload={self.payload})"
+
+
+def _buffer(content: Buffer) -> tuple[Union[bytes, bytearray], memoryview]:
+    """
+    Searchable buffer and byte view of a raw response, for internal use only
+    A memoryview over a whole bytes object is searched in place, other views are copied once
+    """
+    if not isinstance(content, memoryview):
+        return content, memoryview(content)
+    view = content.cast("B") if content.format != "B" else content
+    source = view.obj
+    if isinstance(source, (bytes, bytearray)) and len(source) == view.nbytes:
+        return source, view
+    return view.tobytes(), view
+
+
+def scan(content: Buffer, encoding: str = "utf-8") -> list[PacketView]:
+    """
+    Locate the packets of a raw response without decoding it, e.g. httpx Response.content
+
+    Args:
+        content (bytes | bytearray | memoryview): raw response body
+        encoding (str): encoding used when a field is read
+    Returns:
+        list[PacketView]: one view per packet, sharing the response buffer, malformed packets are skipped
+    """
+    buffer, view = _buffer(content)
+    if buffer == b"ok":
+        return []
+    return [
+        PacketView(view, start + 1, station_end, type_end,
+                   type_end + (2 if buffer[type_end + 1] == 0x7B else 1), payload_end, encoding)
+        for start, station_end, type_end, payload_end in _scan(buffer, b"{", b"}", b" ")
+    ]
@@ -0,0 +1,127 @@
+from typing import AnyStr, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def _skip(buffer: AnyStr, start: int, reason: str) -> None:
+    """
+    Log a packet dropped from a response, for internal use only
+    loguru is imported here so parsing messages does not load the logging stack until a packet is dropped
+    """
+    ...
+
+
+def _payload_end(buffer: AnyStr, payload_start: int, brace_open: AnyStr, brace_close: AnyStr) -> int:
+    """
+    Find the brace closing the payload opened at payload_start, -1 when it is never closed, for internal use only
+    """
+    ...
+
+
+def _scan(buffer: AnyStr, brace_open: AnyStr, brace_close: AnyStr, space: AnyStr) -> list[tuple[int, int, int, int]]:
+    """
+    Locate every packet of a Hoppie response, for internal use only
+    A malformed packet, e.g. an unbalanced brace in its payload, is logged and skipped, scanning resumes at the next
+    packet boundary ``} {`` so the packets after it are kept
+    Returns:
+        list[tuple[int, int, int, int]]: (packet start, station end, type end, payload end) offsets,
+            station starts at packet start + 1, type at station end + 1,
+            payload at type end + 2 when braced and type end + 1 otherwise
+    """
+    ...
+
+
+def tokenize(text: str) -> list[tuple[str, str, str]]:
+    """
+    Split a Hoppie response into packets in a single left to right pass
+
+    The response looks like ``ok {STATION type {payload}} {STATION type {payload}}``,
+    payloads may contain balanced braces and a packet without braced payload ``{STATION type text}`` is accepted.
+    A response without any packet, e.g. a plain ``ok``, returns immediately.
+    A truncated packet or one without station and type is logged and skipped.
+
+    Args:
+        text (str): raw response text
+    Returns:
+        list[tuple[str, str, str]]: (station, packet type, payload) of every packet
+    """
+    ...
+
+
+class PacketView:
+    """
+    Offsets of one packet inside a response buffer, fields are decoded only when they are read
+
+    Attributes:
+        _buffer (memoryview): whole response buffer
+        _station_start (int): offset of station
+        _station_end (int): end offset of station
+        _type_end (int): end offset of packet type
+        _payload_start (int): offset of payload
+        _payload_end (int): end offset of payload
+        _encoding (str): encoding used to decode fields
+    """
+    _buffer: memoryview
+    _station_start: int
+    _station_end: int
+    _type_end: int
+    _payload_start: int
+    _payload_end: int
+    _encoding: str
+
+    def __init__(self, buffer: memoryview, station_start: int, station_end: int, type_end: int,
+                 payload_start: int, payload_end: int, encoding: str = "utf-8") -> None:
+        """
+        Constructor for PacketView class
+        Args:
+            buffer (memoryview): whole response buffer
+            station_start (int): offset of station
+            station_end (int): end offset of station
+            type_end (int): end offset of packet type
+            payload_start (int): offset of payload
+            payload_end (int): end offset of payload
+            encoding (str): encoding used to decode fields
+        """
+        ...
+
+    @property
+    def encoding(self) -> str: ...
+
+    @property
+    def raw_station(self) -> memoryview: ...
+
+    @property
+    def raw_type(self) -> memoryview: ...
+
+    @property
+    def raw_payload(self) -> memoryview: ...
+
+    @property
+    def station(self) -> str: ...
+
+    @property
+    def packet_type(self) -> str: ...
+
+    @property
+    def payload(self) -> str: ...
+
+
+def _buffer(content: Buffer) -> tuple[Union[bytes, bytearray], memoryview]:
+    """
+    Searchable buffer and byte view of a raw response, for internal use only
+    A memoryview over a whole bytes object is searched in place, other views are copied once
+    """
+    ...
+
+
+def scan(content: Buffer, encoding: str = "utf-8") -> list[PacketView]:
+    """
+    Locate the packets of a raw response without decoding it, e.g. httpx Response.content
+
+    Args:
+        content (bytes | bytearray | memoryview): raw response body
+        encoding (str): encoding used when a field is read
+    Returns:
+        list[PacketView]: one view per packet, sharing the response buffer, malformed packets are skipped
+    """
+    ...
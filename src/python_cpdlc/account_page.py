@@ -0,0 +1,75 @@
+from html import unescape
+from importlib.util import find_spec
+from re import DOTALL, IGNORECASE, compile
+from typing import Optional
+
+from .exception import ResponseParserError
+
+# bs4 is optional and only imported when a page has to be parsed with it
+_HAS_BS4 = find_spec("bs4") is not None
+_SOUP_FEATURES = "lxml" if find_spec("lxml") is not None else "html.parser"
+_NETWORK_SELECT_REGEX = compile(r"<select\b[^>]*\bname\s*=\s*[\"']?network\b[^>]*>(.*?)</select\s*>",
+                                IGNORECASE | DOTALL)
+_OPTION_REGEX = compile(r"<option\b([^>]*)>([^<]*)", IGNORECASE)
+_SELECTED_REGEX = compile(r"(?:^|\s)selected\b", IGNORECASE)
+_NOTICE_REGEX = compile(r"<p\b[^>]*\bclass\s*=\s*(?:\"[^\"]*\bnotice\b[^\"]*\"|'[^']*\bnotice\b[^']*'|notice\b)",
+                        IGNORECASE)
+
+
+def _soup(text: str):
+    """
+    Parse text with BeautifulSoup, for internal use only
+    """
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(text, _SOUP_FEATURES)
+
+
+def _soup_selected_network(text: str) -> Optional[str]:
+    """
+    BeautifulSoup version of selected_network, for internal use only
+    """
+    element = _soup(text).find("select", attrs={"name": "network"})
+    if element is None:
+        return None
+    selected = element.find("option", attrs={"selected": True})
+    if selected is None:
+        raise ResponseParserError()
+    return selected.text.strip()
+
+
+def selected_network(text: str) -> Optional[str]:
+    """
+    Extract the selected option of the network select of account.html
+
+    The page is searched for that one element instead of being parsed into a tree,
+    when the element is not found and bs4 is installed the page is parsed with bs4 before giving up
+
+    Args:
+        text (str): account.html body
+    Returns:
+        Optional[str]: selected network name, None when the page has no network select, e.g. invalid login
+    Raises:
+        ResponseParserError: when the network select has no selected option
+    """
+    match = _NETWORK_SELECT_REGEX.search(text)
+    if match is None:
+        return _soup_selected_network(text) if _HAS_BS4 else None
+    for attributes, label in _OPTION_REGEX.findall(match.group(1)):
+        if _SELECTED_REGEX.search(attributes):
+            return unescape(label).strip()
+    raise ResponseParserError()
+
+
+def has_notice(text: str) -> bool:
+    """
+    Check whether account.html contains a notice paragraph, which the server adds after a change
+    Args:
+        text (str): account.html body
+    Returns:
+        bool: true if a <p class="notice"> element is present
+    """
+    if _NOTICE_REGEX.search(text) is not None:
+        return True
+    if not _HAS_BS4:
+        return False
+    return _soup(text).find("p", attrs={"class": "notice"}) is not None
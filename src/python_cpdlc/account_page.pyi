@@ -0,0 +1,53 @@
+from re import Pattern
+from typing import Any, Optional
+
+from .exception import ResponseParserError as ResponseParserError
+
+_HAS_BS4: bool
+_SOUP_FEATURES: str
+_NETWORK_SELECT_REGEX: Pattern
+_OPTION_REGEX: Pattern
+_SELECTED_REGEX: Pattern
+_NOTICE_REGEX: Pattern
+
+
+def _soup(text: str) -> Any:
+    """
+    Parse text with BeautifulSoup, for internal use only
+    """
+    ...
+
+
+def _soup_selected_network(text: str) -> Optional[str]:
+    """
+    BeautifulSoup version of selected_network, for internal use only
+    """
+    ...
+
+
+def selected_network(text: str) -> Optional[str]:
+    """
+    Extract the selected option of the network select of account.html
+
+    The page is searched for that one element instead of being parsed into a tree,
+    when the element is not found and bs4 is installed the page is parsed with bs4 before giving up
+
+    Args:
+        text (str): account.html body
+    Returns:
+        Optional[str]: selected network name, None when the page has no network select, e.g. invalid login
+    Raises:
+        ResponseParserError: when the network select has no selected option
+    """
+    ...
+
+
+def has_notice(text: str) -> bool:
+    """
+    Check whether account.html contains a notice paragraph, which the server adds after a change
+    Args:
+        text (str): account.html body
+    Returns:
+        bool: true if a <p class="notice"> element is present
+    """
+    ...
@@ -0,0 +1,479 @@
+from asyncio import Task, ensure_future, gather
+from functools import partial
+from inspect import isawaitable
+from time import perf_counter
+from typing import Any, Optional, Union
+
+from httpx import AsyncBaseTransport, AsyncClient, HTTPStatusError, Limits, NetworkError, RequestError, Response, \
+    Timeout
+from loguru import logger
+
+from . import logging_mode
+from .acars_message import AcarsMessage
+from .cpdlc_base import CPDLCBase
+from .cpdlc_message import CPDLCMessage
+from .enums import ConnectionState, InfoType, PacketType, ServiceLevel, TraceStage
+from .exception import *
+from .poll_policy import PollState
+from .poller import AsyncPoller
+from .send_queue import AsyncioSendQueue
+from .transport import create_async_client
+
+
+def _schedule_callback(tasks: set[Task], result: Any) -> None:
+    """
+    Run the awaitable result of a callback called without a dispatcher as a task kept in tasks, for internal use only
+    """
+    if not isawaitable(result):
+        return
+    task = ensure_future(result)
+    tasks.add(task)
+    task.add_done_callback(partial(_callback_done, tasks))
+
+
+def _callback_done(tasks: set[Task], task: Task) -> None:
+    """
+    Forget a finished callback task and report its exception, for internal use only
+    """
+    tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Exception occurred while calling callback: {}", task.exception())
+
+
+async def _wait_callbacks(tasks: set[Task]) -> None:
+    """
+    Wait for the callback tasks still running, for internal use only
+    """
+    if tasks:
+        await gather(*tasks, return_exceptions=True)
+
+
+class AsyncCPDLC(CPDLCBase):
+    """
+    Asyncio Controller Pilot Data Link Communications (CPDLC) client
+
+    Same interface as CPDLC, but every network function is a coroutine built on httpx.AsyncClient
+    and polling runs as a task on the event loop, so one loop can drive many sessions
+
+    Attributes:
+        _client (Optional[httpx.AsyncClient]): httpx async client
+        _own_client (bool): whether the client was created by this instance and should be closed by it
+        _transport (Optional[httpx.AsyncBaseTransport]): transport of the client created by this instance
+        _limits (Optional[httpx.Limits]): connection pool limits of the client created by this instance
+        _timeout (Union[float, httpx.Timeout, None]): request timeout of the client created by this instance
+        _callback_tasks (set[asyncio.Task]): tasks of coroutine callbacks called without a dispatcher
+
+    Examples:
+        cpdlc = AsyncCPDLC()\n
+        cpdlc.set_logon_code("11111111111")\n
+        cpdlc.set_callsign("CES2352")\n
+        await cpdlc.initialize_service()\n
+        await cpdlc.cpdlc_login("ZSHA")\n
+        await asyncio.sleep(60)\n
+        await cpdlc.cpdlc_logout()\n
+        await cpdlc.aclose()\n
+    """
+
+    def __init__(self, client: Optional[AsyncClient] = None, transport: Optional[AsyncBaseTransport] = None,
+                 limits: Optional[Limits] = None, timeout: Union[float, Timeout, None] = None):
+        """
+        Constructor for AsyncCPDLC class
+        Args:
+            client (Optional[httpx.AsyncClient]): shared httpx async client,
+                a private one is created on first use when None
+            transport (Optional[httpx.AsyncBaseTransport]): transport of the private client,
+                default network transport
+            limits (Optional[httpx.Limits]): connection pool limits of the private client, DEFAULT_LIMITS when None
+            timeout (Union[float, httpx.Timeout, None]): request timeout of the private client,
+                DEFAULT_TIMEOUT when None
+        """
+        logger.trace("Async CPDLC client initializing")
+        super().__init__()
+        self._client: Optional[AsyncClient] = client
+        self._own_client = client is None
+        self._transport = transport
+        self._limits = limits
+        self._timeout = timeout
+        self._callback_tasks: set[Task] = set()
+        logger.trace("Async CPDLC client initialized")
+
+    def _create_poller(self) -> AsyncPoller:
+        return AsyncPoller(self._poll_message)
+
+    def _send_queue_type(self) -> type[AsyncioSendQueue]:
+        return AsyncioSendQueue
+
+    def _callback_result(self, result: Any) -> None:
+        _schedule_callback(self._callback_tasks, result)
+
+    async def __aenter__(self) -> "AsyncCPDLC":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Stop poller, wait for running coroutine callbacks and close the httpx client if it is owned by this instance
+        """
+        await self.stop_poller()
+        await _wait_callbacks(self._callback_tasks)
+        if self._own_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # Properties
+
+    @property
+    def client(self) -> AsyncClient:
+        if self._client is None:
+            logger.trace("httpx async client initializing")
+            with self._state_lock:
+                self._client = create_async_client(self._transport, self._limits, self._timeout)
+            logger.trace("Async client initialized")
+        return self._client
+
+    # Initialize functions
+
+    def start_poller(self):
+        """
+        Start polling task
+        """
+        logger.trace("Starting poller task")
+        self._poller.start()
+
+    async def stop_poller(self):
+        """
+        Stop polling task
+        """
+        logger.trace("Stopping poller task")
+        await self._poller.stop()
+
+    async def initialize_service(self):
+        """
+        Initialize service
+        Raises:
+            ParameterError: when callsign or login code is not set
+            InitializationError: when service initialize fail
+        """
+        logger.trace("Initializing acars service")
+        if self._service_initialization:
+            logger.warning("Service already initialized")
+            return
+        if self._callsign is None:
+            raise ParameterError("Callsign is required")
+        if self._login_code is None:
+            raise ParameterError("Login code is required")
+        if not await self._ping_station():
+            logger.error("CPDLC init failed. Connection error")
+            raise InitializationError()
+        logger.debug("CPDLC init complete. Connection OK")
+        if self._email is None:
+            logger.trace("Half service provide due to missing email")
+            self._service_level = ServiceLevel.HALF
+        else:
+            logger.trace("Full service provided")
+            self._service_level = ServiceLevel.FULL
+            self._network = await self.get_network()
+        self.start_poller()
+        self._service_initialization = True
+
+    async def reset_service(self):
+        """
+        Reset service
+        """
+        logger.trace("Resetting service")
+        if not self._service_initialization:
+            logger.warning("Service not initialized")
+            return
+        await self.stop_poller()
+        self._service_level = ServiceLevel.NONE
+        self._service_initialization = False
+
+    async def reinitialize_service(self):
+        """
+        Reinitialize service
+        """
+        logger.trace("Reinitializing service")
+        await self.reset_service()
+        await self.initialize_service()
+
+    # Network function
+
+    async def _send_request(self, url: str, data: dict) -> Response:
+        """
+        Send a request to hoppie ACARS server, for internal use only
+        Args:
+            url (str): URL to send request
+            data (dict): Data to send to hoppie ACARS server
+        Returns:
+            response object
+        Raises:
+            NetworkError: Communication failure
+        """
+        span = None if self._tracer is None else self._start_span(
+            TraceStage.REQUEST, PacketType(data["type"]) if "type" in data else None, detail=url.rpartition("/")[2]
+        )
+        begin = perf_counter()
+        try:
+            res = await self.client.post(url, data=data)
+        except RequestError as e:
+            self._observe_request(url, data, begin, True)
+            self._end_span(span, e)
+            logger.error("Network request failed: {}", e)
+            raise NetworkError("Network communication failed") from e
+        self._observe_request(url, data, begin, res.is_error)
+        self._end_span(span)
+        if not res.is_error:
+            self._record_request(data)
+        return res
+
+    async def _send_outbound(self, url: str, data: dict) -> Response:
+        """
+        Send a request through the send queue when one is set, for internal use only
+        Args:
+            url (str): URL to send request
+            data (dict): Data to send to hoppie ACARS server
+        Returns:
+            response object
+        Raises:
+            NetworkError: Communication failure after the last attempt
+        """
+        if self._send_queue is None:
+            return await self._send_request(url, data)
+        return await self._send_queue.submit(self._send_request, url, data)
+
+    async def get_network(self) -> Network:
+        """
+        Get current network
+        Returns:
+            current network
+        Raises:
+            NetworkError: Communication failure
+            NotLoginError: Not logged in
+        """
+        logger.trace("Request get acars network")
+        if not self.is_official_service:
+            return Network.UNOFFICIAL
+        res = await self._send_request(self._account_url, self._account_data())
+        return self._parse_network(res.text)
+
+    @CPDLCBase._require_full_service
+    @CPDLCBase._require_official_server
+    async def change_network(self, new_network: Network) -> bool:
+        """
+        Change network
+        Args:
+            new_network (Network): new network
+        Returns:
+            true if change succeed, false otherwise
+        Raises:
+            FullServiceRequiredError: Not full service
+            NoOfficialServerError: Not official server
+            NetworkError: Communication failure
+            ResponseParserError: when message parser error
+            NetworkSwitchError: when network change failed
+        """
+        logger.trace("Request change acars network")
+        if new_network == self._network:
+            logger.warning("Same network. no change")
+            return True
+        logger.debug("Changing network to {}", new_network)
+        res = await self._send_request(self._account_url, self._account_data(new_network))
+        return self._parse_network_change(res.text, new_network)
+
+    # CPDLC Functions
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def cpdlc_login(self, target_station: str) -> bool:
+        """
+        Request CPDLC login to target station
+        Args:
+            target_station (str): target station name (e.g. ZSHA_CTR)
+        Returns:
+            true if request sent successfully
+        Raises:
+            NoInitializationError: Service not initialized
+            CallsignError: Aircraft callsign not set
+            NetworkError: Communication failure
+            AlreadyLoginError: Already logged in
+        """
+        logger.trace("CPDLC request login")
+        self._begin_login(target_station)
+        res = await self._send_outbound(self._connect_url, self._connect_data(
+            target_station, PacketType.CPDLC,
+            f"/data2/{self._message_id_manager.next_message_id()}//Y/REQUEST LOGON"
+        ))
+        self._message_sender_callback(target_station, "REQUEST LOGON")
+        return res.text == "ok"
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def cpdlc_logout(self) -> bool:
+        """
+        Request logout
+        Returns:
+            true if request sent successfully
+        Raises:
+            NoInitializationError: Service not initialized
+            CallsignError: Aircraft callsign not set
+            NetworkError: Communication failure
+            NotLoginError: Not logged in
+        """
+        logger.trace("CPDLC request logout")
+        self._begin_logout()
+        res = await self._send_outbound(self._connect_url, self._connect_data(
+            self._cpdlc_current_atc, PacketType.CPDLC,
+            f"/data2/{self._message_id_manager.next_message_id()}//N/LOGOFF"
+        ))
+        self._message_sender_callback(self._cpdlc_current_atc, "LOGOFF")
+        self._cpdlc_logout()
+        return res.text == "ok"
+
+    async def _poll_message(self) -> PollState:
+        """
+        Poll message handler, for internal use only
+        Returns:
+            PollState: session state for the poll policy
+        Raises:
+            NetworkError: Communication failure
+            HTTPStatusError: server answered the poll with a 5xx status
+        """
+        begin = perf_counter()
+        res = await self._send_request(self._connect_url, self._connect_data("SERVER", PacketType.POLL))
+        if res.is_server_error:
+            raise HTTPStatusError(f"Poll failed with HTTP {res.status_code}", request=res.request, response=res)
+        state = self._poll_state(len(self._process_poll_response(res.content, res.encoding or "utf-8")))
+        if self._metrics is not None:
+            self._metrics.observe_poll(perf_counter() - begin)
+        return state
+
+    @CPDLCBase._require_callsign_set
+    async def _ping_station(self, station_callsign: str = "SERVER") -> bool:
+        """
+        Test connection, for internal use only
+        Args:
+            station_callsign (str): station callsign
+        Returns:
+            true if connection succeeded
+        Raises:
+            NetworkError: Communication failure
+            LoginError: Login failure
+        """
+        logger.debug("Ping station: {}", station_callsign)
+        res = await self._send_request(self._connect_url, self._connect_data(station_callsign, PacketType.PING, ""))
+        return self._parse_ping(res.text, station_callsign)
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def query_info(self, info_type: InfoType, icao: str) -> AcarsMessage:
+        """
+        Query info
+        Receiver callbacks get each answer once, when the server sends it. Answers returned from the info cache
+        or shared with an identical query in flight are not passed to them again, use the return value instead
+        Args:
+            info_type (InfoType): Target info type
+            icao (str): ICAO
+        Returns:
+            AcarsMessage: query info message
+        Raises:
+            ResponseParserError: when message parser error
+            NetworkError: Communication failure
+        """
+        if self._info_cache is None:
+            message = await self._request_info(info_type, icao)
+        else:
+            message = await self._info_cache.async_fetch(info_type, icao, lambda: self._request_info(info_type, icao))
+        return message
+
+    async def _request_info(self, info_type: InfoType, icao: str) -> AcarsMessage:
+        """
+        Send an inforeq and pass the answer to the receiver callbacks, for internal use only
+        """
+        logger.debug("Query {} for {}", info_type.value, icao)
+        res = await self._send_request(self._connect_url, self._connect_data(
+            "SERVER", PacketType.INFO_REQ, f"{info_type.value} {icao}"
+        ))
+        message = self._parse_info(res.text)
+        self._message_receiver_callback(message)
+        return message
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def send_telex_message(self, target_station: str, message: str) -> bool:
+        """
+        Send a TELEX message to ground station
+        Args:
+            target_station: Recipient station callsign (e.g., "ZSSS_GND")
+            message: Plain text message content (max 220 characters)
+        Returns:
+            bool: True if message was accepted by server
+        Raises:
+            NoInitializationError: Service not initialized
+            CallsignError: Aircraft callsign not set
+            NetworkError: Communication failure
+        """
+        if logging_mode.HOT_PATH_LOGGING:
+            logger.debug("Send telex message to {}: {}", target_station, message)
+        res = await self._send_outbound(self._connect_url, self._connect_data(
+            target_station.upper(), PacketType.TELEX, message
+        ))
+        self._message_sender_callback(target_station.upper(), message)
+        return res.text == "ok"
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def departure_clearance_delivery(self, target_station: str, aircraft_type: str, dest_airport: str,
+                                           dep_airport: str, stand: str, atis_letter: str) -> bool:
+        """
+        Send DCL message to ground station
+        Args:
+            target_station (str): Recipient station callsign (e.g., "ZSSS_GND")
+            aircraft_type (str): aircraft type
+            dest_airport (str): destination airport
+            dep_airport (str): departure airport
+            stand: (str): stand
+            atis_letter (str): atis letter
+        Returns:
+            bool: True if message was accepted by server
+        Raises:
+            NoInitializationError: Service not initialized
+            CallsignError: Aircraft callsign not set
+            NetworkError: Communication failure
+        """
+        if logging_mode.HOT_PATH_LOGGING:
+            logger.debug("Send DCL to {} from {} to {}", target_station, dep_airport, dest_airport)
+        return await self.send_telex_message(target_station, self._build_dcl_message(
+            self._callsign, aircraft_type, dest_airport, dep_airport, stand, atis_letter
+        ))
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    @CPDLCBase._require_connection_state(ConnectionState.CONNECTED)
+    async def reply_cpdlc_message(self, message: CPDLCMessage, status: bool) -> bool:
+        """
+        Reply to a CPDLC message
+        Args:
+            message (CPDLCMessage): target CPDLC message
+            status (bool): reply status
+        Returns:
+            bool: True if message was accepted by server
+        Raises:
+            NoInitializationError: Service not initialized
+            CallsignError: Aircraft callsign not set
+            InvalidStateError: Connection state error
+            NetworkError: Communication failure
+            AlreadyReplyError: Message already replied
+        """
+        if logging_mode.HOT_PATH_LOGGING:
+            logger.debug("Reply CPDLC message with status {}", status)
+        if message.has_replied:
+            raise AlreadyReplyError()
+        reply = message.reply_message(status, self._message_id_manager)
+        res = await self._send_outbound(self._connect_url, self._connect_data(
+            message.target_station, PacketType.CPDLC, reply
+        ))
+        self._reply_sent(message)
+        self._message_sender_callback(message.target_station, reply.split("/")[-1])
+        return res.text == "ok"
@@ -0,0 +1,311 @@
+from .exception import *
+from .acars_message import AcarsMessage as AcarsMessage
+from .cpdlc_base import CPDLCBase as CPDLCBase
+from .cpdlc_message import CPDLCMessage as CPDLCMessage
+from .enums import ConnectionState as ConnectionState, InfoType as InfoType, PacketType as PacketType, \
+    ServiceLevel as ServiceLevel
+from .poll_policy import PollState as PollState
+from .poller import AsyncPoller as AsyncPoller
+from .send_queue import AsyncioSendQueue as AsyncioSendQueue
+from .transport import create_async_client as create_async_client
+from httpx import AsyncBaseTransport as AsyncBaseTransport, AsyncClient as AsyncClient, Limits as Limits, \
+    Response as Response, Timeout as Timeout
+
+
+def _schedule_callback(tasks: set[Task], result: Any) -> None:
+    """
+    Run the awaitable result of a callback called without a dispatcher as a task kept in tasks, for internal use only
+    """
+    ...
+
+
+def _callback_done(tasks: set[Task], task: Task) -> None:
+    """
+    Forget a finished callback task and report its exception, for internal use only
+    """
+    ...
+
+
+async def _wait_callbacks(tasks: set[Task]) -> None:
+    """
+    Wait for the callback tasks still running, for internal use only
+    """
+    ...
+from asyncio import Task
+from typing import Any, Optional, Union
+
+
+class AsyncCPDLC(CPDLCBase):
+    """
+    Asyncio Controller Pilot Data Link Communications (CPDLC) client
+
+    Same interface as CPDLC, but every network function is a coroutine built on httpx.AsyncClient
+    and polling runs as a task on the event loop, so one loop can drive many sessions
+
+    Attributes:
+        _client (Optional[httpx.AsyncClient]): httpx async client
+        _own_client (bool): whether the client was created by this instance and should be closed by it
+        _transport (Optional[httpx.AsyncBaseTransport]): transport of the client created by this instance
+        _limits (Optional[httpx.Limits]): connection pool limits of the client created by this instance
+        _timeout (Union[float, httpx.Timeout, None]): request timeout of the client created by this instance
+        _callback_tasks (set[asyncio.Task]): tasks of coroutine callbacks called without a dispatcher
+
+    Examples:
+        cpdlc = AsyncCPDLC()\n
+        cpdlc.set_logon_code("11111111111")\n
+        cpdlc.set_callsign("CES2352")\n
+        await cpdlc.initialize_service()\n
+        await cpdlc.cpdlc_login("ZSHA")\n
+        await asyncio.sleep(60)\n
+        await cpdlc.cpdlc_logout()\n
+        await cpdlc.aclose()\n
+    """
+
+    _client: Optional[AsyncClient]
+    _own_client: bool
+    _transport: Optional[AsyncBaseTransport]
+    _limits: Optional[Limits]
+    _timeout: Union[float, Timeout, None]
+    _callback_tasks: set[Task]
+
+    def __init__(self, client: Optional[AsyncClient] = None, transport: Optional[AsyncBaseTransport] = None,
+                 limits: Optional[Limits] = None, timeout: Union[float, Timeout, None] = None) -> None:
+        """
+        Constructor for AsyncCPDLC class
+        Args:
+            client (Optional[httpx.AsyncClient]): shared httpx async client,
+                a private one is created on first use when None
+            transport (Optional[httpx.AsyncBaseTransport]): transport of the private client,
+                default network transport
+            limits (Optional[httpx.Limits]): connection pool limits of the private client, DEFAULT_LIMITS when None
+            timeout (Union[float, httpx.Timeout, None]): request timeout of the private client,
+                DEFAULT_TIMEOUT when None
+        """
+        ...
+
+    def _create_poller(self) -> AsyncPoller: ...
+
+    def _send_queue_type(self) -> type[AsyncioSendQueue]: ...
+
+    def _callback_result(self, result: Any) -> None: ...
+
+    async def __aenter__(self) -> AsyncCPDLC: ...
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    async def aclose(self) -> None:
+        """
+        Stop poller, wait for running coroutine callbacks and close the httpx client if it is owned by this instance
+        """
+        ...
+
+    @property
+    def client(self) -> AsyncClient: ...
+
+    def start_poller(self) -> None:
+        """
+        Start polling task
+        """
+        ...
+
+    async def stop_poller(self) -> None:
+        """
+        Stop polling task
+        """
+        ...
+
+    async def initialize_service(self) -> None:
+        """
+        Initialize service
+        Raises:
+            ParameterError: when callsign or login code is not set
+            InitializationError: when service initialize fail
+        """
+        ...
+
+    async def reset_service(self) -> None:
+        """
+        Reset service
+        """
+        ...
+
+    async def reinitialize_service(self) -> None:
+        """
+        Reinitialize service
+        """
+        ...
+
+    async def _send_request(self, url: str, data: dict) -> Response:
+        """
+        Send a request to hoppie ACARS server, for internal use only
+        """
+        ...
+
+    async def _send_outbound(self, url: str, data: dict) -> Response:
+        """
+        Send a request through the send queue when one is set, for internal use only
+        Args:
+            url (str): URL to send request
+            data (dict): Data to send to hoppie ACARS server
+        Returns:
+            response object
+        Raises:
+            NetworkError: Communication failure after the last attempt
+        """
+        ...
+
+    async def get_network(self) -> Network:
+        """
+        Get current network
+        Returns:
+            current network
+        Raises:
+            NetworkError: Communication failure
+            NotLoginError: Not logged in
+        """
+        ...
+
+    @CPDLCBase._require_full_service
+    @CPDLCBase._require_official_server
+    async def change_network(self, new_network: Network) -> bool:
+        """
+        Change network
+        Args:
+            new_network (Network): new network
+        Returns:
+            true if change succeed, false otherwise
+        Raises:
+            FullServiceRequiredError: Not full service
+            NoOfficialServerError: Not official server
+            NetworkError: Communication failure
+            ResponseParserError: when message parser error
+            NetworkSwitchError: when network change failed
+        """
+        ...
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def cpdlc_login(self, target_station: str) -> bool:
+        """
+        Request CPDLC login to target station
+        Args:
+            target_station (str): target station name (e.g. ZSHA_CTR)
+        Returns:
+            true if request sent successfully
+        Raises:
+            NoInitializationError: Service not initialized
+            CallsignError: Aircraft callsign not set
+            NetworkError: Communication failure
+            AlreadyLoginError: Already logged in
+        """
+        ...
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def cpdlc_logout(self) -> bool:
+        """
+        Request logout
+        Returns:
+            true if request sent successfully
+        Raises:
+            NoInitializationError: Service not initialized
+            CallsignError: Aircraft callsign not set
+            NetworkError: Communication failure
+            NotLoginError: Not logged in
+        """
+        ...
+
+    async def _poll_message(self) -> PollState:
+        """
+        Poll message handler, for internal use only
+        """
+        ...
+
+    @CPDLCBase._require_callsign_set
+    async def _ping_station(self, station_callsign: str = "SERVER") -> bool:
+        """
+        Test connection, for internal use only
+        """
+        ...
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def query_info(self, info_type: InfoType, icao: str) -> AcarsMessage:
+        """
+        Query info
+        Receiver callbacks get each answer once, when the server sends it. Answers returned from the info cache
+        or shared with an identical query in flight are not passed to them again, use the return value instead
+        Args:
+            info_type (InfoType): Target info type
+            icao (str): ICAO
+        Returns:
+            AcarsMessage: query info message
+        Raises:
+            ResponseParserError: when message parser error
+            NetworkError: Communication failure
+        """
+        ...
+
+    async def _request_info(self, info_type: InfoType, icao: str) -> AcarsMessage:
+        """
+        Send an inforeq and pass the answer to the receiver callbacks, for internal use only
+        """
+        ...
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def send_telex_message(self, target_station: str, message: str) -> bool:
+        """
+        Send a TELEX message to ground station
+        Args:
+            target_station: Recipient station callsign (e.g., "ZSSS_GND")
+            message: Plain text message content (max 220 characters)
+        Returns:
+            bool: True if message was accepted by server
+        Raises:
+            NoInitializationError: Service not initialized
+            CallsignError: Aircraft callsign not set
+            NetworkError: Communication failure
+        """
+        ...
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def departure_clearance_delivery(self, target_station: str, aircraft_type: str, dest_airport: str,
+                                           dep_airport: str, stand: str, atis_letter: str) -> bool:
+        """
+        Send DCL message to ground station
+        Args:
+            target_station (str): Recipient station callsign (e.g., "ZSSS_GND")
+            aircraft_type (str): aircraft type
+            dest_airport (str): destination airport
+            dep_airport (str): departure airport
+            stand: (str): stand
+            atis_letter (str): atis letter
+        Returns:
+            bool: True if message was accepted by server
+        Raises:
+            NoInitializationError: Service not initialized
+            CallsignError: Aircraft callsign not set
+            NetworkError: Communication failure
+        """
+        ...
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    async def reply_cpdlc_message(self, message: CPDLCMessage, status: bool) -> bool:
+        """
+        Reply to a CPDLC message
+        Args:
+            message (CPDLCMessage): target CPDLC message
+            status (bool): reply status
+        Returns:
+            bool: True if message was accepted by server
+        Raises:
+            NoInitializationError: Service not initialized
+            CallsignError: Aircraft callsign not set
+            InvalidStateError: Connection state error
+            NetworkError: Communication failure
+            AlreadyReplyError: Message already replied
+        """
+        ...
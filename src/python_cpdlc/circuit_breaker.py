@@ -0,0 +1,206 @@
+from dataclasses import dataclass, field
+from random import uniform
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+from .enums import CircuitState
+from .exception import ParameterError
+
+# exceptions of a poll counted as a failure of the link when no BackoffPolicy classifies them, besides network errors
+# a poll fails on HTTPStatusError for a 5xx answer and on any unexpected error, none of them is a healthy server
+POLL_FAILURES: tuple[type[BaseException], ...] = (Exception,)
+
+
+@dataclass(frozen=True, slots=True)
+class BackoffPolicy:
+    """
+    How long a poller waits after polls failing in a row
+
+    After the n-th failure in a row the poller waits a random time between 0 and
+    min(max_delay, base_delay * 2 ** (n - 1)) seconds, the full range is drawn so sessions which lost the server
+    together spread their retries instead of retrying in lockstep
+
+    Attributes:
+        base_delay (float): upper bound of the wait after the first failure
+        max_delay (float): upper bound of every wait
+        degrade_after (int): failures in a row after which the link counts as degraded
+        failure_on (tuple[type[BaseException], ...]): exceptions counted as failures, every exception by default,
+            others leave the wait to the poll policy
+    """
+    base_delay: float = 15
+    max_delay: float = 300
+    degrade_after: int = 3
+    failure_on: tuple[type[BaseException], ...] = field(default=POLL_FAILURES)
+
+    def __post_init__(self):
+        if self.base_delay <= 0 or self.max_delay < self.base_delay or self.degrade_after <= 0:
+            raise ParameterError("degrade_after must be positive and 0 < base_delay <= max_delay")
+
+    def delay(self, failures: int) -> float:
+        """
+        Seconds to wait after failures polls failed in a row, counted from 1
+        """
+        return uniform(0, min(self.max_delay, self.base_delay * 2 ** min(max(failures - 1, 0), 32)))
+
+
+class CircuitBreaker:
+    """
+    Circuit of one server, shared by every session polling it
+
+    The circuit is closed while polls succeed. After failure_threshold failures in a row it opens and every
+    session holds its polls until the reset timeout passed, then it is half open and lets exactly one session probe
+    the server. A successful probe closes the circuit, a failed one opens it again for twice the reset timeout, up to
+    max_reset_timeout. Every open period is drawn between half and the whole reset timeout, so processes sharing a
+    server do not probe it together. A probe which does not report back within the reset timeout, e.g. because its
+    session was stopped, is handed to the next session. Thread safe
+
+    Examples:
+        breaker = shared_circuit_breaker("http://www.hoppie.nl/acars/system")\n
+        cpdlc.set_circuit_breaker(breaker)\n
+
+    Attributes:
+        _failure_threshold (int): failures in a row which open the circuit
+        _reset_timeout (float): seconds the circuit stays open after it opened from closed
+        _max_reset_timeout (float): upper bound of the open period after failed probes
+        _state (CircuitState): circuit state
+        _failures (int): failures in a row
+        _timeout (float): reset timeout of the current open period
+        _retry_at (float): monotonic time the open circuit lets a probe through
+        _probe_until (float): monotonic time a half open probe is handed to the next session
+        _lock (threading.Lock): guards the state
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30, max_reset_timeout: float = 300):
+        """
+        Constructor for CircuitBreaker class
+        Args:
+            failure_threshold (int): failures in a row which open the circuit
+            reset_timeout (float): seconds the circuit stays open after it opened from closed
+            max_reset_timeout (float): upper bound of the open period after failed probes
+        Raises:
+            ParameterError: when failure_threshold or reset_timeout is not positive or above the upper bound
+        """
+        if failure_threshold <= 0 or reset_timeout <= 0 or max_reset_timeout < reset_timeout:
+            raise ParameterError("failure_threshold must be positive and 0 < reset_timeout <= max_reset_timeout")
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._max_reset_timeout = max_reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._timeout = reset_timeout
+        self._retry_at = 0.0
+        self._probe_until = 0.0
+        self._lock = Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    @property
+    def failure_threshold(self) -> int:
+        return self._failure_threshold
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """
+        Whether a session may poll now, grants the probe of a half open circuit to one session
+        Args:
+            now (Optional[float]): monotonic time, current time when None
+        """
+        if self._state is CircuitState.CLOSED:
+            return True
+        now = monotonic() if now is None else now
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                return True
+            if self._state is CircuitState.OPEN and now < self._retry_at:
+                return False
+            if self._state is CircuitState.HALF_OPEN and now < self._probe_until:
+                return False
+            self._state = CircuitState.HALF_OPEN
+            self._probe_until = now + self._timeout
+            return True
+
+    def retry_in(self, now: Optional[float] = None) -> float:
+        """
+        Seconds until the circuit may let a session poll again, 0 when closed
+        Args:
+            now (Optional[float]): monotonic time, current time when None
+        """
+        if self._state is CircuitState.CLOSED:
+            return 0.0
+        now = monotonic() if now is None else now
+        with self._lock:
+            due = self._retry_at if self._state is CircuitState.OPEN else self._probe_until
+            return max(due - now, 0.0)
+
+    def record_success(self) -> bool:
+        """
+        Report a poll the server answered
+        Returns:
+            true if the circuit closed
+        """
+        if self._state is CircuitState.CLOSED and not self._failures:
+            return False
+        with self._lock:
+            closed = self._state is not CircuitState.CLOSED
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._timeout = self._reset_timeout
+            return closed
+
+    def record_failure(self, now: Optional[float] = None) -> bool:
+        """
+        Report a poll which failed to reach the server
+        Args:
+            now (Optional[float]): monotonic time, current time when None
+        Returns:
+            true if the circuit opened
+        """
+        now = monotonic() if now is None else now
+        with self._lock:
+            self._failures += 1
+            if self._state is CircuitState.HALF_OPEN:
+                self._timeout = min(self._timeout * 2, self._max_reset_timeout)
+            elif self._state is CircuitState.OPEN or self._failures < self._failure_threshold:
+                return False
+            self._state = CircuitState.OPEN
+            self._retry_at = now + uniform(self._timeout / 2, self._timeout)
+            return True
+
+    def reset(self) -> None:
+        """
+        Close the circuit and forget every failure
+        """
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._timeout = self._reset_timeout
+
+
+_SHARED: dict[str, CircuitBreaker] = {}
+_SHARED_LOCK = Lock()
+
+
+def shared_circuit_breaker(url: str, failure_threshold: int = 5, reset_timeout: float = 30,
+                           max_reset_timeout: float = 300) -> CircuitBreaker:
+    """
+    Circuit breaker shared by every session of this process polling url
+    Args:
+        url (str): Hoppie ACARS network url
+        failure_threshold (int): failures in a row which open the circuit, only used when it is created
+        reset_timeout (float): seconds the circuit stays open, only used when it is created
+        max_reset_timeout (float): upper bound of the open period, only used when it is created
+    Returns:
+        the circuit breaker of url
+    """
+    key = url.rstrip("/").lower()
+    with _SHARED_LOCK:
+        breaker = _SHARED.get(key)
+        if breaker is None:
+            breaker = _SHARED[key] = CircuitBreaker(failure_threshold, reset_timeout, max_reset_timeout)
+        return breaker
@@ -0,0 +1,153 @@
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Optional
+
+from .enums import CircuitState as CircuitState
+from .exception import ParameterError as ParameterError
+
+POLL_FAILURES: tuple[type[BaseException], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class BackoffPolicy:
+    """
+    How long a poller waits after polls failing in a row
+
+    After the n-th failure in a row the poller waits a random time between 0 and
+    min(max_delay, base_delay * 2 ** (n - 1)) seconds, the full range is drawn so sessions which lost the server
+    together spread their retries instead of retrying in lockstep
+
+    Attributes:
+        base_delay (float): upper bound of the wait after the first failure
+        max_delay (float): upper bound of every wait
+        degrade_after (int): failures in a row after which the link counts as degraded
+        failure_on (tuple[type[BaseException], ...]): exceptions counted as failures, every exception by default,
+            others leave the wait to the poll policy
+    """
+    base_delay: float = 15
+    max_delay: float = 300
+    degrade_after: int = 3
+    failure_on: tuple[type[BaseException], ...] = field(default=POLL_FAILURES)
+
+    def __post_init__(self): ...
+
+    def delay(self, failures: int) -> float:
+        """
+        Seconds to wait after failures polls failed in a row, counted from 1
+        """
+        ...
+
+
+class CircuitBreaker:
+    """
+    Circuit of one server, shared by every session polling it
+
+    The circuit is closed while polls succeed. After failure_threshold failures in a row it opens and every
+    session holds its polls until the reset timeout passed, then it is half open and lets exactly one session probe
+    the server. A successful probe closes the circuit, a failed one opens it again for twice the reset timeout, up to
+    max_reset_timeout. Every open period is drawn between half and the whole reset timeout, so processes sharing a
+    server do not probe it together. A probe which does not report back within the reset timeout, e.g. because its
+    session was stopped, is handed to the next session. Thread safe
+
+    Examples:
+        breaker = shared_circuit_breaker("http://www.hoppie.nl/acars/system")\n
+        cpdlc.set_circuit_breaker(breaker)\n
+
+    Attributes:
+        _failure_threshold (int): failures in a row which open the circuit
+        _reset_timeout (float): seconds the circuit stays open after it opened from closed
+        _max_reset_timeout (float): upper bound of the open period after failed probes
+        _state (CircuitState): circuit state
+        _failures (int): failures in a row
+        _timeout (float): reset timeout of the current open period
+        _retry_at (float): monotonic time the open circuit lets a probe through
+        _probe_until (float): monotonic time a half open probe is handed to the next session
+        _lock (threading.Lock): guards the state
+    """
+    _failure_threshold: int
+    _reset_timeout: float
+    _max_reset_timeout: float
+    _state: CircuitState
+    _failures: int
+    _timeout: float
+    _retry_at: float
+    _probe_until: float
+    _lock: Lock
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30, max_reset_timeout: float = 300):
+        """
+        Constructor for CircuitBreaker class
+        Args:
+            failure_threshold (int): failures in a row which open the circuit
+            reset_timeout (float): seconds the circuit stays open after it opened from closed
+            max_reset_timeout (float): upper bound of the open period after failed probes
+        Raises:
+            ParameterError: when failure_threshold or reset_timeout is not positive or above the upper bound
+        """
+        ...
+
+    @property
+    def state(self) -> CircuitState: ...
+
+    @property
+    def failures(self) -> int: ...
+
+    @property
+    def failure_threshold(self) -> int: ...
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """
+        Whether a session may poll now, grants the probe of a half open circuit to one session
+        Args:
+            now (Optional[float]): monotonic time, current time when None
+        """
+        ...
+
+    def retry_in(self, now: Optional[float] = None) -> float:
+        """
+        Seconds until the circuit may let a session poll again, 0 when closed
+        Args:
+            now (Optional[float]): monotonic time, current time when None
+        """
+        ...
+
+    def record_success(self) -> bool:
+        """
+        Report a poll the server answered
+        Returns:
+            true if the circuit closed
+        """
+        ...
+
+    def record_failure(self, now: Optional[float] = None) -> bool:
+        """
+        Report a poll which failed to reach the server
+        Args:
+            now (Optional[float]): monotonic time, current time when None
+        Returns:
+            true if the circuit opened
+        """
+        ...
+
+    def reset(self) -> None:
+        """
+        Close the circuit and forget every failure
+        """
+        ...
+_SHARED: dict[str, CircuitBreaker]
+_SHARED_LOCK: Lock
+
+
+def shared_circuit_breaker(url: str, failure_threshold: int = 5, reset_timeout: float = 30,
+                           max_reset_timeout: float = 300) -> CircuitBreaker:
+    """
+    Circuit breaker shared by every session of this process polling url
+    Args:
+        url (str): Hoppie ACARS network url
+        failure_threshold (int): failures in a row which open the circuit, only used when it is created
+        reset_timeout (float): seconds the circuit stays open, only used when it is created
+        max_reset_timeout (float): upper bound of the open period, only used when it is created
+    Returns:
+        the circuit breaker of url
+    """
+    ...
@@ -1,28 +1,22 @@
-from functools import wraps
-from re import compile
-from threading import RLock
-from typing import Callable, Optional, ParamSpec, TypeVar
+from time import perf_counter
+from typing import Optional, Union
 
-from bs4 import BeautifulSoup
-from httpx import Client, NetworkError, RequestError, Response
+from httpx import BaseTransport, Client, HTTPStatusError, Limits, NetworkError, RequestError, Response, Timeout
 from loguru import logger
 
+from . import logging_mode
 from .acars_message import AcarsMessage
-from .acars_message_factory import AcarsMessageFactory
+from .cpdlc_base import CPDLCBase
 from .cpdlc_message import CPDLCMessage
-from .cpdlc_message_id import message_id_manager
-from .enums import ConnectionState, InfoType, PacketType, ServiceLevel
+from .enums import ConnectionState, InfoType, PacketType, ServiceLevel, TraceStage
 from .exception import *
+from .poll_policy import PollState
 from .poller import Poller
+from .send_queue import ThreadPoolSendQueue
+from .transport import create_client
 
-_OFFICIAL_ACARS_URL = "http://www.hoppie.nl/acars/system"
-_ATC_INFO_REGEX = compile(r"CURRENT ATC UNIT@_@(\w+)@_@(\w+)")
 
-P = ParamSpec("P")
-R = TypeVar("R")
-
-
-class CPDLC:
+class CPDLC(CPDLCBase):
     """
     Controller Pilot Data Link Communications (CPDLC) client
 
@@ -45,7 +39,11 @@ class CPDLC:
         _cpdlc_atc_info_update_callback (Optional[Callable[[], None]]): CPDLC connection info updated callback function
         _cpdlc_disconnect_callback (Optional[Callable[[], None]]): CPDLC disconnect callback function
         _network (Optional[Network]): Hoppie ACARS network
-        _client (httpx.Client): httpx client
+        _client (Optional[httpx.Client]): httpx client
+        _own_client (bool): whether the client was created by this instance and should be closed by it
+        _transport (Optional[httpx.BaseTransport]): transport of the client created by this instance
+        _limits (Optional[httpx.Limits]): connection pool limits of the client created by this instance
+        _timeout (Union[float, httpx.Timeout, None]): request timeout of the client created by this instance
         _state_lock (threading.RLock): global lock
 
     Examples:
@@ -95,114 +93,35 @@ class CPDLC:
         cpdlc.cpdlc_logout()\n
     """
 
-    def __init__(self):
+    def __init__(self, client: Optional[Client] = None, transport: Optional[BaseTransport] = None,
+                 limits: Optional[Limits] = None, timeout: Union[float, Timeout, None] = None):
         """
         Constructor for CPDLC class
+        Args:
+            client (Optional[httpx.Client]): shared httpx client, a private one is created on first use when None
+            transport (Optional[httpx.BaseTransport]): transport of the private client, default network transport
+            limits (Optional[httpx.Limits]): connection pool limits of the private client, DEFAULT_LIMITS when None
+            timeout (Union[float, httpx.Timeout, None]): request timeout of the private client,
+                DEFAULT_TIMEOUT when None
         """
         logger.trace("CPDLC client initializing")
-        self._service_initialization = False
-        self._service_level = ServiceLevel.NONE
-        self._login_code: Optional[str] = None
-        self._email: Optional[str] = None
-        self._acars_url: str = _OFFICIAL_ACARS_URL
-        self._callsign: Optional[str] = None
-        self._poller: Poller = Poller(self._poll_message)
-        self._message_receiver_callbacks: list[Callable[[AcarsMessage], None]] = []
-        self._message_sender_callbacks: list[Callable[[str, str], None]] = []
-        self._cpdlc_connect_state = ConnectionState.DISCONNECTED
-        self._cpdlc_current_atc: Optional[str] = None
-        self._cpdlc_atc_callsign: Optional[str] = None
-        self._cpdlc_connect_callback: Optional[Callable[[], None]] = None
-        self._cpdlc_atc_info_update_callback: Optional[Callable[[], None]] = None
-        self._cpdlc_disconnect_callback: Optional[Callable[[], None]] = None
-        self._network: Network = Network.UNKNOWN
-        self._state_lock = RLock()
-        self._client: Optional[Client] = None
+        super().__init__()
+        self._client: Optional[Client] = client
+        self._own_client = client is None
+        self._transport = transport
+        self._limits = limits
+        self._timeout = timeout
         logger.trace("CPDLC client initialized")
 
     def __del__(self):
-        if hasattr(self, '_client') and self._client:
+        if getattr(self, '_own_client', False) and self._client:
             self._client.close()
 
-    # Getter and Setter
+    def _create_poller(self) -> Poller:
+        return Poller(self._poll_message)
 
-    def set_callsign(self, callsign: str):
-        """
-        Set callsign
-        Args:
-            callsign (str): callsign
-        """
-        logger.trace(f"Setting callsign: {callsign}")
-        self._callsign = callsign
-
-    def set_logon_code(self, logon_code: str):
-        """
-        Set logon code
-        Args:
-            logon_code (str): logon code
-        """
-        logger.trace(f"Setting logon code: {logon_code}")
-        self._login_code = logon_code
-
-    def set_email(self, email: str):
-        """
-        Set email, if service has been initialized without a email, which means service not in FULL\n
-        Set email will automatic upgrade service level to FULL
-        Of course, it will not be triggered if it is not the official server address
-        Args:
-            email (str): email
-        """
-        logger.trace(f"Setting email: {email}")
-        old_email = self._email
-        self._email = email
-
-        if self.is_official_service and self._service_initialization and old_email is None and email:
-            logger.info("Upgrading to FULL service")
-            self._service_level = ServiceLevel.FULL
-
-    def set_acars_url(self, acars_url: str):
-        """
-        Set ACARS url
-        Args:
-            acars_url (str): ACARS url
-        """
-        logger.trace(f"Setting acars url: {acars_url}")
-        self._acars_url = acars_url
-
-    def set_cpdlc_connect_callback(self, callback: Callable[[], None]):
-        """
-        Set CPDLC connect callback
-        Args:
-            callback (Callable[[], None]): callback
-        """
-        self._cpdlc_connect_callback = callback
-
-    def set_cpdlc_atc_info_update_callback(self, callback: Callable[[], None]):
-        """
-        Set CPDLC atc info update callback
-        Args:
-            callback (Callable[[], None]): callback
-        """
-        self._cpdlc_atc_info_update_callback = callback
-
-    def set_cpdlc_disconnect_callback(self, callback: Callable[[], None]):
-        """
-        Set CPDLC disconnect callback
-        Args:
-            callback (Callable[[], None]): callback
-        """
-        self._cpdlc_disconnect_callback = callback
-
-    def set_poll_interval_range(self, min_interval: int, max_interval: int):
-        """
-        Set polling interval range
-        Args:
-            min_interval (int): min_interval
-            max_interval (int): max_interval
-        Raises:
-            ValueError: When min_interval greater than max_interval
-        """
-        self._poller.set_interval(min_interval, max_interval)
+    def _send_queue_type(self) -> type[ThreadPoolSendQueue]:
+        return ThreadPoolSendQueue
 
     # Properties
     @property
@@ -210,46 +129,10 @@ class CPDLC:
         if self._client is None:
             logger.trace("httpx client initializing")
             with self._state_lock:
-                self._client = Client(timeout=10)
+                self._client = create_client(self._transport, self._limits, self._timeout)
             logger.trace("Client initialized")
         return self._client
 
-    @property
-    def callsign(self) -> str:
-        return self._callsign
-
-    @property
-    def logon_code(self) -> str:
-        return self._login_code
-
-    @property
-    def email(self) -> str:
-        return self._email
-
-    @property
-    def acars_url(self) -> str:
-        return self._acars_url
-
-    @property
-    def is_official_service(self) -> bool:
-        return self._acars_url == _OFFICIAL_ACARS_URL
-
-    @property
-    def network(self) -> Network:
-        return self._network
-
-    @property
-    def cpdlc_connection_status(self) -> ConnectionState:
-        return self._cpdlc_connect_state
-
-    @property
-    def cpdlc_current_atc(self) -> str:
-        return self._cpdlc_atc_callsign
-
-    @property
-    def cpdlc_atc_callsign(self) -> str:
-        return self._cpdlc_atc_callsign
-
     # Initialize functions
 
     def start_poller(self):
@@ -288,14 +171,14 @@ class CPDLC:
         if self._login_code is None:
             raise ParameterError("Login code is required")
         if not self._ping_station():
-            logger.error(f"CPDLC init failed. Connection error")
+            logger.error("CPDLC init failed. Connection error")
             raise InitializationError()
-        logger.debug(f"CPDLC init complete. Connection OK")
+        logger.debug("CPDLC init complete. Connection OK")
         if self._email is None:
-            logger.trace(f"Half service provide due to missing email")
+            logger.trace("Half service provide due to missing email")
             self._service_level = ServiceLevel.HALF
         else:
-            logger.trace(f"Full service provided")
+            logger.trace("Full service provided")
             self._service_level = ServiceLevel.FULL
             self._network = self.get_network()
         self.start_poller()
@@ -321,162 +204,6 @@ class CPDLC:
         self.reset_service()
         self.initialize_service()
 
-    # Callback functions
-
-    def listen_message_receiver(self):
-        """
-        Add callback to receive message
-        """
-
-        def wrapper(func):
-            self._message_receiver_callbacks.append(func)
-
-        return wrapper
-
-    def add_message_receiver_callback(self, callback: Callable[[AcarsMessage], None]) -> None:
-        """
-        Add callback to receive message
-        Args:
-            callback (Callable[[AcarsMessage], None]): callback
-        """
-        self._message_receiver_callbacks.append(callback)
-
-    def _message_receiver_callback(self, message: AcarsMessage) -> None:
-        """
-        Triggers callback to receive message, for internal use only
-        Args:
-            message (str): message
-        """
-        logger.trace(f"Message received : {message}")
-        for callback in self._message_receiver_callbacks:
-            try:
-                logger.trace(f"Callback executed: {callback.__name__}")
-                callback(message)
-            except Exception as e:
-                logger.error(f"Exception occurred while calling callback: {e}")
-
-    def listen_message_sender(self):
-        """
-        Add callback to send message
-        """
-
-        def wrapper(func):
-            self._message_sender_callbacks.append(func)
-
-        return wrapper
-
-    def add_message_sender_callback(self, callback: Callable[[str, str], None]) -> None:
-        """
-        Add callback to send message
-        Args:
-            callback (Callable[[str, str], None]): callback
-        """
-        self._message_sender_callbacks.append(callback)
-
-    def _message_sender_callback(self, to: str, message: str) -> None:
-        """
-        Triggers callback to send message, for internal use only
-        Args:
-            to (str): message send to
-            message (str): message
-        """
-        logger.trace(f"Message send to {to}: {message}")
-        for callback in self._message_sender_callbacks:
-            try:
-                logger.trace(f"Callback executed: {callback.__name__}")
-                callback(to, message)
-            except Exception as e:
-                logger.error(f"Exception occurred while calling callback: {e}")
-
-    # Decorators
-
-    @staticmethod
-    def _require_official_server(func: Callable[P, R]) -> Callable[P, R]:
-        """
-        Service address checker, for internal use only
-        Raises:
-            NoOfficialServerError: Not official server
-        """
-
-        @wraps(func)
-        def wrapper(self: "CPDLC", *args: P.args, **kwargs: P.kwargs) -> R:
-            if not self.is_official_service:
-                raise NoOfficialServerError()
-            return func(self, *args, **kwargs)
-
-        return wrapper
-
-    @staticmethod
-    def _require_full_service(func: Callable[P, R]) -> Callable[P, R]:
-        """
-        Service level checker, for internal use only
-        Raises:
-            FullServiceRequiredError: Not full service
-        """
-
-        @wraps(func)
-        def wrapper(self: "CPDLC", *args: P.args, **kwargs: P.kwargs) -> R:
-            if self._service_level != ServiceLevel.FULL:
-                logger.error("No full service available, cannot change network")
-                raise FullServiceRequiredError()
-            return func(self, *args, **kwargs)
-
-        return wrapper
-
-    @staticmethod
-    def _require_service_initialized(func: Callable[P, R]) -> Callable[P, R]:
-        """
-        Service initialization checker, for internal use only
-        Raises:
-            NoInitializationError: Service not initialized
-        """
-
-        @wraps(func)
-        def wrapper(self: "CPDLC", *args: P.args, **kwargs: P.kwargs) -> R:
-            if not self._service_initialization:
-                raise NoInitializationError()
-            return func(self, *args, **kwargs)
-
-        return wrapper
-
-    @staticmethod
-    def _require_callsign_set(func: Callable[P, R]) -> Callable[P, R]:
-        """
-        Callsign checker, for internal use only
-        Raises:
-            CallsignError: Aircraft callsign not set
-        """
-
-        @wraps(func)
-        def wrapper(self: "CPDLC", *args: P.args, **kwargs: P.kwargs) -> R:
-            if self._callsign is None:
-                raise CallsignError()
-            return func(self, *args, **kwargs)
-
-        return wrapper
-
-    @staticmethod
-    def _require_connection_state(*states: ConnectionState) -> Callable[[Callable[P, R]], Callable[P, R]]:
-        """
-        Connection state checker, for internal use only
-        Raises:
-                InvalidStateError: connection state is invalid
-        """
-
-        def decorator(func: Callable[P, R]) -> Callable[P, R]:
-            @wraps(func)
-            def wrapper(self: "CPDLC", *args: P.args, **kwargs: P.kwargs) -> R:
-                if self._cpdlc_connect_state not in states:
-                    raise InvalidStateError(
-                        f"Required states: {[s.name for s in states]}, "
-                        f"Current state: {self._cpdlc_connect_state.name}"
-                    )
-                return func(self, *args, **kwargs)
-
-            return wrapper
-
-        return decorator
-
     # Network function
 
     def _send_request(self, url: str, data: dict) -> Response:
@@ -490,11 +217,37 @@ class CPDLC:
         Raises:
             NetworkError: Communication failure
         """
+        span = None if self._tracer is None else self._start_span(
+            TraceStage.REQUEST, PacketType(data["type"]) if "type" in data else None, detail=url.rpartition("/")[2]
+        )
+        begin = perf_counter()
         try:
-            return self.client.post(url, data=data)
+            res = self.client.post(url, data=data)
         except RequestError as e:
-            logger.error(f"Network request failed: {e}")
+            self._observe_request(url, data, begin, True)
+            self._end_span(span, e)
+            logger.error("Network request failed: {}", e)
             raise NetworkError("Network communication failed") from e
+        self._observe_request(url, data, begin, res.is_error)
+        self._end_span(span)
+        if not res.is_error:
+            self._record_request(data)
+        return res
+
+    def _send_outbound(self, url: str, data: dict) -> Response:
+        """
+        Send a request through the send queue when one is set, for internal use only
+        Args:
+            url (str): URL to send request
+            data (dict): Data to send to hoppie ACARS server
+        Returns:
+            response object
+        Raises:
+            NetworkError: Communication failure after the last attempt
+        """
+        if self._send_queue is None:
+            return self._send_request(url, data)
+        return self._send_queue.submit(self._send_request, url, data).result()
 
     def get_network(self) -> Network:
         """
@@ -508,21 +261,11 @@ class CPDLC:
         logger.trace("Request get acars network")
         if not self.is_official_service:
             return Network.UNOFFICIAL
-        res = self._send_request(f"{self._acars_url}/account.html", {
-            "email": self._email,
-            "logon": self._login_code
-        })
-        soup = BeautifulSoup(res.text, 'lxml')
-        element = soup.find("select", attrs={"name": "network"})
-        if element is None:
-            logger.error(f"Login code or email is invalid, please check login code or email")
-            raise LoginError()
-        selected = element.find("option", attrs={"selected": ""})
-        logger.debug(f"Current network: {selected.text}")
-        return Network(selected.text)
-
-    @_require_full_service
-    @_require_official_server
+        res = self._send_request(self._account_url, self._account_data())
+        return self._parse_network(res.text)
+
+    @CPDLCBase._require_full_service
+    @CPDLCBase._require_official_server
     def change_network(self, new_network: Network) -> bool:
         """
         Change network
@@ -539,53 +282,16 @@ class CPDLC:
         """
         logger.trace("Request change acars network")
         if new_network == self._network:
-            logger.warning(f"Same network. no change")
+            logger.warning("Same network. no change")
             return True
-        logger.debug(f"Changing network to {new_network}")
-        res = self._send_request(f"{self._acars_url}/account.html", {
-            "email": self._email,
-            "logon": self._login_code,
-            "network": new_network.value
-        })
-        soup = BeautifulSoup(res.text, 'lxml')
-        element = soup.find("p", attrs={"class": "notice"})
-        if element is None:
-            logger.error(f"Change network failed, wrong response")
-            raise ResponseParserError()
-        element = soup.find("select", attrs={"name": "network"})
-        if element is None:
-            logger.error(f"Login code or email is invalid, please check login code or email")
-            raise LoginError()
-        selected = element.find("option", attrs={"selected": ""})
-        if selected.text != new_network.value:
-            logger.error(f"Change network failed. Expected {new_network.value}, got {selected.text}")
-            raise NetworkSwitchError(self._network, new_network)
-        self._network = Network(selected.text)
-        logger.debug(f"Network changed to {new_network.value}")
-        return True
+        logger.debug("Changing network to {}", new_network)
+        res = self._send_request(self._account_url, self._account_data(new_network))
+        return self._parse_network_change(res.text, new_network)
 
     # CPDLC Functions
 
-    @_require_service_initialized
-    def _cpdlc_logout(self):
-        """
-        Clear CPDLC variable, for internal use only
-        Raises:
-            NoInitializationError: Service not initialized
-            NotLoginError: Not logged in
-        """
-        with self._state_lock:
-            if self._cpdlc_connect_state != ConnectionState.CONNECTED:
-                raise NotLoginError()
-            self._cpdlc_connect_state = ConnectionState.DISCONNECTED
-            self._cpdlc_current_atc = None
-            self._cpdlc_atc_callsign = None
-        logger.debug(f"CPDLC disconnected")
-        if self._cpdlc_disconnect_callback is not None:
-            self._cpdlc_disconnect_callback()
-
-    @_require_service_initialized
-    @_require_callsign_set
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def cpdlc_login(self, target_station: str) -> bool:
         """
         Request CPDLC login to target station
@@ -600,24 +306,16 @@ class CPDLC:
             AlreadyLoginError: Already logged in
         """
         logger.trace("CPDLC request login")
-        with self._state_lock:
-            if self._cpdlc_connect_state != ConnectionState.DISCONNECTED:
-                raise AlreadyLoginError()
-            self._cpdlc_connect_state = ConnectionState.CONNECTING
-            logger.debug(f"CPDLC request login to {target_station}")
-            self._cpdlc_current_atc = target_station.upper()
-        res = self._send_request(f"{self._acars_url}/connect.html", {
-            "logon": self._login_code,
-            "from": self._callsign,
-            "to": target_station,
-            "type": PacketType.CPDLC.value,
-            "packet": f"/data2/{message_id_manager.next_message_id()}//Y/REQUEST LOGON"
-        })
+        self._begin_login(target_station)
+        res = self._send_outbound(self._connect_url, self._connect_data(
+            target_station, PacketType.CPDLC,
+            f"/data2/{self._message_id_manager.next_message_id()}//Y/REQUEST LOGON"
+        ))
         self._message_sender_callback(target_station, "REQUEST LOGON")
         return res.text == "ok"
 
-    @_require_service_initialized
-    @_require_callsign_set
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def cpdlc_logout(self) -> bool:
         """
         Request logout
@@ -630,67 +328,34 @@ class CPDLC:
             NotLoginError: Not logged in
         """
         logger.trace("CPDLC request logout")
-        with self._state_lock:
-            if self._cpdlc_connect_state != ConnectionState.CONNECTED:
-                raise NotLoginError()
-            self._cpdlc_connect_state = ConnectionState.DISCONNECTING
-        logger.debug(f"CPDLC logout")
-        res = self._send_request(f"{self._acars_url}/connect.html", {
-            "logon": self._login_code,
-            "from": self._callsign,
-            "to": self._cpdlc_current_atc,
-            "type": PacketType.CPDLC.value,
-            "packet": f"/data2/{message_id_manager.next_message_id()}//N/LOGOFF"
-        })
+        self._begin_logout()
+        res = self._send_outbound(self._connect_url, self._connect_data(
+            self._cpdlc_current_atc, PacketType.CPDLC,
+            f"/data2/{self._message_id_manager.next_message_id()}//N/LOGOFF"
+        ))
         self._message_sender_callback(self._cpdlc_current_atc, "LOGOFF")
         self._cpdlc_logout()
         return res.text == "ok"
 
-    def _handle_message(self, message: AcarsMessage):
-        """
-        Handle CPDLC login and logout message, for internal use only
-        Args:
-            message (AcarsMessage): message to be handled
-        """
-        if isinstance(message, CPDLCMessage):
-            if message.message == "LOGON ACCEPTED":
-                # cpdlc logon success
-                with self._state_lock:
-                    self._cpdlc_connect_state = ConnectionState.CONNECTED
-                logger.success(f"CPDLC connected. ATC Unit: {self._cpdlc_current_atc}")
-                if self._cpdlc_connect_callback is not None:
-                    self._cpdlc_connect_callback()
-            if message.message.startswith("CURRENT ATC UNIT") and (match := _ATC_INFO_REGEX.match(message.message)):
-                # cpdlc atc info
-                unit, callsign = match.groups()
-                with self._state_lock:
-                    self._cpdlc_current_atc = unit
-                    self._cpdlc_atc_callsign = callsign
-                    self._cpdlc_connect_state = ConnectionState.CONNECTED
-                logger.success(f"ATC Unit: {self._cpdlc_current_atc}. Callsign: {self._cpdlc_atc_callsign}")
-                if self._cpdlc_atc_info_update_callback is not None:
-                    self._cpdlc_atc_info_update_callback()
-            if message.message == "LOGOFF":
-                self._cpdlc_logout()
-
-    def _poll_message(self):
+    def _poll_message(self) -> PollState:
         """
         Poll message handler, for internal use only
+        Returns:
+            PollState: session state for the poll policy
         Raises:
             NetworkError: Communication failure
-        """
-        res = self._send_request(f"{self._acars_url}/connect.html", {
-            "logon": self._login_code,
-            "from": self._callsign,
-            "to": "SERVER",
-            "type": PacketType.POLL.value
-        })
-        messages = AcarsMessageFactory.parser_message(res.text)
-        for message in messages:
-            self._handle_message(message)
-            self._message_receiver_callback(message)
-
-    @_require_callsign_set
+            HTTPStatusError: server answered the poll with a 5xx status
+        """
+        begin = perf_counter()
+        res = self._send_request(self._connect_url, self._connect_data("SERVER", PacketType.POLL))
+        if res.is_server_error:
+            raise HTTPStatusError(f"Poll failed with HTTP {res.status_code}", request=res.request, response=res)
+        state = self._poll_state(len(self._process_poll_response(res.content, res.encoding or "utf-8")))
+        if self._metrics is not None:
+            self._metrics.observe_poll(perf_counter() - begin)
+        return state
+
+    @CPDLCBase._require_callsign_set
     def _ping_station(self, station_callsign: str = "SERVER") -> bool:
         """
         Test connection, for internal use only
@@ -702,27 +367,17 @@ class CPDLC:
             NetworkError: Communication failure
             LoginError: Login failure
         """
-        logger.debug(f"Ping station: {station_callsign}")
-        res = self._send_request(f"{self._acars_url}/connect.html", {
-            "logon": self._login_code,
-            "from": self._callsign,
-            "to": station_callsign,
-            "type": PacketType.PING.value,
-            "packet": ""
-        })
-        if res.text.lower() != "ok":
-            if "invalid logon code" in res.text:
-                raise LoginError()
-            logger.error(f"Ping station {station_callsign} failed, got {res.text}")
-            return False
-        logger.debug(f"Ping station {station_callsign} succeeded")
-        return True
-
-    @_require_service_initialized
-    @_require_callsign_set
+        logger.debug("Ping station: {}", station_callsign)
+        res = self._send_request(self._connect_url, self._connect_data(station_callsign, PacketType.PING, ""))
+        return self._parse_ping(res.text, station_callsign)
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def query_info(self, info_type: InfoType, icao: str) -> AcarsMessage:
         """
         Query info
+        Receiver callbacks get each answer once, when the server sends it. Answers returned from the info cache
+        or shared with an identical query in flight are not passed to them again, use the return value instead
         Args:
             info_type (InfoType): Target info type
             icao (str): ICAO
@@ -732,22 +387,26 @@ class CPDLC:
             ResponseParserError: when message parser error
             NetworkError: Communication failure
         """
-        logger.debug(f"Query {info_type.value} for {icao}")
-        res = self._send_request(f"{self._acars_url}/connect.html", {
-            "logon": self._login_code,
-            "from": self._callsign,
-            "to": "SERVER",
-            "type": PacketType.INFO_REQ.value,
-            "packet": f"{info_type.value} {icao}"
-        })
-        data = AcarsMessageFactory.parser_message(res.text)
-        if len(data) != 1:
-            raise ResponseParserError()
-        self._message_receiver_callback(data[0])
-        return data[0]
-
-    @_require_service_initialized
-    @_require_callsign_set
+        if self._info_cache is None:
+            message = self._request_info(info_type, icao)
+        else:
+            message = self._info_cache.fetch(info_type, icao, lambda: self._request_info(info_type, icao))
+        return message
+
+    def _request_info(self, info_type: InfoType, icao: str) -> AcarsMessage:
+        """
+        Send an inforeq and pass the answer to the receiver callbacks, for internal use only
+        """
+        logger.debug("Query {} for {}", info_type.value, icao)
+        res = self._send_request(self._connect_url, self._connect_data(
+            "SERVER", PacketType.INFO_REQ, f"{info_type.value} {icao}"
+        ))
+        message = self._parse_info(res.text)
+        self._message_receiver_callback(message)
+        return message
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def send_telex_message(self, target_station: str, message: str) -> bool:
         """
         Send a TELEX message to ground station
@@ -761,19 +420,16 @@ class CPDLC:
             CallsignError: Aircraft callsign not set
             NetworkError: Communication failure
         """
-        logger.debug(f"Send telex message to {target_station}: {message}")
-        res = self._send_request(f"{self._acars_url}/connect.html", {
-            "logon": self._login_code,
-            "from": self._callsign,
-            "to": target_station.upper(),
-            "type": PacketType.TELEX.value,
-            "packet": message
-        })
+        if logging_mode.HOT_PATH_LOGGING:
+            logger.debug("Send telex message to {}: {}", target_station, message)
+        res = self._send_outbound(self._connect_url, self._connect_data(
+            target_station.upper(), PacketType.TELEX, message
+        ))
         self._message_sender_callback(target_station.upper(), message)
         return res.text == "ok"
 
-    @_require_service_initialized
-    @_require_callsign_set
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def departure_clearance_delivery(self, target_station: str, aircraft_type: str, dest_airport: str, dep_airport: str,
                                      stand: str, atis_letter: str) -> bool:
         """
@@ -792,15 +448,15 @@ class CPDLC:
             CallsignError: Aircraft callsign not set
             NetworkError: Communication failure
         """
-        logger.debug(f"Send DCL to {target_station} from {dep_airport} to {dest_airport}")
-        return self.send_telex_message(target_station,
-                                       f"REQUEST PREDEP CLEARANCE {self._callsign} {aircraft_type} "
-                                       f"TO {dest_airport.upper()} AT {dep_airport.upper()} STAND {stand} "
-                                       f"ATIS {atis_letter}")
+        if logging_mode.HOT_PATH_LOGGING:
+            logger.debug("Send DCL to {} from {} to {}", target_station, dep_airport, dest_airport)
+        return self.send_telex_message(target_station, self._build_dcl_message(
+            self._callsign, aircraft_type, dest_airport, dep_airport, stand, atis_letter
+        ))
 
-    @_require_service_initialized
-    @_require_callsign_set
-    @_require_connection_state(ConnectionState.CONNECTED)
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
+    @CPDLCBase._require_connection_state(ConnectionState.CONNECTED)
     def reply_cpdlc_message(self, message: CPDLCMessage, status: bool) -> bool:
         """
         Reply to a CPDLC message
@@ -816,16 +472,14 @@ class CPDLC:
             NetworkError: Communication failure
             AlreadyReplyError: Message already replied
         """
-        logger.debug(f"Reply CPDLC message with status {status}")
+        if logging_mode.HOT_PATH_LOGGING:
+            logger.debug("Reply CPDLC message with status {}", status)
         if message.has_replied:
             raise AlreadyReplyError()
-        reply = message.reply_message(status)
-        res = self._send_request(f"{self._acars_url}/connect.html", {
-            "logon": self._login_code,
-            "from": self._callsign,
-            "to": message.target_station,
-            "type": PacketType.CPDLC.value,
-            "packet": reply
-        })
+        reply = message.reply_message(status, self._message_id_manager)
+        res = self._send_outbound(self._connect_url, self._connect_data(
+            message.target_station, PacketType.CPDLC, reply
+        ))
+        self._reply_sent(message)
         self._message_sender_callback(message.target_station, reply.split("/")[-1])
         return res.text == "ok"
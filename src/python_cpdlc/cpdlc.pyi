@@ -1,22 +1,19 @@
-from concurrent.futures import ThreadPoolExecutor as ThreadPoolExecutor
-from threading import RLock as RLock
-
 from .exception import *
 from .acars_message import AcarsMessage as AcarsMessage
-from .acars_message_factory import AcarsMessageFactory as AcarsMessageFactory
+from .cpdlc_base import CPDLCBase as CPDLCBase
 from .cpdlc_message import CPDLCMessage as CPDLCMessage
-from .cpdlc_message_id import message_id_manager as message_id_manager
 from .enums import ConnectionState as ConnectionState, InfoType as InfoType, PacketType as PacketType, \
     ServiceLevel as ServiceLevel
+from .poll_policy import PollState as PollState
 from .poller import Poller as Poller
-from httpx import Client as Client, Response as Response
-from typing import Callable, Optional, ParamSpec, TypeVar
-
-P = ParamSpec("P")
-R = TypeVar("R")
+from .send_queue import ThreadPoolSendQueue as ThreadPoolSendQueue
+from .transport import create_client as create_client
+from httpx import BaseTransport as BaseTransport, Client as Client, Limits as Limits, Response as Response, \
+    Timeout as Timeout
+from typing import Optional, Union
 
 
-class CPDLC:
+class CPDLC(CPDLCBase):
     """
     Controller Pilot Data Link Communications (CPDLC) client
 
@@ -39,7 +36,11 @@ class CPDLC:
         _cpdlc_atc_info_update_callback (Optional[Callable[[], None]]): CPDLC connection info updated callback function
         _cpdlc_disconnect_callback (Optional[Callable[[], None]]): CPDLC disconnect callback function
         _network (Optional[Network]): Hoppie ACARS network
-        _client (httpx.Client): httpx client
+        _client (Optional[httpx.Client]): httpx client
+        _own_client (bool): whether the client was created by this instance and should be closed by it
+        _transport (Optional[httpx.BaseTransport]): transport of the client created by this instance
+        _limits (Optional[httpx.Limits]): connection pool limits of the client created by this instance
+        _timeout (Union[float, httpx.Timeout, None]): request timeout of the client created by this instance
         _state_lock (threading.RLock): global lock
 
     Examples:
@@ -89,134 +90,34 @@ class CPDLC:
         cpdlc.cpdlc_logout()\n
     """
 
-    _service_initialization: bool
-    _service_level: ServiceLevel
-    _login_code: Optional[str]
-    _email: Optional[str]
-    _acars_url: str
-    _callsign: Optional[str]
-    _poller: Poller
-    _message_receiver_callbacks: list[Callable[[AcarsMessage], None]]
-    _message_sender_callbacks: list[Callable[[str, str], None]]
-    _cpdlc_connect_state: ConnectionState
-    _cpdlc_current_atc: Optional[str]
-    _cpdlc_atc_callsign: Optional[str]
-    _cpdlc_connect_callback: Optional[Callable[[], None]]
-    _cpdlc_atc_info_update_callback: Optional[Callable[[], None]]
-    _cpdlc_disconnect_callback: Optional[Callable[[], None]]
-    _network: Optional[Network]
     _client: Optional[Client]
-    _state_lock: RLock
+    _own_client: bool
+    _transport: Optional[BaseTransport]
+    _limits: Optional[Limits]
+    _timeout: Union[float, Timeout, None]
 
-    def __init__(self, max_workers: int = 8) -> None:
+    def __init__(self, client: Optional[Client] = None, transport: Optional[BaseTransport] = None,
+                 limits: Optional[Limits] = None, timeout: Union[float, Timeout, None] = None) -> None:
         """
         Constructor for CPDLC class
         Args:
-            max_workers (int): Maximum number of threads
+            client (Optional[httpx.Client]): shared httpx client, a private one is created on first use when None
+            transport (Optional[httpx.BaseTransport]): transport of the private client, default network transport
+            limits (Optional[httpx.Limits]): connection pool limits of the private client, DEFAULT_LIMITS when None
+            timeout (Union[float, httpx.Timeout, None]): request timeout of the private client,
+                DEFAULT_TIMEOUT when None
         """
         ...
 
     def __del__(self) -> None: ...
 
-    def set_callsign(self, callsign: str):
-        """
-        Set callsign
-        Args:
-            callsign (str): callsign
-        """
-        ...
-
-    def set_logon_code(self, logon_code: str):
-        """
-        Set logon code
-        Args:
-            logon_code (str): logon code
-        """
-        ...
-
-    def set_email(self, email: str):
-        """
-        Set email, if service has been initialized without a email, which means service not in FULL\n
-        Set email will automatic upgrade service level to FULL
-        Of course, it will not be triggered if it is not the official server address
-        Args:
-            email (str): email
-        """
-        ...
-
-    def set_acars_url(self, acars_url: str):
-        """
-        Set ACARS url
-        Args:
-            acars_url (str): ACARS url
-        """
-        ...
+    def _create_poller(self) -> Poller: ...
 
-    def set_cpdlc_connect_callback(self, callback: Callable[[], None]):
-        """
-        Set CPDLC connect callback
-        Args:
-            callback (Callable[[], None]): callback
-        """
-        ...
-
-    def set_cpdlc_atc_info_update_callback(self, callback: Callable[[], None]):
-        """
-        Set CPDLC atc info update callback
-        Args:
-            callback (Callable[[], None]): callback
-        """
-        ...
-
-    def set_cpdlc_disconnect_callback(self, callback: Callable[[], None]):
-        """
-        Set CPDLC disconnect callback
-        Args:
-            callback (Callable[[], None]): callback
-        """
-        ...
-
-    def set_poll_interval_range(self, min_interval: int, max_interval: int):
-        """
-        Set polling interval range
-        Args:
-            min_interval (int): min_interval
-            max_interval (int): max_interval
-        Raises:
-            ValueError: When min_interval greater than max_interval
-        """
-        ...
+    def _send_queue_type(self) -> type[ThreadPoolSendQueue]: ...
 
     @property
     def client(self) -> Client: ...
 
-    @property
-    def callsign(self) -> str: ...
-
-    @property
-    def logon_code(self) -> str: ...
-
-    @property
-    def email(self) -> str: ...
-
-    @property
-    def acars_url(self) -> str: ...
-
-    @property
-    def is_official_service(self) -> bool: ...
-
-    @property
-    def network(self) -> Network: ...
-
-    @property
-    def cpdlc_connection_status(self) -> ConnectionState: ...
-
-    @property
-    def cpdlc_current_atc(self) -> str: ...
-
-    @property
-    def cpdlc_atc_callsign(self) -> str: ...
-
     def start_poller(self) -> None:
         """
         Start polling thread
@@ -256,84 +157,22 @@ class CPDLC:
         """
         ...
 
-    def listen_message_receiver(self):
-        """
-        Add callback to receive message
-        """
-        ...
-
-    def add_message_receiver_callback(self, callback: Callable[[AcarsMessage], None]) -> None:
-        """
-        Add callback to receive message
-        Args:
-            callback (Callable[[AcarsMessage], None]): callback
-        """
-        ...
-
-    def _message_receiver_callback(self, message: AcarsMessage) -> None:
-        """
-        Triggers callback to receive message, for internal use only
-        """
-        ...
-
-    def listen_message_sender(self):
+    def _send_request(self, url: str, data: dict) -> Response:
         """
-        Add callback to send message
+        Send a request to hoppie ACARS server, for internal use only
         """
         ...
 
-    def add_message_sender_callback(self, callback: Callable[[str, str], None]) -> None:
+    def _send_outbound(self, url: str, data: dict) -> Response:
         """
-        Add callback to send message
+        Send a request through the send queue when one is set, for internal use only
         Args:
-             callback (Callable[[str, str], None]): callback
-        """
-        ...
-
-    def _message_sender_callback(self, to: str, message: str) -> None:
-        """
-        Triggers callback to send message, for internal use only
-        """
-        ...
-
-    @staticmethod
-    def _require_official_server(func: Callable[P, R]) -> Callable[P, R]:
-        """
-        Service address checker, for internal use only
-        """
-        ...
-
-    @staticmethod
-    def _require_full_service(func: Callable[P, R]) -> Callable[P, R]:
-        """
-        Service level checker, for internal use only
-        """
-        ...
-
-    @staticmethod
-    def _require_service_initialized(func: Callable[P, R]) -> Callable[P, R]:
-        """
-        Service initialization checker, for internal use only
-        """
-        ...
-
-    @staticmethod
-    def _require_callsign_set(func: Callable[P, R]) -> Callable[P, R]:
-        """
-        Callsign checker, for internal use only
-        """
-        ...
-
-    @staticmethod
-    def _require_connection_state(*states: ConnectionState) -> Callable[[Callable[P, R]], Callable[P, R]]:
-        """
-        Connection state checker, for internal use only
-        """
-        ...
-
-    def _send_request(self, url: str, data: dict) -> Response:
-        """
-        Send a request to hoppie ACARS server, for internal use only
+            url (str): URL to send request
+            data (dict): Data to send to hoppie ACARS server
+        Returns:
+            response object
+        Raises:
+            NetworkError: Communication failure after the last attempt
         """
         ...
 
@@ -348,8 +187,8 @@ class CPDLC:
         """
         ...
 
-    @_require_full_service
-    @_require_official_server
+    @CPDLCBase._require_full_service
+    @CPDLCBase._require_official_server
     def change_network(self, new_network: Network) -> bool:
         """
         Change network
@@ -366,15 +205,8 @@ class CPDLC:
         """
         ...
 
-    @_require_service_initialized
-    def _cpdlc_logout(self):
-        """
-        Clear CPDLC variable, for internal use only
-        """
-        ...
-
-    @_require_service_initialized
-    @_require_callsign_set
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def cpdlc_login(self, target_station: str) -> bool:
         """
         Request CPDLC login to target station
@@ -390,8 +222,8 @@ class CPDLC:
         """
         ...
 
-    @_require_service_initialized
-    @_require_callsign_set
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def cpdlc_logout(self) -> bool:
         """
         Request logout
@@ -405,30 +237,26 @@ class CPDLC:
         """
         ...
 
-    def _handle_message(self, message: AcarsMessage):
-        """
-        Handle CPDLC login and logout message, for internal use only
-        """
-        ...
-
-    def _poll_message(self):
+    def _poll_message(self) -> PollState:
         """
         Poll message handler, for internal use only
         """
         ...
 
-    @_require_callsign_set
+    @CPDLCBase._require_callsign_set
     def _ping_station(self, station_callsign: str = "SERVER") -> bool:
         """
         Test connection, for internal use only
         """
         ...
 
-    @_require_service_initialized
-    @_require_callsign_set
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def query_info(self, info_type: InfoType, icao: str) -> AcarsMessage:
         """
         Query info
+        Receiver callbacks get each answer once, when the server sends it. Answers returned from the info cache
+        or shared with an identical query in flight are not passed to them again, use the return value instead
         Args:
             info_type (InfoType): Target info type
             icao (str): ICAO
@@ -440,8 +268,14 @@ class CPDLC:
         """
         ...
 
-    @_require_service_initialized
-    @_require_callsign_set
+    def _request_info(self, info_type: InfoType, icao: str) -> AcarsMessage:
+        """
+        Send an inforeq and pass the answer to the receiver callbacks, for internal use only
+        """
+        ...
+
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def send_telex_message(self, target_station: str, message: str) -> bool:
         """
         Send a TELEX message to ground station
@@ -457,8 +291,8 @@ class CPDLC:
         """
         ...
 
-    @_require_service_initialized
-    @_require_callsign_set
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def departure_clearance_delivery(self, target_station: str, aircraft_type: str, dest_airport: str, dep_airport: str,
                                      stand: str, atis_letter: str) -> bool:
         """
@@ -479,8 +313,8 @@ class CPDLC:
         """
         ...
 
-    @_require_service_initialized
-    @_require_callsign_set
+    @CPDLCBase._require_service_initialized
+    @CPDLCBase._require_callsign_set
     def reply_cpdlc_message(self, message: CPDLCMessage, status: bool) -> bool:
         """
         Reply to a CPDLC message
@@ -0,0 +1,1207 @@
+from abc import ABC, abstractmethod
+from functools import wraps
+from inspect import isawaitable, iscoroutinefunction
+from pathlib import Path
+from re import compile
+from threading import RLock
+from time import perf_counter, time
+from typing import Any, Awaitable, Callable, Optional, ParamSpec, TypeVar, Union
+
+from loguru import logger
+
+from . import logging_mode
+from .account_page import has_notice, selected_network
+from .acars_message import AcarsMessage
+from .acars_message_factory import AcarsMessageFactory
+from .circuit_breaker import BackoffPolicy, CircuitBreaker
+from .cpdlc_message import CPDLCMessage
+from .cpdlc_message_id import MessageIdManager
+from .dedup import MessageDeduplicator
+from .dialogue import Dialogue, DialogueIndex
+from .dispatcher import CallbackDispatcher
+from .enums import ConnectionState, MessageDirection, Network, PacketType, ReplyTag, ServiceLevel, TraceStage
+from .exception import *
+from .info_cache import InfoCache
+from .journal import JournalState, MessageJournal
+from .metrics import MetricsRegistry
+from .pending_replies import PendingReplyIndex
+from .poll_policy import PollDecision, PollPolicy, PollState
+from .routing import Subscription, SubscriptionTable
+from .send_queue import SendQueue
+from .tracing import SpanContext, Tracer
+
+_OFFICIAL_ACARS_URL = "http://www.hoppie.nl/acars/system"
+_ATC_INFO_REGEX = compile(r"CURRENT ATC UNIT@_@(\w+)@_@(\w+)")
+_RECORDED_TYPES = frozenset((PacketType.CPDLC.value, PacketType.TELEX.value))
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _guard(func: Callable[P, R], check: Callable[["CPDLCBase"], None]) -> Callable[P, R]:
+    """
+    Wrap func so that check runs before it, for internal use only
+    Coroutine functions get a coroutine wrapper, so the check runs when the call is awaited
+    """
+    if iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(self: "CPDLCBase", *args: P.args, **kwargs: P.kwargs) -> R:
+            check(self)
+            return await func(self, *args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(self: "CPDLCBase", *args: P.args, **kwargs: P.kwargs) -> R:
+        check(self)
+        return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _well_formed(messages: list[AcarsMessage]) -> list[AcarsMessage]:
+    """
+    Drop CPDLC messages whose payload does not parse, for internal use only
+    Payloads are parsed here, so one bad packet cannot fail de-duplication or handling of the whole poll
+    """
+    result: list[AcarsMessage] = []
+    for message in messages:
+        if isinstance(message, CPDLCMessage):
+            try:
+                message.message_id
+            except ValueError as e:
+                logger.warning("Skipping CPDLC message from {}: {}", message.target_station, e)
+                continue
+        result.append(message)
+    return result
+
+
+class CPDLCBase(ABC):
+    """
+    Shared state and message handling of the synchronous and asynchronous CPDLC clients
+
+    Everything that does not touch the network lives here,
+    subclasses only provide the poller and the request functions, the abstract methods below
+
+    Attributes:
+        _service_initialization (bool): Service initialization flag
+        _service_level (ServiceLevel): Service level
+        _login_code (Optional[str]): Hoppie ACARS network login code
+        _email (Optional[str]): Hoppie ACARS network login email
+        _acars_url (str): Hoppie ACARS network url
+        _callsign (Optional[str]): Aircraft callsign
+        _poller (Poller | AsyncPoller): poller object
+        _message_receiver_callbacks (list[Callable[[AcarsMessage], None]]): message receiver callbacks
+        _subscriptions (SubscriptionTable): receiver callbacks with filters, called only with matching messages
+        _message_sender_callbacks (list[Callable[[str, str], None]]): message sender callbacks
+        _cpdlc_connect_state (ConnectionState): CPDLC connection state
+        _cpdlc_current_atc (Optional[str]): CPDLC current ATC letter (e.g. ZSHA_CTR)
+        _cpdlc_atc_callsign (Optional[str]): CPDLC current ATC callsign (e.g. Shanghai Control)
+        _cpdlc_connect_callback (Optional[Callable[[], None]]): CPDLC connect callback function
+        _cpdlc_atc_info_update_callback (Optional[Callable[[], None]]): CPDLC connection info updated callback function
+        _cpdlc_disconnect_callback (Optional[Callable[[], None]]): CPDLC disconnect callback function
+        _reply_expired_callback (Optional[Callable[[CPDLCMessage], None]]): called with uplinks left unanswered
+            past the reply timeout
+        _network (Optional[Network]): Hoppie ACARS network
+        _pending_replies (PendingReplyIndex): received uplinks waiting for our reply, keyed by station and message id
+        _info_cache (Optional[InfoCache]): cache of query_info answers, None sends every query
+        _send_queue (Optional[SendQueue]): queue of logon, logoff, telex and reply requests, None sends them inline
+        _metrics (Optional[MetricsRegistry]): registry of request, poll and callback metrics, None records nothing
+        _tracer (Optional[Tracer]): tracer of request, parse, handle and callback spans, None traces nothing
+        _traced_callbacks (dict[Callable[..., Any], Callable[..., Any]]): tracing wrapper per receiver callback
+        _journal (Optional[MessageJournal]): journal of received messages and sent packets, None keeps no journal
+        _dialogues (Optional[DialogueIndex]): received and sent CPDLC packets grouped into dialogues,
+            None links nothing
+        _state_lock (threading.RLock): global lock
+    """
+
+    def __init__(self):
+        """
+        Constructor for CPDLCBase class
+        """
+        self._service_initialization = False
+        self._service_level = ServiceLevel.NONE
+        self._login_code: Optional[str] = None
+        self._email: Optional[str] = None
+        self._acars_url: str = _OFFICIAL_ACARS_URL
+        self._callsign: Optional[str] = None
+        self._message_receiver_callbacks: list[Callable[[AcarsMessage], None]] = []
+        self._subscriptions = SubscriptionTable()
+        self._message_sender_callbacks: list[Callable[[str, str], None]] = []
+        self._cpdlc_connect_state = ConnectionState.DISCONNECTED
+        self._cpdlc_current_atc: Optional[str] = None
+        self._cpdlc_atc_callsign: Optional[str] = None
+        self._cpdlc_connect_callback: Optional[Callable[[], None]] = None
+        self._cpdlc_atc_info_update_callback: Optional[Callable[[], None]] = None
+        self._cpdlc_disconnect_callback: Optional[Callable[[], None]] = None
+        self._reply_expired_callback: Optional[Callable[[CPDLCMessage], None]] = None
+        self._network: Network = Network.UNKNOWN
+        self._pending_replies = PendingReplyIndex()
+        self._deduplicator: Optional[MessageDeduplicator] = MessageDeduplicator()
+        self._message_id_manager = MessageIdManager()
+        self._callback_dispatcher: Optional[CallbackDispatcher] = None
+        self._info_cache: Optional[InfoCache] = None
+        self._send_queue: Optional[SendQueue] = None
+        self._metrics: Optional[MetricsRegistry] = None
+        self._tracer: Optional[Tracer] = None
+        self._traced_callbacks: dict[Callable[..., Any], Callable[..., Any]] = {}
+        self._journal: Optional[MessageJournal] = None
+        self._dialogues: Optional[DialogueIndex] = DialogueIndex()
+        self._state_lock = RLock()
+        self._poller = self._create_poller()
+
+    @abstractmethod
+    def _create_poller(self):
+        """
+        Create the poller which drives _poll_message, for internal use only
+        """
+
+    @abstractmethod
+    def _send_queue_type(self) -> type[SendQueue]:
+        """
+        Send queue class whose workers can run the requests of this client, for internal use only
+        """
+
+    @abstractmethod
+    def _send_request(self, url: str, data: dict):
+        """
+        Send a request to hoppie ACARS server, a coroutine function in asynchronous clients, for internal use only
+        Args:
+            url (str): URL to send request
+            data (dict): Data to send to hoppie ACARS server
+        Raises:
+            NetworkError: Communication failure
+        """
+
+    @abstractmethod
+    def _poll_message(self):
+        """
+        Poll message handler returning the PollState, a coroutine function in asynchronous clients,
+        for internal use only
+        """
+
+    @abstractmethod
+    def start_poller(self):
+        """
+        Start the poller
+        """
+
+    @abstractmethod
+    def stop_poller(self):
+        """
+        Stop the poller, a coroutine function in asynchronous clients
+        """
+
+    # Getter and Setter
+
+    def set_callsign(self, callsign: str):
+        """
+        Set callsign
+        Args:
+            callsign (str): callsign
+        """
+        logger.trace("Setting callsign: {}", callsign)
+        self._callsign = callsign
+
+    def set_logon_code(self, logon_code: str):
+        """
+        Set logon code
+        Args:
+            logon_code (str): logon code
+        """
+        logger.trace("Setting logon code: {}", logon_code)
+        self._login_code = logon_code
+
+    def set_email(self, email: str):
+        """
+        Set email, if service has been initialized without a email, which means service not in FULL\n
+        Set email will automatic upgrade service level to FULL
+        Of course, it will not be triggered if it is not the official server address
+        Args:
+            email (str): email
+        """
+        logger.trace("Setting email: {}", email)
+        old_email = self._email
+        self._email = email
+
+        if self.is_official_service and self._service_initialization and old_email is None and email:
+            logger.info("Upgrading to FULL service")
+            self._service_level = ServiceLevel.FULL
+
+    def set_acars_url(self, acars_url: str):
+        """
+        Set ACARS url
+        Args:
+            acars_url (str): ACARS url
+        """
+        logger.trace("Setting acars url: {}", acars_url)
+        self._acars_url = acars_url
+
+    def set_cpdlc_connect_callback(self, callback: Callable[[], None]):
+        """
+        Set CPDLC connect callback
+        Args:
+            callback (Callable[[], None]): callback
+        """
+        self._cpdlc_connect_callback = callback
+
+    def set_cpdlc_atc_info_update_callback(self, callback: Callable[[], None]):
+        """
+        Set CPDLC atc info update callback
+        Args:
+            callback (Callable[[], None]): callback
+        """
+        self._cpdlc_atc_info_update_callback = callback
+
+    def set_cpdlc_disconnect_callback(self, callback: Callable[[], None]):
+        """
+        Set CPDLC disconnect callback
+        Args:
+            callback (Callable[[], None]): callback
+        """
+        self._cpdlc_disconnect_callback = callback
+
+    def set_reply_timeout(self, timeout: Optional[float]):
+        """
+        Set seconds a received uplink may stay unanswered before the reply expired callback is called,
+        it is checked after every poll, None never expires
+        Args:
+            timeout (Optional[float]): timeout in seconds
+        Raises:
+            ParameterError: when timeout is not positive
+        """
+        self._pending_replies.set_timeout(timeout)
+
+    def set_reply_expired_callback(self, callback: Optional[Callable[[CPDLCMessage], None]]):
+        """
+        Set callback called once with every uplink left unanswered past the reply timeout, None to remove it
+        Args:
+            callback (Optional[Callable[[CPDLCMessage], None]]): callback
+        """
+        self._reply_expired_callback = callback
+
+    def set_poll_interval_range(self, min_interval: int, max_interval: int):
+        """
+        Set polling interval range
+        Args:
+            min_interval (int): min_interval
+            max_interval (int): max_interval
+        Raises:
+            ValueError: When min_interval greater than max_interval
+        """
+        self._poller.set_interval(min_interval, max_interval)
+
+    def set_poll_policy(self, policy: PollPolicy):
+        """
+        Set poll scheduling policy, AdaptivePollPolicy is used by default
+        Args:
+            policy (PollPolicy): policy
+        """
+        self._poller.set_policy(policy)
+
+    def set_poll_decision_callback(self, callback: Optional[Callable[[PollDecision], None]]):
+        """
+        Set callback called with every poll scheduling decision, None to remove it
+        Args:
+            callback (Optional[Callable[[PollDecision], None]]): callback
+        """
+        self._poller.set_decision_callback(callback)
+
+    def set_poll_backoff(self, backoff: Optional[BackoffPolicy]):
+        """
+        Set wait after failed polls, BackoffPolicy() is used by default,
+        None leaves it to the poll policy
+        Args:
+            backoff (Optional[BackoffPolicy]): backoff policy
+        """
+        self._poller.set_backoff(backoff)
+
+    def set_circuit_breaker(self, circuit_breaker: Optional[CircuitBreaker]):
+        """
+        Set circuit of the Hoppie ACARS server, pass shared_circuit_breaker(acars_url) to share it with every
+        session of this process polling the same server, None polls regardless
+        Args:
+            circuit_breaker (Optional[CircuitBreaker]): circuit breaker
+        """
+        self._poller.set_circuit_breaker(circuit_breaker)
+
+    def set_link_degraded_callback(self, callback: Optional[Callable[[int], None]]):
+        """
+        Set callback called with the failed polls in a row when the link to the server degrades, None to remove it
+        Args:
+            callback (Optional[Callable[[int], None]]): callback
+        """
+        self._poller.set_link_degraded_callback(callback)
+
+    def set_link_recovered_callback(self, callback: Optional[Callable[[float], None]]):
+        """
+        Set callback called with the seconds the link was degraded when the server answers again, None to remove it
+        Args:
+            callback (Optional[Callable[[float], None]]): callback
+        """
+        self._poller.set_link_recovered_callback(callback)
+
+    def set_message_deduplicator(self, deduplicator: Optional[MessageDeduplicator]):
+        """
+        Set index used to drop messages received twice, None disables de-duplication
+        Args:
+            deduplicator (Optional[MessageDeduplicator]): deduplicator
+        """
+        self._deduplicator = deduplicator
+
+    def set_callback_dispatcher(self, dispatcher: Optional[CallbackDispatcher]):
+        """
+        Set dispatcher running message receiver and sender callbacks off the poll and caller threads,
+        None runs them inline
+        Args:
+            dispatcher (Optional[CallbackDispatcher]): dispatcher
+        """
+        self._callback_dispatcher = dispatcher
+
+    def set_info_cache(self, info_cache: Optional[InfoCache]):
+        """
+        Set cache answering query_info, it can be shared between clients, None sends every query
+        With a cache, receiver callbacks no longer see query_info answers on cache hits or coalesced queries
+        Args:
+            info_cache (Optional[InfoCache]): info cache
+        """
+        self._info_cache = info_cache
+
+    def set_send_queue(self, send_queue: Optional[SendQueue]):
+        """
+        Set queue sending logon, logoff, telex and reply requests under its rate limit and retry policy,
+        it can be shared between clients, None sends them inline
+        Args:
+            send_queue (Optional[SendQueue]): send queue, a ThreadPoolSendQueue for CPDLC
+                and an AsyncioSendQueue for AsyncCPDLC
+        Raises:
+            ParameterError: when send queue cannot run the requests of this client
+        """
+        queue_type = self._send_queue_type()
+        if send_queue is not None and not isinstance(send_queue, queue_type):
+            raise ParameterError(f"{type(self).__name__} requires {queue_type.__name__}, "
+                                 f"got {type(send_queue).__name__}")
+        self._send_queue = send_queue
+
+    def set_metrics(self, metrics: Optional[MetricsRegistry]):
+        """
+        Set registry recording requests, polls, callback timings and connection state transitions,
+        it can be shared between clients, None records nothing
+        Args:
+            metrics (Optional[MetricsRegistry]): metrics registry
+        """
+        self._metrics = metrics
+
+    def set_tracer(self, tracer: Optional[Tracer]):
+        """
+        Set tracer receiving spans around requests, response parsing, message handling and receiver callbacks,
+        it can be shared between clients, None traces nothing
+        Args:
+            tracer (Optional[Tracer]): tracer
+        """
+        self._tracer = tracer
+
+    def set_journal(self, journal: Optional[MessageJournal]):
+        """
+        Set journal recording every received message and sent CPDLC and telex packet, one journal per session,
+        None keeps no journal
+        Args:
+            journal (Optional[MessageJournal]): message journal
+        """
+        self._journal = journal
+
+    def set_dialogue_index(self, dialogues: Optional[DialogueIndex]):
+        """
+        Set index grouping received and sent CPDLC packets into dialogues, None links nothing
+        Args:
+            dialogues (Optional[DialogueIndex]): dialogue index
+        """
+        self._dialogues = dialogues
+
+    # Properties
+
+    @property
+    def callsign(self) -> str:
+        return self._callsign
+
+    @property
+    def logon_code(self) -> str:
+        return self._login_code
+
+    @property
+    def email(self) -> str:
+        return self._email
+
+    @property
+    def acars_url(self) -> str:
+        return self._acars_url
+
+    @property
+    def is_official_service(self) -> bool:
+        return self._acars_url == _OFFICIAL_ACARS_URL
+
+    @property
+    def network(self) -> Network:
+        return self._network
+
+    @property
+    def cpdlc_connection_status(self) -> ConnectionState:
+        return self._cpdlc_connect_state
+
+    @property
+    def cpdlc_current_atc(self) -> str:
+        return self._cpdlc_atc_callsign
+
+    @property
+    def cpdlc_atc_callsign(self) -> str:
+        return self._cpdlc_atc_callsign
+
+    @property
+    def pending_replies(self) -> list[CPDLCMessage]:
+        return list(self._pending_replies)
+
+    @property
+    def reply_timeout(self) -> Optional[float]:
+        return self._pending_replies.timeout
+
+    def pending_reply(self, station: str, message_id: int) -> Optional[CPDLCMessage]:
+        """
+        Received uplink waiting for our reply, every station numbers its own uplinks
+        Args:
+            station (str): ATC station the uplink was received from
+            message_id (int): CPDLC message id of the uplink
+        Returns:
+            the uplink, None when it is not pending
+        """
+        return self._pending_replies.get(station, message_id)
+
+    @property
+    def last_poll_decision(self) -> Optional[PollDecision]:
+        return self._poller.last_decision
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        return self._poller.circuit_breaker
+
+    @property
+    def poll_failures(self) -> int:
+        return self._poller.failures
+
+    @property
+    def link_degraded(self) -> bool:
+        return self._poller.degraded
+
+    @property
+    def message_deduplicator(self) -> Optional[MessageDeduplicator]:
+        return self._deduplicator
+
+    @property
+    def message_id_manager(self) -> MessageIdManager:
+        return self._message_id_manager
+
+    @property
+    def callback_dispatcher(self) -> Optional[CallbackDispatcher]:
+        return self._callback_dispatcher
+
+    @property
+    def info_cache(self) -> Optional[InfoCache]:
+        return self._info_cache
+
+    @property
+    def send_queue(self) -> Optional[SendQueue]:
+        return self._send_queue
+
+    @property
+    def metrics(self) -> Optional[MetricsRegistry]:
+        return self._metrics
+
+    @property
+    def tracer(self) -> Optional[Tracer]:
+        return self._tracer
+
+    @property
+    def journal(self) -> Optional[MessageJournal]:
+        return self._journal
+
+    @property
+    def subscriptions(self) -> tuple[Subscription, ...]:
+        return self._subscriptions.subscriptions
+
+    @property
+    def dialogue_index(self) -> Optional[DialogueIndex]:
+        return self._dialogues
+
+    @property
+    def open_dialogues(self) -> list[Dialogue]:
+        if self._dialogues is None:
+            return []
+        with self._state_lock:
+            return self._dialogues.open_dialogues
+
+    def dialogue(self, station: str, message_id: int,
+                 direction: MessageDirection = MessageDirection.IN) -> Optional[Dialogue]:
+        """
+        Dialogue a received or sent CPDLC packet belongs to
+        Args:
+            station (str): ATC station the packet was received from or sent to
+            message_id (int): message id of the packet
+            direction (MessageDirection): IN for received uplinks, OUT for packets we sent
+        Returns:
+            the dialogue, None when the packet is unknown or no dialogue index is set
+        """
+        if self._dialogues is None:
+            return None
+        with self._state_lock:
+            return self._dialogues.dialogue(station, message_id, direction)
+
+    # Callback functions
+
+    def listen_message_receiver(self):
+        """
+        Add callback to receive message
+        """
+
+        def wrapper(func):
+            self._message_receiver_callbacks.append(func)
+
+        return wrapper
+
+    def add_message_receiver_callback(self, callback: Callable[[AcarsMessage], None]) -> None:
+        """
+        Add callback to receive message
+        query_info answers are passed only when they come from the server, not from the info cache
+        Args:
+            callback (Callable[[AcarsMessage], None]): callback
+        """
+        self._message_receiver_callbacks.append(callback)
+
+    def listen_subscription(self, packet_type: Optional[PacketType] = None, station: Optional[str] = None,
+                            reply_type: Optional[ReplyTag] = None, prefix: Optional[str] = None):
+        """
+        Subscribe the decorated callback to messages matching every filter given, see subscribe
+        """
+
+        def wrapper(func):
+            self.subscribe(func, packet_type, station, reply_type, prefix)
+            return func
+
+        return wrapper
+
+    def subscribe(self, callback: Callable[[AcarsMessage], None], packet_type: Optional[PacketType] = None,
+                  station: Optional[str] = None, reply_type: Optional[ReplyTag] = None,
+                  prefix: Optional[str] = None) -> Subscription:
+        """
+        Add callback to receive only messages matching every filter given, a filter left None matches every message
+        Subscribed callbacks are called after the callbacks added with add_message_receiver_callback
+
+        Examples:
+            cpdlc.subscribe(on_clearance, PacketType.CPDLC, CURRENT_ATC, ReplyTag.WILCO_UNABLE)\n
+            cpdlc.subscribe(on_atis, PacketType.TELEX, prefix="ATIS")\n
+
+        Args:
+            callback (Callable[[AcarsMessage], None]): callback
+            packet_type (Optional[PacketType]): packet type of the message
+            station (Optional[str]): station the message was received from, CURRENT_ATC for the current ATC unit
+            reply_type (Optional[ReplyTag]): reply type of a CPDLC message, implies PacketType.CPDLC
+            prefix (Optional[str]): start of the message text
+        Returns:
+            the subscription, for unsubscribe
+        Raises:
+            ParameterError: when reply_type is given with another packet type than CPDLC
+        """
+        return self._subscriptions.add(Subscription(callback, packet_type, station, reply_type, prefix))
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """
+        Remove a subscription
+        Args:
+            subscription (Subscription): subscription returned by subscribe
+        Returns:
+            true if the subscription was subscribed
+        """
+        return self._subscriptions.remove(subscription)
+
+    def _message_receiver_callback(self, message: AcarsMessage) -> None:
+        """
+        Triggers callback to receive message, for internal use only
+        Args:
+            message (str): message
+        """
+        log = logging_mode.HOT_PATH_LOGGING
+        if log:
+            logger.trace("Message received : {}", message)
+        dispatcher = self._callback_dispatcher
+        metrics = self._metrics
+        traced = self._tracer is not None
+        callbacks = self._message_receiver_callbacks
+        if self._subscriptions:
+            routed = self._subscriptions.match(message, self._cpdlc_current_atc)
+            if routed:
+                callbacks = callbacks + routed
+        for callback in callbacks:
+            run = callback if metrics is None else metrics.timed(callback)
+            if traced:
+                run = self._traced_callback(callback, run)
+            if dispatcher is not None:
+                dispatcher.dispatch(run, message)
+                continue
+            try:
+                if log:
+                    logger.trace("Callback executed: {}", callback.__name__)
+                result = run(message)
+            except Exception as e:
+                logger.error("Exception occurred while calling callback: {}", e)
+                continue
+            if result is not None:
+                self._callback_result(result)
+
+    def listen_message_sender(self):
+        """
+        Add callback to send message
+        """
+
+        def wrapper(func):
+            self._message_sender_callbacks.append(func)
+
+        return wrapper
+
+    def add_message_sender_callback(self, callback: Callable[[str, str], None]) -> None:
+        """
+        Add callback to send message
+        Args:
+            callback (Callable[[str, str], None]): callback
+        """
+        self._message_sender_callbacks.append(callback)
+
+    def _message_sender_callback(self, to: str, message: str) -> None:
+        """
+        Triggers callback to send message, for internal use only
+        Args:
+            to (str): message send to
+            message (str): message
+        """
+        log = logging_mode.HOT_PATH_LOGGING
+        if log:
+            logger.trace("Message send to {}: {}", to, message)
+        dispatcher = self._callback_dispatcher
+        metrics = self._metrics
+        for callback in self._message_sender_callbacks:
+            run = callback if metrics is None else metrics.timed(callback)
+            if dispatcher is not None:
+                dispatcher.dispatch(run, to, message)
+                continue
+            try:
+                if log:
+                    logger.trace("Callback executed: {}", callback.__name__)
+                result = run(to, message)
+            except Exception as e:
+                logger.error("Exception occurred while calling callback: {}", e)
+                continue
+            if result is not None:
+                self._callback_result(result)
+
+    def _callback_result(self, result: Any) -> None:
+        """
+        Handle the result of a callback called without a dispatcher, for internal use only
+        A coroutine callback has no event loop to run on here, so it is closed and reported
+        """
+        if not isawaitable(result):
+            return
+        close = getattr(result, "close", None)
+        if close is not None:
+            close()
+        logger.error("Coroutine callback needs an AsyncCPDLC or a callback dispatcher to run")
+
+    # Decorators
+
+    @staticmethod
+    def _require_official_server(func: Callable[P, R]) -> Callable[P, R]:
+        """
+        Service address checker, for internal use only
+        Raises:
+            NoOfficialServerError: Not official server
+        """
+
+        def check(self: "CPDLCBase") -> None:
+            if not self.is_official_service:
+                raise NoOfficialServerError()
+
+        return _guard(func, check)
+
+    @staticmethod
+    def _require_full_service(func: Callable[P, R]) -> Callable[P, R]:
+        """
+        Service level checker, for internal use only
+        Raises:
+            FullServiceRequiredError: Not full service
+        """
+
+        def check(self: "CPDLCBase") -> None:
+            if self._service_level != ServiceLevel.FULL:
+                logger.error("No full service available, cannot change network")
+                raise FullServiceRequiredError()
+
+        return _guard(func, check)
+
+    @staticmethod
+    def _require_service_initialized(func: Callable[P, R]) -> Callable[P, R]:
+        """
+        Service initialization checker, for internal use only
+        Raises:
+            NoInitializationError: Service not initialized
+        """
+
+        def check(self: "CPDLCBase") -> None:
+            if not self._service_initialization:
+                raise NoInitializationError()
+
+        return _guard(func, check)
+
+    @staticmethod
+    def _require_callsign_set(func: Callable[P, R]) -> Callable[P, R]:
+        """
+        Callsign checker, for internal use only
+        Raises:
+            CallsignError: Aircraft callsign not set
+        """
+
+        def check(self: "CPDLCBase") -> None:
+            if self._callsign is None:
+                raise CallsignError()
+
+        return _guard(func, check)
+
+    @staticmethod
+    def _require_connection_state(*states: ConnectionState) -> Callable[[Callable[P, R]], Callable[P, R]]:
+        """
+        Connection state checker, for internal use only
+        Raises:
+                InvalidStateError: connection state is invalid
+        """
+
+        def check(self: "CPDLCBase") -> None:
+            if self._cpdlc_connect_state not in states:
+                raise InvalidStateError(
+                    f"Required states: {[s.name for s in states]}, "
+                    f"Current state: {self._cpdlc_connect_state.name}"
+                )
+
+        def decorator(func: Callable[P, R]) -> Callable[P, R]:
+            return _guard(func, check)
+
+        return decorator
+
+    # Request builders
+
+    @property
+    def _connect_url(self) -> str:
+        return f"{self._acars_url}/connect.html"
+
+    @property
+    def _account_url(self) -> str:
+        return f"{self._acars_url}/account.html"
+
+    def _connect_data(self, to: str, packet_type: PacketType, packet: Optional[str] = None) -> dict:
+        """
+        Build the form data of a connect.html request, for internal use only
+        Args:
+            to (str): target station
+            packet_type (PacketType): packet type
+            packet (Optional[str]): packet content, omitted when None
+        Returns:
+            form data
+        """
+        data = {
+            "logon": self._login_code,
+            "from": self._callsign,
+            "to": to,
+            "type": packet_type.value
+        }
+        if packet is not None:
+            data["packet"] = packet
+        return data
+
+    def _account_data(self, new_network: Optional[Network] = None) -> dict:
+        """
+        Build the form data of an account.html request, for internal use only
+        Args:
+            new_network (Optional[Network]): network to switch to, omitted when None
+        Returns:
+            form data
+        """
+        data = {
+            "email": self._email,
+            "logon": self._login_code
+        }
+        if new_network is not None:
+            data["network"] = new_network.value
+        return data
+
+    # Response parsers
+
+    @staticmethod
+    def _parse_network(text: str) -> Network:
+        """
+        Parse current network from account.html, for internal use only
+        Raises:
+            LoginError: Login failure
+        """
+        network = selected_network(text)
+        if network is None:
+            logger.error("Login code or email is invalid, please check login code or email")
+            raise LoginError()
+        logger.debug("Current network: {}", network)
+        return Network(network)
+
+    def _parse_network_change(self, text: str, new_network: Network) -> bool:
+        """
+        Parse network change result from account.html, for internal use only
+        Raises:
+            ResponseParserError: when message parser error
+            LoginError: Login failure
+            NetworkSwitchError: when network change failed
+        """
+        if not has_notice(text):
+            logger.error("Change network failed, wrong response")
+            raise ResponseParserError()
+        network = selected_network(text)
+        if network is None:
+            logger.error("Login code or email is invalid, please check login code or email")
+            raise LoginError()
+        if network != new_network.value:
+            logger.error("Change network failed. Expected {}, got {}", new_network.value, network)
+            raise NetworkSwitchError(self._network, new_network)
+        self._network = Network(network)
+        logger.debug("Network changed to {}", new_network.value)
+        return True
+
+    def _parse_ping(self, text: str, station_callsign: str) -> bool:
+        """
+        Parse ping response, for internal use only
+        Raises:
+            LoginError: Login failure
+        """
+        if text.lower() != "ok":
+            if "invalid logon code" in text:
+                raise LoginError()
+            logger.error("Ping station {} failed, got {}", station_callsign, text)
+            return False
+        logger.debug("Ping station {} succeeded", station_callsign)
+        return True
+
+    @staticmethod
+    def _parse_info(text: str) -> AcarsMessage:
+        """
+        Parse inforeq response, for internal use only
+        Raises:
+            ResponseParserError: when message parser error
+        """
+        data = AcarsMessageFactory.parser_message(text)
+        if len(data) != 1:
+            raise ResponseParserError()
+        return data[0]
+
+    # CPDLC state handling
+
+    def _set_connection_state(self, state: ConnectionState) -> None:
+        """
+        Move connection state and record the transition, caller must hold the state lock, for internal use only
+        """
+        if self._metrics is not None and state != self._cpdlc_connect_state:
+            self._metrics.observe_transition(self._cpdlc_connect_state, state)
+        self._cpdlc_connect_state = state
+
+    def _begin_login(self, target_station: str) -> None:
+        """
+        Move connection state to CONNECTING, for internal use only
+        Raises:
+            AlreadyLoginError: Already logged in
+        """
+        with self._state_lock:
+            if self._cpdlc_connect_state != ConnectionState.DISCONNECTED:
+                raise AlreadyLoginError()
+            self._set_connection_state(ConnectionState.CONNECTING)
+            logger.debug("CPDLC request login to {}", target_station)
+            self._cpdlc_current_atc = target_station.upper()
+
+    def _begin_logout(self) -> None:
+        """
+        Move connection state to DISCONNECTING, for internal use only
+        Raises:
+            NotLoginError: Not logged in
+        """
+        with self._state_lock:
+            if self._cpdlc_connect_state != ConnectionState.CONNECTED:
+                raise NotLoginError()
+            self._set_connection_state(ConnectionState.DISCONNECTING)
+        logger.debug("CPDLC logout")
+
+    @_require_service_initialized
+    def _cpdlc_logout(self):
+        """
+        Clear CPDLC variable, for internal use only
+        Raises:
+            NoInitializationError: Service not initialized
+            NotLoginError: Not logged in
+        """
+        with self._state_lock:
+            if self._cpdlc_connect_state not in (ConnectionState.CONNECTED, ConnectionState.DISCONNECTING):
+                raise NotLoginError()
+            self._set_connection_state(ConnectionState.DISCONNECTED)
+            self._cpdlc_current_atc = None
+            self._cpdlc_atc_callsign = None
+            self._pending_replies.clear()
+            if self._dialogues is not None:
+                self._dialogues.close_open()
+        logger.debug("CPDLC disconnected")
+        if self._cpdlc_disconnect_callback is not None:
+            self._cpdlc_disconnect_callback()
+
+    def _handle_message(self, message: AcarsMessage, now: Optional[float] = None):
+        """
+        Handle CPDLC login and logout message, for internal use only
+        Received CPDLC message ids also advance the session message id counter
+        Args:
+            message (AcarsMessage): message to be handled
+            now (Optional[float]): monotonic time the message was received, starts its reply timer, current time
+                when None
+        """
+        if isinstance(message, CPDLCMessage):
+            self._message_id_manager.update_message_id(message.message_id)
+            with self._state_lock:
+                if message.request_for_reply and not message.has_replied:
+                    self._pending_replies.add(message, now)
+                if self._dialogues is not None:
+                    self._dialogues.record_message(message)
+            if message.message == "LOGON ACCEPTED":
+                # cpdlc logon success
+                with self._state_lock:
+                    self._set_connection_state(ConnectionState.CONNECTED)
+                logger.success("CPDLC connected. ATC Unit: {}", self._cpdlc_current_atc)
+                if self._cpdlc_connect_callback is not None:
+                    self._cpdlc_connect_callback()
+            if message.message.startswith("CURRENT ATC UNIT") and (match := _ATC_INFO_REGEX.match(message.message)):
+                # cpdlc atc info
+                unit, callsign = match.groups()
+                with self._state_lock:
+                    self._cpdlc_current_atc = unit
+                    self._cpdlc_atc_callsign = callsign
+                    self._set_connection_state(ConnectionState.CONNECTED)
+                logger.success("ATC Unit: {}. Callsign: {}", self._cpdlc_current_atc, self._cpdlc_atc_callsign)
+                if self._cpdlc_atc_info_update_callback is not None:
+                    self._cpdlc_atc_info_update_callback()
+            if message.message == "LOGOFF":
+                self._cpdlc_logout()
+
+    def _process_poll_response(self, content: Union[str, bytes], encoding: str = "utf-8",
+                               now: Optional[float] = None) -> list[AcarsMessage]:
+        """
+        Parse a poll response and dispatch every message, for internal use only
+        CPDLC messages with a malformed payload are logged and skipped, the rest of the response is handled
+        Messages already received within the de-duplication window are dropped before they are handled
+        Args:
+            content (str | bytes): poll response body, raw bytes are parsed without decoding the whole body
+            encoding (str): encoding of raw response body
+            now (Optional[float]): monotonic time the response was received, drives the de-duplication window
+                and reply timers, current time when None
+        Returns:
+            new messages received
+        """
+        metrics = self._metrics
+        begin = perf_counter()
+        if self._tracer is None:
+            messages = _well_formed(AcarsMessageFactory.parser_message(content, encoding))
+        else:
+            span = self._start_span(TraceStage.PARSE)
+            try:
+                messages = _well_formed(AcarsMessageFactory.parser_message(content, encoding))
+            except Exception as e:
+                self._end_span(span, e)
+                raise
+            self._end_span(span)
+        parsed = len(messages)
+        if self._deduplicator is not None:
+            messages = self._deduplicator.filter(messages, now)
+        if metrics is not None:
+            metrics.observe_parse(perf_counter() - begin, parsed, parsed - len(messages))
+        if self._journal is not None:
+            self._journal.record_messages(messages)
+        for message in messages:
+            if self._tracer is None:
+                self._handle_message(message, now)
+            else:
+                self._traced_handle_message(message, now)
+            self._message_receiver_callback(message)
+        if self._pending_replies.timeout is not None:
+            self._expire_replies(now)
+        return messages
+
+    def _expire_replies(self, now: Optional[float] = None) -> None:
+        """
+        Call the reply expired callback with every uplink whose reply timeout passed, for internal use only
+        """
+        with self._state_lock:
+            expired = self._pending_replies.expire(now)
+        for message in expired:
+            logger.warning("CPDLC message {} from {} not replied in time", message.message_id, message.target_station)
+            if self._reply_expired_callback is None:
+                continue
+            try:
+                self._reply_expired_callback(message)
+            except Exception as e:
+                logger.error("Exception occurred while calling reply expired callback: {}", e)
+
+    def _poll_state(self, message_count: int) -> PollState:
+        """
+        Snapshot session state for the poll policy, for internal use only
+        Args:
+            message_count (int): number of messages returned by the poll
+        """
+        return PollState(self._cpdlc_connect_state, len(self._pending_replies), message_count)
+
+    def _observe_request(self, url: str, data: dict, begin: float, error: bool) -> None:
+        """
+        Record a request started at perf_counter time begin, for internal use only
+        """
+        if self._metrics is not None:
+            self._metrics.observe_request(url.rpartition("/")[2], data.get("type", ""), perf_counter() - begin, error)
+
+    def _record_request(self, data: dict) -> None:
+        """
+        Record a sent CPDLC packet in the dialogue index and a sent CPDLC or telex packet in the journal,
+        for internal use only
+        """
+        packet_type = data.get("type")
+        if packet_type not in _RECORDED_TYPES:
+            return
+        epoch = time()
+        if self._journal is not None:
+            self._journal.record_packet(epoch, data["to"], PacketType(packet_type), data["packet"])
+        if self._dialogues is not None and packet_type == PacketType.CPDLC.value:
+            with self._state_lock:
+                self._dialogues.record_packet(data["to"], data["packet"], epoch)
+
+    def restore_journal(self, path: Union[str, Path]) -> JournalState:
+        """
+        Rebuild message id counter, pending replies and CPDLC connection from a journal,
+        e.g. after a restart, no callback is called
+        Args:
+            path (str | Path): journal file, a missing file restores nothing
+        Returns:
+            state read from the journal
+        Raises:
+            AlreadyLoginError: CPDLC connection is not disconnected
+        """
+        state = MessageJournal.replay(path)
+        with self._state_lock:
+            if self._cpdlc_connect_state != ConnectionState.DISCONNECTED:
+                raise AlreadyLoginError()
+            self._message_id_manager.update_message_id(state.message_id)
+            for message in state.pending_replies.values():
+                self._pending_replies.add(message)
+            self._set_connection_state(state.connection_state)
+            self._cpdlc_current_atc = state.current_atc
+            self._cpdlc_atc_callsign = state.atc_callsign
+        logger.info("Restored {} journal records, {} pending replies", state.records, len(state.pending_replies))
+        return state
+
+    # Tracing
+
+    def _start_span(self, stage: TraceStage, packet_type: Optional[PacketType] = None,
+                    message_id: Optional[int] = None, detail: Optional[str] = None) -> Optional[tuple]:
+        """
+        Open a span on the current tracer, for internal use only
+        Returns:
+            (tracer, context, token) to close the span with, None without tracer or when the hook raised
+        """
+        tracer = self._tracer
+        if tracer is None:
+            return None
+        context = SpanContext(stage, self._callsign, packet_type, message_id, detail)
+        try:
+            return tracer, context, tracer.start_span(context)
+        except Exception as e:
+            logger.error("Exception occurred while starting span: {}", e)
+            return None
+
+    @staticmethod
+    def _end_span(span: Optional[tuple], error: Optional[BaseException] = None) -> None:
+        """
+        Close a span opened by _start_span, for internal use only
+        """
+        if span is None:
+            return
+        tracer, context, token = span
+        try:
+            tracer.end_span(context, token, error)
+        except Exception as e:
+            logger.error("Exception occurred while ending span: {}", e)
+
+    @staticmethod
+    def _span_message_id(message: AcarsMessage) -> Optional[int]:
+        return message.message_id if isinstance(message, CPDLCMessage) else None
+
+    def _traced_handle_message(self, message: AcarsMessage, now: Optional[float] = None) -> None:
+        """
+        Handle message inside a HANDLE span, for internal use only
+        """
+        span = self._start_span(TraceStage.HANDLE, message.msg_type, self._span_message_id(message))
+        try:
+            self._handle_message(message, now)
+        except Exception as e:
+            self._end_span(span, e)
+            raise
+        self._end_span(span)
+
+    def _traced_callback(self, callback: Callable[..., Any], run: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap run, the possibly timed receiver callback, in a CALLBACK span, for internal use only
+        The wrapper is created once per run, so it hashes the same way on every call
+        """
+        wrapper = self._traced_callbacks.get(run)
+        if wrapper is not None:
+            return wrapper
+        name = getattr(callback, "__qualname__", None) or repr(callback)
+
+        def wrapper(message: AcarsMessage) -> Any:
+            span = self._start_span(TraceStage.CALLBACK, message.msg_type, self._span_message_id(message), name)
+            try:
+                result = run(message)
+            except Exception as e:
+                self._end_span(span, e)
+                raise
+            if isawaitable(result):
+                return self._end_span_after(span, result)
+            self._end_span(span)
+            return result
+
+        return self._traced_callbacks.setdefault(run, wrapper)
+
+    async def _end_span_after(self, span: Optional[tuple], result: Awaitable[Any]) -> Any:
+        """
+        Await the result of a coroutine callback and close its span, for internal use only
+        """
+        try:
+            value = await result
+        except Exception as e:
+            self._end_span(span, e)
+            raise
+        self._end_span(span)
+        return value
+
+    def _reply_sent(self, message: CPDLCMessage) -> None:
+        """
+        Remove a replied uplink from pending replies, for internal use only
+        """
+        with self._state_lock:
+            self._pending_replies.pop(message.target_station, message.message_id)
+
+    @staticmethod
+    def _build_dcl_message(callsign: str, aircraft_type: str, dest_airport: str, dep_airport: str,
+                           stand: str, atis_letter: str) -> str:
+        """
+        Build DCL request text, for internal use only
+        """
+        return (f"REQUEST PREDEP CLEARANCE {callsign} {aircraft_type} "
+                f"TO {dest_airport.upper()} AT {dep_airport.upper()} STAND {stand} "
+                f"ATIS {atis_letter}")
@@ -0,0 +1,787 @@
+from abc import ABC, abstractmethod
+from threading import RLock as RLock
+
+from .exception import *
+from .info_cache import InfoCache as InfoCache
+from .journal import JournalState as JournalState, MessageJournal as MessageJournal
+from .metrics import MetricsRegistry as MetricsRegistry
+from .pending_replies import PendingReplyIndex as PendingReplyIndex
+from .account_page import has_notice as has_notice, selected_network as selected_network
+from .acars_message import AcarsMessage as AcarsMessage
+from .acars_message_factory import AcarsMessageFactory as AcarsMessageFactory
+from .circuit_breaker import BackoffPolicy as BackoffPolicy, CircuitBreaker as CircuitBreaker
+from .cpdlc_message import CPDLCMessage as CPDLCMessage
+from .cpdlc_message_id import MessageIdManager as MessageIdManager
+from .dedup import MessageDeduplicator as MessageDeduplicator
+from .dialogue import Dialogue as Dialogue, DialogueIndex as DialogueIndex
+from .dispatcher import CallbackDispatcher as CallbackDispatcher
+from .enums import ConnectionState as ConnectionState, MessageDirection as MessageDirection, Network as Network, \
+    PacketType as PacketType, ReplyTag as ReplyTag, ServiceLevel as ServiceLevel, TraceStage as TraceStage
+from .poll_policy import PollDecision as PollDecision, PollPolicy as PollPolicy, PollState as PollState
+from .routing import Subscription as Subscription, SubscriptionTable as SubscriptionTable
+from .send_queue import SendQueue as SendQueue
+from .tracing import SpanContext as SpanContext, Tracer as Tracer
+from pathlib import Path
+from re import Pattern
+from typing import Any, Awaitable, Callable, Optional, ParamSpec, TypeVar, Union
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_OFFICIAL_ACARS_URL: str
+_ATC_INFO_REGEX: Pattern
+_RECORDED_TYPES: frozenset[str]
+
+
+def _guard(func: Callable[P, R], check: Callable[[CPDLCBase], None]) -> Callable[P, R]:
+    """
+    Wrap func so that check runs before it, for internal use only
+    Coroutine functions get a coroutine wrapper, so the check runs when the call is awaited
+    """
+    ...
+
+
+def _well_formed(messages: list[AcarsMessage]) -> list[AcarsMessage]:
+    """
+    Drop CPDLC messages whose payload does not parse, for internal use only
+    Payloads are parsed here, so one bad packet cannot fail de-duplication or handling of the whole poll
+    """
+    ...
+
+
+class CPDLCBase(ABC):
+    """
+    Shared state and message handling of the synchronous and asynchronous CPDLC clients
+
+    Everything that does not touch the network lives here,
+    subclasses only provide the poller and the request functions, the abstract methods below
+
+    Attributes:
+        _service_initialization (bool): Service initialization flag
+        _service_level (ServiceLevel): Service level
+        _login_code (Optional[str]): Hoppie ACARS network login code
+        _email (Optional[str]): Hoppie ACARS network login email
+        _acars_url (str): Hoppie ACARS network url
+        _callsign (Optional[str]): Aircraft callsign
+        _poller (Poller | AsyncPoller): poller object
+        _message_receiver_callbacks (list[Callable[[AcarsMessage], None]]): message receiver callbacks
+        _subscriptions (SubscriptionTable): receiver callbacks with filters, called only with matching messages
+        _message_sender_callbacks (list[Callable[[str, str], None]]): message sender callbacks
+        _cpdlc_connect_state (ConnectionState): CPDLC connection state
+        _cpdlc_current_atc (Optional[str]): CPDLC current ATC letter (e.g. ZSHA_CTR)
+        _cpdlc_atc_callsign (Optional[str]): CPDLC current ATC callsign (e.g. Shanghai Control)
+        _cpdlc_connect_callback (Optional[Callable[[], None]]): CPDLC connect callback function
+        _cpdlc_atc_info_update_callback (Optional[Callable[[], None]]): CPDLC connection info updated callback function
+        _cpdlc_disconnect_callback (Optional[Callable[[], None]]): CPDLC disconnect callback function
+        _reply_expired_callback (Optional[Callable[[CPDLCMessage], None]]): called with uplinks left unanswered
+            past the reply timeout
+        _network (Optional[Network]): Hoppie ACARS network
+        _pending_replies (PendingReplyIndex): received uplinks waiting for our reply, keyed by station and message id
+        _deduplicator (Optional[MessageDeduplicator]): index of recently received messages, None when disabled
+        _message_id_manager (MessageIdManager): allocator of the message ids sent by this session
+        _callback_dispatcher (Optional[CallbackDispatcher]): dispatcher of message callbacks, None runs them inline
+        _info_cache (Optional[InfoCache]): cache of query_info answers, None sends every query
+        _send_queue (Optional[SendQueue]): queue of logon, logoff, telex and reply requests, None sends them inline
+        _metrics (Optional[MetricsRegistry]): registry of request, poll and callback metrics, None records nothing
+        _tracer (Optional[Tracer]): tracer of request, parse, handle and callback spans, None traces nothing
+        _traced_callbacks (dict[Callable[..., Any], Callable[..., Any]]): tracing wrapper per receiver callback
+        _journal (Optional[MessageJournal]): journal of received messages and sent packets, None keeps no journal
+        _dialogues (Optional[DialogueIndex]): received and sent CPDLC packets grouped into dialogues,
+            None links nothing
+        _state_lock (threading.RLock): global lock
+    """
+
+    _service_initialization: bool
+    _service_level: ServiceLevel
+    _login_code: Optional[str]
+    _email: Optional[str]
+    _acars_url: str
+    _callsign: Optional[str]
+    _poller: Any
+    _message_receiver_callbacks: list[Callable[[AcarsMessage], None]]
+    _subscriptions: SubscriptionTable
+    _message_sender_callbacks: list[Callable[[str, str], None]]
+    _cpdlc_connect_state: ConnectionState
+    _cpdlc_current_atc: Optional[str]
+    _cpdlc_atc_callsign: Optional[str]
+    _cpdlc_connect_callback: Optional[Callable[[], None]]
+    _cpdlc_atc_info_update_callback: Optional[Callable[[], None]]
+    _cpdlc_disconnect_callback: Optional[Callable[[], None]]
+    _reply_expired_callback: Optional[Callable[[CPDLCMessage], None]]
+    _network: Optional[Network]
+    _pending_replies: PendingReplyIndex
+    _deduplicator: Optional[MessageDeduplicator]
+    _message_id_manager: MessageIdManager
+    _callback_dispatcher: Optional[CallbackDispatcher]
+    _info_cache: Optional[InfoCache]
+    _send_queue: Optional[SendQueue]
+    _metrics: Optional[MetricsRegistry]
+    _tracer: Optional[Tracer]
+    _traced_callbacks: dict[Callable[..., Any], Callable[..., Any]]
+    _journal: Optional[MessageJournal]
+    _dialogues: Optional[DialogueIndex]
+    _state_lock: RLock
+
+    def __init__(self) -> None:
+        """
+        Constructor for CPDLCBase class
+        """
+        ...
+
+    @abstractmethod
+    def _create_poller(self) -> Any:
+        """
+        Create the poller which drives _poll_message, for internal use only
+        """
+
+    @abstractmethod
+    def _send_queue_type(self) -> type[SendQueue]:
+        """
+        Send queue class whose workers can run the requests of this client, for internal use only
+        """
+        ...
+
+    @abstractmethod
+    def _send_request(self, url: str, data: dict) -> Any:
+        """
+        Send a request to hoppie ACARS server, a coroutine function in asynchronous clients, for internal use only
+        Args:
+            url (str): URL to send request
+            data (dict): Data to send to hoppie ACARS server
+        Raises:
+            NetworkError: Communication failure
+        """
+        ...
+
+    @abstractmethod
+    def _poll_message(self) -> Any:
+        """
+        Poll message handler returning the PollState, a coroutine function in asynchronous clients,
+        for internal use only
+        """
+        ...
+
+    @abstractmethod
+    def start_poller(self) -> None:
+        """
+        Start the poller
+        """
+        ...
+
+    @abstractmethod
+    def stop_poller(self) -> Any:
+        """
+        Stop the poller, a coroutine function in asynchronous clients
+        """
+        ...
+
+    def set_callsign(self, callsign: str):
+        """
+        Set callsign
+        Args:
+            callsign (str): callsign
+        """
+        ...
+
+    def set_logon_code(self, logon_code: str):
+        """
+        Set logon code
+        Args:
+            logon_code (str): logon code
+        """
+        ...
+
+    def set_email(self, email: str):
+        """
+        Set email, if service has been initialized without a email, which means service not in FULL\n
+        Set email will automatic upgrade service level to FULL
+        Of course, it will not be triggered if it is not the official server address
+        Args:
+            email (str): email
+        """
+        ...
+
+    def set_acars_url(self, acars_url: str):
+        """
+        Set ACARS url
+        Args:
+            acars_url (str): ACARS url
+        """
+        ...
+
+    def set_cpdlc_connect_callback(self, callback: Callable[[], None]):
+        """
+        Set CPDLC connect callback
+        Args:
+            callback (Callable[[], None]): callback
+        """
+        ...
+
+    def set_cpdlc_atc_info_update_callback(self, callback: Callable[[], None]):
+        """
+        Set CPDLC atc info update callback
+        Args:
+            callback (Callable[[], None]): callback
+        """
+        ...
+
+    def set_cpdlc_disconnect_callback(self, callback: Callable[[], None]):
+        """
+        Set CPDLC disconnect callback
+        Args:
+            callback (Callable[[], None]): callback
+        """
+        ...
+
+    def set_reply_timeout(self, timeout: Optional[float]):
+        """
+        Set seconds a received uplink may stay unanswered before the reply expired callback is called,
+        it is checked after every poll, None never expires
+        Args:
+            timeout (Optional[float]): timeout in seconds
+        Raises:
+            ParameterError: when timeout is not positive
+        """
+        ...
+
+    def set_reply_expired_callback(self, callback: Optional[Callable[[CPDLCMessage], None]]):
+        """
+        Set callback called once with every uplink left unanswered past the reply timeout, None to remove it
+        Args:
+            callback (Optional[Callable[[CPDLCMessage], None]]): callback
+        """
+        ...
+
+    def set_poll_interval_range(self, min_interval: int, max_interval: int):
+        """
+        Set polling interval range
+        Args:
+            min_interval (int): min_interval
+            max_interval (int): max_interval
+        Raises:
+            ValueError: When min_interval greater than max_interval
+        """
+        ...
+
+    def set_poll_policy(self, policy: PollPolicy):
+        """
+        Set poll scheduling policy, AdaptivePollPolicy is used by default
+        Args:
+            policy (PollPolicy): policy
+        """
+        ...
+
+    def set_poll_decision_callback(self, callback: Optional[Callable[[PollDecision], None]]):
+        """
+        Set callback called with every poll scheduling decision, None to remove it
+        Args:
+            callback (Optional[Callable[[PollDecision], None]]): callback
+        """
+        ...
+
+    def set_poll_backoff(self, backoff: Optional[BackoffPolicy]):
+        """
+        Set wait after failed polls, BackoffPolicy() is used by default,
+        None leaves it to the poll policy
+        Args:
+            backoff (Optional[BackoffPolicy]): backoff policy
+        """
+        ...
+
+    def set_circuit_breaker(self, circuit_breaker: Optional[CircuitBreaker]):
+        """
+        Set circuit of the Hoppie ACARS server, pass shared_circuit_breaker(acars_url) to share it with every
+        session of this process polling the same server, None polls regardless
+        Args:
+            circuit_breaker (Optional[CircuitBreaker]): circuit breaker
+        """
+        ...
+
+    def set_link_degraded_callback(self, callback: Optional[Callable[[int], None]]):
+        """
+        Set callback called with the failed polls in a row when the link to the server degrades, None to remove it
+        Args:
+            callback (Optional[Callable[[int], None]]): callback
+        """
+        ...
+
+    def set_link_recovered_callback(self, callback: Optional[Callable[[float], None]]):
+        """
+        Set callback called with the seconds the link was degraded when the server answers again, None to remove it
+        Args:
+            callback (Optional[Callable[[float], None]]): callback
+        """
+        ...
+
+    def set_message_deduplicator(self, deduplicator: Optional[MessageDeduplicator]):
+        """
+        Set index used to drop messages received twice, None disables de-duplication
+        Args:
+            deduplicator (Optional[MessageDeduplicator]): deduplicator
+        """
+        ...
+
+    def set_callback_dispatcher(self, dispatcher: Optional[CallbackDispatcher]):
+        """
+        Set dispatcher running message receiver and sender callbacks off the poll and caller threads,
+        None runs them inline
+        Args:
+            dispatcher (Optional[CallbackDispatcher]): dispatcher
+        """
+        ...
+
+    def set_info_cache(self, info_cache: Optional[InfoCache]):
+        """
+        Set cache answering query_info, it can be shared between clients, None sends every query
+        With a cache, receiver callbacks no longer see query_info answers on cache hits or coalesced queries
+        Args:
+            info_cache (Optional[InfoCache]): info cache
+        """
+        ...
+
+    def set_send_queue(self, send_queue: Optional[SendQueue]):
+        """
+        Set queue sending logon, logoff, telex and reply requests under its rate limit and retry policy,
+        it can be shared between clients, None sends them inline
+        Args:
+            send_queue (Optional[SendQueue]): send queue, a ThreadPoolSendQueue for CPDLC
+                and an AsyncioSendQueue for AsyncCPDLC
+        Raises:
+            ParameterError: when send queue cannot run the requests of this client
+        """
+        ...
+
+    def set_metrics(self, metrics: Optional[MetricsRegistry]):
+        """
+        Set registry recording requests, polls, callback timings and connection state transitions,
+        it can be shared between clients, None records nothing
+        Args:
+            metrics (Optional[MetricsRegistry]): metrics registry
+        """
+        ...
+
+    def set_tracer(self, tracer: Optional[Tracer]):
+        """
+        Set tracer receiving spans around requests, response parsing, message handling and receiver callbacks,
+        it can be shared between clients, None traces nothing
+        Args:
+            tracer (Optional[Tracer]): tracer
+        """
+        ...
+
+    def set_journal(self, journal: Optional[MessageJournal]):
+        """
+        Set journal recording every received message and sent CPDLC and telex packet, one journal per session,
+        None keeps no journal
+        Args:
+            journal (Optional[MessageJournal]): message journal
+        """
+        ...
+
+    def set_dialogue_index(self, dialogues: Optional[DialogueIndex]):
+        """
+        Set index grouping received and sent CPDLC packets into dialogues, None links nothing
+        Args:
+            dialogues (Optional[DialogueIndex]): dialogue index
+        """
+        ...
+
+    @property
+    def callsign(self) -> str: ...
+
+    @property
+    def logon_code(self) -> str: ...
+
+    @property
+    def email(self) -> str: ...
+
+    @property
+    def acars_url(self) -> str: ...
+
+    @property
+    def is_official_service(self) -> bool: ...
+
+    @property
+    def network(self) -> Network: ...
+
+    @property
+    def cpdlc_connection_status(self) -> ConnectionState: ...
+
+    @property
+    def cpdlc_current_atc(self) -> str: ...
+
+    @property
+    def cpdlc_atc_callsign(self) -> str: ...
+
+    @property
+    def pending_replies(self) -> list[CPDLCMessage]: ...
+
+    @property
+    def reply_timeout(self) -> Optional[float]: ...
+
+    def pending_reply(self, station: str, message_id: int) -> Optional[CPDLCMessage]:
+        """
+        Received uplink waiting for our reply, every station numbers its own uplinks
+        Args:
+            station (str): ATC station the uplink was received from
+            message_id (int): CPDLC message id of the uplink
+        Returns:
+            the uplink, None when it is not pending
+        """
+        ...
+
+    @property
+    def last_poll_decision(self) -> Optional[PollDecision]: ...
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]: ...
+
+    @property
+    def poll_failures(self) -> int: ...
+
+    @property
+    def link_degraded(self) -> bool: ...
+
+    @property
+    def message_deduplicator(self) -> Optional[MessageDeduplicator]: ...
+
+    @property
+    def message_id_manager(self) -> MessageIdManager: ...
+
+    @property
+    def callback_dispatcher(self) -> Optional[CallbackDispatcher]: ...
+
+    @property
+    def info_cache(self) -> Optional[InfoCache]: ...
+
+    @property
+    def send_queue(self) -> Optional[SendQueue]: ...
+
+    @property
+    def metrics(self) -> Optional[MetricsRegistry]: ...
+
+    @property
+    def tracer(self) -> Optional[Tracer]: ...
+
+    @property
+    def journal(self) -> Optional[MessageJournal]: ...
+
+    @property
+    def subscriptions(self) -> tuple[Subscription, ...]: ...
+
+    @property
+    def dialogue_index(self) -> Optional[DialogueIndex]: ...
+
+    @property
+    def open_dialogues(self) -> list[Dialogue]: ...
+
+    def dialogue(self, station: str, message_id: int,
+                 direction: MessageDirection = MessageDirection.IN) -> Optional[Dialogue]:
+        """
+        Dialogue a received or sent CPDLC packet belongs to
+        Args:
+            station (str): ATC station the packet was received from or sent to
+            message_id (int): message id of the packet
+            direction (MessageDirection): IN for received uplinks, OUT for packets we sent
+        Returns:
+            the dialogue, None when the packet is unknown or no dialogue index is set
+        """
+        ...
+
+    def listen_message_receiver(self):
+        """
+        Add callback to receive message
+        """
+        ...
+
+    def add_message_receiver_callback(self, callback: Callable[[AcarsMessage], None]) -> None:
+        """
+        Add callback to receive message
+        query_info answers are passed only when they come from the server, not from the info cache
+        Args:
+            callback (Callable[[AcarsMessage], None]): callback
+        """
+        ...
+
+    def listen_subscription(self, packet_type: Optional[PacketType] = None, station: Optional[str] = None,
+                            reply_type: Optional[ReplyTag] = None, prefix: Optional[str] = None):
+        """
+        Subscribe the decorated callback to messages matching every filter given, see subscribe
+        """
+        ...
+
+    def subscribe(self, callback: Callable[[AcarsMessage], None], packet_type: Optional[PacketType] = None,
+                  station: Optional[str] = None, reply_type: Optional[ReplyTag] = None,
+                  prefix: Optional[str] = None) -> Subscription:
+        """
+        Add callback to receive only messages matching every filter given, a filter left None matches every message
+        Subscribed callbacks are called after the callbacks added with add_message_receiver_callback
+
+        Examples:
+            cpdlc.subscribe(on_clearance, PacketType.CPDLC, CURRENT_ATC, ReplyTag.WILCO_UNABLE)\n
+            cpdlc.subscribe(on_atis, PacketType.TELEX, prefix="ATIS")\n
+
+        Args:
+            callback (Callable[[AcarsMessage], None]): callback
+            packet_type (Optional[PacketType]): packet type of the message
+            station (Optional[str]): station the message was received from, CURRENT_ATC for the current ATC unit
+            reply_type (Optional[ReplyTag]): reply type of a CPDLC message, implies PacketType.CPDLC
+            prefix (Optional[str]): start of the message text
+        Returns:
+            the subscription, for unsubscribe
+        Raises:
+            ParameterError: when reply_type is given with another packet type than CPDLC
+        """
+        ...
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """
+        Remove a subscription
+        Args:
+            subscription (Subscription): subscription returned by subscribe
+        Returns:
+            true if the subscription was subscribed
+        """
+        ...
+
+    def _message_receiver_callback(self, message: AcarsMessage) -> None:
+        """
+        Triggers callback to receive message, for internal use only
+        """
+        ...
+
+    def listen_message_sender(self):
+        """
+        Add callback to send message
+        """
+        ...
+
+    def add_message_sender_callback(self, callback: Callable[[str, str], None]) -> None:
+        """
+        Add callback to send message
+        Args:
+             callback (Callable[[str, str], None]): callback
+        """
+        ...
+
+    def _message_sender_callback(self, to: str, message: str) -> None:
+        """
+        Triggers callback to send message, for internal use only
+        """
+        ...
+
+    def _callback_result(self, result: Any) -> None:
+        """
+        Handle the result of a callback called without a dispatcher, for internal use only
+        A coroutine callback has no event loop to run on here, so it is closed and reported
+        """
+        ...
+
+    @staticmethod
+    def _require_official_server(func: Callable[P, R]) -> Callable[P, R]:
+        """
+        Service address checker, for internal use only
+        """
+        ...
+
+    @staticmethod
+    def _require_full_service(func: Callable[P, R]) -> Callable[P, R]:
+        """
+        Service level checker, for internal use only
+        """
+        ...
+
+    @staticmethod
+    def _require_service_initialized(func: Callable[P, R]) -> Callable[P, R]:
+        """
+        Service initialization checker, for internal use only
+        """
+        ...
+
+    @staticmethod
+    def _require_callsign_set(func: Callable[P, R]) -> Callable[P, R]:
+        """
+        Callsign checker, for internal use only
+        """
+        ...
+
+    @staticmethod
+    def _require_connection_state(*states: ConnectionState) -> Callable[[Callable[P, R]], Callable[P, R]]:
+        """
+        Connection state checker, for internal use only
+        """
+        ...
+
+    @property
+    def _connect_url(self) -> str: ...
+
+    @property
+    def _account_url(self) -> str: ...
+
+    def _connect_data(self, to: str, packet_type: PacketType, packet: Optional[str] = None) -> dict:
+        """
+        Build the form data of a connect.html request, for internal use only
+        """
+        ...
+
+    def _account_data(self, new_network: Optional[Network] = None) -> dict:
+        """
+        Build the form data of an account.html request, for internal use only
+        """
+        ...
+
+    @staticmethod
+    def _parse_network(text: str) -> Network:
+        """
+        Parse current network from account.html, for internal use only
+        """
+        ...
+
+    def _parse_network_change(self, text: str, new_network: Network) -> bool:
+        """
+        Parse network change result from account.html, for internal use only
+        """
+        ...
+
+    def _parse_ping(self, text: str, station_callsign: str) -> bool:
+        """
+        Parse ping response, for internal use only
+        """
+        ...
+
+    @staticmethod
+    def _parse_info(text: str) -> AcarsMessage:
+        """
+        Parse inforeq response, for internal use only
+        """
+        ...
+
+    def _set_connection_state(self, state: ConnectionState) -> None:
+        """
+        Move connection state and record the transition, caller must hold the state lock, for internal use only
+        """
+        ...
+
+    def _begin_login(self, target_station: str) -> None:
+        """
+        Move connection state to CONNECTING, for internal use only
+        """
+        ...
+
+    def _begin_logout(self) -> None:
+        """
+        Move connection state to DISCONNECTING, for internal use only
+        """
+        ...
+
+    def _cpdlc_logout(self):
+        """
+        Clear CPDLC variable, for internal use only
+        """
+        ...
+
+    def _handle_message(self, message: AcarsMessage, now: Optional[float] = None):
+        """
+        Handle CPDLC login and logout message, for internal use only
+        Received CPDLC message ids also advance the session message id counter
+        """
+        ...
+
+    def _process_poll_response(self, content: Union[str, bytes], encoding: str = "utf-8",
+                               now: Optional[float] = None) -> list[AcarsMessage]:
+        """
+        Parse a poll response and dispatch every message, for internal use only
+        CPDLC messages with a malformed payload are logged and skipped, the rest of the response is handled
+        Messages already received within the de-duplication window are dropped before they are handled
+        """
+        ...
+
+    def _expire_replies(self, now: Optional[float] = None) -> None:
+        """
+        Call the reply expired callback with every uplink whose reply timeout passed, for internal use only
+        """
+        ...
+
+    def _poll_state(self, message_count: int) -> PollState:
+        """
+        Snapshot session state for the poll policy, for internal use only
+        """
+        ...
+
+    def _observe_request(self, url: str, data: dict, begin: float, error: bool) -> None:
+        """
+        Record a request started at perf_counter time begin, for internal use only
+        """
+        ...
+
+    def _record_request(self, data: dict) -> None:
+        """
+        Record a sent CPDLC packet in the dialogue index and a sent CPDLC or telex packet in the journal,
+        for internal use only
+        """
+        ...
+
+    def restore_journal(self, path: Union[str, Path]) -> JournalState:
+        """
+        Rebuild message id counter, pending replies and CPDLC connection from a journal,
+        e.g. after a restart, no callback is called
+        Args:
+            path (str | Path): journal file, a missing file restores nothing
+        Returns:
+            state read from the journal
+        Raises:
+            AlreadyLoginError: CPDLC connection is not disconnected
+        """
+        ...
+
+    def _start_span(self, stage: TraceStage, packet_type: Optional[PacketType] = None,
+                    message_id: Optional[int] = None, detail: Optional[str] = None) -> Optional[tuple]:
+        """
+        Open a span on the current tracer, for internal use only
+        Returns:
+            (tracer, context, token) to close the span with, None without tracer or when the hook raised
+        """
+        ...
+
+    @staticmethod
+    def _end_span(span: Optional[tuple], error: Optional[BaseException] = None) -> None:
+        """
+        Close a span opened by _start_span, for internal use only
+        """
+        ...
+
+    @staticmethod
+    def _span_message_id(message: AcarsMessage) -> Optional[int]: ...
+
+    def _traced_handle_message(self, message: AcarsMessage, now: Optional[float] = None) -> None:
+        """
+        Handle message inside a HANDLE span, for internal use only
+        """
+        ...
+
+    def _traced_callback(self, callback: Callable[..., Any], run: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap run, the possibly timed receiver callback, in a CALLBACK span, for internal use only
+        The wrapper is created once per run, so it hashes the same way on every call
+        """
+        ...
+
+    async def _end_span_after(self, span: Optional[tuple], result: Awaitable[Any]) -> Any:
+        """
+        Await the result of a coroutine callback and close its span, for internal use only
+        """
+        ...
+
+    def _reply_sent(self, message: CPDLCMessage) -> None:
+        """
+        Remove a replied uplink from pending replies, for internal use only
+        """
+        ...
+
+    @staticmethod
+    def _build_dcl_message(callsign: str, aircraft_type: str, dest_airport: str, dep_airport: str,
+                           stand: str, atis_letter: str) -> str:
+        """
+        Build DCL request text, for internal use only
+        """
+        ...
@@ -1,46 +1,77 @@
+from typing import Optional, Union
+
 from .acars_message import AcarsMessage
-from .cpdlc_message_id import message_id_manager as mim
-from .enums import PacketType, ReplyTag
+from .acars_tokenizer import PacketView
+from .cpdlc_message_id import MessageIdManager, message_id_manager as mim
+from .enums import MessageDirection, PacketType, ReplyTag
 from .exception import CantReplyError
 
+_REPLY_TAGS: dict[str, ReplyTag] = {tag.value: tag for tag in ReplyTag}
+
 
 class CPDLCMessage(AcarsMessage):
     """
     CPDLCMessage class, which inherits from the AcarsMessage class, represents a standard CPDLC message
 
+    The payload is split into its fields on first access of any of them
+
     Attributes:
-        _data_tag (str): message data tag
+        _data_tag (Optional[str]): message data tag, None until the payload is parsed
         _message_id (int): message id
         _reply_id (int): reply id
         _reply_type (ReplyTag): reply type
         _replied (bool): whether message was replied
     """
+    __slots__ = ("_data_tag", "_message_id", "_reply_id", "_reply_type", "_replied")
 
-    def __init__(self, target_station: str, msg_type: PacketType, message: str):
-        super().__init__(target_station, msg_type, message)
+    def __init__(self, target_station: str, msg_type: PacketType, message: Union[str, PacketView],
+                 direction: MessageDirection = MessageDirection.IN):
         """
         Constructor for CPDLCMessage class
         Args:
             target_station (str): target station name
             msg_type (PacketType): type of the message
-            message (str): raw message
+            message (str | PacketView): CPDLC payload (/data2/<id>/<reply id>/<reply type>/<text>) or the raw packet
+            direction (MessageDirection): direction of message
         """
-        data = self._message.split("/")
-        self._data_tag = data[1]
+        super().__init__(target_station, msg_type, message, direction)
+        self._data_tag = None
+        self._replied = False
+
+    def _parse(self) -> None:
+        """
+        Split the payload into its fields, for internal use only
+        Raises:
+            ValueError: when the payload is not a CPDLC payload
+        """
+        payload = super().message
+        data = payload.split("/", 5)
+        if len(data) < 6:
+            raise ValueError(f"Malformed CPDLC payload: {payload}")
+        reply_type = _REPLY_TAGS.get(data[4])
         self._message_id = int(data[2])
         self._reply_id = int(data[3]) if data[3] != "" else 0
-        self._reply_type = ReplyTag(data[4])
+        self._reply_type = reply_type if reply_type is not None else ReplyTag(data[4])
         self._message = data[5].removesuffix("}")
-        self._replied = False
-        mim.update_message_id(self._message_id)
+        # data tag is set last, it marks the payload as parsed
+        self._data_tag = data[1]
+
+    def _identity_fields(self) -> tuple[str, str, Optional[int], str]:
+        return self._target_station, self._msg_type.value, self.message_id, self._message
+
+    @property
+    def message(self) -> str:
+        if self._data_tag is None:
+            self._parse()
+        return self._message
 
     @property
     def request_for_reply(self) -> bool:
-        return self._reply_type != ReplyTag.NOT_REQUIRED
+        return self.reply_type != ReplyTag.NOT_REQUIRED
 
     @property
     def no_reply(self) -> bool:
-        return self._reply_type == ReplyTag.NOT_REQUIRED
+        return self.reply_type == ReplyTag.NOT_REQUIRED
 
     @property
     def has_replied(self) -> bool:
@@ -48,21 +79,29 @@ class CPDLCMessage(AcarsMessage):
 
     @property
     def data_tag(self) -> str:
+        if self._data_tag is None:
+            self._parse()
         return self._data_tag
 
     @property
     def message_id(self) -> int:
+        if self._data_tag is None:
+            self._parse()
         return self._message_id
 
     @property
     def reply_id(self) -> int:
+        if self._data_tag is None:
+            self._parse()
         return self._reply_id
 
     @property
     def reply_type(self) -> ReplyTag:
+        if self._data_tag is None:
+            self._parse()
         return self._reply_type
 
-    def reply_message(self, status: bool) -> str:
+    def reply_message(self, status: bool, id_manager: Optional[MessageIdManager] = None) -> str:
         """
         Got reply message if message can be replied, automatically fill in the message id and reply id
         Which means you can send to server without any operation
@@ -72,27 +111,30 @@ class CPDLCMessage(AcarsMessage):
         When reply type is ROGER, The message will be 'ROGER' regardless of the 'status' variable
         Args:
             status (bool): flag which control reply message
+            id_manager (Optional[MessageIdManager]): allocator of the reply id, the shared allocator when None
         Raises:
             CantReplyError: Raise when message cannot be replied
         Returns:
             str: reply message
         """
         self._replied = True
-        match self._reply_type:
+        match self.reply_type:
             case ReplyTag.WILCO_UNABLE:
-                return f"/data2/{mim.next_message_id()}/{self._message_id}/N/{'WILCO' if status else 'UNABLE'}"
+                reply = 'WILCO' if status else 'UNABLE'
             case ReplyTag.AFFIRM_NEGATIVE:
-                return f"/data2/{mim.next_message_id()}/{self._message_id}/N/{'AFFIRM' if status else 'NEGATIVE'}"
+                reply = 'AFFIRM' if status else 'NEGATIVE'
             case ReplyTag.ROGER:
-                return f"/data2/{mim.next_message_id()}/{self._message_id}/N/ROGER"
+                reply = 'ROGER'
             case _:
                 raise CantReplyError(str(self))
+        message_id = (mim if id_manager is None else id_manager).next_message_id()
+        return f"/data2/{message_id}/{self._message_id}/N/{reply}"
 
     def __str__(self) -> str:
         return ("CPDLCMessage{"
                 f"from={self._target_station},"
                 f"type={self._msg_type},"
-                f"message_id={self._message_id},"
+                f"message_id={self.message_id},"
                 f"reply_id={self._reply_id},"
                 f"reply_type={self._reply_type},"
                 f"message={self._message}"
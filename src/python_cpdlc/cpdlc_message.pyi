@@ -1,35 +1,57 @@
 from .acars_message import AcarsMessage as AcarsMessage
-from .enums import PacketType as PacketType, ReplyTag as ReplyTag
+from .acars_tokenizer import PacketView as PacketView
+from .cpdlc_message_id import MessageIdManager as MessageIdManager
+from .enums import MessageDirection as MessageDirection, PacketType as PacketType, ReplyTag as ReplyTag
 from .exception import CantReplyError as CantReplyError
+from typing import Optional, Union
+
+_REPLY_TAGS: dict[str, ReplyTag]
 
 
 class CPDLCMessage(AcarsMessage):
     """
     CPDLCMessage class, which inherits from the AcarsMessage class, represents a standard CPDLC message
 
+    The payload is split into its fields on first access of any of them
+
     Attributes:
-        _data_tag (str): message data tag
+        _data_tag (Optional[str]): message data tag, None until the payload is parsed
         _message_id (int): message id
         _reply_id (int): reply id
         _reply_type (ReplyTag): reply type
         _replied (bool): whether message was replied
     """
-    _data_tag: str
+    _data_tag: Optional[str]
     _message_id: int
     _reply_id: int
     _reply_type: ReplyTag
     _replied: bool
 
-    def __init__(self, target_station: str, msg_type: PacketType, message: str) -> None:
+    def __init__(self, target_station: str, msg_type: PacketType, message: Union[str, PacketView],
+                 direction: MessageDirection = ...) -> None:
         """
         Constructor for CPDLCMessage class
         Args:
             target_station (str): target station name
             msg_type (PacketType): type of the message
-            message (str): raw message
+            message (str | PacketView): CPDLC payload (/data2/<id>/<reply id>/<reply type>/<text>) or the raw packet
+            direction (MessageDirection): direction of message
+        """
+        ...
+
+    def _parse(self) -> None:
+        """
+        Split the payload into its fields, for internal use only
+        Raises:
+            ValueError: when the payload is not a CPDLC payload
         """
         ...
 
+    def _identity_fields(self) -> tuple[str, str, Optional[int], str]: ...
+
+    @property
+    def message(self) -> str: ...
+
     @property
     def request_for_reply(self) -> bool: ...
 
@@ -51,7 +73,7 @@ class CPDLCMessage(AcarsMessage):
     @property
     def reply_type(self) -> ReplyTag: ...
 
-    def reply_message(self, status: bool) -> str:
+    def reply_message(self, status: bool, id_manager: Optional[MessageIdManager] = None) -> str:
         """
         Got reply message if message can be replied, automatically fill in the message id and reply id
         Which means you can send to server without any operation
@@ -61,6 +83,7 @@ class CPDLCMessage(AcarsMessage):
         When reply type is ROGER, The message will be 'ROGER' regardless of the 'status' variable
         Args:
             status (bool): flag which control reply message
+            id_manager (Optional[MessageIdManager]): allocator of the reply id, the shared allocator when None
         Raises:
             CantReplyError: Raise when message cannot be replied
         Returns:
@@ -1,13 +1,55 @@
+from threading import Lock
+
+
 class MessageIdManager:
-    def __init__(self):
-        self.message_id = 0
+    """
+    Allocator of CPDLC message ids, every session owns one
+
+    The last id allocated or received is kept in an int guarded by the instance lock, allocation advances it by one
+    and received ids move it forward and never back, so concurrent senders never share an id and never reuse one
+    the ground station already used.
+
+    Attributes:
+        _message_id (int): last id allocated or received
+        _lock (threading.Lock): guards _message_id
+    """
+
+    def __init__(self, start: int = 0):
+        """
+        Constructor for MessageIdManager class
+        Args:
+            start (int): last id in use, the first allocated id is start + 1
+        """
+        self._message_id = start
+        self._lock = Lock()
+
+    @property
+    def message_id(self) -> int:
+        """
+        Last id allocated or received
+        """
+        return self._message_id
 
     def update_message_id(self, message_id: int) -> None:
-        self.message_id = message_id
+        """
+        Make sure ids allocated from now on are greater than message_id
+        Args:
+            message_id (int): id received from the ground station
+        """
+        with self._lock:
+            if message_id > self._message_id:
+                self._message_id = message_id
 
     def next_message_id(self) -> int:
-        self.message_id += 1
-        return self.message_id
+        """
+        Allocate a message id
+        Returns:
+            int: message id
+        """
+        with self._lock:
+            self._message_id += 1
+            return self._message_id
 
 
+# Shared allocator kept for code building replies without a session, sessions use their own
 message_id_manager = MessageIdManager()
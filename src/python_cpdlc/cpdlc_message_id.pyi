@@ -1,11 +1,51 @@
+from threading import Lock
+
+
 class MessageIdManager:
-    message_id: int
+    """
+    Allocator of CPDLC message ids, every session owns one
+
+    The last id allocated or received is kept in an int guarded by the instance lock, allocation advances it by one
+    and received ids move it forward and never back, so concurrent senders never share an id and never reuse one
+    the ground station already used.
+
+    Attributes:
+        _message_id (int): last id allocated or received
+        _lock (threading.Lock): guards _message_id
+    """
+    _message_id: int
+    _lock: Lock
+
+    def __init__(self, start: int = 0) -> None:
+        """
+        Constructor for MessageIdManager class
+        Args:
+            start (int): last id in use, the first allocated id is start + 1
+        """
+        ...
 
-    def __init__(self) -> None: ...
+    @property
+    def message_id(self) -> int:
+        """
+        Last id allocated or received
+        """
+        ...
 
-    def update_message_id(self, message_id: int) -> None: ...
+    def update_message_id(self, message_id: int) -> None:
+        """
+        Make sure ids allocated from now on are greater than message_id
+        Args:
+            message_id (int): id received from the ground station
+        """
+        ...
 
-    def next_message_id(self) -> int: ...
+    def next_message_id(self) -> int:
+        """
+        Allocate a message id
+        Returns:
+            int: message id
+        """
+        ...
 
 
 message_id_manager: MessageIdManager
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Optional
+
+from .acars_message import AcarsMessage
+from .exception import ParameterError
+
+
+class MessageDeduplicator:
+    """
+    Bounded index of recently received message identities
+
+    Identities are kept in least recently seen order, an identity is forgotten once it was not seen for window
+    seconds or when more than max_size identities are tracked. It is consulted from the poll path only,
+    so it takes no lock.
+
+    Attributes:
+        _max_size (int): maximum number of identities tracked
+        _window (float): seconds an identity is remembered after it was last seen
+        _seen (OrderedDict[int, float]): identity to monotonic time it was last seen
+        _duplicates (int): number of duplicates detected
+    """
+
+    def __init__(self, max_size: int = 1024, window: float = 120):
+        """
+        Constructor for MessageDeduplicator class
+        Args:
+            max_size (int): maximum number of identities tracked
+            window (float): seconds an identity is remembered after it was last seen
+        Raises:
+            ParameterError: when max_size or window is not positive
+        """
+        if max_size <= 0 or window <= 0:
+            raise ParameterError("max_size and window must be positive")
+        self._max_size = max_size
+        self._window = window
+        self._seen: OrderedDict[int, float] = OrderedDict()
+        self._duplicates = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def window(self) -> float:
+        return self._window
+
+    @property
+    def duplicates(self) -> int:
+        return self._duplicates
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def is_duplicate(self, message: AcarsMessage, now: Optional[float] = None) -> bool:
+        """
+        Record message and check whether it was already seen within the window
+        Args:
+            message (AcarsMessage): received message
+            now (Optional[float]): monotonic time the message was received, current time when None
+        Returns:
+            true if the message is a duplicate
+        """
+        if now is None:
+            now = monotonic()
+        seen = self._seen
+        expire = now - self._window
+        while seen:
+            identity, last_seen = next(iter(seen.items()))
+            if last_seen > expire:
+                break
+            del seen[identity]
+        identity = message.identity
+        duplicate = identity in seen
+        seen[identity] = now
+        if duplicate:
+            seen.move_to_end(identity)
+            self._duplicates += 1
+        elif len(seen) > self._max_size:
+            seen.popitem(last=False)
+        return duplicate
+
+    def filter(self, messages: list[AcarsMessage], now: Optional[float] = None) -> list[AcarsMessage]:
+        """
+        Drop messages already seen within the window
+        Args:
+            messages (list[AcarsMessage]): received messages
+            now (Optional[float]): monotonic time the messages were received, current time when None
+        Returns:
+            messages not seen before, in order
+        """
+        if now is None:
+            now = monotonic()
+        return [message for message in messages if not self.is_duplicate(message, now)]
+
+    def clear(self) -> None:
+        """
+        Forget every identity
+        """
+        self._seen.clear()
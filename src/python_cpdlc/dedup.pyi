@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from typing import Optional
+
+from .acars_message import AcarsMessage as AcarsMessage
+from .exception import ParameterError as ParameterError
+
+
+class MessageDeduplicator:
+    """
+    Bounded index of recently received message identities
+
+    Identities are kept in least recently seen order, an identity is forgotten once it was not seen for window
+    seconds or when more than max_size identities are tracked. It is consulted from the poll path only,
+    so it takes no lock.
+
+    Attributes:
+        _max_size (int): maximum number of identities tracked
+        _window (float): seconds an identity is remembered after it was last seen
+        _seen (OrderedDict[int, float]): identity to monotonic time it was last seen
+        _duplicates (int): number of duplicates detected
+    """
+    _max_size: int
+    _window: float
+    _seen: OrderedDict[int, float]
+    _duplicates: int
+
+    def __init__(self, max_size: int = 1024, window: float = 120) -> None:
+        """
+        Constructor for MessageDeduplicator class
+        Args:
+            max_size (int): maximum number of identities tracked
+            window (float): seconds an identity is remembered after it was last seen
+        Raises:
+            ParameterError: when max_size or window is not positive
+        """
+        ...
+
+    @property
+    def max_size(self) -> int: ...
+
+    @property
+    def window(self) -> float: ...
+
+    @property
+    def duplicates(self) -> int: ...
+
+    def __len__(self) -> int: ...
+
+    def is_duplicate(self, message: AcarsMessage, now: Optional[float] = None) -> bool:
+        """
+        Record message and check whether it was already seen within the window
+        Args:
+            message (AcarsMessage): received message
+            now (Optional[float]): monotonic time the message was received, current time when None
+        Returns:
+            true if the message is a duplicate
+        """
+        ...
+
+    def filter(self, messages: list[AcarsMessage], now: Optional[float] = None) -> list[AcarsMessage]:
+        """
+        Drop messages already seen within the window
+        Args:
+            messages (list[AcarsMessage]): received messages
+            now (Optional[float]): monotonic time the messages were received, current time when None
+        Returns:
+            messages not seen before, in order
+        """
+        ...
+
+    def clear(self) -> None:
+        """
+        Forget every identity
+        """
+        ...
@@ -0,0 +1,237 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .cpdlc_message import CPDLCMessage
+from .enums import MessageDirection
+from .exception import ParameterError
+
+# reply tags of packets which expect no answer, NE on uplinks and N on our downlinks
+_NO_REPLY_TAGS = frozenset(("NE", "N"))
+
+_DialogueKey = tuple[MessageDirection, str, int]
+
+
+@dataclass(frozen=True, slots=True)
+class DialogueEntry:
+    """
+    One CPDLC packet of a dialogue
+
+    Attributes:
+        direction (MessageDirection): IN for uplinks, OUT for our downlinks
+        station (str): ATC station the packet was received from or sent to, upper case
+        message_id (int): message id, allocated by the sender
+        reply_id (int): message id of the packet of the other side this one answers, 0 when it answers nothing
+        reply_tag (str): reply tag as sent, e.g. WU or NE on uplinks, Y or N on downlinks
+        text (str): message text
+        epoch (float): epoch seconds the packet was received or sent
+    """
+    direction: MessageDirection
+    station: str
+    message_id: int
+    reply_id: int
+    reply_tag: str
+    text: str
+    epoch: float
+
+    @property
+    def needs_reply(self) -> bool:
+        return self.reply_tag not in _NO_REPLY_TAGS
+
+    @property
+    def answers(self) -> Optional[_DialogueKey]:
+        """
+        Key of the packet this one answers, None when it answers nothing
+        """
+        if not self.reply_id:
+            return None
+        direction = MessageDirection.OUT if self.direction is MessageDirection.IN else MessageDirection.IN
+        return direction, self.station, self.reply_id
+
+    @property
+    def key(self) -> _DialogueKey:
+        return self.direction, self.station, self.message_id
+
+    @staticmethod
+    def from_message(message: CPDLCMessage) -> "DialogueEntry":
+        """
+        Entry of a received CPDLC message
+        """
+        return DialogueEntry(message.direction, message.target_station.upper(), message.message_id, message.reply_id,
+                             message.reply_type.value, message.message, message.epoch)
+
+    @staticmethod
+    def from_packet(station: str, packet: str, epoch: float) -> Optional["DialogueEntry"]:
+        """
+        Entry of a CPDLC packet we sent, downlinks carry Y or N reply tags which CPDLCMessage cannot parse
+        Returns:
+            the entry, None when packet is no CPDLC packet
+        """
+        data = packet.split("/", 5)
+        if len(data) < 6 or not data[2].isdigit():
+            return None
+        return DialogueEntry(MessageDirection.OUT, station.upper(), int(data[2]), int(data[3]) if data[3] else 0,
+                             data[4], data[5], epoch)
+
+
+@dataclass(slots=True)
+class Dialogue:
+    """
+    CPDLC packets linked by their reply ids, starting with the packet which answers nothing known
+
+    Attributes:
+        entries (list[DialogueEntry]): packets in the order they were received or sent
+        closed (bool): set when the session logged off while the dialogue was open
+    """
+    entries: list[DialogueEntry] = field(default_factory=list)
+    closed: bool = False
+
+    @property
+    def key(self) -> _DialogueKey:
+        return self.entries[0].key
+
+    @property
+    def first(self) -> DialogueEntry:
+        return self.entries[0]
+
+    @property
+    def last(self) -> DialogueEntry:
+        return self.entries[-1]
+
+    @property
+    def station(self) -> str:
+        return self.entries[0].station
+
+    @property
+    def is_open(self) -> bool:
+        return not self.closed and self.entries[-1].needs_reply
+
+
+class DialogueIndex:
+    """
+    Groups the CPDLC packets of a session into dialogues
+
+    Uplinks and downlinks carry message ids of separate counters and every station numbers its uplinks on its own,
+    a packet answers the packet of the other direction and the same station its reply id names. Every packet is
+    indexed by (direction, station, message id), so the dialogue of a packet is a dict lookup. A dialogue is open
+    while its last packet expects an answer. Open dialogues are kept until they are answered or closed, closed
+    dialogues are kept in least recently used order and the oldest is evicted beyond max_closed. Not thread safe,
+    the session guards it with its state lock
+
+    Attributes:
+        _max_closed (int): closed dialogues kept
+        _by_message (dict[tuple[MessageDirection, str, int], Dialogue]): dialogue of every indexed packet
+        _open (dict[tuple[MessageDirection, str, int], Dialogue]): open dialogues by key, oldest first
+        _closed (OrderedDict[tuple[MessageDirection, str, int], Dialogue]): closed dialogues, least recently used
+            first
+    """
+
+    def __init__(self, max_closed: int = 256):
+        """
+        Constructor for DialogueIndex class
+        Args:
+            max_closed (int): closed dialogues kept
+        Raises:
+            ParameterError: when max_closed is negative
+        """
+        if max_closed < 0:
+            raise ParameterError("max_closed must not be negative")
+        self._max_closed = max_closed
+        self._by_message: dict[_DialogueKey, Dialogue] = {}
+        self._open: dict[_DialogueKey, Dialogue] = {}
+        self._closed: OrderedDict[_DialogueKey, Dialogue] = OrderedDict()
+
+    @property
+    def max_closed(self) -> int:
+        return self._max_closed
+
+    @property
+    def open_dialogues(self) -> list[Dialogue]:
+        return list(self._open.values())
+
+    @property
+    def open_count(self) -> int:
+        return len(self._open)
+
+    def __len__(self) -> int:
+        return len(self._open) + len(self._closed)
+
+    def dialogue(self, station: str, message_id: int,
+                 direction: MessageDirection = MessageDirection.IN) -> Optional[Dialogue]:
+        """
+        Dialogue a packet belongs to
+        Args:
+            station (str): ATC station the packet was received from or sent to
+            message_id (int): message id of the packet
+            direction (MessageDirection): IN for uplinks, OUT for our downlinks
+        Returns:
+            the dialogue, None when the packet is not indexed or its dialogue was evicted
+        """
+        return self._by_message.get((direction, station.upper(), message_id))
+
+    def record(self, entry: DialogueEntry) -> Dialogue:
+        """
+        Add a packet to the dialogue of the packet it answers, or start a dialogue with it
+        Args:
+            entry (DialogueEntry): received or sent packet
+        Returns:
+            dialogue of the packet
+        """
+        answers = entry.answers
+        dialogue = None if answers is None else self._by_message.get(answers)
+        if dialogue is None:
+            dialogue = Dialogue([entry])
+        else:
+            self._closed.pop(dialogue.key, None)
+            self._open.pop(dialogue.key, None)
+            dialogue.entries.append(entry)
+            dialogue.closed = False
+        self._by_message[entry.key] = dialogue
+        self._file(dialogue)
+        return dialogue
+
+    def record_message(self, message: CPDLCMessage) -> Dialogue:
+        """
+        Add a received CPDLC message
+        """
+        return self.record(DialogueEntry.from_message(message))
+
+    def record_packet(self, station: str, packet: str, epoch: float) -> Optional[Dialogue]:
+        """
+        Add a CPDLC packet we sent
+        Returns:
+            dialogue of the packet, None when packet is no CPDLC packet
+        """
+        entry = DialogueEntry.from_packet(station, packet, epoch)
+        return None if entry is None else self.record(entry)
+
+    def close_open(self) -> None:
+        """
+        Close every open dialogue, e.g. when the session logs off
+        """
+        dialogues, self._open = list(self._open.values()), {}
+        for dialogue in dialogues:
+            dialogue.closed = True
+            self._file(dialogue)
+
+    def clear(self) -> None:
+        """
+        Forget every dialogue
+        """
+        self._by_message.clear()
+        self._open.clear()
+        self._closed.clear()
+
+    def _file(self, dialogue: Dialogue) -> None:
+        """
+        Put a dialogue with open or closed ones and evict beyond max_closed, for internal use only
+        """
+        if dialogue.is_open:
+            self._open[dialogue.key] = dialogue
+            return
+        self._closed[dialogue.key] = dialogue
+        while len(self._closed) > self._max_closed:
+            _, evicted = self._closed.popitem(last=False)
+            for entry in evicted.entries:
+                if self._by_message.get(entry.key) is evicted:
+                    del self._by_message[entry.key]
@@ -0,0 +1,191 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .cpdlc_message import CPDLCMessage as CPDLCMessage
+from .enums import MessageDirection as MessageDirection
+from .exception import ParameterError as ParameterError
+
+_NO_REPLY_TAGS: frozenset[str]
+
+_DialogueKey = tuple[MessageDirection, str, int]
+
+
+@dataclass(frozen=True, slots=True)
+class DialogueEntry:
+    """
+    One CPDLC packet of a dialogue
+
+    Attributes:
+        direction (MessageDirection): IN for uplinks, OUT for our downlinks
+        station (str): ATC station the packet was received from or sent to, upper case
+        message_id (int): message id, allocated by the sender
+        reply_id (int): message id of the packet of the other side this one answers, 0 when it answers nothing
+        reply_tag (str): reply tag as sent, e.g. WU or NE on uplinks, Y or N on downlinks
+        text (str): message text
+        epoch (float): epoch seconds the packet was received or sent
+    """
+    direction: MessageDirection
+    station: str
+    message_id: int
+    reply_id: int
+    reply_tag: str
+    text: str
+    epoch: float
+
+    @property
+    def needs_reply(self) -> bool: ...
+
+    @property
+    def answers(self) -> Optional[_DialogueKey]:
+        """
+        Key of the packet this one answers, None when it answers nothing
+        """
+        ...
+
+    @property
+    def key(self) -> _DialogueKey: ...
+
+    @staticmethod
+    def from_message(message: CPDLCMessage) -> "DialogueEntry":
+        """
+        Entry of a received CPDLC message
+        """
+        ...
+
+    @staticmethod
+    def from_packet(station: str, packet: str, epoch: float) -> Optional["DialogueEntry"]:
+        """
+        Entry of a CPDLC packet we sent, downlinks carry Y or N reply tags which CPDLCMessage cannot parse
+        Returns:
+            the entry, None when packet is no CPDLC packet
+        """
+        ...
+
+
+@dataclass(slots=True)
+class Dialogue:
+    """
+    CPDLC packets linked by their reply ids, starting with the packet which answers nothing known
+
+    Attributes:
+        entries (list[DialogueEntry]): packets in the order they were received or sent
+        closed (bool): set when the session logged off while the dialogue was open
+    """
+    entries: list[DialogueEntry] = field(default_factory=list)
+    closed: bool = False
+
+    @property
+    def key(self) -> _DialogueKey: ...
+
+    @property
+    def first(self) -> DialogueEntry: ...
+
+    @property
+    def last(self) -> DialogueEntry: ...
+
+    @property
+    def station(self) -> str: ...
+
+    @property
+    def is_open(self) -> bool: ...
+
+
+class DialogueIndex:
+    """
+    Groups the CPDLC packets of a session into dialogues
+
+    Uplinks and downlinks carry message ids of separate counters and every station numbers its uplinks on its own,
+    a packet answers the packet of the other direction and the same station its reply id names. Every packet is
+    indexed by (direction, station, message id), so the dialogue of a packet is a dict lookup. A dialogue is open
+    while its last packet expects an answer. Open dialogues are kept until they are answered or closed, closed
+    dialogues are kept in least recently used order and the oldest is evicted beyond max_closed. Not thread safe,
+    the session guards it with its state lock
+
+    Attributes:
+        _max_closed (int): closed dialogues kept
+        _by_message (dict[tuple[MessageDirection, str, int], Dialogue]): dialogue of every indexed packet
+        _open (dict[tuple[MessageDirection, str, int], Dialogue]): open dialogues by key, oldest first
+        _closed (OrderedDict[tuple[MessageDirection, str, int], Dialogue]): closed dialogues, least recently used
+            first
+    """
+    _max_closed: int
+    _by_message: dict[_DialogueKey, Dialogue]
+    _open: dict[_DialogueKey, Dialogue]
+    _closed: OrderedDict[_DialogueKey, Dialogue]
+
+    def __init__(self, max_closed: int = 256):
+        """
+        Constructor for DialogueIndex class
+        Args:
+            max_closed (int): closed dialogues kept
+        Raises:
+            ParameterError: when max_closed is negative
+        """
+        ...
+
+    @property
+    def max_closed(self) -> int: ...
+
+    @property
+    def open_dialogues(self) -> list[Dialogue]: ...
+
+    @property
+    def open_count(self) -> int: ...
+
+    def __len__(self) -> int: ...
+
+    def dialogue(self, station: str, message_id: int,
+                 direction: MessageDirection = MessageDirection.IN) -> Optional[Dialogue]:
+        """
+        Dialogue a packet belongs to
+        Args:
+            station (str): ATC station the packet was received from or sent to
+            message_id (int): message id of the packet
+            direction (MessageDirection): IN for uplinks, OUT for our downlinks
+        Returns:
+            the dialogue, None when the packet is not indexed or its dialogue was evicted
+        """
+        ...
+
+    def record(self, entry: DialogueEntry) -> Dialogue:
+        """
+        Add a packet to the dialogue of the packet it answers, or start a dialogue with it
+        Args:
+            entry (DialogueEntry): received or sent packet
+        Returns:
+            dialogue of the packet
+        """
+        ...
+
+    def record_message(self, message: CPDLCMessage) -> Dialogue:
+        """
+        Add a received CPDLC message
+        """
+        ...
+
+    def record_packet(self, station: str, packet: str, epoch: float) -> Optional[Dialogue]:
+        """
+        Add a CPDLC packet we sent
+        Returns:
+            dialogue of the packet, None when packet is no CPDLC packet
+        """
+        ...
+
+    def close_open(self) -> None:
+        """
+        Close every open dialogue, e.g. when the session logs off
+        """
+        ...
+
+    def clear(self) -> None:
+        """
+        Forget every dialogue
+        """
+        ...
+
+    def _file(self, dialogue: Dialogue) -> None:
+        """
+        Put a dialogue with open or closed ones and evict beyond max_closed, for internal use only
+        """
+        ...
@@ -0,0 +1,329 @@
+from asyncio import AbstractEventLoop, Event as AsyncEvent, Task, gather, get_running_loop
+from collections import deque
+from dataclasses import dataclass
+from inspect import isawaitable
+from threading import Condition, Thread, get_ident
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from .enums import OverflowPolicy
+from .exception import InvalidStateError, ParameterError
+
+
+@dataclass(frozen=True, slots=True)
+class DispatcherStats:
+    """
+    Snapshot of dispatcher counters
+
+    Attributes:
+        depths (tuple[int, ...]): queued callbacks per worker
+        max_depth (int): highest queue depth seen on any worker
+        dispatched (int): callbacks completed
+        failed (int): callbacks which raised
+        dropped (int): callbacks dropped by the overflow policy
+    """
+    depths: tuple[int, ...]
+    max_depth: int
+    dispatched: int
+    failed: int
+    dropped: int
+
+    @property
+    def depth(self) -> int:
+        return sum(self.depths)
+
+
+class _Shard:
+    """
+    Queue of one worker, for internal use only
+    Only the owning worker updates dispatched and failed, dropped and max_depth are updated under condition
+    """
+    __slots__ = ("queue", "condition", "dispatched", "failed", "dropped", "max_depth", "ready")
+
+    def __init__(self):
+        self.queue: deque[tuple[Callable[..., Any], tuple]] = deque()
+        self.condition = Condition()
+        self.dispatched = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.ready: Optional[AsyncEvent] = None
+
+
+class CallbackDispatcher:
+    """
+    Base class of callback dispatchers, hands callbacks to workers through bounded queues
+
+    Each callback is always queued on the same worker, so calls of one callback run in the order they were
+    dispatched, while a slow callback only holds back the callbacks sharing its worker
+
+    Attributes:
+        _queue_size (int): maximum callbacks queued per worker
+        _overflow (OverflowPolicy): what dispatch does when the worker queue is full
+        _shards (list[_Shard]): worker queues
+        _closed (bool): whether dispatcher was closed
+    """
+
+    def __init__(self, workers: int, queue_size: int, overflow: OverflowPolicy):
+        """
+        Constructor for CallbackDispatcher class
+        Args:
+            workers (int): number of workers
+            queue_size (int): maximum callbacks queued per worker
+            overflow (OverflowPolicy): what dispatch does when the worker queue is full
+        Raises:
+            ParameterError: when workers or queue_size is not positive
+        """
+        if workers <= 0 or queue_size <= 0:
+            raise ParameterError("workers and queue_size must be positive")
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._shards = [_Shard() for _ in range(workers)]
+        self._closed = False
+
+    @property
+    def workers(self) -> int:
+        return len(self._shards)
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue_size
+
+    @property
+    def overflow(self) -> OverflowPolicy:
+        return self._overflow
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def stats(self) -> DispatcherStats:
+        shards = self._shards
+        return DispatcherStats(
+            tuple(len(shard.queue) for shard in shards),
+            max(shard.max_depth for shard in shards),
+            sum(shard.dispatched for shard in shards),
+            sum(shard.failed for shard in shards),
+            sum(shard.dropped for shard in shards)
+        )
+
+    def _can_block(self) -> bool:
+        """
+        Whether the calling thread may wait for room in a queue, for internal use only
+        """
+        return True
+
+    def _wakeup(self, shard: _Shard) -> None:
+        """
+        Wake the worker of shard after a callback was queued, for internal use only
+        """
+        shard.condition.notify_all()
+
+    def dispatch(self, callback: Callable[..., Any], *args: Any) -> bool:
+        """
+        Queue a call of callback with args
+        Args:
+            callback (Callable[..., Any]): callback
+            *args (Any): arguments
+        Returns:
+            true if queued, false if dropped by the overflow policy
+        Raises:
+            InvalidStateError: when dispatcher is closed
+        """
+        if self._closed:
+            raise InvalidStateError("Dispatcher closed")
+        shard = self._shards[hash(callback) % len(self._shards)]
+        with shard.condition:
+            queue = shard.queue
+            if len(queue) >= self._queue_size:
+                overflow = self._overflow
+                if overflow is OverflowPolicy.BLOCK and not self._can_block():
+                    logger.warning("Callback queue full on the event loop thread, callback dropped instead of blocking")
+                    overflow = OverflowPolicy.DROP_NEWEST
+                if overflow is OverflowPolicy.BLOCK:
+                    while len(queue) >= self._queue_size and not self._closed:
+                        shard.condition.wait()
+                    if self._closed:
+                        raise InvalidStateError("Dispatcher closed")
+                elif overflow is OverflowPolicy.DROP_NEWEST:
+                    shard.dropped += 1
+                    return False
+                else:
+                    queue.popleft()
+                    shard.dropped += 1
+            queue.append((callback, args))
+            if len(queue) > shard.max_depth:
+                shard.max_depth = len(queue)
+            self._wakeup(shard)
+        return True
+
+    @staticmethod
+    def _take(shard: _Shard) -> tuple[Callable[..., Any], tuple]:
+        """
+        Pop the next queued callback of shard, for internal use only
+        """
+        with shard.condition:
+            item = shard.queue.popleft()
+            shard.condition.notify_all()
+        return item
+
+
+class ThreadPoolDispatcher(CallbackDispatcher):
+    """
+    Runs callbacks on a pool of daemon worker threads
+
+    Examples:
+        dispatcher = ThreadPoolDispatcher(workers=2, queue_size=256, overflow=OverflowPolicy.DROP_OLDEST)\n
+        cpdlc.set_callback_dispatcher(dispatcher)\n
+        ...\n
+        dispatcher.close()\n
+
+    Attributes:
+        _threads (list[threading.Thread]): worker threads
+    """
+
+    def __init__(self, workers: int = 4, queue_size: int = 1024, overflow: OverflowPolicy = OverflowPolicy.BLOCK):
+        """
+        Constructor for ThreadPoolDispatcher class
+        Args:
+            workers (int): number of worker threads
+            queue_size (int): maximum callbacks queued per worker
+            overflow (OverflowPolicy): what dispatch does when the worker queue is full
+        Raises:
+            ParameterError: when workers or queue_size is not positive
+        """
+        super().__init__(workers, queue_size, overflow)
+        self._threads = [Thread(target=self._work, args=(shard,), name=f"CallbackDispatcher-{index}", daemon=True)
+                         for index, shard in enumerate(self._shards)]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self, shard: _Shard) -> None:
+        """
+        Worker thread loop, for internal use only
+        """
+        while True:
+            with shard.condition:
+                while not shard.queue and not self._closed:
+                    shard.condition.wait()
+                if not shard.queue:
+                    return
+            callback, args = self._take(shard)
+            try:
+                callback(*args)
+                shard.dispatched += 1
+            except Exception as e:
+                shard.failed += 1
+                logger.error("Exception occurred while calling callback: {}", e)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting callbacks, run the queued ones and stop the workers
+        Args:
+            timeout (Optional[float]): seconds to wait for every worker, wait forever when None
+        """
+        self._closed = True
+        for shard in self._shards:
+            with shard.condition:
+                shard.condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+
+class AsyncioDispatcher(CallbackDispatcher):
+    """
+    Runs callbacks as tasks of an asyncio event loop, coroutine callbacks are awaited
+
+    Callbacks may be dispatched from any thread. The event loop thread can never wait for room in a queue,
+    so with OverflowPolicy.BLOCK a callback dispatched on the loop thread to a full queue is dropped and logged
+
+    Examples:
+        dispatcher = AsyncioDispatcher(workers=2)\n
+        dispatcher.start()\n
+        cpdlc.set_callback_dispatcher(dispatcher)\n
+        ...\n
+        await dispatcher.aclose()\n
+
+    Attributes:
+        _loop (Optional[asyncio.AbstractEventLoop]): event loop running the workers
+        _loop_thread (Optional[int]): ident of the event loop thread
+        _tasks (list[asyncio.Task]): worker tasks
+    """
+
+    def __init__(self, workers: int = 4, queue_size: int = 1024, overflow: OverflowPolicy = OverflowPolicy.BLOCK):
+        """
+        Constructor for AsyncioDispatcher class
+        Args:
+            workers (int): number of worker tasks
+            queue_size (int): maximum callbacks queued per worker
+            overflow (OverflowPolicy): what dispatch does when the worker queue is full
+        Raises:
+            ParameterError: when workers or queue_size is not positive
+        """
+        super().__init__(workers, queue_size, overflow)
+        self._loop: Optional[AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._tasks: list[Task] = []
+
+    def start(self) -> None:
+        """
+        Start worker tasks, must be called from a running event loop
+        """
+        if self._tasks:
+            return
+        self._loop = get_running_loop()
+        self._loop_thread = get_ident()
+        for shard in self._shards:
+            shard.ready = AsyncEvent()
+        self._tasks = [self._loop.create_task(self._work(shard)) for shard in self._shards]
+
+    def dispatch(self, callback: Callable[..., Any], *args: Any) -> bool:
+        if not self._tasks and not self._closed:
+            raise InvalidStateError("Dispatcher not started")
+        return super().dispatch(callback, *args)
+
+    def _can_block(self) -> bool:
+        return get_ident() != self._loop_thread
+
+    def _wakeup(self, shard: _Shard) -> None:
+        if get_ident() == self._loop_thread:
+            shard.ready.set()
+        else:
+            self._loop.call_soon_threadsafe(shard.ready.set)
+
+    async def _work(self, shard: _Shard) -> None:
+        """
+        Worker task loop, for internal use only
+        """
+        while True:
+            while not shard.queue:
+                if self._closed:
+                    return
+                shard.ready.clear()
+                if shard.queue:
+                    break
+                await shard.ready.wait()
+            callback, args = self._take(shard)
+            try:
+                result = callback(*args)
+                if isawaitable(result):
+                    await result
+                shard.dispatched += 1
+            except Exception as e:
+                shard.failed += 1
+                logger.error("Exception occurred while calling callback: {}", e)
+
+    async def aclose(self) -> None:
+        """
+        Stop accepting callbacks, run the queued ones and stop the workers
+        """
+        self._closed = True
+        for shard in self._shards:
+            with shard.condition:
+                shard.condition.notify_all()
+            if shard.ready is not None:
+                shard.ready.set()
+        await gather(*self._tasks)
+        self._tasks = []
@@ -0,0 +1,229 @@
+from asyncio import AbstractEventLoop, Event as AsyncEvent, Task
+from collections import deque
+from threading import Condition, Thread
+from typing import Any, Callable, Optional
+
+from .enums import OverflowPolicy as OverflowPolicy
+from .exception import InvalidStateError as InvalidStateError, ParameterError as ParameterError
+
+
+class DispatcherStats:
+    """
+    Snapshot of dispatcher counters
+
+    Attributes:
+        depths (tuple[int, ...]): queued callbacks per worker
+        max_depth (int): highest queue depth seen on any worker
+        dispatched (int): callbacks completed
+        failed (int): callbacks which raised
+        dropped (int): callbacks dropped by the overflow policy
+    """
+    depths: tuple[int, ...]
+    max_depth: int
+    dispatched: int
+    failed: int
+    dropped: int
+
+    def __init__(self, depths: tuple[int, ...], max_depth: int, dispatched: int, failed: int,
+                 dropped: int) -> None: ...
+
+    @property
+    def depth(self) -> int: ...
+
+
+class _Shard:
+    """
+    Queue of one worker, for internal use only
+    Only the owning worker updates dispatched and failed, dropped and max_depth are updated under condition
+    """
+    queue: deque[tuple[Callable[..., Any], tuple]]
+    condition: Condition
+    dispatched: int
+    failed: int
+    dropped: int
+    max_depth: int
+    ready: Optional[AsyncEvent]
+
+    def __init__(self) -> None: ...
+
+
+class CallbackDispatcher:
+    """
+    Base class of callback dispatchers, hands callbacks to workers through bounded queues
+
+    Each callback is always queued on the same worker, so calls of one callback run in the order they were
+    dispatched, while a slow callback only holds back the callbacks sharing its worker
+
+    Attributes:
+        _queue_size (int): maximum callbacks queued per worker
+        _overflow (OverflowPolicy): what dispatch does when the worker queue is full
+        _shards (list[_Shard]): worker queues
+        _closed (bool): whether dispatcher was closed
+    """
+    _queue_size: int
+    _overflow: OverflowPolicy
+    _shards: list[_Shard]
+    _closed: bool
+
+    def __init__(self, workers: int, queue_size: int, overflow: OverflowPolicy) -> None:
+        """
+        Constructor for CallbackDispatcher class
+        Args:
+            workers (int): number of workers
+            queue_size (int): maximum callbacks queued per worker
+            overflow (OverflowPolicy): what dispatch does when the worker queue is full
+        Raises:
+            ParameterError: when workers or queue_size is not positive
+        """
+        ...
+
+    @property
+    def workers(self) -> int: ...
+
+    @property
+    def queue_size(self) -> int: ...
+
+    @property
+    def overflow(self) -> OverflowPolicy: ...
+
+    @property
+    def closed(self) -> bool: ...
+
+    @property
+    def stats(self) -> DispatcherStats: ...
+
+    def _can_block(self) -> bool:
+        """
+        Whether the calling thread may wait for room in a queue, for internal use only
+        """
+        ...
+
+    def _wakeup(self, shard: _Shard) -> None:
+        """
+        Wake the worker of shard after a callback was queued, for internal use only
+        """
+        ...
+
+    def dispatch(self, callback: Callable[..., Any], *args: Any) -> bool:
+        """
+        Queue a call of callback with args
+        Args:
+            callback (Callable[..., Any]): callback
+            *args (Any): arguments
+        Returns:
+            true if queued, false if dropped by the overflow policy
+        Raises:
+            InvalidStateError: when dispatcher is closed
+        """
+        ...
+
+    @staticmethod
+    def _take(shard: _Shard) -> tuple[Callable[..., Any], tuple]:
+        """
+        Pop the next queued callback of shard, for internal use only
+        """
+        ...
+
+
+class ThreadPoolDispatcher(CallbackDispatcher):
+    """
+    Runs callbacks on a pool of daemon worker threads
+
+    Examples:
+        dispatcher = ThreadPoolDispatcher(workers=2, queue_size=256, overflow=OverflowPolicy.DROP_OLDEST)\n
+        cpdlc.set_callback_dispatcher(dispatcher)\n
+        ...\n
+        dispatcher.close()\n
+
+    Attributes:
+        _threads (list[threading.Thread]): worker threads
+    """
+    _threads: list[Thread]
+
+    def __init__(self, workers: int = 4, queue_size: int = 1024,
+                 overflow: OverflowPolicy = OverflowPolicy.BLOCK) -> None:
+        """
+        Constructor for ThreadPoolDispatcher class
+        Args:
+            workers (int): number of worker threads
+            queue_size (int): maximum callbacks queued per worker
+            overflow (OverflowPolicy): what dispatch does when the worker queue is full
+        Raises:
+            ParameterError: when workers or queue_size is not positive
+        """
+        ...
+
+    def _work(self, shard: _Shard) -> None:
+        """
+        Worker thread loop, for internal use only
+        """
+        ...
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting callbacks, run the queued ones and stop the workers
+        Args:
+            timeout (Optional[float]): seconds to wait for every worker, wait forever when None
+        """
+        ...
+
+
+class AsyncioDispatcher(CallbackDispatcher):
+    """
+    Runs callbacks as tasks of an asyncio event loop, coroutine callbacks are awaited
+
+    Callbacks may be dispatched from any thread. The event loop thread can never wait for room in a queue,
+    so with OverflowPolicy.BLOCK a callback dispatched on the loop thread to a full queue is dropped and logged
+
+    Examples:
+        dispatcher = AsyncioDispatcher(workers=2)\n
+        dispatcher.start()\n
+        cpdlc.set_callback_dispatcher(dispatcher)\n
+        ...\n
+        await dispatcher.aclose()\n
+
+    Attributes:
+        _loop (Optional[asyncio.AbstractEventLoop]): event loop running the workers
+        _loop_thread (Optional[int]): ident of the event loop thread
+        _tasks (list[asyncio.Task]): worker tasks
+    """
+    _loop: Optional[AbstractEventLoop]
+    _loop_thread: Optional[int]
+    _tasks: list[Task]
+
+    def __init__(self, workers: int = 4, queue_size: int = 1024,
+                 overflow: OverflowPolicy = OverflowPolicy.BLOCK) -> None:
+        """
+        Constructor for AsyncioDispatcher class
+        Args:
+            workers (int): number of worker tasks
+            queue_size (int): maximum callbacks queued per worker
+            overflow (OverflowPolicy): what dispatch does when the worker queue is full
+        Raises:
+            ParameterError: when workers or queue_size is not positive
+        """
+        ...
+
+    def start(self) -> None:
+        """
+        Start worker tasks, must be called from a running event loop
+        """
+        ...
+
+    def dispatch(self, callback: Callable[..., Any], *args: Any) -> bool: ...
+
+    def _can_block(self) -> bool: ...
+
+    def _wakeup(self, shard: _Shard) -> None: ...
+
+    async def _work(self, shard: _Shard) -> None:
+        """
+        Worker task loop, for internal use only
+        """
+        ...
+
+    async def aclose(self) -> None:
+        """
+        Stop accepting callbacks, run the queued ones and stop the workers
+        """
+        ...
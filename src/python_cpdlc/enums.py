@@ -61,3 +61,22 @@ class ReplyTag(Enum):
 class MessageDirection(Enum):
     IN = "IN"
     OUT = "OUT"
+
+
+class OverflowPolicy(Enum):
+    BLOCK = auto()
+    DROP_OLDEST = auto()
+    DROP_NEWEST = auto()
+
+
+class TraceStage(Enum):
+    REQUEST = "request"
+    PARSE = "parse"
+    HANDLE = "handle"
+    CALLBACK = "callback"
+
+
+class CircuitState(Enum):
+    CLOSED = auto()
+    OPEN = auto()
+    HALF_OPEN = auto()
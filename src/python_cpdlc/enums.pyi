@@ -61,3 +61,22 @@ class ReplyTag(Enum):
 class MessageDirection(Enum):
     IN = 'IN'
     OUT = 'OUT'
+
+
+class OverflowPolicy(Enum):
+    BLOCK = ...
+    DROP_OLDEST = ...
+    DROP_NEWEST = ...
+
+
+class TraceStage(Enum):
+    REQUEST = 'request'
+    PARSE = 'parse'
+    HANDLE = 'handle'
+    CALLBACK = 'callback'
+
+
+class CircuitState(Enum):
+    CLOSED = ...
+    OPEN = ...
+    HALF_OPEN = ...
@@ -0,0 +1,441 @@
+from asyncio import sleep as async_sleep
+from collections import deque
+from html import escape
+from itertools import count
+from random import Random
+from threading import Lock
+from time import sleep
+from typing import Callable, Iterable, Optional, Sequence, Union
+from urllib.parse import parse_qsl
+
+from httpx import AsyncBaseTransport, BaseTransport, ConnectError, Request, Response
+
+from .enums import InfoType, Network, PacketType, ReplyTag
+
+# Networks offered by the network select of account.html, in page order
+_ACCOUNT_NETWORKS = (Network.NONE, Network.CAFSIM, Network.CFR, Network.FSAD, Network.IVAO, Network.PDAsim,
+                     Network.XKFX, Network.SXC, Network.VATSIM)
+_ACCOUNT_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Hoppie's ACARS &mdash; Account</title></head>
+<body>
+  <h2>Your account</h2>
+{body}
+</body>
+</html>
+"""
+
+
+class FakeAtcStation:
+    """
+    Scripted ground station of a FakeHoppieServer
+
+    It answers REQUEST LOGON with LOGON ACCEPTED and CURRENT ATC UNIT followed by the welcome uplinks,
+    or with UNABLE when logons are refused, and records every downlink it receives
+
+    Attributes:
+        callsign (str): station callsign
+        name (str): ATC callsign sent in CURRENT ATC UNIT, a single word
+        accept_logon (bool): whether logon requests are accepted
+        welcome (Sequence[tuple[str, ReplyTag]]): uplinks sent after a logon was accepted
+        connected (set[str]): aircraft logged on
+        downlinks (list[tuple[str, str]]): (aircraft, cpdlc packet) received, oldest first
+        _message_ids (itertools.count): message id allocator of the station
+    """
+
+    def __init__(self, callsign: str, name: Optional[str] = None, accept_logon: bool = True,
+                 welcome: Sequence[tuple[str, ReplyTag]] = ()):
+        """
+        Constructor for FakeAtcStation class
+        Args:
+            callsign (str): station callsign
+            name (Optional[str]): ATC callsign sent in CURRENT ATC UNIT, callsign when None
+            accept_logon (bool): whether logon requests are accepted
+            welcome (Sequence[tuple[str, ReplyTag]]): (text, reply tag) uplinks sent after a logon was accepted
+        """
+        self.callsign = callsign.upper()
+        self.name = name or self.callsign
+        self.accept_logon = accept_logon
+        self.welcome = welcome
+        self.connected: set[str] = set()
+        self.downlinks: list[tuple[str, str]] = []
+        self._message_ids = count(1)
+
+    def next_message_id(self) -> int:
+        return next(self._message_ids)
+
+    def uplink(self, text: str, reply_tag: ReplyTag = ReplyTag.NOT_REQUIRED, reply_id: Optional[int] = None) -> str:
+        """
+        Build a cpdlc packet sent by this station
+        Args:
+            text (str): message text
+            reply_tag (ReplyTag): response the aircraft must send
+            reply_id (Optional[int]): id of the message answered
+        Returns:
+            cpdlc packet
+        """
+        return f"/data2/{self.next_message_id()}/{'' if reply_id is None else reply_id}/{reply_tag.value}/{text}"
+
+    def handle(self, aircraft: str, packet: str) -> list[str]:
+        """
+        React to a cpdlc packet of aircraft
+        Args:
+            aircraft (str): sending aircraft
+            packet (str): cpdlc packet
+        Returns:
+            cpdlc packets to send back, in order
+        """
+        self.downlinks.append((aircraft, packet))
+        fields = packet.split("/", 5)
+        if len(fields) < 6:
+            return []
+        message_id, text = fields[2], fields[5]
+        reply_id = int(message_id) if message_id.isdigit() else None
+        if text == "REQUEST LOGON":
+            if not self.accept_logon:
+                return [self.uplink("UNABLE", reply_id=reply_id)]
+            self.connected.add(aircraft)
+            return [self.uplink("LOGON ACCEPTED", reply_id=reply_id),
+                    self.uplink(f"CURRENT ATC UNIT@_@{self.callsign}@_@{self.name}"),
+                    *(self.uplink(welcome, reply_tag) for welcome, reply_tag in self.welcome)]
+        if text == "LOGOFF":
+            self.connected.discard(aircraft)
+        return []
+
+
+class FakeHoppieServer(BaseTransport, AsyncBaseTransport):
+    """
+    In-process stand-in for the Hoppie ACARS server, for offline tests and load tests
+
+    Implements connect.html (ping, poll, peek, telex, cpdlc, inforeq and any other packet type, which is delivered
+    like a telex) and account.html. It is an httpx transport for both httpx.Client and httpx.AsyncClient,
+    and an ASGI application, so it can also be served by any ASGI server.
+
+    Latency is added to every request, a share of requests can fail with httpx.ConnectError,
+    or with an empty 503 response when served over ASGI. Failures happen before the request reaches
+    the server state, like a dropped connection
+
+    Attributes:
+        _logon_codes (Optional[set[str]]): accepted logon codes, any when None
+        _accounts (dict[str, tuple[str, Network]]): email and network of account.html logins by logon code
+        _stations (dict[str, FakeAtcStation]): scripted stations by callsign
+        _mailboxes (dict[str, deque[tuple[str, str, str]]]): (from, type, packet) waiting per callsign
+        _info (dict[tuple[InfoType, str], str]): inforeq answers by (info type, ICAO)
+        _latency (Union[float, Callable[[], float]]): seconds added to every request
+        _error_rate (float): share of requests failing with httpx.ConnectError
+        _fail_next (int): number of next requests failing with httpx.ConnectError
+        _random (random.Random): source of error injection
+        _lock (threading.Lock): guards the server state
+        _requests (int): requests handled, failed ones included
+
+    Examples:
+        server = FakeHoppieServer()\n
+        server.add_station(FakeAtcStation("ZSHA", welcome=[("CLIMB TO @FL350@", ReplyTag.WILCO_UNABLE)]))\n
+        cpdlc = CPDLC(transport=server)\n
+        cpdlc.set_acars_url("http://hoppie.test/acars/system")\n
+    """
+
+    def __init__(self, logon_codes: Optional[Iterable[str]] = None, latency: Union[float, Callable[[], float]] = 0,
+                 error_rate: float = 0, seed: Optional[int] = None):
+        """
+        Constructor for FakeHoppieServer class
+        Args:
+            logon_codes (Optional[Iterable[str]]): accepted logon codes, any when None
+            latency (Union[float, Callable[[], float]]): seconds added to every request, or a function returning them
+            error_rate (float): share of requests failing with httpx.ConnectError, between 0 and 1
+            seed (Optional[int]): seed of error injection
+        """
+        self._logon_codes = None if logon_codes is None else set(logon_codes)
+        self._accounts: dict[str, tuple[str, Network]] = {}
+        self._stations: dict[str, FakeAtcStation] = {}
+        self._mailboxes: dict[str, deque[tuple[str, str, str]]] = {}
+        self._info: dict[tuple[InfoType, str], str] = {}
+        self._latency = latency
+        self._error_rate = error_rate
+        self._fail_next = 0
+        self._random = Random(seed)
+        self._lock = Lock()
+        self._requests = 0
+
+    @property
+    def requests(self) -> int:
+        return self._requests
+
+    @property
+    def stations(self) -> dict[str, FakeAtcStation]:
+        return self._stations
+
+    # Scripting
+
+    def add_account(self, logon_code: str, email: str, network: Network = Network.VATSIM) -> None:
+        """
+        Register an account.html login, its logon code is accepted by connect.html as well
+        """
+        with self._lock:
+            self._accounts[logon_code] = (email, network)
+            if self._logon_codes is not None:
+                self._logon_codes.add(logon_code)
+
+    def add_station(self, station: FakeAtcStation) -> FakeAtcStation:
+        """
+        Add a scripted station, cpdlc packets sent to its callsign are answered by it
+        """
+        with self._lock:
+            self._stations[station.callsign] = station
+        return station
+
+    def set_info(self, info_type: InfoType, icao: str, text: str) -> None:
+        """
+        Set the inforeq answer of (info_type, icao), others get a generated answer
+        """
+        with self._lock:
+            self._info[(info_type, icao.upper())] = text
+
+    def set_latency(self, latency: Union[float, Callable[[], float]]) -> None:
+        """
+        Set seconds added to every request, or a function returning them
+        """
+        self._latency = latency
+
+    def set_error_rate(self, error_rate: float) -> None:
+        """
+        Set share of requests failing with httpx.ConnectError, between 0 and 1
+        """
+        self._error_rate = error_rate
+
+    def fail_next(self, requests: int = 1) -> None:
+        """
+        Fail the next requests with httpx.ConnectError
+        """
+        with self._lock:
+            self._fail_next += requests
+
+    def deliver(self, to: str, sender: str, packet_type: PacketType, packet: str) -> None:
+        """
+        Queue a packet for the next poll of to
+        """
+        with self._lock:
+            self._deliver(to.upper(), sender.upper(), packet_type.value, packet)
+
+    def uplink(self, station: str, aircraft: str, text: str,
+               reply_tag: ReplyTag = ReplyTag.WILCO_UNABLE) -> int:
+        """
+        Send a cpdlc uplink from a scripted station
+        Args:
+            station (str): station callsign
+            aircraft (str): aircraft callsign
+            text (str): message text
+            reply_tag (ReplyTag): response the aircraft must send
+        Returns:
+            message id of the uplink
+        Raises:
+            KeyError: station not added
+        """
+        with self._lock:
+            station = self._stations[station.upper()]
+            packet = station.uplink(text, reply_tag)
+            self._deliver(aircraft.upper(), station.callsign, PacketType.CPDLC.value, packet)
+        return int(packet.split("/", 3)[2])
+
+    def pending(self, callsign: str) -> int:
+        """
+        Number of packets waiting for the next poll of callsign
+        """
+        with self._lock:
+            return len(self._mailboxes.get(callsign.upper(), ()))
+
+    # Request handling
+
+    def _deliver(self, to: str, sender: str, packet_type: str, packet: str) -> None:
+        """
+        Queue a packet, must hold lock, for internal use only
+        """
+        mailbox = self._mailboxes.get(to)
+        if mailbox is None:
+            mailbox = self._mailboxes[to] = deque()
+        mailbox.append((sender, packet_type, packet))
+
+    def _should_fail(self) -> bool:
+        """
+        Decide whether a request fails before reaching the server, for internal use only
+        """
+        with self._lock:
+            self._requests += 1
+            if self._fail_next > 0:
+                self._fail_next -= 1
+                return True
+        return self._error_rate > 0 and self._random.random() < self._error_rate
+
+    def _delay(self) -> float:
+        """
+        Seconds added to a request, for internal use only
+        """
+        latency = self._latency
+        return latency() if callable(latency) else latency
+
+    def handle(self, path: str, form: dict[str, str]) -> tuple[int, str, str]:
+        """
+        Answer a request without latency or error injection
+        Args:
+            path (str): request path, only its last segment is used
+            form (dict[str, str]): query and form fields
+        Returns:
+            status code, content type and body
+        """
+        page = path.rstrip("/").rsplit("/", 1)[-1]
+        if page == "connect.html":
+            return 200, "text/plain", self._connect(form)
+        if page == "account.html":
+            return 200, "text/html", self._account(form)
+        return 404, "text/plain", "not found"
+
+    def _connect(self, form: dict[str, str]) -> str:
+        """
+        Answer connect.html, for internal use only
+        """
+        logon = form.get("logon", "")
+        sender = form.get("from", "").upper()
+        to = form.get("to", "").upper()
+        packet_type = form.get("type", "")
+        packet = form.get("packet", "")
+        with self._lock:
+            if self._logon_codes is not None and logon not in self._logon_codes:
+                return "error {invalid logon code}"
+            if not sender:
+                return "error {illegal callsign}"
+            if packet_type == PacketType.PING.value:
+                return "ok"
+            if packet_type in (PacketType.POLL.value, PacketType.PEEK.value):
+                mailbox = self._mailboxes.get(sender)
+                if not mailbox:
+                    return "ok"
+                body = " ".join(f"{{{source} {kind} {{{text}}}}}" for source, kind, text in mailbox)
+                if packet_type == PacketType.POLL.value:
+                    mailbox.clear()
+                return f"ok {body}"
+            if packet_type == PacketType.INFO_REQ.value:
+                return f"ok {{server info {{{self._info_text(packet)}}}}}"
+            if not to:
+                return "error {illegal callsign}"
+            station = self._stations.get(to)
+            if packet_type == PacketType.CPDLC.value and station is not None:
+                for answer in station.handle(sender, packet):
+                    self._deliver(sender, station.callsign, PacketType.CPDLC.value, answer)
+                return "ok"
+            self._deliver(to, sender, packet_type, packet)
+            return "ok"
+
+    def _info_text(self, packet: str) -> str:
+        """
+        Answer of an inforeq packet, must hold lock, for internal use only
+        """
+        kind, _, icao = packet.partition(" ")
+        icao = icao.strip().upper()
+        try:
+            info_type = InfoType(kind.lower())
+        except ValueError:
+            return f"{packet.upper()} NOT AVAILABLE"
+        text = self._info.get((info_type, icao))
+        if text is not None:
+            return text
+        if info_type in (InfoType.METAR, InfoType.TAF, InfoType.SHORT_TAF):
+            return f"{icao} 161200Z 24008KT 9999 FEW030 18/12 Q1013"
+        return f"{icao} ATIS INFORMATION A 1200Z RWY 24 IN USE"
+
+    def _account(self, form: dict[str, str]) -> str:
+        """
+        Answer account.html, for internal use only
+        """
+        logon = form.get("logon", "")
+        email = form.get("email", "")
+        with self._lock:
+            account = self._accounts.get(logon)
+            if account is None or account[0] != email:
+                return _ACCOUNT_PAGE.format(body="""  <p class="error">Unknown logon code or e-mail address.</p>""")
+            notice = ""
+            requested = form.get("network")
+            if requested is not None:
+                try:
+                    network = Network(requested)
+                except ValueError:
+                    network = account[1]
+                self._accounts[logon] = (email, network)
+                notice = f"""  <p class="notice">Network changed to {escape(network.value)}.</p>\n"""
+            network = self._accounts[logon][1]
+        options = "\n".join(f"      <option{' selected' if option is network else ''}>{escape(option.value)}</option>"
+                            for option in _ACCOUNT_NETWORKS)
+        return _ACCOUNT_PAGE.format(body=f"""{notice}  <form method="post" action="account.html">
+    <select name="network">
+{options}
+    </select>
+  </form>""")
+
+    # httpx transport
+
+    @staticmethod
+    def _form(request: Request) -> dict[str, str]:
+        """
+        Query and form fields of a read request, for internal use only
+        """
+        form = dict(request.url.params)
+        if request.content:
+            form.update(parse_qsl(request.content.decode(), keep_blank_values=True))
+        return form
+
+    def _response(self, request: Request) -> Response:
+        """
+        Answer a read request, for internal use only
+        """
+        status, content_type, body = self.handle(request.url.path, self._form(request))
+        return Response(status, headers={"content-type": f"{content_type}; charset=utf-8"}, text=body)
+
+    def handle_request(self, request: Request) -> Response:
+        request.read()
+        delay = self._delay()
+        if delay > 0:
+            sleep(delay)
+        if self._should_fail():
+            raise ConnectError("Injected connection failure", request=request)
+        return self._response(request)
+
+    async def handle_async_request(self, request: Request) -> Response:
+        await request.aread()
+        delay = self._delay()
+        if delay > 0:
+            await async_sleep(delay)
+        if self._should_fail():
+            raise ConnectError("Injected connection failure", request=request)
+        return self._response(request)
+
+    # ASGI application
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            while (await receive())["type"] != "lifespan.shutdown":
+                await send({"type": "lifespan.startup.complete"})
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            event = await receive()
+            body += event.get("body", b"")
+            if not event.get("more_body", False):
+                break
+        delay = self._delay()
+        if delay > 0:
+            await async_sleep(delay)
+        if self._should_fail():
+            # a dropped connection, the server answers nothing useful
+            await send({"type": "http.response.start", "status": 503, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        form = dict(parse_qsl(scope.get("query_string", b"").decode(), keep_blank_values=True))
+        form.update(parse_qsl(body.decode(), keep_blank_values=True))
+        status, content_type, text = self.handle(scope["path"], form)
+        content = text.encode()
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", f"{content_type}; charset=utf-8".encode()),
+                                (b"content-length", str(len(content)).encode())]})
+        await send({"type": "http.response.body", "body": content})
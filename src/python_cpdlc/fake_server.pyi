@@ -0,0 +1,266 @@
+from collections import deque
+from itertools import count
+from random import Random
+from threading import Lock
+from typing import Callable, Iterable, Optional, Sequence, Union
+
+from httpx import AsyncBaseTransport, BaseTransport, Request, Response
+
+from .enums import InfoType as InfoType, Network as Network, PacketType as PacketType, ReplyTag as ReplyTag
+
+_ACCOUNT_NETWORKS: tuple[Network, ...]
+_ACCOUNT_PAGE: str
+
+
+class FakeAtcStation:
+    """
+    Scripted ground station of a FakeHoppieServer
+
+    It answers REQUEST LOGON with LOGON ACCEPTED and CURRENT ATC UNIT followed by the welcome uplinks,
+    or with UNABLE when logons are refused, and records every downlink it receives
+
+    Attributes:
+        callsign (str): station callsign
+        name (str): ATC callsign sent in CURRENT ATC UNIT, a single word
+        accept_logon (bool): whether logon requests are accepted
+        welcome (Sequence[tuple[str, ReplyTag]]): uplinks sent after a logon was accepted
+        connected (set[str]): aircraft logged on
+        downlinks (list[tuple[str, str]]): (aircraft, cpdlc packet) received, oldest first
+        _message_ids (itertools.count): message id allocator of the station
+    """
+    callsign: str
+    name: str
+    accept_logon: bool
+    welcome: Sequence[tuple[str, ReplyTag]]
+    connected: set[str]
+    downlinks: list[tuple[str, str]]
+    _message_ids: count
+
+    def __init__(self, callsign: str, name: Optional[str] = None, accept_logon: bool = True,
+                 welcome: Sequence[tuple[str, ReplyTag]] = ()):
+        """
+        Constructor for FakeAtcStation class
+        Args:
+            callsign (str): station callsign
+            name (Optional[str]): ATC callsign sent in CURRENT ATC UNIT, callsign when None
+            accept_logon (bool): whether logon requests are accepted
+            welcome (Sequence[tuple[str, ReplyTag]]): (text, reply tag) uplinks sent after a logon was accepted
+        """
+        ...
+
+    def next_message_id(self) -> int: ...
+
+    def uplink(self, text: str, reply_tag: ReplyTag = ReplyTag.NOT_REQUIRED, reply_id: Optional[int] = None) -> str:
+        """
+        Build a cpdlc packet sent by this station
+        Args:
+            text (str): message text
+            reply_tag (ReplyTag): response the aircraft must send
+            reply_id (Optional[int]): id of the message answered
+        Returns:
+            cpdlc packet
+        """
+        ...
+
+    def handle(self, aircraft: str, packet: str) -> list[str]:
+        """
+        React to a cpdlc packet of aircraft
+        Args:
+            aircraft (str): sending aircraft
+            packet (str): cpdlc packet
+        Returns:
+            cpdlc packets to send back, in order
+        """
+        ...
+
+
+class FakeHoppieServer(BaseTransport, AsyncBaseTransport):
+    """
+    In-process stand-in for the Hoppie ACARS server, for offline tests and load tests
+
+    Implements connect.html (ping, poll, peek, telex, cpdlc, inforeq and any other packet type, which is delivered
+    like a telex) and account.html. It is an httpx transport for both httpx.Client and httpx.AsyncClient,
+    and an ASGI application, so it can also be served by any ASGI server.
+
+    Latency is added to every request, a share of requests can fail with httpx.ConnectError,
+    or with an empty 503 response when served over ASGI. Failures happen before the request reaches
+    the server state, like a dropped connection
+
+    Attributes:
+        _logon_codes (Optional[set[str]]): accepted logon codes, any when None
+        _accounts (dict[str, tuple[str, Network]]): email and network of account.html logins by logon code
+        _stations (dict[str, FakeAtcStation]): scripted stations by callsign
+        _mailboxes (dict[str, deque[tuple[str, str, str]]]): (from, type, packet) waiting per callsign
+        _info (dict[tuple[InfoType, str], str]): inforeq answers by (info type, ICAO)
+        _latency (Union[float, Callable[[], float]]): seconds added to every request
+        _error_rate (float): share of requests failing with httpx.ConnectError
+        _fail_next (int): number of next requests failing with httpx.ConnectError
+        _random (random.Random): source of error injection
+        _lock (threading.Lock): guards the server state
+        _requests (int): requests handled, failed ones included
+
+    Examples:
+        server = FakeHoppieServer()\n
+        server.add_station(FakeAtcStation("ZSHA", welcome=[("CLIMB TO @FL350@", ReplyTag.WILCO_UNABLE)]))\n
+        cpdlc = CPDLC(transport=server)\n
+        cpdlc.set_acars_url("http://hoppie.test/acars/system")\n
+    """
+    _logon_codes: Optional[set[str]]
+    _accounts: dict[str, tuple[str, Network]]
+    _stations: dict[str, FakeAtcStation]
+    _mailboxes: dict[str, deque[tuple[str, str, str]]]
+    _info: dict[tuple[InfoType, str], str]
+    _latency: Union[float, Callable[[], float]]
+    _error_rate: float
+    _fail_next: int
+    _random: Random
+    _lock: Lock
+    _requests: int
+
+    def __init__(self, logon_codes: Optional[Iterable[str]] = None, latency: Union[float, Callable[[], float]] = 0,
+                 error_rate: float = 0, seed: Optional[int] = None) -> None:
+        """
+        Constructor for FakeHoppieServer class
+        Args:
+            logon_codes (Optional[Iterable[str]]): accepted logon codes, any when None
+            latency (Union[float, Callable[[], float]]): seconds added to every request, or a function returning them
+            error_rate (float): share of requests failing with httpx.ConnectError, between 0 and 1
+            seed (Optional[int]): seed of error injection
+        """
+        ...
+
+    @property
+    def requests(self) -> int: ...
+
+    @property
+    def stations(self) -> dict[str, FakeAtcStation]: ...
+
+    def add_account(self, logon_code: str, email: str, network: Network = Network.VATSIM) -> None:
+        """
+        Register an account.html login, its logon code is accepted by connect.html as well
+        """
+        ...
+
+    def add_station(self, station: FakeAtcStation) -> FakeAtcStation:
+        """
+        Add a scripted station, cpdlc packets sent to its callsign are answered by it
+        """
+        ...
+
+    def set_info(self, info_type: InfoType, icao: str, text: str) -> None:
+        """
+        Set the inforeq answer of (info_type, icao), others get a generated answer
+        """
+        ...
+
+    def set_latency(self, latency: Union[float, Callable[[], float]]) -> None:
+        """
+        Set seconds added to every request, or a function returning them
+        """
+        ...
+
+    def set_error_rate(self, error_rate: float) -> None:
+        """
+        Set share of requests failing with httpx.ConnectError, between 0 and 1
+        """
+        ...
+
+    def fail_next(self, requests: int = 1) -> None:
+        """
+        Fail the next requests with httpx.ConnectError
+        """
+        ...
+
+    def deliver(self, to: str, sender: str, packet_type: PacketType, packet: str) -> None:
+        """
+        Queue a packet for the next poll of to
+        """
+        ...
+
+    def uplink(self, station: str, aircraft: str, text: str,
+               reply_tag: ReplyTag = ReplyTag.WILCO_UNABLE) -> int:
+        """
+        Send a cpdlc uplink from a scripted station
+        Args:
+            station (str): station callsign
+            aircraft (str): aircraft callsign
+            text (str): message text
+            reply_tag (ReplyTag): response the aircraft must send
+        Returns:
+            message id of the uplink
+        Raises:
+            KeyError: station not added
+        """
+        ...
+
+    def pending(self, callsign: str) -> int:
+        """
+        Number of packets waiting for the next poll of callsign
+        """
+        ...
+
+    def _deliver(self, to: str, sender: str, packet_type: str, packet: str) -> None:
+        """
+        Queue a packet, must hold lock, for internal use only
+        """
+        ...
+
+    def _should_fail(self) -> bool:
+        """
+        Decide whether a request fails before reaching the server, for internal use only
+        """
+        ...
+
+    def _delay(self) -> float:
+        """
+        Seconds added to a request, for internal use only
+        """
+        ...
+
+    def handle(self, path: str, form: dict[str, str]) -> tuple[int, str, str]:
+        """
+        Answer a request without latency or error injection
+        Args:
+            path (str): request path, only its last segment is used
+            form (dict[str, str]): query and form fields
+        Returns:
+            status code, content type and body
+        """
+        ...
+
+    def _connect(self, form: dict[str, str]) -> str:
+        """
+        Answer connect.html, for internal use only
+        """
+        ...
+
+    def _info_text(self, packet: str) -> str:
+        """
+        Answer of an inforeq packet, must hold lock, for internal use only
+        """
+        ...
+
+    def _account(self, form: dict[str, str]) -> str:
+        """
+        Answer account.html, for internal use only
+        """
+        ...
+
+    @staticmethod
+    def _form(request: Request) -> dict[str, str]:
+        """
+        Query and form fields of a read request, for internal use only
+        """
+        ...
+
+    def _response(self, request: Request) -> Response:
+        """
+        Answer a read request, for internal use only
+        """
+        ...
+
+    def handle_request(self, request: Request) -> Response: ...
+
+    async def handle_async_request(self, request: Request) -> Response: ...
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None: ...
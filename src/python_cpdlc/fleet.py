@@ -0,0 +1,491 @@
+from asyncio import CancelledError, Event as AsyncEvent, Semaphore, Task, TimeoutError as AsyncTimeoutError, \
+    get_running_loop, wait_for
+from heapq import heappop, heappush
+from itertools import count
+from time import monotonic
+from typing import Callable, Iterator, Optional, Union
+
+from httpx import AsyncBaseTransport, AsyncClient, Limits, Timeout
+from loguru import logger
+
+from .acars_message import AcarsMessage
+from .async_cpdlc import AsyncCPDLC, _schedule_callback, _wait_callbacks
+from .circuit_breaker import CircuitBreaker
+from .dispatcher import CallbackDispatcher
+from .exception import ParameterError
+from .info_cache import InfoCache
+from .metrics import MetricsRegistry
+from .poll_policy import PollPolicy, PollState
+from .poller import PollerBase
+from .send_queue import AsyncioSendQueue
+from .tracing import Tracer
+from .transport import DEFAULT_LIMITS, create_async_client
+
+
+class FleetPollHandle(PollerBase):
+    """
+    Stand-in for AsyncPoller used by fleet sessions, it only records the session in the fleet scheduler
+    so no task or thread is created per session
+
+    Attributes:
+        _scheduler (FleetScheduler): owning scheduler
+        _session (FleetSession): session to poll
+        _active (bool): whether the session is registered in the scheduler
+        _generation (int): incremented by every start, heap entries of earlier starts are stale
+    """
+
+    def __init__(self, scheduler: "FleetScheduler", session: "FleetSession", min_interval: int = 15,
+                 max_interval: int = 30, policy: Optional[PollPolicy] = None):
+        """
+        Constructor for FleetPollHandle class
+        Args:
+            scheduler (FleetScheduler): owning scheduler
+            session (FleetSession): session to poll
+            min_interval (int): Minimum interval to poll
+            max_interval (int): Maximum interval to poll
+            policy (Optional[PollPolicy]): poll scheduling policy, AdaptivePollPolicy when None
+        """
+        super().__init__(min_interval, max_interval, policy)
+        self._scheduler = scheduler
+        self._session = session
+        self._active = False
+        self._generation = 0
+
+    @property
+    def running(self) -> bool:
+        return self._active
+
+    def start(self):
+        """
+        Register session in the fleet scheduler, first poll happens immediately
+        """
+        if not self._active:
+            self._active = True
+            self._generation += 1
+            self._scheduler.schedule(self, 0)
+
+    async def stop(self):
+        """
+        Unregister session from the fleet scheduler
+        """
+        self._active = False
+
+
+class FleetScheduler:
+    """
+    Single asyncio task polling every registered fleet session when it becomes due
+
+    Sessions are kept in a heap ordered by due time, removed sessions and entries left by an earlier start are
+    dropped lazily when popped
+
+    Attributes:
+        _heap (list[tuple[float, int, int, FleetPollHandle]]): due time heap
+        _sequence (itertools.count): tie breaker for equal due times
+        _semaphore (Optional[asyncio.Semaphore]): limits concurrent polls
+        _max_concurrent_polls (int): maximum number of polls in flight
+        _wakeup (Optional[asyncio.Event]): set when a session is scheduled earlier than the current sleep
+        _task (Optional[asyncio.Task]): scheduler task
+        _in_flight (set[asyncio.Task]): running poll tasks
+        _polls (int): number of polls executed
+    """
+
+    def __init__(self, max_concurrent_polls: int = 64):
+        """
+        Constructor for FleetScheduler class
+        Args:
+            max_concurrent_polls (int): maximum number of polls in flight
+        """
+        self._heap: list[tuple[float, int, int, FleetPollHandle]] = []
+        self._sequence = count()
+        self._max_concurrent_polls = max_concurrent_polls
+        self._semaphore: Optional[Semaphore] = None
+        self._wakeup: Optional[AsyncEvent] = None
+        self._task: Optional[Task] = None
+        self._in_flight: set[Task] = set()
+        self._polls = 0
+
+    @property
+    def polls(self) -> int:
+        return self._polls
+
+    @property
+    def pending(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, handle: FleetPollHandle, delay: float) -> None:
+        """
+        Schedule a poll of handle after delay seconds
+        """
+        due = monotonic() + delay
+        if not self._heap or due < self._heap[0][0]:
+            if self._wakeup is not None:
+                self._wakeup.set()
+        heappush(self._heap, (due, next(self._sequence), handle._generation, handle))
+
+    async def _poll(self, handle: FleetPollHandle, generation: int) -> None:
+        decision = handle._hold()
+        if decision is None:
+            error = None
+            async with self._semaphore:
+                try:
+                    state = await handle._session._poll_message()
+                except CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error("Exception occurred while polling {}: {}", handle._session.callsign, e)
+                    state = PollState(failed=True)
+                    error = e
+            self._polls += 1
+            decision = handle._decide(state, error)
+        if handle._active and handle._generation == generation:
+            self.schedule(handle, decision.interval)
+
+    async def _run(self) -> None:
+        logger.trace("Fleet scheduler started")
+        while True:
+            now = monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, generation, handle = heappop(self._heap)
+                if not handle._active or handle._generation != generation:
+                    continue
+                task = get_running_loop().create_task(self._poll(handle, generation))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+            timeout = self._heap[0][0] - now if self._heap else None
+            self._wakeup.clear()
+            try:
+                await wait_for(self._wakeup.wait(), timeout=timeout)
+            except AsyncTimeoutError:
+                pass
+
+    def start(self) -> None:
+        """
+        Start scheduler task, must be called from a running event loop
+        """
+        if self._task is None or self._task.done():
+            self._semaphore = Semaphore(self._max_concurrent_polls)
+            self._wakeup = AsyncEvent()
+            self._task = get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop scheduler task and cancel in flight polls
+        """
+        tasks = list(self._in_flight)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except CancelledError:
+                pass
+        self._task = None
+        logger.trace("Fleet scheduler stopped")
+
+
+class FleetSession(AsyncCPDLC):
+    """
+    AsyncCPDLC session owned by a CPDLCFleet, it shares the fleet client, info cache and send queue
+    and is polled by the fleet scheduler
+
+    Attributes:
+        _fleet (CPDLCFleet): owning fleet
+    """
+
+    def __init__(self, fleet: "CPDLCFleet"):
+        """
+        Constructor for FleetSession class
+        Args:
+            fleet (CPDLCFleet): owning fleet
+        """
+        self._fleet = fleet
+        super().__init__(fleet.client)
+        self._info_cache = fleet.info_cache
+        self._send_queue = fleet.send_queue
+        self._metrics = fleet.metrics
+        self._tracer = fleet.tracer
+        self._poller.set_circuit_breaker(fleet.circuit_breaker)
+
+    def _create_poller(self) -> FleetPollHandle:
+        return FleetPollHandle(self._fleet._scheduler, self, self._fleet._min_interval, self._fleet._max_interval)
+
+    def _message_receiver_callback(self, message: AcarsMessage) -> None:
+        super()._message_receiver_callback(message)
+        self._fleet._message_receiver_callback(self._callsign, message)
+
+    def _message_sender_callback(self, to: str, message: str) -> None:
+        super()._message_sender_callback(to, message)
+        self._fleet._message_sender_callback(self._callsign, to, message)
+
+
+class CPDLCFleet:
+    """
+    Serve many callsigns from one process
+
+    All sessions share one pooled httpx.AsyncClient, one scheduler task and one info cache,
+    so adding a callsign only costs its session state
+
+    Attributes:
+        _logon_code (str): Hoppie ACARS network login code shared by all sessions
+        _email (Optional[str]): Hoppie ACARS network login email
+        _acars_url (Optional[str]): Hoppie ACARS network url, official server when None
+        _min_interval (int): Minimum interval to poll
+        _max_interval (int): Maximum interval to poll
+        _client (httpx.AsyncClient): shared httpx async client
+        _own_client (bool): whether the client was created by this fleet and should be closed by it
+        _scheduler (FleetScheduler): shared scheduler
+        _info_cache (InfoCache): shared cache of query_info answers
+        _send_queue (Optional[AsyncioSendQueue]): shared queue of outbound requests, None sends them inline
+        _metrics (Optional[MetricsRegistry]): shared registry of request, poll and callback metrics,
+            None records nothing
+        _tracer (Optional[Tracer]): shared tracer of session spans, None traces nothing
+        _circuit_breaker (Optional[CircuitBreaker]): circuit of the server shared by all sessions,
+            None polls regardless
+        _sessions (dict[str, FleetSession]): sessions by callsign
+        _message_receiver_callbacks (list[Callable[[str, AcarsMessage], None]]): fleet wide receiver callbacks
+        _message_sender_callbacks (list[Callable[[str, str, str], None]]): fleet wide sender callbacks
+        _callback_dispatcher (Optional[CallbackDispatcher]): dispatcher of fleet wide callbacks, None runs them inline
+        _callback_tasks (set[asyncio.Task]): tasks of fleet wide coroutine callbacks run inline
+
+    Examples:
+        async with CPDLCFleet("11111111111") as fleet:\n
+            fleet.add_message_receiver_callback(lambda callsign, msg: print(callsign, msg))\n
+            session = await fleet.add_callsign("CES2352")\n
+            await session.cpdlc_login("ZSHA")\n
+    """
+
+    def __init__(self, logon_code: str, email: Optional[str] = None, acars_url: Optional[str] = None,
+                 limits: Optional[Limits] = None, timeout: Union[float, Timeout, None] = None,
+                 max_concurrent_polls: int = 64,
+                 min_interval: int = 15, max_interval: int = 30, transport: Optional[AsyncBaseTransport] = None,
+                 info_cache: Optional[InfoCache] = None, send_queue: Optional[AsyncioSendQueue] = None,
+                 client: Optional[AsyncClient] = None, metrics: Optional[MetricsRegistry] = None,
+                 tracer: Optional[Tracer] = None, circuit_breaker: Optional[CircuitBreaker] = None):
+        """
+        Constructor for CPDLCFleet class
+        Args:
+            logon_code (str): Hoppie ACARS network login code
+            email (Optional[str]): Hoppie ACARS network login email
+            acars_url (Optional[str]): Hoppie ACARS network url, official server when None
+            limits (Optional[httpx.Limits]): connection pool limits of the shared client,
+                max_concurrent_polls connections kept alive for DEFAULT_LIMITS.keepalive_expiry when None
+            timeout (Union[float, httpx.Timeout, None]): request timeout, DEFAULT_TIMEOUT when None
+            max_concurrent_polls (int): maximum number of polls in flight
+            min_interval (int): Minimum interval to poll
+            max_interval (int): Maximum interval to poll
+            transport (Optional[httpx.AsyncBaseTransport]): transport of the shared client, default network transport
+            info_cache (Optional[InfoCache]): cache of query_info answers shared by all sessions, default InfoCache()
+            send_queue (Optional[AsyncioSendQueue]): queue of outbound requests shared by all sessions,
+                started with the fleet, None sends them inline
+            client (Optional[httpx.AsyncClient]): client shared with other fleets or clients, it is not closed
+                by the fleet and transport, limits and timeout are ignored, a private one is created when None
+            metrics (Optional[MetricsRegistry]): registry shared by all sessions and fleet wide callbacks,
+                None records nothing
+            tracer (Optional[Tracer]): tracer shared by all sessions, None traces nothing
+            circuit_breaker (Optional[CircuitBreaker]): circuit shared by all sessions, e.g.
+                shared_circuit_breaker(acars_url), None polls regardless
+        """
+        if min_interval > max_interval:
+            raise ValueError(f"min_interval={min_interval} > max_interval={max_interval}")
+        self._logon_code = logon_code
+        self._email = email
+        self._acars_url = acars_url
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._own_client = client is None
+        if client is None:
+            client = create_async_client(transport, limits or Limits(
+                max_connections=max_concurrent_polls, max_keepalive_connections=max_concurrent_polls,
+                keepalive_expiry=DEFAULT_LIMITS.keepalive_expiry
+            ), timeout)
+        self._client = client
+        self._scheduler = FleetScheduler(max_concurrent_polls)
+        self._info_cache = info_cache if info_cache is not None else InfoCache()
+        self._send_queue = send_queue
+        self._metrics = metrics
+        self._tracer = tracer
+        self._circuit_breaker = circuit_breaker
+        self._sessions: dict[str, FleetSession] = {}
+        self._message_receiver_callbacks: list[Callable[[str, AcarsMessage], None]] = []
+        self._message_sender_callbacks: list[Callable[[str, str, str], None]] = []
+        self._callback_dispatcher: Optional[CallbackDispatcher] = None
+        self._callback_tasks: set[Task] = set()
+
+    async def __aenter__(self) -> "CPDLCFleet":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    @property
+    def client(self) -> AsyncClient:
+        return self._client
+
+    @property
+    def scheduler(self) -> FleetScheduler:
+        return self._scheduler
+
+    @property
+    def info_cache(self) -> InfoCache:
+        return self._info_cache
+
+    @property
+    def send_queue(self) -> Optional[AsyncioSendQueue]:
+        return self._send_queue
+
+    @property
+    def metrics(self) -> Optional[MetricsRegistry]:
+        return self._metrics
+
+    @property
+    def tracer(self) -> Optional[Tracer]:
+        return self._tracer
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        return self._circuit_breaker
+
+    @property
+    def callsigns(self) -> list[str]:
+        return list(self._sessions)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, callsign: str) -> bool:
+        return callsign in self._sessions
+
+    def __iter__(self) -> Iterator[FleetSession]:
+        return iter(list(self._sessions.values()))
+
+    def session(self, callsign: str) -> FleetSession:
+        """
+        Get session of callsign
+        Raises:
+            KeyError: callsign not in fleet
+        """
+        return self._sessions[callsign]
+
+    def start(self) -> None:
+        """
+        Start the fleet scheduler and send queue, must be called from a running event loop
+        """
+        self._scheduler.start()
+        if self._send_queue is not None:
+            self._send_queue.start()
+
+    async def aclose(self) -> None:
+        """
+        Stop every session and the scheduler, send the queued requests, wait for running coroutine callbacks
+        and close the shared client if it is owned by this fleet
+        """
+        for session in list(self._sessions.values()):
+            await session.reset_service()
+            await _wait_callbacks(session._callback_tasks)
+        self._sessions.clear()
+        await self._scheduler.stop()
+        if self._send_queue is not None:
+            await self._send_queue.aclose()
+        await _wait_callbacks(self._callback_tasks)
+        if self._own_client:
+            await self._client.aclose()
+
+    async def add_callsign(self, callsign: str, initialize: bool = True) -> FleetSession:
+        """
+        Add a callsign to the fleet
+        Args:
+            callsign (str): aircraft callsign
+            initialize (bool): initialize service immediately, which pings the server and starts polling
+        Returns:
+            session of the callsign
+        Raises:
+            ParameterError: callsign already in fleet
+            InitializationError: when service initialize fail
+        """
+        if callsign in self._sessions:
+            raise ParameterError(f"Callsign {callsign} already in fleet")
+        session = FleetSession(self)
+        session.set_callsign(callsign)
+        session.set_logon_code(self._logon_code)
+        if self._email is not None:
+            session.set_email(self._email)
+        if self._acars_url is not None:
+            session.set_acars_url(self._acars_url)
+        self._sessions[callsign] = session
+        if initialize:
+            self.start()
+            try:
+                await session.initialize_service()
+            except Exception:
+                del self._sessions[callsign]
+                raise
+        logger.debug("Callsign {} added to fleet", callsign)
+        return session
+
+    async def remove_callsign(self, callsign: str) -> None:
+        """
+        Remove a callsign from the fleet and stop polling for it
+        Raises:
+            KeyError: callsign not in fleet
+        """
+        session = self._sessions.pop(callsign)
+        await session.reset_service()
+        logger.debug("Callsign {} removed from fleet", callsign)
+
+    def add_message_receiver_callback(self, callback: Callable[[str, AcarsMessage], None]) -> None:
+        """
+        Add callback called with (callsign, message) for messages received by any session
+        query_info answers are passed only when they come from the server, not from the shared info cache
+        """
+        self._message_receiver_callbacks.append(callback)
+
+    def add_message_sender_callback(self, callback: Callable[[str, str, str], None]) -> None:
+        """
+        Add callback called with (callsign, to, message) for messages sent by any session
+        """
+        self._message_sender_callbacks.append(callback)
+
+    def set_callback_dispatcher(self, dispatcher: Optional[CallbackDispatcher]) -> None:
+        """
+        Set dispatcher running fleet wide callbacks off the poll and caller tasks, None runs them inline
+        """
+        self._callback_dispatcher = dispatcher
+
+    def _message_receiver_callback(self, callsign: str, message: AcarsMessage) -> None:
+        """
+        Triggers fleet wide receiver callbacks, for internal use only
+        """
+        dispatcher = self._callback_dispatcher
+        metrics = self._metrics
+        for callback in self._message_receiver_callbacks:
+            run = callback if metrics is None else metrics.timed(callback)
+            if dispatcher is not None:
+                dispatcher.dispatch(run, callsign, message)
+                continue
+            try:
+                result = run(callsign, message)
+            except Exception as e:
+                logger.error("Exception occurred while calling callback: {}", e)
+                continue
+            _schedule_callback(self._callback_tasks, result)
+
+    def _message_sender_callback(self, callsign: str, to: str, message: str) -> None:
+        """
+        Triggers fleet wide sender callbacks, for internal use only
+        """
+        dispatcher = self._callback_dispatcher
+        metrics = self._metrics
+        for callback in self._message_sender_callbacks:
+            run = callback if metrics is None else metrics.timed(callback)
+            if dispatcher is not None:
+                dispatcher.dispatch(run, callsign, to, message)
+                continue
+            try:
+                result = run(callsign, to, message)
+            except Exception as e:
+                logger.error("Exception occurred while calling callback: {}", e)
+                continue
+            _schedule_callback(self._callback_tasks, result)
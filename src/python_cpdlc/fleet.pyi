@@ -0,0 +1,345 @@
+from asyncio import Event as AsyncEvent, Semaphore, Task
+from itertools import count
+from typing import Callable, Iterator, Optional, Union
+
+from httpx import AsyncBaseTransport, AsyncClient, Limits, Timeout
+
+from .acars_message import AcarsMessage as AcarsMessage
+from .async_cpdlc import AsyncCPDLC as AsyncCPDLC, _schedule_callback as _schedule_callback, \
+    _wait_callbacks as _wait_callbacks
+from .circuit_breaker import CircuitBreaker as CircuitBreaker
+from .dispatcher import CallbackDispatcher as CallbackDispatcher
+from .exception import ParameterError as ParameterError
+from .info_cache import InfoCache as InfoCache
+from .metrics import MetricsRegistry as MetricsRegistry
+from .poll_policy import PollPolicy as PollPolicy, PollState as PollState
+from .poller import PollerBase as PollerBase
+from .send_queue import AsyncioSendQueue as AsyncioSendQueue
+from .tracing import Tracer as Tracer
+from .transport import DEFAULT_LIMITS as DEFAULT_LIMITS, create_async_client as create_async_client
+
+
+class FleetPollHandle(PollerBase):
+    """
+    Stand-in for AsyncPoller used by fleet sessions, it only records the session in the fleet scheduler
+    so no task or thread is created per session
+
+    Attributes:
+        _scheduler (FleetScheduler): owning scheduler
+        _session (FleetSession): session to poll
+        _active (bool): whether the session is registered in the scheduler
+        _generation (int): incremented by every start, heap entries of earlier starts are stale
+    """
+    _scheduler: FleetScheduler
+    _session: FleetSession
+    _active: bool
+    _generation: int
+
+    def __init__(self, scheduler: FleetScheduler, session: FleetSession, min_interval: int = 15,
+                 max_interval: int = 30, policy: Optional[PollPolicy] = None) -> None:
+        """
+        Constructor for FleetPollHandle class
+        Args:
+            scheduler (FleetScheduler): owning scheduler
+            session (FleetSession): session to poll
+            min_interval (int): Minimum interval to poll
+            max_interval (int): Maximum interval to poll
+            policy (Optional[PollPolicy]): poll scheduling policy, AdaptivePollPolicy when None
+        """
+        ...
+
+    @property
+    def running(self) -> bool: ...
+
+    def start(self) -> None:
+        """
+        Register session in the fleet scheduler, first poll happens immediately
+        """
+        ...
+
+    async def stop(self) -> None:
+        """
+        Unregister session from the fleet scheduler
+        """
+        ...
+
+
+class FleetScheduler:
+    """
+    Single asyncio task polling every registered fleet session when it becomes due
+
+    Sessions are kept in a heap ordered by due time, removed sessions and entries left by an earlier start are
+    dropped lazily when popped
+
+    Attributes:
+        _heap (list[tuple[float, int, int, FleetPollHandle]]): due time heap
+        _sequence (itertools.count): tie breaker for equal due times
+        _semaphore (Optional[asyncio.Semaphore]): limits concurrent polls
+        _max_concurrent_polls (int): maximum number of polls in flight
+        _wakeup (Optional[asyncio.Event]): set when a session is scheduled earlier than the current sleep
+        _task (Optional[asyncio.Task]): scheduler task
+        _in_flight (set[asyncio.Task]): running poll tasks
+        _polls (int): number of polls executed
+    """
+    _heap: list[tuple[float, int, int, FleetPollHandle]]
+    _sequence: count
+    _max_concurrent_polls: int
+    _semaphore: Optional[Semaphore]
+    _wakeup: Optional[AsyncEvent]
+    _task: Optional[Task]
+    _in_flight: set[Task]
+    _polls: int
+
+    def __init__(self, max_concurrent_polls: int = 64) -> None:
+        """
+        Constructor for FleetScheduler class
+        Args:
+            max_concurrent_polls (int): maximum number of polls in flight
+        """
+        ...
+
+    @property
+    def polls(self) -> int: ...
+
+    @property
+    def pending(self) -> int: ...
+
+    def schedule(self, handle: FleetPollHandle, delay: float) -> None:
+        """
+        Schedule a poll of handle after delay seconds
+        """
+        ...
+
+    async def _poll(self, handle: FleetPollHandle, generation: int) -> None: ...
+
+    async def _run(self) -> None: ...
+
+    def start(self) -> None:
+        """
+        Start scheduler task, must be called from a running event loop
+        """
+        ...
+
+    async def stop(self) -> None:
+        """
+        Stop scheduler task and cancel in flight polls
+        """
+        ...
+
+
+class FleetSession(AsyncCPDLC):
+    """
+    AsyncCPDLC session owned by a CPDLCFleet, it shares the fleet client, info cache and send queue
+    and is polled by the fleet scheduler
+
+    Attributes:
+        _fleet (CPDLCFleet): owning fleet
+    """
+    _fleet: CPDLCFleet
+
+    def __init__(self, fleet: CPDLCFleet) -> None:
+        """
+        Constructor for FleetSession class
+        Args:
+            fleet (CPDLCFleet): owning fleet
+        """
+        ...
+
+    def _create_poller(self) -> FleetPollHandle: ...
+
+
+class CPDLCFleet:
+    """
+    Serve many callsigns from one process
+
+    All sessions share one pooled httpx.AsyncClient, one scheduler task and one info cache,
+    so adding a callsign only costs its session state
+
+    Attributes:
+        _logon_code (str): Hoppie ACARS network login code shared by all sessions
+        _email (Optional[str]): Hoppie ACARS network login email
+        _acars_url (Optional[str]): Hoppie ACARS network url, official server when None
+        _min_interval (int): Minimum interval to poll
+        _max_interval (int): Maximum interval to poll
+        _client (httpx.AsyncClient): shared httpx async client
+        _own_client (bool): whether the client was created by this fleet and should be closed by it
+        _scheduler (FleetScheduler): shared scheduler
+        _info_cache (InfoCache): shared cache of query_info answers
+        _send_queue (Optional[AsyncioSendQueue]): shared queue of outbound requests, None sends them inline
+        _metrics (Optional[MetricsRegistry]): shared registry of request, poll and callback metrics,
+            None records nothing
+        _tracer (Optional[Tracer]): shared tracer of session spans, None traces nothing
+        _circuit_breaker (Optional[CircuitBreaker]): circuit of the server shared by all sessions,
+            None polls regardless
+        _sessions (dict[str, FleetSession]): sessions by callsign
+        _message_receiver_callbacks (list[Callable[[str, AcarsMessage], None]]): fleet wide receiver callbacks
+        _message_sender_callbacks (list[Callable[[str, str, str], None]]): fleet wide sender callbacks
+        _callback_dispatcher (Optional[CallbackDispatcher]): dispatcher of fleet wide callbacks, None runs them inline
+        _callback_tasks (set[asyncio.Task]): tasks of fleet wide coroutine callbacks run inline
+
+    Examples:
+        async with CPDLCFleet("11111111111") as fleet:\n
+            fleet.add_message_receiver_callback(lambda callsign, msg: print(callsign, msg))\n
+            session = await fleet.add_callsign("CES2352")\n
+            await session.cpdlc_login("ZSHA")\n
+    """
+    _logon_code: str
+    _email: Optional[str]
+    _acars_url: Optional[str]
+    _min_interval: int
+    _max_interval: int
+    _client: AsyncClient
+    _own_client: bool
+    _scheduler: FleetScheduler
+    _info_cache: InfoCache
+    _send_queue: Optional[AsyncioSendQueue]
+    _metrics: Optional[MetricsRegistry]
+    _tracer: Optional[Tracer]
+    _circuit_breaker: Optional[CircuitBreaker]
+    _sessions: dict[str, FleetSession]
+    _message_receiver_callbacks: list[Callable[[str, AcarsMessage], None]]
+    _message_sender_callbacks: list[Callable[[str, str, str], None]]
+    _callback_dispatcher: Optional[CallbackDispatcher]
+    _callback_tasks: set[Task]
+
+    def __init__(self, logon_code: str, email: Optional[str] = None, acars_url: Optional[str] = None,
+                 limits: Optional[Limits] = None, timeout: Union[float, Timeout, None] = None,
+                 max_concurrent_polls: int = 64,
+                 min_interval: int = 15, max_interval: int = 30,
+                 transport: Optional[AsyncBaseTransport] = None,
+                 info_cache: Optional[InfoCache] = None, send_queue: Optional[AsyncioSendQueue] = None,
+                 client: Optional[AsyncClient] = None, metrics: Optional[MetricsRegistry] = None,
+                 tracer: Optional[Tracer] = None, circuit_breaker: Optional[CircuitBreaker] = None) -> None:
+        """
+        Constructor for CPDLCFleet class
+        Args:
+            logon_code (str): Hoppie ACARS network login code
+            email (Optional[str]): Hoppie ACARS network login email
+            acars_url (Optional[str]): Hoppie ACARS network url, official server when None
+            limits (Optional[httpx.Limits]): connection pool limits of the shared client,
+                max_concurrent_polls connections kept alive for DEFAULT_LIMITS.keepalive_expiry when None
+            timeout (Union[float, httpx.Timeout, None]): request timeout, DEFAULT_TIMEOUT when None
+            max_concurrent_polls (int): maximum number of polls in flight
+            min_interval (int): Minimum interval to poll
+            max_interval (int): Maximum interval to poll
+            transport (Optional[httpx.AsyncBaseTransport]): transport of the shared client, default network transport
+            info_cache (Optional[InfoCache]): cache of query_info answers shared by all sessions, default InfoCache()
+            send_queue (Optional[AsyncioSendQueue]): queue of outbound requests shared by all sessions,
+                started with the fleet, None sends them inline
+            client (Optional[httpx.AsyncClient]): client shared with other fleets or clients, it is not closed
+                by the fleet and transport, limits and timeout are ignored, a private one is created when None
+            metrics (Optional[MetricsRegistry]): registry shared by all sessions and fleet wide callbacks,
+                None records nothing
+            tracer (Optional[Tracer]): tracer shared by all sessions, None traces nothing
+            circuit_breaker (Optional[CircuitBreaker]): circuit shared by all sessions, e.g.
+                shared_circuit_breaker(acars_url), None polls regardless
+        """
+        ...
+
+    async def __aenter__(self) -> CPDLCFleet: ...
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
+
+    @property
+    def client(self) -> AsyncClient: ...
+
+    @property
+    def scheduler(self) -> FleetScheduler: ...
+
+    @property
+    def info_cache(self) -> InfoCache: ...
+
+    @property
+    def send_queue(self) -> Optional[AsyncioSendQueue]: ...
+
+    @property
+    def metrics(self) -> Optional[MetricsRegistry]: ...
+
+    @property
+    def tracer(self) -> Optional[Tracer]: ...
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]: ...
+
+    @property
+    def callsigns(self) -> list[str]: ...
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, callsign: str) -> bool: ...
+
+    def __iter__(self) -> Iterator[FleetSession]: ...
+
+    def session(self, callsign: str) -> FleetSession:
+        """
+        Get session of callsign
+        Raises:
+            KeyError: callsign not in fleet
+        """
+        ...
+
+    def start(self) -> None:
+        """
+        Start the fleet scheduler and send queue, must be called from a running event loop
+        """
+        ...
+
+    async def aclose(self) -> None:
+        """
+        Stop every session and the scheduler, send the queued requests, wait for running coroutine callbacks
+        and close the shared client if it is owned by this fleet
+        """
+        ...
+
+    async def add_callsign(self, callsign: str, initialize: bool = True) -> FleetSession:
+        """
+        Add a callsign to the fleet
+        Args:
+            callsign (str): aircraft callsign
+            initialize (bool): initialize service immediately, which pings the server and starts polling
+        Returns:
+            session of the callsign
+        Raises:
+            ParameterError: callsign already in fleet
+            InitializationError: when service initialize fail
+        """
+        ...
+
+    async def remove_callsign(self, callsign: str) -> None:
+        """
+        Remove a callsign from the fleet and stop polling for it
+        Raises:
+            KeyError: callsign not in fleet
+        """
+        ...
+
+    def add_message_receiver_callback(self, callback: Callable[[str, AcarsMessage], None]) -> None:
+        """
+        Add callback called with (callsign, message) for messages received by any session
+        query_info answers are passed only when they come from the server, not from the shared info cache
+        """
+        ...
+
+    def add_message_sender_callback(self, callback: Callable[[str, str, str], None]) -> None:
+        """
+        Add callback called with (callsign, to, message) for messages sent by any session
+        """
+        ...
+
+    def set_callback_dispatcher(self, dispatcher: Optional[CallbackDispatcher]) -> None:
+        """
+        Set dispatcher running fleet wide callbacks off the poll and caller tasks, None runs them inline
+        """
+        ...
+
+    def _message_receiver_callback(self, callsign: str, message: AcarsMessage) -> None:
+        """
+        Triggers fleet wide receiver callbacks, for internal use only
+        """
+        ...
+
+    def _message_sender_callback(self, callsign: str, to: str, message: str) -> None:
+        """
+        Triggers fleet wide sender callbacks, for internal use only
+        """
+        ...
@@ -0,0 +1,268 @@
+from asyncio import CancelledError, Future as AsyncFuture, get_running_loop, shield
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import Awaitable, Callable, Optional
+
+from .acars_message import AcarsMessage
+from .enums import InfoType
+from .exception import ParameterError
+
+_DEFAULT_TTLS: dict[InfoType, float] = {
+    InfoType.METAR: 300,
+    InfoType.TAF: 1800,
+    InfoType.SHORT_TAF: 1800,
+    InfoType.VAT_ATIS: 60,
+    InfoType.PE_ATIS: 60,
+    InfoType.IVAO_ATIS: 60
+}
+
+
+@dataclass(frozen=True, slots=True)
+class InfoCacheStats:
+    """
+    Snapshot of info cache counters
+
+    Attributes:
+        hits (int): queries answered from the cache
+        misses (int): queries which sent a request
+        coalesced (int): queries which waited for an identical request in flight
+        size (int): entries cached
+    """
+    hits: int
+    misses: int
+    coalesced: int
+    size: int
+
+
+class InfoCache:
+    """
+    Cache of inforeq answers keyed by (InfoType, ICAO), shareable between threaded and asyncio clients
+
+    Entries expire after the TTL of their info type and the least recently used entry is evicted beyond max_size.
+    Concurrent identical queries are coalesced, only the first sends a request and the others wait for its answer
+
+    Attributes:
+        _ttls (dict[InfoType, float]): seconds an answer stays fresh per info type
+        _max_size (int): maximum number of entries
+        _entries (OrderedDict[tuple[InfoType, str], tuple[float, AcarsMessage]]): expiry time and answer,
+            least recently used first
+        _in_flight (dict[tuple[InfoType, str], concurrent.futures.Future]): requests of threaded clients
+        _async_in_flight (dict[tuple[InfoType, str], asyncio.Future]): requests of asyncio clients, resolved with
+            None when the leading query was cancelled
+        _lock (threading.Lock): guards entries, requests in flight and counters
+        _hits (int): queries answered from the cache
+        _misses (int): queries which sent a request
+        _coalesced (int): queries which waited for an identical request in flight
+    """
+
+    def __init__(self, ttls: Optional[dict[InfoType, float]] = None, max_size: int = 256):
+        """
+        Constructor for InfoCache class
+        Args:
+            ttls (Optional[dict[InfoType, float]]): seconds an answer stays fresh, overrides the defaults per type
+            max_size (int): maximum number of entries
+        Raises:
+            ParameterError: when max_size is not positive or a ttl is negative
+        """
+        self._ttls = {**_DEFAULT_TTLS, **(ttls or {})}
+        if max_size <= 0 or any(ttl < 0 for ttl in self._ttls.values()):
+            raise ParameterError("max_size must be positive and ttls must not be negative")
+        self._max_size = max_size
+        self._entries: OrderedDict[tuple[InfoType, str], tuple[float, AcarsMessage]] = OrderedDict()
+        self._in_flight: dict[tuple[InfoType, str], Future] = {}
+        self._async_in_flight: dict[tuple[InfoType, str], AsyncFuture] = {}
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def stats(self) -> InfoCacheStats:
+        with self._lock:
+            return InfoCacheStats(self._hits, self._misses, self._coalesced, len(self._entries))
+
+    def ttl(self, info_type: InfoType) -> float:
+        """
+        Seconds an answer of info_type stays fresh
+        """
+        return self._ttls[info_type]
+
+    def set_ttl(self, info_type: InfoType, ttl: float) -> None:
+        """
+        Set seconds an answer of info_type stays fresh, 0 disables caching of that type
+        Raises:
+            ParameterError: when ttl is negative
+        """
+        if ttl < 0:
+            raise ParameterError("ttl must not be negative")
+        self._ttls[info_type] = ttl
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(info_type: InfoType, icao: str) -> tuple[InfoType, str]:
+        return info_type, icao.upper()
+
+    def _lookup(self, key: tuple[InfoType, str]) -> Optional[AcarsMessage]:
+        """
+        Fresh cached answer of key, must hold lock, for internal use only
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key: tuple[InfoType, str], message: AcarsMessage) -> None:
+        """
+        Cache answer of key, must hold lock, for internal use only
+        """
+        ttl = self._ttls[key[0]]
+        if ttl <= 0:
+            return
+        self._entries[key] = (monotonic() + ttl, message)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, info_type: InfoType, icao: str) -> Optional[AcarsMessage]:
+        """
+        Fresh cached answer, without sending a request or counting a hit
+        """
+        with self._lock:
+            return self._lookup(self._key(info_type, icao))
+
+    def fetch(self, info_type: InfoType, icao: str, request: Callable[[], AcarsMessage]) -> AcarsMessage:
+        """
+        Cached answer, or the answer of request, called at most once for concurrent identical queries
+        Args:
+            info_type (InfoType): info type
+            icao (str): ICAO
+            request (Callable[[], AcarsMessage]): sends the inforeq
+        Returns:
+            AcarsMessage: answer
+        Raises:
+            Exception: whatever request raised, also raised in every coalesced query
+        """
+        key = self._key(info_type, icao)
+        with self._lock:
+            message = self._lookup(key)
+            if message is not None:
+                self._hits += 1
+                return message
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                self._misses += 1
+                future = self._in_flight[key] = Future()
+                leader = True
+        if not leader:
+            return future.result()
+        try:
+            message = request()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._store(key, message)
+            del self._in_flight[key]
+        future.set_result(message)
+        return message
+
+    async def async_fetch(self, info_type: InfoType, icao: str,
+                          request: Callable[[], Awaitable[AcarsMessage]]) -> AcarsMessage:
+        """
+        Cached answer, or the answer of request, awaited at most once for concurrent identical queries
+        of one event loop. When the query sending the request is cancelled one of the waiting queries sends it again
+        Args:
+            info_type (InfoType): info type
+            icao (str): ICAO
+            request (Callable[[], Awaitable[AcarsMessage]]): sends the inforeq
+        Returns:
+            AcarsMessage: answer
+        Raises:
+            Exception: whatever request raised, also raised in every coalesced query
+        """
+        key = self._key(info_type, icao)
+        loop = get_running_loop()
+        while True:
+            with self._lock:
+                message = self._lookup(key)
+                if message is not None:
+                    self._hits += 1
+                    return message
+                future = self._async_in_flight.get(key)
+                if future is not None and future.get_loop() is loop:
+                    self._coalesced += 1
+                    leader = False
+                else:
+                    self._misses += 1
+                    future = loop.create_future()
+                    self._async_in_flight[key] = future
+                    leader = True
+            if leader:
+                break
+            # shielded, a cancelled waiter must not cancel the answer of the others
+            message = await shield(future)
+            if message is not None:
+                return message
+            # the leading query was cancelled, the first waiter to get here sends the request again
+        try:
+            message = await request()
+        except CancelledError:
+            with self._lock:
+                if self._async_in_flight.get(key) is future:
+                    del self._async_in_flight[key]
+            future.set_result(None)
+            raise
+        except BaseException as e:
+            with self._lock:
+                if self._async_in_flight.get(key) is future:
+                    del self._async_in_flight[key]
+            future.set_exception(e)
+            # waiters re-raise it, mark it retrieved so a query without waiters does not log it
+            future.exception()
+            raise
+        with self._lock:
+            self._store(key, message)
+            if self._async_in_flight.get(key) is future:
+                del self._async_in_flight[key]
+        future.set_result(message)
+        return message
+
+    def invalidate(self, info_type: InfoType, icao: str) -> None:
+        """
+        Drop the cached answer of (info_type, icao)
+        """
+        with self._lock:
+            self._entries.pop(self._key(info_type, icao), None)
+
+    def clear(self) -> None:
+        """
+        Drop every cached answer
+        """
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,162 @@
+from asyncio import Future as AsyncFuture
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from threading import Lock
+from typing import Awaitable, Callable, Optional
+
+from .acars_message import AcarsMessage as AcarsMessage
+from .enums import InfoType as InfoType
+from .exception import ParameterError as ParameterError
+
+_DEFAULT_TTLS: dict[InfoType, float]
+
+
+@dataclass(frozen=True, slots=True)
+class InfoCacheStats:
+    """
+    Snapshot of info cache counters
+
+    Attributes:
+        hits (int): queries answered from the cache
+        misses (int): queries which sent a request
+        coalesced (int): queries which waited for an identical request in flight
+        size (int): entries cached
+    """
+    hits: int
+    misses: int
+    coalesced: int
+    size: int
+
+
+class InfoCache:
+    """
+    Cache of inforeq answers keyed by (InfoType, ICAO), shareable between threaded and asyncio clients
+
+    Entries expire after the TTL of their info type and the least recently used entry is evicted beyond max_size.
+    Concurrent identical queries are coalesced, only the first sends a request and the others wait for its answer
+
+    Attributes:
+        _ttls (dict[InfoType, float]): seconds an answer stays fresh per info type
+        _max_size (int): maximum number of entries
+        _entries (OrderedDict[tuple[InfoType, str], tuple[float, AcarsMessage]]): expiry time and answer,
+            least recently used first
+        _in_flight (dict[tuple[InfoType, str], concurrent.futures.Future]): requests of threaded clients
+        _async_in_flight (dict[tuple[InfoType, str], asyncio.Future]): requests of asyncio clients, resolved with
+            None when the leading query was cancelled
+        _lock (threading.Lock): guards entries, requests in flight and counters
+        _hits (int): queries answered from the cache
+        _misses (int): queries which sent a request
+        _coalesced (int): queries which waited for an identical request in flight
+    """
+    _ttls: dict[InfoType, float]
+    _max_size: int
+    _entries: OrderedDict[tuple[InfoType, str], tuple[float, AcarsMessage]]
+    _in_flight: dict[tuple[InfoType, str], Future]
+    _async_in_flight: dict[tuple[InfoType, str], AsyncFuture]
+    _lock: Lock
+    _hits: int
+    _misses: int
+    _coalesced: int
+
+    def __init__(self, ttls: Optional[dict[InfoType, float]] = None, max_size: int = 256) -> None:
+        """
+        Constructor for InfoCache class
+        Args:
+            ttls (Optional[dict[InfoType, float]]): seconds an answer stays fresh, overrides the defaults per type
+            max_size (int): maximum number of entries
+        Raises:
+            ParameterError: when max_size is not positive or a ttl is negative
+        """
+        ...
+
+    @property
+    def max_size(self) -> int: ...
+
+    @property
+    def hits(self) -> int: ...
+
+    @property
+    def misses(self) -> int: ...
+
+    @property
+    def stats(self) -> InfoCacheStats: ...
+
+    def ttl(self, info_type: InfoType) -> float:
+        """
+        Seconds an answer of info_type stays fresh
+        """
+        ...
+
+    def set_ttl(self, info_type: InfoType, ttl: float) -> None:
+        """
+        Set seconds an answer of info_type stays fresh, 0 disables caching of that type
+        Raises:
+            ParameterError: when ttl is negative
+        """
+        ...
+
+    def __len__(self) -> int: ...
+
+    @staticmethod
+    def _key(info_type: InfoType, icao: str) -> tuple[InfoType, str]: ...
+
+    def _lookup(self, key: tuple[InfoType, str]) -> Optional[AcarsMessage]:
+        """
+        Fresh cached answer of key, must hold lock, for internal use only
+        """
+        ...
+
+    def _store(self, key: tuple[InfoType, str], message: AcarsMessage) -> None:
+        """
+        Cache answer of key, must hold lock, for internal use only
+        """
+        ...
+
+    def get(self, info_type: InfoType, icao: str) -> Optional[AcarsMessage]:
+        """
+        Fresh cached answer, without sending a request or counting a hit
+        """
+        ...
+
+    def fetch(self, info_type: InfoType, icao: str, request: Callable[[], AcarsMessage]) -> AcarsMessage:
+        """
+        Cached answer, or the answer of request, called at most once for concurrent identical queries
+        Args:
+            info_type (InfoType): info type
+            icao (str): ICAO
+            request (Callable[[], AcarsMessage]): sends the inforeq
+        Returns:
+            AcarsMessage: answer
+        Raises:
+            Exception: whatever request raised, also raised in every coalesced query
+        """
+        ...
+
+    async def async_fetch(self, info_type: InfoType, icao: str,
+                          request: Callable[[], Awaitable[AcarsMessage]]) -> AcarsMessage:
+        """
+        Cached answer, or the answer of request, awaited at most once for concurrent identical queries
+        of one event loop. When the query sending the request is cancelled one of the waiting queries sends it again
+        Args:
+            info_type (InfoType): info type
+            icao (str): ICAO
+            request (Callable[[], Awaitable[AcarsMessage]]): sends the inforeq
+        Returns:
+            AcarsMessage: answer
+        Raises:
+            Exception: whatever request raised, also raised in every coalesced query
+        """
+        ...
+
+    def invalidate(self, info_type: InfoType, icao: str) -> None:
+        """
+        Drop the cached answer of (info_type, icao)
+        """
+        ...
+
+    def clear(self) -> None:
+        """
+        Drop every cached answer
+        """
+        ...
@@ -0,0 +1,354 @@
+from dataclasses import dataclass, field
+from json import JSONDecodeError, JSONEncoder, loads
+from os import fsync
+from pathlib import Path
+from re import compile
+from threading import Condition, Lock, Thread
+from typing import Iterable, Iterator, Optional, Union
+
+from loguru import logger
+
+from .acars_message import AcarsMessage
+from .cpdlc_message import CPDLCMessage
+from .enums import ConnectionState, MessageDirection, PacketType
+from .exception import InvalidStateError, ParameterError
+
+_ATC_INFO_REGEX = compile(r"CURRENT ATC UNIT@_@(\w+)@_@(\w+)")
+_ENCODER = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+_DIRECTIONS = {direction.value: direction for direction in MessageDirection}
+_PACKET_TYPES = {packet_type.value: packet_type for packet_type in PacketType}
+
+_Entry = tuple[float, str, str, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class JournalRecord:
+    """
+    One message written to a journal
+
+    Attributes:
+        epoch (float): epoch seconds the message was received or sent
+        direction (MessageDirection): IN for received messages, OUT for sent packets
+        station (str): sending station of received messages, target station of sent packets
+        packet_type (PacketType): packet type
+        packet (str): packet as sent on the wire, CPDLC packets include the /data2/ header
+    """
+    epoch: float
+    direction: MessageDirection
+    station: str
+    packet_type: PacketType
+    packet: str
+
+    def to_message(self) -> AcarsMessage:
+        """
+        Rebuild the message of this record
+        Returns:
+            CPDLCMessage for received CPDLC packets, AcarsMessage otherwise
+        """
+        if self.packet_type is PacketType.CPDLC and self.direction is MessageDirection.IN:
+            return CPDLCMessage(self.station, self.packet_type, self.packet, self.direction)
+        return AcarsMessage(self.station, self.packet_type, self.packet, self.direction)
+
+
+@dataclass(slots=True)
+class JournalState:
+    """
+    Session state rebuilt from a journal
+
+    Attributes:
+        message_id (int): highest CPDLC message id received or sent
+        pending_replies (dict[tuple[str, int], CPDLCMessage]): received uplinks never replied to,
+            keyed by upper case station and message id
+        connection_state (ConnectionState): CPDLC connection state after the last record
+        current_atc (Optional[str]): CPDLC current ATC unit
+        atc_callsign (Optional[str]): CPDLC current ATC callsign
+        records (int): number of records read
+    """
+    message_id: int = 0
+    pending_replies: dict[tuple[str, int], CPDLCMessage] = field(default_factory=dict)
+    connection_state: ConnectionState = ConnectionState.DISCONNECTED
+    current_atc: Optional[str] = None
+    atc_callsign: Optional[str] = None
+    records: int = 0
+
+    def _disconnect(self) -> None:
+        self.connection_state = ConnectionState.DISCONNECTED
+        self.current_atc = None
+        self.atc_callsign = None
+        self.pending_replies.clear()
+
+    def apply(self, record: JournalRecord) -> None:
+        """
+        Move the state forward the way the client did when the record was written
+        Args:
+            record (JournalRecord): next record of the journal
+        Raises:
+            ValueError: when a CPDLC record has a malformed payload, the record is counted but changes nothing else
+        """
+        self.records += 1
+        if record.packet_type is not PacketType.CPDLC:
+            return
+        if record.direction is MessageDirection.OUT:
+            # sent packets carry the "N" reply tag, which is no ReplyTag, so they are split here
+            data = record.packet.split("/", 5)
+            if len(data) < 6:
+                return
+            message_id = int(data[2])
+            reply_id = int(data[3]) if data[3] else None
+            self.message_id = max(self.message_id, message_id)
+            if reply_id is not None:
+                self.pending_replies.pop((record.station.upper(), reply_id), None)
+            if data[5] == "REQUEST LOGON":
+                self.connection_state = ConnectionState.CONNECTING
+                self.current_atc = record.station.upper()
+            elif data[5] == "LOGOFF":
+                self._disconnect()
+            return
+        message = record.to_message()
+        text = message.message
+        self.message_id = max(self.message_id, message.message_id)
+        if message.request_for_reply:
+            self.pending_replies[(message.target_station.upper(), message.message_id)] = message
+        if text == "LOGON ACCEPTED":
+            self.connection_state = ConnectionState.CONNECTED
+        elif match := _ATC_INFO_REGEX.match(text):
+            self.current_atc, self.atc_callsign = match.groups()
+            self.connection_state = ConnectionState.CONNECTED
+        elif text == "LOGOFF":
+            self._disconnect()
+
+
+def _packet(message: AcarsMessage) -> str:
+    """
+    Packet of a received message as it was on the wire, for internal use only
+    """
+    if isinstance(message, CPDLCMessage):
+        return (f"/{message.data_tag}/{message.message_id}/{message.reply_id or ''}/"
+                f"{message.reply_type.value}/{message.message}")
+    return message.message
+
+
+def _is_torn(path: Path) -> bool:
+    """
+    Whether the last line of a journal misses its line break, for internal use only
+    """
+    if not path.exists() or path.stat().st_size == 0:
+        return False
+    with path.open("rb") as file:
+        file.seek(-1, 2)
+        return file.read(1) != b"\n"
+
+
+class MessageJournal:
+    """
+    Append-only NDJSON file of received messages and sent packets of one session
+
+    Each line is a JSON array [epoch, direction, station, packet type, packet]. Records are buffered in memory and
+    encoded and written by a background thread in batches, flush_interval seconds after the first record of a batch
+    was appended or once batch_size records are waiting, so the poll thread or task never waits for the disk. The
+    writer sleeps without a timeout while nothing is waiting. A torn last line left by a crash is skipped on replay.
+
+    Examples:
+        journal = MessageJournal("CES2352.journal")\n
+        cpdlc.restore_journal(journal.path)\n
+        cpdlc.set_journal(journal)\n
+        ...\n
+        journal.close()\n
+
+    Attributes:
+        _path (Path): journal file
+        _flush_interval (float): seconds records wait before they are written
+        _batch_size (int): waiting records which trigger an early write
+        _fsync (bool): whether every batch is synced to disk
+        _buffer (list[_Entry]): records waiting to be written
+        _condition (Condition): guards buffer and closed, wakes the writer
+        _write_lock (Lock): keeps batches in order, held while a batch is written
+        _closed (bool): whether close was called
+        _written (int): records written to the file
+        _file (TextIO): journal file opened for appending
+        _writer (Thread): background writer
+    """
+
+    def __init__(self, path: Union[str, Path], flush_interval: float = 0.05, batch_size: int = 64,
+                 fsync: bool = False):
+        """
+        Constructor for MessageJournal class, the file is created or appended to
+        Args:
+            path (str | Path): journal file
+            flush_interval (float): seconds records wait before they are written
+            batch_size (int): waiting records which trigger an early write
+            fsync (bool): sync every batch to disk, survives a power loss at the cost of a disk flush per batch
+        Raises:
+            ParameterError: when flush_interval or batch_size is not positive
+        """
+        if flush_interval <= 0 or batch_size <= 0:
+            raise ParameterError("flush_interval and batch_size must be positive")
+        self._path = Path(path)
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._fsync = fsync
+        self._buffer: list[_Entry] = []
+        self._condition = Condition()
+        self._write_lock = Lock()
+        self._closed = False
+        self._written = 0
+        torn = _is_torn(self._path)
+        self._file = self._path.open("a", encoding="utf-8")
+        if torn:
+            # terminate a torn last line, so the next record starts on a line of its own
+            self._file.write("\n")
+        self._writer = Thread(target=self._write_loop, name=f"journal-{self._path.name}", daemon=True)
+        self._writer.start()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def written(self) -> int:
+        return self._written
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _append(self, entries: list[_Entry]) -> None:
+        with self._condition:
+            if self._closed:
+                raise InvalidStateError("Journal is closed")
+            # the writer sleeps until the first record arrives, then waits flush_interval for more
+            empty = not self._buffer
+            self._buffer.extend(entries)
+            if empty or len(self._buffer) >= self._batch_size:
+                self._condition.notify()
+
+    def record_messages(self, messages: Iterable[AcarsMessage]) -> None:
+        """
+        Append received messages
+        Args:
+            messages (Iterable[AcarsMessage]): messages of one poll
+        Raises:
+            InvalidStateError: when the journal is closed
+        """
+        entries = [(message.epoch, message.direction.value, message.target_station, message.msg_type.value,
+                    _packet(message)) for message in messages]
+        if entries:
+            self._append(entries)
+
+    def record_packet(self, epoch: float, station: str, packet_type: PacketType, packet: str) -> None:
+        """
+        Append a sent packet
+        Args:
+            epoch (float): epoch seconds the packet was sent
+            station (str): target station
+            packet_type (PacketType): packet type
+            packet (str): packet
+        Raises:
+            InvalidStateError: when the journal is closed
+        """
+        self._append([(epoch, MessageDirection.OUT.value, station, packet_type.value, packet)])
+
+    def _write(self, entries: list[_Entry]) -> None:
+        """
+        Encode and write one batch, for internal use only
+        """
+        encode = _ENCODER.encode
+        self._file.write("".join([f"{encode(entry)}\n" for entry in entries]))
+        self._file.flush()
+        if self._fsync:
+            fsync(self._file.fileno())
+        self._written += len(entries)
+
+    def _write_loop(self) -> None:
+        """
+        Write batches until closed, for internal use only
+        """
+        while True:
+            with self._condition:
+                while not self._closed and not self._buffer:
+                    self._condition.wait()
+                if not self._closed and len(self._buffer) < self._batch_size:
+                    self._condition.wait(self._flush_interval)
+                closed = self._closed
+            # the buffer is swapped under the write lock, so batches reach the file in order,
+            # appending only takes the condition and never waits for the disk
+            with self._write_lock:
+                with self._condition:
+                    entries, self._buffer = self._buffer, []
+                if entries:
+                    try:
+                        self._write(entries)
+                    except OSError as e:
+                        logger.error("Failed to write {} journal records: {}", len(entries), e)
+            if closed:
+                return
+
+    def flush(self) -> None:
+        """
+        Write every waiting record now
+        """
+        with self._write_lock:
+            with self._condition:
+                entries, self._buffer = self._buffer, []
+            if entries and not self._file.closed:
+                self._write(entries)
+
+    def close(self) -> None:
+        """
+        Write every waiting record, stop the writer and close the file, closing twice does nothing
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._writer.join()
+        self._file.close()
+
+    def __enter__(self) -> "MessageJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def read(path: Union[str, Path]) -> Iterator[JournalRecord]:
+        """
+        Read every record of a journal in order, lines which cannot be parsed are skipped
+        Args:
+            path (str | Path): journal file
+        Returns:
+            iterator of records
+        """
+        with Path(path).open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    epoch, direction, station, packet_type, packet = loads(line)
+                    yield JournalRecord(epoch, _DIRECTIONS[direction], station, _PACKET_TYPES[packet_type], packet)
+                except (JSONDecodeError, KeyError, TypeError, ValueError):
+                    logger.warning("Skipping unreadable journal line: {!r}", line[:80])
+
+    @staticmethod
+    def replay(path: Union[str, Path]) -> JournalState:
+        """
+        Rebuild session state from a journal in a single sequential read,
+        records with a malformed CPDLC payload are skipped like unreadable lines
+        Args:
+            path (str | Path): journal file
+        Returns:
+            rebuilt state, an empty state when the file does not exist
+        """
+        state = JournalState()
+        if not Path(path).exists():
+            return state
+        for record in MessageJournal.read(path):
+            try:
+                state.apply(record)
+            except ValueError as e:
+                logger.warning("Skipping malformed journal record from {}: {}", record.station, e)
+        return state
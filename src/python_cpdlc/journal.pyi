@@ -0,0 +1,237 @@
+from dataclasses import dataclass, field
+from json import JSONEncoder
+from pathlib import Path
+from re import Pattern
+from threading import Condition, Lock, Thread
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+from .acars_message import AcarsMessage as AcarsMessage
+from .cpdlc_message import CPDLCMessage as CPDLCMessage
+from .enums import ConnectionState as ConnectionState, MessageDirection as MessageDirection, PacketType as PacketType
+from .exception import InvalidStateError as InvalidStateError, ParameterError as ParameterError
+
+_ATC_INFO_REGEX: Pattern
+_ENCODER: JSONEncoder
+_DIRECTIONS: dict[str, MessageDirection]
+_PACKET_TYPES: dict[str, PacketType]
+
+_Entry = tuple[float, str, str, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class JournalRecord:
+    """
+    One message written to a journal
+
+    Attributes:
+        epoch (float): epoch seconds the message was received or sent
+        direction (MessageDirection): IN for received messages, OUT for sent packets
+        station (str): sending station of received messages, target station of sent packets
+        packet_type (PacketType): packet type
+        packet (str): packet as sent on the wire, CPDLC packets include the /data2/ header
+    """
+    epoch: float
+    direction: MessageDirection
+    station: str
+    packet_type: PacketType
+    packet: str
+
+    def to_message(self) -> AcarsMessage:
+        """
+        Rebuild the message of this record
+        Returns:
+            CPDLCMessage for received CPDLC packets, AcarsMessage otherwise
+        """
+        ...
+
+
+@dataclass(slots=True)
+class JournalState:
+    """
+    Session state rebuilt from a journal
+
+    Attributes:
+        message_id (int): highest CPDLC message id received or sent
+        pending_replies (dict[tuple[str, int], CPDLCMessage]): received uplinks never replied to,
+            keyed by upper case station and message id
+        connection_state (ConnectionState): CPDLC connection state after the last record
+        current_atc (Optional[str]): CPDLC current ATC unit
+        atc_callsign (Optional[str]): CPDLC current ATC callsign
+        records (int): number of records read
+    """
+    message_id: int = 0
+    pending_replies: dict[tuple[str, int], CPDLCMessage] = field(default_factory=dict)
+    connection_state: ConnectionState = ConnectionState.DISCONNECTED
+    current_atc: Optional[str] = None
+    atc_callsign: Optional[str] = None
+    records: int = 0
+
+    def _disconnect(self) -> None: ...
+
+    def apply(self, record: JournalRecord) -> None:
+        """
+        Move the state forward the way the client did when the record was written
+        Args:
+            record (JournalRecord): next record of the journal
+        Raises:
+            ValueError: when a CPDLC record has a malformed payload, the record is counted but changes nothing else
+        """
+        ...
+
+
+def _packet(message: AcarsMessage) -> str:
+    """
+    Packet of a received message as it was on the wire, for internal use only
+    """
+    ...
+
+
+def _is_torn(path: Path) -> bool:
+    """
+    Whether the last line of a journal misses its line break, for internal use only
+    """
+    ...
+
+
+class MessageJournal:
+    """
+    Append-only NDJSON file of received messages and sent packets of one session
+
+    Each line is a JSON array [epoch, direction, station, packet type, packet]. Records are buffered in memory and
+    encoded and written by a background thread in batches, flush_interval seconds after the first record of a batch
+    was appended or once batch_size records are waiting, so the poll thread or task never waits for the disk. The
+    writer sleeps without a timeout while nothing is waiting. A torn last line left by a crash is skipped on replay.
+
+    Examples:
+        journal = MessageJournal("CES2352.journal")\n
+        cpdlc.restore_journal(journal.path)\n
+        cpdlc.set_journal(journal)\n
+        ...\n
+        journal.close()\n
+
+    Attributes:
+        _path (Path): journal file
+        _flush_interval (float): seconds records wait before they are written
+        _batch_size (int): waiting records which trigger an early write
+        _fsync (bool): whether every batch is synced to disk
+        _buffer (list[_Entry]): records waiting to be written
+        _condition (Condition): guards buffer and closed, wakes the writer
+        _write_lock (Lock): keeps batches in order, held while a batch is written
+        _closed (bool): whether close was called
+        _written (int): records written to the file
+        _file (TextIO): journal file opened for appending
+        _writer (Thread): background writer
+    """
+    _path: Path
+    _flush_interval: float
+    _batch_size: int
+    _fsync: bool
+    _buffer: list[_Entry]
+    _condition: Condition
+    _write_lock: Lock
+    _closed: bool
+    _written: int
+    _file: TextIO
+    _writer: Thread
+
+    def __init__(self, path: Union[str, Path], flush_interval: float = 0.05, batch_size: int = 64,
+                 fsync: bool = False):
+        """
+        Constructor for MessageJournal class, the file is created or appended to
+        Args:
+            path (str | Path): journal file
+            flush_interval (float): seconds records wait before they are written
+            batch_size (int): waiting records which trigger an early write
+            fsync (bool): sync every batch to disk, survives a power loss at the cost of a disk flush per batch
+        Raises:
+            ParameterError: when flush_interval or batch_size is not positive
+        """
+        ...
+
+    @property
+    def path(self) -> Path: ...
+
+    @property
+    def written(self) -> int: ...
+
+    @property
+    def pending(self) -> int: ...
+
+    @property
+    def closed(self) -> bool: ...
+
+    def _append(self, entries: list[_Entry]) -> None: ...
+
+    def record_messages(self, messages: Iterable[AcarsMessage]) -> None:
+        """
+        Append received messages
+        Args:
+            messages (Iterable[AcarsMessage]): messages of one poll
+        Raises:
+            InvalidStateError: when the journal is closed
+        """
+        ...
+
+    def record_packet(self, epoch: float, station: str, packet_type: PacketType, packet: str) -> None:
+        """
+        Append a sent packet
+        Args:
+            epoch (float): epoch seconds the packet was sent
+            station (str): target station
+            packet_type (PacketType): packet type
+            packet (str): packet
+        Raises:
+            InvalidStateError: when the journal is closed
+        """
+        ...
+
+    def _write(self, entries: list[_Entry]) -> None:
+        """
+        Encode and write one batch, for internal use only
+        """
+        ...
+
+    def _write_loop(self) -> None:
+        """
+        Write batches until closed, for internal use only
+        """
+        ...
+
+    def flush(self) -> None:
+        """
+        Write every waiting record now
+        """
+        ...
+
+    def close(self) -> None:
+        """
+        Write every waiting record, stop the writer and close the file, closing twice does nothing
+        """
+        ...
+
+    def __enter__(self) -> "MessageJournal": ...
+
+    def __exit__(self, *exc) -> None: ...
+
+    @staticmethod
+    def read(path: Union[str, Path]) -> Iterator[JournalRecord]:
+        """
+        Read every record of a journal in order, lines which cannot be parsed are skipped
+        Args:
+            path (str | Path): journal file
+        Returns:
+            iterator of records
+        """
+        ...
+
+    @staticmethod
+    def replay(path: Union[str, Path]) -> JournalState:
+        """
+        Rebuild session state from a journal in a single sequential read,
+        records with a malformed CPDLC payload are skipped like unreadable lines
+        Args:
+            path (str | Path): journal file
+        Returns:
+            rebuilt state, an empty state when the file does not exist
+        """
+        ...
@@ -0,0 +1,25 @@
+from os import environ
+
+# Checked before every log call of the poll and send hot paths, so disabled calls build no arguments at all.
+# PYTHON_CPDLC_HOT_PATH_LOGGING=0 turns them off from the start
+HOT_PATH_LOGGING = environ.get("PYTHON_CPDLC_HOT_PATH_LOGGING", "1").lower() not in ("0", "false", "no", "off")
+
+
+def set_hot_path_logging(enabled: bool) -> None:
+    """
+    Turn logging of the poll and send hot paths on or off for every client, other logging is not affected
+    Hot path logging covers received and sent messages, callback calls, poll timing and outbound telex,
+    DCL and reply requests
+    Args:
+        enabled (bool): whether hot path log calls are made
+    """
+    global HOT_PATH_LOGGING
+    HOT_PATH_LOGGING = enabled
+
+
+def hot_path_logging() -> bool:
+    """
+    Returns:
+        whether hot path log calls are made
+    """
+    return HOT_PATH_LOGGING
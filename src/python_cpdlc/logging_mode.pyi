@@ -0,0 +1,20 @@
+HOT_PATH_LOGGING: bool
+
+
+def set_hot_path_logging(enabled: bool) -> None:
+    """
+    Turn logging of the poll and send hot paths on or off for every client, other logging is not affected
+    Hot path logging covers received and sent messages, callback calls, poll timing and outbound telex,
+    DCL and reply requests
+    Args:
+        enabled (bool): whether hot path log calls are made
+    """
+    ...
+
+
+def hot_path_logging() -> bool:
+    """
+    Returns:
+        whether hot path log calls are made
+    """
+    ...
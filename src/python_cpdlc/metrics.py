@@ -0,0 +1,356 @@
+from bisect import bisect_left
+from inspect import isawaitable
+from threading import Lock
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+from .enums import ConnectionState
+from .exception import ParameterError
+
+# Seconds, from a local server round trip to a slow account.html call
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """
+    Fixed bucket histogram of observed values, buckets are inclusive upper bounds
+
+    Attributes:
+        _buckets (tuple[float, ...]): sorted bucket upper bounds
+        _counts (list[int]): observations per bucket, the last one counts values above every bound
+        _count (int): number of observations
+        _sum (float): sum of observations
+    """
+    __slots__ = ("_buckets", "_counts", "_count", "_sum")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Constructor for Histogram class
+        Args:
+            buckets (tuple[float, ...]): bucket upper bounds
+        Raises:
+            ParameterError: when buckets is empty or not strictly increasing
+        """
+        if not buckets or any(low >= high for low, high in zip(buckets, buckets[1:])):
+            raise ParameterError("buckets must be a non-empty increasing sequence")
+        self._buckets = tuple(buckets)
+        self._counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        return self._buckets
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def observe(self, value: float) -> None:
+        """
+        Add an observation
+        Args:
+            value (float): observed value
+        """
+        self._counts[bisect_left(self._buckets, value)] += 1
+        self._count += 1
+        self._sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """
+        Cumulative counts per upper bound, ending with infinity
+        Returns:
+            (upper bound, observations less than or equal to it) pairs
+        """
+        result = []
+        total = 0
+        for bound, count in zip((*self._buckets, float("inf")), self._counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            count, sum and cumulative bucket counts keyed by upper bound
+        """
+        return {"count": self._count, "sum": self._sum, "buckets": dict(self.cumulative())}
+
+
+class _Series:
+    """
+    Counters and latency histogram of one label set, for internal use only
+    """
+    __slots__ = ("errors", "latency")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.errors = 0
+        self.latency = Histogram(buckets)
+
+    def snapshot(self) -> dict:
+        return {"count": self.latency.count, "errors": self.errors, "latency": self.latency.snapshot()}
+
+
+class MetricsRegistry:
+    """
+    Counters and latency histograms of the hot paths of a CPDLC session
+
+    Tracks requests per endpoint and packet type, poll cycles with their parse time and message counts,
+    execution time per callback and connection state transitions. It can be shared between sessions,
+    every observation takes a lock. Times are in seconds
+
+    Examples:
+        metrics = MetricsRegistry()\n
+        cpdlc.set_metrics(metrics)\n
+        ...\n
+        print(metrics.prometheus())\n
+
+    Attributes:
+        _buckets (tuple[float, ...]): bucket upper bounds of every histogram
+        _requests (dict[tuple[str, str], _Series]): series per (endpoint, packet type)
+        _poll_latency (Histogram): duration of whole poll cycles
+        _parse_latency (Histogram): time spent parsing poll responses
+        _messages (int): messages parsed from poll responses
+        _duplicates (int): parsed messages dropped as duplicates
+        _callbacks (dict[str, _Series]): series per callback name
+        _transitions (dict[tuple[ConnectionState, ConnectionState], int]): count per (from, to) state
+        _timed (dict[Callable[..., Any], Callable[..., Any]]): timing wrapper per callback
+        _lock (threading.Lock): guards every counter
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Constructor for MetricsRegistry class
+        Args:
+            buckets (tuple[float, ...]): bucket upper bounds of every histogram, in seconds
+        Raises:
+            ParameterError: when buckets is empty or not strictly increasing
+        """
+        self._buckets = tuple(buckets)
+        self._poll_latency = Histogram(self._buckets)
+        self._parse_latency = Histogram(self._buckets)
+        self._requests: dict[tuple[str, str], _Series] = {}
+        self._messages = 0
+        self._duplicates = 0
+        self._callbacks: dict[str, _Series] = {}
+        self._transitions: dict[tuple[ConnectionState, ConnectionState], int] = {}
+        self._timed: dict[Callable[..., Any], Callable[..., Any]] = {}
+        self._lock = Lock()
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        return self._buckets
+
+    def observe_request(self, endpoint: str, packet_type: str, seconds: float, error: bool = False) -> None:
+        """
+        Record a request to the ACARS server
+        Args:
+            endpoint (str): endpoint, e.g. connect.html
+            packet_type (str): packet type of the request, empty for account.html
+            seconds (float): request duration
+            error (bool): whether the request failed
+        """
+        with self._lock:
+            series = self._requests.get((endpoint, packet_type))
+            if series is None:
+                series = self._requests[(endpoint, packet_type)] = _Series(self._buckets)
+            series.latency.observe(seconds)
+            if error:
+                series.errors += 1
+
+    def observe_poll(self, seconds: float) -> None:
+        """
+        Record a whole poll cycle, request, parsing and dispatch included
+        Args:
+            seconds (float): poll duration
+        """
+        with self._lock:
+            self._poll_latency.observe(seconds)
+
+    def observe_parse(self, seconds: float, messages: int, duplicates: int = 0) -> None:
+        """
+        Record parsing of a poll response
+        Args:
+            seconds (float): parse duration
+            messages (int): messages parsed
+            duplicates (int): parsed messages dropped as duplicates
+        """
+        with self._lock:
+            self._parse_latency.observe(seconds)
+            self._messages += messages
+            self._duplicates += duplicates
+
+    def observe_callback(self, name: str, seconds: float, error: bool = False) -> None:
+        """
+        Record a callback run
+        Args:
+            name (str): callback name
+            seconds (float): execution time
+            error (bool): whether the callback raised
+        """
+        with self._lock:
+            series = self._callbacks.get(name)
+            if series is None:
+                series = self._callbacks[name] = _Series(self._buckets)
+            series.latency.observe(seconds)
+            if error:
+                series.errors += 1
+
+    def observe_transition(self, old: ConnectionState, new: ConnectionState) -> None:
+        """
+        Record a connection state transition
+        Args:
+            old (ConnectionState): previous state
+            new (ConnectionState): new state
+        """
+        with self._lock:
+            self._transitions[(old, new)] = self._transitions.get((old, new), 0) + 1
+
+    def timed(self, callback: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap callback to record its execution time, awaitable results are timed until they complete
+        The wrapper of a callback is created once, so it hashes the same way on every call
+        Args:
+            callback (Callable[..., Any]): callback
+        Returns:
+            timing wrapper of callback
+        """
+        wrapper = self._timed.get(callback)
+        if wrapper is not None:
+            return wrapper
+        name = getattr(callback, "__qualname__", None) or repr(callback)
+
+        def wrapper(*args: Any) -> Any:
+            begin = perf_counter()
+            try:
+                result = callback(*args)
+            except Exception:
+                self.observe_callback(name, perf_counter() - begin, True)
+                raise
+            if isawaitable(result):
+                return self._await_timed(name, begin, result)
+            self.observe_callback(name, perf_counter() - begin)
+            return result
+
+        return self._timed.setdefault(callback, wrapper)
+
+    async def _await_timed(self, name: str, begin: float, result: Awaitable[Any]) -> Any:
+        """
+        Await the result of a coroutine callback and record its time, for internal use only
+        """
+        try:
+            value = await result
+        except Exception:
+            self.observe_callback(name, perf_counter() - begin, True)
+            raise
+        self.observe_callback(name, perf_counter() - begin)
+        return value
+
+    def reset(self) -> None:
+        """
+        Drop every recorded value
+        """
+        with self._lock:
+            self._poll_latency = Histogram(self._buckets)
+            self._parse_latency = Histogram(self._buckets)
+            self._requests.clear()
+            self._messages = 0
+            self._duplicates = 0
+            self._callbacks.clear()
+            self._transitions.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Copy every recorded value into plain dicts
+        Returns:
+            requests keyed by endpoint then packet type, polls, callbacks keyed by name
+            and state transitions keyed by "FROM->TO"
+        """
+        with self._lock:
+            requests: dict[str, dict[str, dict]] = {}
+            for (endpoint, packet_type), series in self._requests.items():
+                requests.setdefault(endpoint, {})[packet_type] = series.snapshot()
+            return {
+                "requests": requests,
+                "polls": {
+                    "count": self._poll_latency.count,
+                    "latency": self._poll_latency.snapshot(),
+                    "parse": self._parse_latency.snapshot(),
+                    "messages": self._messages,
+                    "duplicates": self._duplicates
+                },
+                "callbacks": {name: series.snapshot() for name, series in self._callbacks.items()},
+                "state_transitions": {f"{old.name}->{new.name}": count
+                                      for (old, new), count in self._transitions.items()}
+            }
+
+    def prometheus(self, prefix: str = "cpdlc") -> str:
+        """
+        Export every recorded value in the Prometheus text exposition format
+        Args:
+            prefix (str): metric name prefix
+        Returns:
+            exposition text
+        """
+        lines: list[str] = []
+        with self._lock:
+            requests = sorted(self._requests.items())
+            _header(lines, f"{prefix}_requests_total", "counter", "Requests sent to the ACARS server")
+            for (endpoint, packet_type), series in requests:
+                labels = _labels(endpoint=endpoint, type=packet_type)
+                lines.append(f"{prefix}_requests_total{labels} {series.latency.count}")
+            _header(lines, f"{prefix}_request_errors_total", "counter", "Requests that failed")
+            for (endpoint, packet_type), series in requests:
+                lines.append(f"{prefix}_request_errors_total{_labels(endpoint=endpoint, type=packet_type)} "
+                             f"{series.errors}")
+            _header(lines, f"{prefix}_request_duration_seconds", "histogram", "Request duration")
+            for (endpoint, packet_type), series in requests:
+                _histogram(lines, f"{prefix}_request_duration_seconds", series.latency,
+                           endpoint=endpoint, type=packet_type)
+            _header(lines, f"{prefix}_poll_duration_seconds", "histogram", "Poll cycle duration")
+            _histogram(lines, f"{prefix}_poll_duration_seconds", self._poll_latency)
+            _header(lines, f"{prefix}_poll_parse_duration_seconds", "histogram", "Poll response parse duration")
+            _histogram(lines, f"{prefix}_poll_parse_duration_seconds", self._parse_latency)
+            _header(lines, f"{prefix}_poll_messages_total", "counter", "Messages parsed from poll responses")
+            lines.append(f"{prefix}_poll_messages_total {self._messages}")
+            _header(lines, f"{prefix}_poll_duplicates_total", "counter", "Parsed messages dropped as duplicates")
+            lines.append(f"{prefix}_poll_duplicates_total {self._duplicates}")
+            callbacks = sorted(self._callbacks.items())
+            _header(lines, f"{prefix}_callback_errors_total", "counter", "Callbacks that raised")
+            for name, series in callbacks:
+                lines.append(f"{prefix}_callback_errors_total{_labels(callback=name)} {series.errors}")
+            _header(lines, f"{prefix}_callback_duration_seconds", "histogram", "Callback execution time")
+            for name, series in callbacks:
+                _histogram(lines, f"{prefix}_callback_duration_seconds", series.latency, callback=name)
+            _header(lines, f"{prefix}_state_transitions_total", "counter", "Connection state transitions")
+            for (old, new), count in self._transitions.items():
+                lines.append(f"{prefix}_state_transitions_total{_labels(**{'from': old.name, 'to': new.name})} "
+                             f"{count}")
+        return "\n".join(lines) + "\n"
+
+
+def _header(lines: list[str], name: str, kind: str, description: str) -> None:
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _histogram(lines: list[str], name: str, histogram: Histogram, **labels: str) -> None:
+    for bound, count in histogram.cumulative():
+        le = "+Inf" if bound == float("inf") else repr(float(bound))
+        lines.append(f"{name}_bucket{_labels(**labels, le=le)} {count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
@@ -0,0 +1,232 @@
+from threading import Lock
+from typing import Any, Awaitable, Callable
+
+from .enums import ConnectionState as ConnectionState
+from .exception import ParameterError as ParameterError
+
+DEFAULT_BUCKETS: tuple[float, ...]
+
+
+class Histogram:
+    """
+    Fixed bucket histogram of observed values, buckets are inclusive upper bounds
+
+    Attributes:
+        _buckets (tuple[float, ...]): sorted bucket upper bounds
+        _counts (list[int]): observations per bucket, the last one counts values above every bound
+        _count (int): number of observations
+        _sum (float): sum of observations
+    """
+    __slots__ = ("_buckets", "_counts", "_count", "_sum")
+    _buckets: tuple[float, ...]
+    _counts: list[int]
+    _count: int
+    _sum: float
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        Constructor for Histogram class
+        Args:
+            buckets (tuple[float, ...]): bucket upper bounds
+        Raises:
+            ParameterError: when buckets is empty or not strictly increasing
+        """
+        ...
+
+    @property
+    def buckets(self) -> tuple[float, ...]: ...
+
+    @property
+    def count(self) -> int: ...
+
+    @property
+    def sum(self) -> float: ...
+
+    def observe(self, value: float) -> None:
+        """
+        Add an observation
+        Args:
+            value (float): observed value
+        """
+        ...
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """
+        Cumulative counts per upper bound, ending with infinity
+        Returns:
+            (upper bound, observations less than or equal to it) pairs
+        """
+        ...
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            count, sum and cumulative bucket counts keyed by upper bound
+        """
+        ...
+
+
+class _Series:
+    """
+    Counters and latency histogram of one label set, for internal use only
+    """
+    __slots__ = ("errors", "latency")
+    errors: int
+    latency: Histogram
+
+    def __init__(self, buckets: tuple[float, ...]) -> None: ...
+
+    def snapshot(self) -> dict: ...
+
+
+class MetricsRegistry:
+    """
+    Counters and latency histograms of the hot paths of a CPDLC session
+
+    Tracks requests per endpoint and packet type, poll cycles with their parse time and message counts,
+    execution time per callback and connection state transitions. It can be shared between sessions,
+    every observation takes a lock. Times are in seconds
+
+    Examples:
+        metrics = MetricsRegistry()\n
+        cpdlc.set_metrics(metrics)\n
+        ...\n
+        print(metrics.prometheus())\n
+
+    Attributes:
+        _buckets (tuple[float, ...]): bucket upper bounds of every histogram
+        _requests (dict[tuple[str, str], _Series]): series per (endpoint, packet type)
+        _poll_latency (Histogram): duration of whole poll cycles
+        _parse_latency (Histogram): time spent parsing poll responses
+        _messages (int): messages parsed from poll responses
+        _duplicates (int): parsed messages dropped as duplicates
+        _callbacks (dict[str, _Series]): series per callback name
+        _transitions (dict[tuple[ConnectionState, ConnectionState], int]): count per (from, to) state
+        _timed (dict[Callable[..., Any], Callable[..., Any]]): timing wrapper per callback
+        _lock (threading.Lock): guards every counter
+    """
+    _buckets: tuple[float, ...]
+    _requests: dict[tuple[str, str], _Series]
+    _poll_latency: Histogram
+    _parse_latency: Histogram
+    _messages: int
+    _duplicates: int
+    _callbacks: dict[str, _Series]
+    _transitions: dict[tuple[ConnectionState, ConnectionState], int]
+    _timed: dict[Callable[..., Any], Callable[..., Any]]
+    _lock: Lock
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        Constructor for MetricsRegistry class
+        Args:
+            buckets (tuple[float, ...]): bucket upper bounds of every histogram, in seconds
+        Raises:
+            ParameterError: when buckets is empty or not strictly increasing
+        """
+        ...
+
+    @property
+    def buckets(self) -> tuple[float, ...]: ...
+
+    def observe_request(self, endpoint: str, packet_type: str, seconds: float, error: bool = False) -> None:
+        """
+        Record a request to the ACARS server
+        Args:
+            endpoint (str): endpoint, e.g. connect.html
+            packet_type (str): packet type of the request, empty for account.html
+            seconds (float): request duration
+            error (bool): whether the request failed
+        """
+        ...
+
+    def observe_poll(self, seconds: float) -> None:
+        """
+        Record a whole poll cycle, request, parsing and dispatch included
+        Args:
+            seconds (float): poll duration
+        """
+        ...
+
+    def observe_parse(self, seconds: float, messages: int, duplicates: int = 0) -> None:
+        """
+        Record parsing of a poll response
+        Args:
+            seconds (float): parse duration
+            messages (int): messages parsed
+            duplicates (int): parsed messages dropped as duplicates
+        """
+        ...
+
+    def observe_callback(self, name: str, seconds: float, error: bool = False) -> None:
+        """
+        Record a callback run
+        Args:
+            name (str): callback name
+            seconds (float): execution time
+            error (bool): whether the callback raised
+        """
+        ...
+
+    def observe_transition(self, old: ConnectionState, new: ConnectionState) -> None:
+        """
+        Record a connection state transition
+        Args:
+            old (ConnectionState): previous state
+            new (ConnectionState): new state
+        """
+        ...
+
+    def timed(self, callback: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wrap callback to record its execution time, awaitable results are timed until they complete
+        The wrapper of a callback is created once, so it hashes the same way on every call
+        Args:
+            callback (Callable[..., Any]): callback
+        Returns:
+            timing wrapper of callback
+        """
+        ...
+
+    async def _await_timed(self, name: str, begin: float, result: Awaitable[Any]) -> Any:
+        """
+        Await the result of a coroutine callback and record its time, for internal use only
+        """
+        ...
+
+    def reset(self) -> None:
+        """
+        Drop every recorded value
+        """
+        ...
+
+    def snapshot(self) -> dict:
+        """
+        Copy every recorded value into plain dicts
+        Returns:
+            requests keyed by endpoint then packet type, polls, callbacks keyed by name
+            and state transitions keyed by "FROM->TO"
+        """
+        ...
+
+    def prometheus(self, prefix: str = "cpdlc") -> str:
+        """
+        Export every recorded value in the Prometheus text exposition format
+        Args:
+            prefix (str): metric name prefix
+        Returns:
+            exposition text
+        """
+        ...
+
+
+def _header(lines: list[str], name: str, kind: str, description: str) -> None: ...
+
+
+def _escape(value: str) -> str: ...
+
+
+def _labels(**labels: str) -> str: ...
+
+
+def _histogram(lines: list[str], name: str, histogram: Histogram, **labels: str) -> None: ...
@@ -0,0 +1,224 @@
+from math import ceil, floor
+from time import monotonic
+from typing import Hashable, Iterator, Optional
+
+from .cpdlc_message import CPDLCMessage
+from .exception import ParameterError
+
+# every station numbers its own uplinks, so an uplink is identified by station and message id
+_ReplyKey = tuple[str, int]
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel of keys due at a monotonic deadline
+
+    Time is cut into ticks, a timer lives in the slot of the tick it is due in, modulo the number of slots.
+    Scheduling and cancelling touch one slot, advancing visits every slot passed since the last advance once and
+    only pops the timers due, timers of later rounds stay in their slot. Deadlines are rounded up to the next tick,
+    so a timer never fires early and at most one tick late
+
+    Attributes:
+        _tick (float): seconds per tick
+        _slots (list[dict[Hashable, int]]): per slot, tick each timer is due in by key
+        _timers (dict[Hashable, int]): slot of every scheduled key
+        _current (int): last tick advanced to
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 256, now: Optional[float] = None):
+        """
+        Constructor for TimerWheel class
+        Args:
+            tick (float): seconds per tick
+            slots (int): number of slots, a wheel turn lasts tick * slots seconds
+            now (Optional[float]): monotonic time the wheel starts at, current time when None
+        Raises:
+            ParameterError: when tick or slots is not positive
+        """
+        if tick <= 0 or slots <= 0:
+            raise ParameterError("tick and slots must be positive")
+        self._tick = tick
+        self._slots: list[dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._timers: dict[Hashable, int] = {}
+        self._current = floor((monotonic() if now is None else now) / tick)
+
+    @property
+    def tick(self) -> float:
+        return self._tick
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """
+        Schedule key at a monotonic deadline, a key already scheduled is moved
+        Args:
+            key (Hashable): timer key
+            deadline (float): monotonic time the timer is due, a passed deadline fires on the next advance
+        """
+        self.cancel(key)
+        due = max(ceil(deadline / self._tick), self._current + 1)
+        slot = due % len(self._slots)
+        self._slots[slot][key] = due
+        self._timers[key] = slot
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Cancel the timer of key
+        Args:
+            key (Hashable): timer key
+        Returns:
+            true if a timer was scheduled
+        """
+        slot = self._timers.pop(key, None)
+        if slot is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def clear(self) -> None:
+        """
+        Cancel every timer
+        """
+        for slot in self._timers.values():
+            self._slots[slot].clear()
+        self._timers.clear()
+
+    def advance(self, now: Optional[float] = None) -> list[Hashable]:
+        """
+        Move the wheel to now and pop every timer due
+        Args:
+            now (Optional[float]): monotonic time, current time when None
+        Returns:
+            keys of the timers due
+        """
+        target = floor((monotonic() if now is None else now) / self._tick)
+        if target <= self._current:
+            return []
+        expired = []
+        if self._timers:
+            size = len(self._slots)
+            for tick in range(self._current + 1, min(target, self._current + size) + 1):
+                slot = self._slots[tick % size]
+                if not slot:
+                    continue
+                for key, due in list(slot.items()):
+                    if due <= target:
+                        del slot[key]
+                        del self._timers[key]
+                        expired.append(key)
+        self._current = target
+        return expired
+
+
+class PendingReplyIndex:
+    """
+    Received uplinks waiting for our reply, keyed by station and message id, with optional expiry
+
+    Lookup, insertion and removal are dict operations. With a timeout every uplink gets a timer on a TimerWheel,
+    expire returns each uplink once when it stayed unanswered for timeout seconds. An expired uplink stays pending
+    until it is replied to or the session logs off. Not thread safe, the session guards it with its state lock
+
+    Attributes:
+        _messages (dict[tuple[str, int], CPDLCMessage]): pending uplinks by upper case station and message id,
+            in arrival order
+        _timeout (Optional[float]): seconds an uplink may stay unanswered, None never expires
+        _wheel (TimerWheel): reply timers keyed like _messages
+    """
+
+    def __init__(self, timeout: Optional[float] = None, tick: float = 1.0, slots: int = 256):
+        """
+        Constructor for PendingReplyIndex class
+        Args:
+            timeout (Optional[float]): seconds an uplink may stay unanswered, None never expires
+            tick (float): resolution of the reply timers in seconds
+            slots (int): slots of the timer wheel
+        Raises:
+            ParameterError: when timeout, tick or slots is not positive
+        """
+        if timeout is not None and timeout <= 0:
+            raise ParameterError("timeout must be positive")
+        self._messages: dict[_ReplyKey, CPDLCMessage] = {}
+        self._timeout = timeout
+        self._wheel = TimerWheel(tick, slots)
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
+
+    def set_timeout(self, timeout: Optional[float]) -> None:
+        """
+        Set seconds an uplink may stay unanswered, uplinks already pending keep their timer
+        Raises:
+            ParameterError: when timeout is not positive
+        """
+        if timeout is not None and timeout <= 0:
+            raise ParameterError("timeout must be positive")
+        self._timeout = timeout
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __contains__(self, key: _ReplyKey) -> bool:
+        return key in self._messages
+
+    def __iter__(self) -> Iterator[CPDLCMessage]:
+        return iter(self._messages.values())
+
+    def get(self, station: str, message_id: int) -> Optional[CPDLCMessage]:
+        """
+        Pending uplink of station with message id
+        Args:
+            station (str): ATC station the uplink was received from
+            message_id (int): message id of the uplink
+        Returns:
+            the uplink, None when it is not pending
+        """
+        return self._messages.get((station.upper(), message_id))
+
+    def add(self, message: CPDLCMessage, now: Optional[float] = None) -> None:
+        """
+        Track an uplink, its timer starts now
+        Args:
+            message (CPDLCMessage): uplink waiting for our reply
+            now (Optional[float]): monotonic time the uplink arrived, current time when None
+        """
+        key = (message.target_station.upper(), message.message_id)
+        self._messages[key] = message
+        if self._timeout is not None:
+            self._wheel.schedule(key, (monotonic() if now is None else now) + self._timeout)
+
+    def pop(self, station: str, message_id: int) -> Optional[CPDLCMessage]:
+        """
+        Stop tracking an uplink, e.g. once replied to
+        Args:
+            station (str): ATC station the uplink was received from
+            message_id (int): message id of the uplink
+        Returns:
+            the uplink, None when it was not pending
+        """
+        key = (station.upper(), message_id)
+        self._wheel.cancel(key)
+        return self._messages.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Stop tracking every uplink
+        """
+        self._messages.clear()
+        self._wheel.clear()
+
+    def expire(self, now: Optional[float] = None) -> list[CPDLCMessage]:
+        """
+        Uplinks whose timeout passed since the last call, each is returned once
+        Args:
+            now (Optional[float]): monotonic time, current time when None
+        Returns:
+            expired uplinks, still pending
+        """
+        if not self._wheel:
+            return []
+        return [self._messages[key] for key in self._wheel.advance(now) if key in self._messages]
@@ -0,0 +1,181 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from random import randint, uniform
+
+from .enums import ConnectionState
+
+
+@dataclass(frozen=True, slots=True)
+class PollState:
+    """
+    Session state observed after a poll, input of PollPolicy
+
+    Attributes:
+        connection_state (ConnectionState): CPDLC connection state
+        pending_replies (int): number of received uplinks still waiting for our reply
+        message_count (int): number of messages returned by the poll
+        failed (bool): whether the poll raised
+    """
+    connection_state: ConnectionState = ConnectionState.DISCONNECTED
+    pending_replies: int = 0
+    message_count: int = 0
+    failed: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class PollDecision:
+    """
+    Delay before the next poll and why it was chosen
+
+    Attributes:
+        interval (float): seconds until next poll
+        reason (str): short tag describing the rule which produced the interval
+    """
+    interval: float
+    reason: str
+
+
+class PollPolicy(ABC):
+    """
+    Decides how long the poller waits before polling again
+
+    Attributes:
+        _min_interval (int): Minimum interval to poll
+        _max_interval (int): Maximum interval to poll
+    """
+
+    def __init__(self, min_interval: int = 15, max_interval: int = 30):
+        """
+        Constructor for PollPolicy class
+        Args:
+            min_interval (int): Minimum interval to poll
+            max_interval (int): Maximum interval to poll
+        """
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+
+    @property
+    def min_interval(self) -> int:
+        return self._min_interval
+
+    @property
+    def max_interval(self) -> int:
+        return self._max_interval
+
+    def set_interval(self, min_interval: int, max_interval: int) -> None:
+        """
+        Change interval range, range is validated by the poller
+        """
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+
+    @abstractmethod
+    def decide(self, state: PollState) -> PollDecision:
+        """
+        Decide delay before next poll
+        Args:
+            state (PollState): state observed after the last poll
+        Returns:
+            PollDecision: next interval and reason
+        """
+
+
+class FixedPollPolicy(PollPolicy):
+    """
+    Constant interval of min_interval seconds regardless of state
+    """
+
+    def decide(self, state: PollState) -> PollDecision:
+        return PollDecision(self._min_interval, "fixed")
+
+
+class RandomPollPolicy(PollPolicy):
+    """
+    Uniformly random interval between min_interval and max_interval regardless of state
+    """
+
+    def decide(self, state: PollState) -> PollDecision:
+        return PollDecision(randint(self._min_interval, self._max_interval), "random")
+
+
+class AdaptivePollPolicy(PollPolicy):
+    """
+    Poll fast while a login or logout is in progress or uplinks wait for a reply,
+    otherwise start at min_interval after traffic and back off exponentially up to max_interval on empty polls.
+    Fast polling stops after fast_limit polls in a row without traffic, e.g. a logon the station never answers,
+    the idle back off applies until the state changes or messages arrive
+
+    Attributes:
+        _fast_interval (float): interval while connecting, disconnecting or awaiting replies
+        _fast_limit (int): fast polls in a row without traffic before the idle back off applies
+        _fast_polls (int): fast polls in a row without traffic so far
+        _backoff_factor (float): multiplier applied to the idle interval after an empty poll
+        _jitter (float): relative random spread applied to every interval, keeps sessions from polling in lockstep
+        _idle_interval (float): current idle interval
+    """
+
+    def __init__(self, min_interval: int = 15, max_interval: int = 30, fast_interval: float = 3,
+                 backoff_factor: float = 2, jitter: float = 0.1, fast_limit: int = 20):
+        """
+        Constructor for AdaptivePollPolicy class
+        Args:
+            min_interval (int): interval after a poll which returned messages
+            max_interval (int): upper bound of the idle back off
+            fast_interval (float): interval while connecting, disconnecting or awaiting replies
+            backoff_factor (float): multiplier applied to the idle interval after an empty poll
+            jitter (float): relative random spread applied to every interval
+            fast_limit (int): fast polls in a row without traffic before the idle back off applies
+        """
+        super().__init__(min_interval, max_interval)
+        self._fast_interval = fast_interval
+        self._fast_limit = fast_limit
+        self._fast_polls = 0
+        self._backoff_factor = backoff_factor
+        self._jitter = jitter
+        self._idle_interval: float = min_interval
+
+    @property
+    def fast_interval(self) -> float:
+        return self._fast_interval
+
+    @property
+    def fast_limit(self) -> int:
+        return self._fast_limit
+
+    @property
+    def idle_interval(self) -> float:
+        return self._idle_interval
+
+    def set_interval(self, min_interval: int, max_interval: int) -> None:
+        super().set_interval(min_interval, max_interval)
+        self._idle_interval = min(max(self._idle_interval, min_interval), max_interval)
+
+    def _spread(self, interval: float) -> float:
+        if self._jitter <= 0:
+            return interval
+        return interval * uniform(1 - self._jitter, 1 + self._jitter)
+
+    def decide(self, state: PollState) -> PollDecision:
+        if state.connection_state in (ConnectionState.CONNECTING, ConnectionState.DISCONNECTING):
+            reason = state.connection_state.name.lower()
+        elif state.pending_replies > 0:
+            reason = "awaiting_reply"
+        else:
+            reason = None
+        if reason is None or (state.message_count > 0 and not state.failed):
+            self._fast_polls = 0
+        if reason is not None and self._fast_polls < self._fast_limit:
+            self._fast_polls += 1
+            self._idle_interval = self._min_interval
+            return PollDecision(self._spread(self._fast_interval), reason)
+        if state.message_count > 0 and not state.failed:
+            self._idle_interval = self._min_interval
+            return PollDecision(self._spread(self._idle_interval), "traffic")
+        self._idle_interval = min(self._idle_interval * self._backoff_factor, self._max_interval)
+        if state.failed:
+            reason = "failed"
+        elif reason is None:
+            reason = "idle"
+        else:
+            reason = "fast_limit"
+        return PollDecision(self._spread(self._idle_interval), reason)
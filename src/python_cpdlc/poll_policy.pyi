@@ -0,0 +1,148 @@
+from abc import ABC, abstractmethod
+
+from .enums import ConnectionState as ConnectionState
+
+
+class PollState:
+    """
+    Session state observed after a poll, input of PollPolicy
+
+    Attributes:
+        connection_state (ConnectionState): CPDLC connection state
+        pending_replies (int): number of received uplinks still waiting for our reply
+        message_count (int): number of messages returned by the poll
+        failed (bool): whether the poll raised
+    """
+    connection_state: ConnectionState
+    pending_replies: int
+    message_count: int
+    failed: bool
+
+    def __init__(self, connection_state: ConnectionState = ..., pending_replies: int = 0, message_count: int = 0,
+                 failed: bool = False) -> None: ...
+
+
+class PollDecision:
+    """
+    Delay before the next poll and why it was chosen
+
+    Attributes:
+        interval (float): seconds until next poll
+        reason (str): short tag describing the rule which produced the interval
+    """
+    interval: float
+    reason: str
+
+    def __init__(self, interval: float, reason: str) -> None: ...
+
+
+class PollPolicy(ABC):
+    """
+    Decides how long the poller waits before polling again
+
+    Attributes:
+        _min_interval (int): Minimum interval to poll
+        _max_interval (int): Maximum interval to poll
+    """
+    _min_interval: int
+    _max_interval: int
+
+    def __init__(self, min_interval: int = 15, max_interval: int = 30) -> None:
+        """
+        Constructor for PollPolicy class
+        Args:
+            min_interval (int): Minimum interval to poll
+            max_interval (int): Maximum interval to poll
+        """
+        ...
+
+    @property
+    def min_interval(self) -> int: ...
+
+    @property
+    def max_interval(self) -> int: ...
+
+    def set_interval(self, min_interval: int, max_interval: int) -> None:
+        """
+        Change interval range, range is validated by the poller
+        """
+        ...
+
+    @abstractmethod
+    def decide(self, state: PollState) -> PollDecision:
+        """
+        Decide delay before next poll
+        Args:
+            state (PollState): state observed after the last poll
+        Returns:
+            PollDecision: next interval and reason
+        """
+        ...
+
+
+class FixedPollPolicy(PollPolicy):
+    """
+    Constant interval of min_interval seconds regardless of state
+    """
+
+    def decide(self, state: PollState) -> PollDecision: ...
+
+
+class RandomPollPolicy(PollPolicy):
+    """
+    Uniformly random interval between min_interval and max_interval regardless of state
+    """
+
+    def decide(self, state: PollState) -> PollDecision: ...
+
+
+class AdaptivePollPolicy(PollPolicy):
+    """
+    Poll fast while a login or logout is in progress or uplinks wait for a reply,
+    otherwise start at min_interval after traffic and back off exponentially up to max_interval on empty polls.
+    Fast polling stops after fast_limit polls in a row without traffic, e.g. a logon the station never answers,
+    the idle back off applies until the state changes or messages arrive
+
+    Attributes:
+        _fast_interval (float): interval while connecting, disconnecting or awaiting replies
+        _fast_limit (int): fast polls in a row without traffic before the idle back off applies
+        _fast_polls (int): fast polls in a row without traffic so far
+        _backoff_factor (float): multiplier applied to the idle interval after an empty poll
+        _jitter (float): relative random spread applied to every interval, keeps sessions from polling in lockstep
+        _idle_interval (float): current idle interval
+    """
+    _fast_interval: float
+    _fast_limit: int
+    _fast_polls: int
+    _backoff_factor: float
+    _jitter: float
+    _idle_interval: float
+
+    def __init__(self, min_interval: int = 15, max_interval: int = 30, fast_interval: float = 3,
+                 backoff_factor: float = 2, jitter: float = 0.1, fast_limit: int = 20) -> None:
+        """
+        Constructor for AdaptivePollPolicy class
+        Args:
+            min_interval (int): interval after a poll which returned messages
+            max_interval (int): upper bound of the idle back off
+            fast_interval (float): interval while connecting, disconnecting or awaiting replies
+            backoff_factor (float): multiplier applied to the idle interval after an empty poll
+            jitter (float): relative random spread applied to every interval
+            fast_limit (int): fast polls in a row without traffic before the idle back off applies
+        """
+        ...
+
+    @property
+    def fast_interval(self) -> float: ...
+
+    @property
+    def fast_limit(self) -> int: ...
+
+    @property
+    def idle_interval(self) -> float: ...
+
+    def set_interval(self, min_interval: int, max_interval: int) -> None: ...
+
+    def _spread(self, interval: float) -> float: ...
+
+    def decide(self, state: PollState) -> PollDecision: ...
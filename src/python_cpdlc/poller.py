@@ -1,67 +1,140 @@
+from asyncio import CancelledError, Event as AsyncEvent, Task, TimeoutError as AsyncTimeoutError, get_running_loop, \
+    wait_for
 from datetime import datetime
-from random import randint
 from threading import Event, Lock, Thread
 from time import monotonic
-from typing import Callable, Optional
+from typing import Awaitable, Callable, Optional
 
 from loguru import logger
 
+from . import logging_mode
+from .circuit_breaker import BackoffPolicy, CircuitBreaker
+from .enums import CircuitState
+from .poll_policy import AdaptivePollPolicy, PollDecision, PollPolicy, PollState
 
-class Poller:
+# failure classification and degrade threshold when no backoff is set
+_DEFAULT_BACKOFF = BackoffPolicy()
+
+
+class PollerBase:
     """
-    Used to execute a function at regular intervals, the time delay fluctuates between min_interval and max_interval
+    Interval handling shared by all pollers, the delay before each poll is decided by a PollPolicy
+
+    Failed polls are not left to the policy, whether the server was unreachable, answered with a 5xx status or the
+    poll raised, the poller waits a BackoffPolicy delay which grows with the failures in a row. With a
+    CircuitBreaker the poller holds its polls while the circuit is open and polls again a random share of the
+    backoff after it may close, so sessions sharing the circuit do not return together. The link counts as degraded
+    after degrade_after failures in a row or while the circuit is open, and as recovered with the next poll the
+    server answers
 
     Attributes:
-        _poll_function (Callable[[], None]): Function to be executed at regular intervals
-        _min_interval (int): Minimum interval to poll
-        _max_interval (int): Maximum interval to poll
+        _policy (PollPolicy): poll scheduling policy
         _lock (threading.Lock): Lock to acquire lock
-        _exit_event (threading.Event): Thread exit event
-        _task (threading.Thread): Thread handler
+        _last_decision (Optional[PollDecision]): decision taken after the last poll
+        _decision_callback (Optional[Callable[[PollDecision], None]]): called with every decision
+        _backoff (Optional[BackoffPolicy]): wait after failed polls, None leaves it to the policy
+        _circuit_breaker (Optional[CircuitBreaker]): circuit of the polled server, None polls regardless
+        _failures (int): polls failed in a row
+        _degraded_since (Optional[float]): monotonic time the link degraded, None while it is up
+        _link_degraded_callback (Optional[Callable[[int], None]]): called with the failures in a row when the
+            link degrades
+        _link_recovered_callback (Optional[Callable[[float], None]]): called with the seconds the link was
+            degraded when it recovers
     """
 
-    def __init__(
-            self,
-            poll_function: Callable[[], None],
-            min_interval: int = 15,
-            max_interval: int = 30
-    ):
+    def __init__(self, min_interval: int = 15, max_interval: int = 30, policy: Optional[PollPolicy] = None):
         """
-        Constructor for Poller class
+        Constructor for PollerBase class
         Args:
-            poll_function (Callable[[], None]): Function to be executed at regular intervals
             min_interval (int): Minimum interval to poll
             max_interval (int): Maximum interval to poll
+            policy (Optional[PollPolicy]): poll scheduling policy, AdaptivePollPolicy when None
         """
-        logger.trace(f"Poller initializing with "
-                     f"min_interval={min_interval}s, max_interval={max_interval}s")
-        self._poll_function = poll_function
-        self._min_interval = min_interval
-        self._max_interval = max_interval
+        if min_interval > max_interval:
+            raise ValueError(f"min_interval={min_interval} > max_interval={max_interval}")
+        self._policy = policy if policy is not None else AdaptivePollPolicy(min_interval, max_interval)
         self._lock = Lock()
-        self._exit_event = Event()
-        self._task: Optional[Thread] = None
-        logger.trace("Poller initialized")
+        self._last_decision: Optional[PollDecision] = None
+        self._decision_callback: Optional[Callable[[PollDecision], None]] = None
+        self._backoff: Optional[BackoffPolicy] = BackoffPolicy()
+        self._circuit_breaker: Optional[CircuitBreaker] = None
+        self._failures = 0
+        self._degraded_since: Optional[float] = None
+        self._link_degraded_callback: Optional[Callable[[int], None]] = None
+        self._link_recovered_callback: Optional[Callable[[float], None]] = None
 
-    def _polling_loop(self) -> None:
+    @property
+    def policy(self) -> PollPolicy:
+        return self._policy
+
+    @property
+    def last_decision(self) -> Optional[PollDecision]:
+        return self._last_decision
+
+    @property
+    def backoff(self) -> Optional[BackoffPolicy]:
+        return self._backoff
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        return self._circuit_breaker
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    @property
+    def degraded(self) -> bool:
+        return self._degraded_since is not None
+
+    def set_policy(self, policy: PollPolicy) -> None:
         """
-        Internal loop execution function
+        Replace poll scheduling policy, takes effect after the current wait
+        Args:
+            policy (PollPolicy): new policy
         """
-        logger.trace(f"Poll thread started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        while not self._exit_event.is_set():
-            with self._lock:
-                interval = randint(self._min_interval, self._max_interval)
+        with self._lock:
+            self._policy = policy
 
-            try:
-                start_time = monotonic()
-                self._poll_function()
-                elapsed = monotonic() - start_time
-                logger.trace(f"Current polling loop elapsed time: {elapsed:.6}s")
-            except Exception as e:
-                logger.error(f"Exception occurred while polling: {e}")
+    def set_decision_callback(self, callback: Optional[Callable[[PollDecision], None]]) -> None:
+        """
+        Set callback called with every poll decision, None to remove it
+        Args:
+            callback (Optional[Callable[[PollDecision], None]]): callback
+        """
+        self._decision_callback = callback
 
-            self._exit_event.wait(timeout=interval)
-        logger.trace(f"Poll thread stopped at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    def set_backoff(self, backoff: Optional[BackoffPolicy]) -> None:
+        """
+        Set wait after failed polls, None leaves it to the poll policy
+        Args:
+            backoff (Optional[BackoffPolicy]): backoff policy
+        """
+        self._backoff = backoff
+
+    def set_circuit_breaker(self, circuit_breaker: Optional[CircuitBreaker]) -> None:
+        """
+        Set circuit of the polled server, usually shared with every session polling it, None polls regardless
+        Args:
+            circuit_breaker (Optional[CircuitBreaker]): circuit breaker
+        """
+        self._circuit_breaker = circuit_breaker
+
+    def set_link_degraded_callback(self, callback: Optional[Callable[[int], None]]) -> None:
+        """
+        Set callback called with the failures in a row when the link degrades, None to remove it
+        Args:
+            callback (Optional[Callable[[int], None]]): callback
+        """
+        self._link_degraded_callback = callback
+
+    def set_link_recovered_callback(self, callback: Optional[Callable[[float], None]]) -> None:
+        """
+        Set callback called with the seconds the link was degraded when it recovers, None to remove it
+        Args:
+            callback (Optional[Callable[[float], None]]): callback
+        """
+        self._link_recovered_callback = callback
 
     def set_interval(self, min_interval: int, max_interval: int) -> None:
         """
@@ -73,18 +146,159 @@ class Poller:
             ValueError: When min_interval greater than max_interval
         """
         if min_interval > max_interval:
-            logger.error(f"Min interval must be less than max interval but got {min_interval} and {max_interval}")
+            logger.error("Min interval must be less than max interval but got {} and {}", min_interval, max_interval)
             raise ValueError(f"min_interval={min_interval} > max_interval={max_interval}")
         with self._lock:
-            self._min_interval = min_interval
-            self._max_interval = max_interval
+            self._policy.set_interval(min_interval, max_interval)
+
+    def _hold(self) -> Optional[PollDecision]:
+        """
+        Decide whether the circuit lets the next poll through, for internal use only
+        Returns:
+            None to poll now, otherwise the decision to wait instead
+        """
+        circuit = self._circuit_breaker
+        if circuit is None or circuit.allow():
+            return None
+        self._degrade()
+        spread = 0.0 if self._backoff is None else self._backoff.delay(self._failures + 1)
+        return self._publish(PollDecision(circuit.retry_in() + spread, "circuit_open"))
+
+    def _decide(self, state: Optional[PollState], error: Optional[BaseException] = None) -> PollDecision:
+        """
+        Decide the next interval after a poll and publish the decision, for internal use only
+        Only a poll which returned counts as a success, an error outside failure_on is left to the poll policy
+        without resetting the failures in a row or closing the circuit
+        Args:
+            state (Optional[PollState]): state returned by the poll
+            error (Optional[BaseException]): exception raised by the poll, None when it returned
+        """
+        backoff = self._backoff
+        rules = backoff if backoff is not None else _DEFAULT_BACKOFF
+        circuit = self._circuit_breaker
+        if error is not None and isinstance(error, rules.failure_on):
+            self._failures += 1
+            if circuit is not None:
+                circuit.record_failure()
+            if self._failures >= rules.degrade_after or (circuit is not None and circuit.state is CircuitState.OPEN):
+                self._degrade()
+            if backoff is not None:
+                return self._publish(PollDecision(backoff.delay(self._failures), "backoff"))
+        elif error is None:
+            if circuit is not None:
+                circuit.record_success()
+            self._failures = 0
+            if self._degraded_since is not None:
+                self._recover()
+        with self._lock:
+            decision = self._policy.decide(state if state is not None else PollState())
+        return self._publish(decision)
+
+    def _degrade(self) -> None:
+        """
+        Mark the link degraded and call the degraded callback once, for internal use only
+        """
+        if self._degraded_since is not None:
+            return
+        self._degraded_since = monotonic()
+        logger.warning("Link degraded after {} failed polls in a row", self._failures)
+        if self._link_degraded_callback is not None:
+            try:
+                self._link_degraded_callback(self._failures)
+            except Exception as e:
+                logger.error("Exception occurred while calling link degraded callback: {}", e)
+
+    def _recover(self) -> None:
+        """
+        Mark the link up again and call the recovered callback, for internal use only
+        """
+        downtime = monotonic() - self._degraded_since
+        self._degraded_since = None
+        logger.info("Link recovered after {:.1f}s", downtime)
+        if self._link_recovered_callback is not None:
+            try:
+                self._link_recovered_callback(downtime)
+            except Exception as e:
+                logger.error("Exception occurred while calling link recovered callback: {}", e)
+
+    def _publish(self, decision: PollDecision) -> PollDecision:
+        """
+        Record a decision and call the decision callback, for internal use only
+        """
+        with self._lock:
+            self._last_decision = decision
+        if self._decision_callback is not None:
+            try:
+                self._decision_callback(decision)
+            except Exception as e:
+                logger.error("Exception occurred while calling decision callback: {}", e)
+        if logging_mode.HOT_PATH_LOGGING:
+            logger.trace("Next poll in {:.3f}s ({})", decision.interval, decision.reason)
+        return decision
+
+
+class Poller(PollerBase):
+    """
+    Used to execute a function at regular intervals, the delay before each poll is decided by a PollPolicy
+    which receives the PollState returned by the poll function
+
+    Attributes:
+        _poll_function (Callable[[], Optional[PollState]]): Function to be executed at regular intervals
+        _exit_event (threading.Event): Thread exit event
+        _task (threading.Thread): Thread handler
+    """
+
+    def __init__(
+            self,
+            poll_function: Callable[[], Optional[PollState]],
+            min_interval: int = 15,
+            max_interval: int = 30,
+            policy: Optional[PollPolicy] = None
+    ):
+        """
+        Constructor for Poller class
+        Args:
+            poll_function (Callable[[], Optional[PollState]]): Function to be executed at regular intervals
+            min_interval (int): Minimum interval to poll
+            max_interval (int): Maximum interval to poll
+            policy (Optional[PollPolicy]): poll scheduling policy, AdaptivePollPolicy when None
+        """
+        logger.trace("Poller initializing with min_interval={}s, max_interval={}s", min_interval, max_interval)
+        super().__init__(min_interval, max_interval, policy)
+        self._poll_function = poll_function
+        self._exit_event = Event()
+        self._task: Optional[Thread] = None
+        logger.trace("Poller initialized")
+
+    def _polling_loop(self) -> None:
+        """
+        Internal loop execution function
+        """
+        logger.trace("Poll thread started at {:%Y-%m-%d %H:%M:%S}", datetime.now())
+        while not self._exit_event.is_set():
+            decision = self._hold()
+            if decision is None:
+                error = None
+                try:
+                    start_time = monotonic()
+                    state = self._poll_function()
+                    if logging_mode.HOT_PATH_LOGGING:
+                        logger.trace("Current polling loop elapsed time: {:.6}s", monotonic() - start_time)
+                except Exception as e:
+                    logger.error("Exception occurred while polling: {}", e)
+                    state = PollState(failed=True)
+                    error = e
+                decision = self._decide(state, error)
+
+            self._exit_event.wait(timeout=decision.interval)
+        logger.trace("Poll thread stopped at {:%Y-%m-%d %H:%M:%S}", datetime.now())
 
     def start(self):
         """
         Start polling thread
         """
         if self._task is None or not self._task.is_alive():
-            logger.debug(f"Poll thread starting")
+            logger.debug("Poll thread starting")
             self._exit_event.clear()
             self._task = Thread(target=self._polling_loop, daemon=True)
             self._task.start()
@@ -94,7 +308,96 @@ class Poller:
         Stop polling thread
         """
         if self._task and self._task.is_alive():
-            logger.debug(f"Poll thread stopping")
+            logger.debug("Poll thread stopping")
             self._exit_event.set()
             self._task.join()
             self._task = None
+
+
+class AsyncPoller(PollerBase):
+    """
+    Asyncio version of Poller, runs the poll coroutine as a task on the current event loop
+    instead of a dedicated thread
+
+    Attributes:
+        _poll_function (Callable[[], Awaitable[Optional[PollState]]]): Coroutine function to be executed
+            at regular intervals
+        _exit_event (Optional[asyncio.Event]): Task exit event
+        _task (Optional[asyncio.Task]): Task handler
+    """
+
+    def __init__(
+            self,
+            poll_function: Callable[[], Awaitable[Optional[PollState]]],
+            min_interval: int = 15,
+            max_interval: int = 30,
+            policy: Optional[PollPolicy] = None
+    ):
+        """
+        Constructor for AsyncPoller class
+        Args:
+            poll_function (Callable[[], Awaitable[Optional[PollState]]]): Coroutine function to be executed
+                at regular intervals
+            min_interval (int): Minimum interval to poll
+            max_interval (int): Maximum interval to poll
+            policy (Optional[PollPolicy]): poll scheduling policy, AdaptivePollPolicy when None
+        """
+        logger.trace("AsyncPoller initializing with min_interval={}s, max_interval={}s", min_interval, max_interval)
+        super().__init__(min_interval, max_interval, policy)
+        self._poll_function = poll_function
+        self._exit_event: Optional[AsyncEvent] = None
+        self._task: Optional[Task] = None
+        logger.trace("AsyncPoller initialized")
+
+    async def _polling_loop(self) -> None:
+        """
+        Internal loop execution coroutine
+        """
+        logger.trace("Poll task started at {:%Y-%m-%d %H:%M:%S}", datetime.now())
+        while not self._exit_event.is_set():
+            decision = self._hold()
+            if decision is None:
+                error = None
+                try:
+                    start_time = monotonic()
+                    state = await self._poll_function()
+                    if logging_mode.HOT_PATH_LOGGING:
+                        logger.trace("Current polling loop elapsed time: {:.6}s", monotonic() - start_time)
+                except CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error("Exception occurred while polling: {}", e)
+                    state = PollState(failed=True)
+                    error = e
+                decision = self._decide(state, error)
+
+            try:
+                await wait_for(self._exit_event.wait(), timeout=decision.interval)
+            except AsyncTimeoutError:
+                pass
+        logger.trace("Poll task stopped at {:%Y-%m-%d %H:%M:%S}", datetime.now())
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """
+        Start polling task, must be called from a running event loop
+        Raises:
+            RuntimeError: When there is no running event loop
+        """
+        if not self.running:
+            logger.debug("Poll task starting")
+            self._exit_event = AsyncEvent()
+            self._task = get_running_loop().create_task(self._polling_loop())
+
+    async def stop(self):
+        """
+        Stop polling task and wait for it to finish
+        """
+        if self.running:
+            logger.debug("Poll task stopping")
+            self._exit_event.set()
+            await self._task
+        self._task = None
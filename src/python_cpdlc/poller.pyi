@@ -1,28 +1,124 @@
+from asyncio import Event as AsyncEvent, Task
 from threading import Event, Lock, Thread
-from typing import Callable, Optional
+from typing import Awaitable, Callable, Optional
 
+from .circuit_breaker import BackoffPolicy as BackoffPolicy, CircuitBreaker as CircuitBreaker
+from .enums import CircuitState as CircuitState
+from .poll_policy import AdaptivePollPolicy as AdaptivePollPolicy, PollDecision as PollDecision, \
+    PollPolicy as PollPolicy, PollState as PollState
 
-class Poller:
-    _poll_function: Callable[[], None]
-    _min_interval: int
-    _max_interval: int
+_DEFAULT_BACKOFF: BackoffPolicy
+
+
+class PollerBase:
+    """
+    Interval handling shared by all pollers, the delay before each poll is decided by a PollPolicy
+
+    Failed polls are not left to the policy, whether the server was unreachable, answered with a 5xx status or the
+    poll raised, the poller waits a BackoffPolicy delay which grows with the failures in a row. With a
+    CircuitBreaker the poller holds its polls while the circuit is open and polls again a random share of the
+    backoff after it may close, so sessions sharing the circuit do not return together. The link counts as degraded
+    after degrade_after failures in a row or while the circuit is open, and as recovered with the next poll the
+    server answers
+
+    Attributes:
+        _policy (PollPolicy): poll scheduling policy
+        _lock (threading.Lock): Lock to acquire lock
+        _last_decision (Optional[PollDecision]): decision taken after the last poll
+        _decision_callback (Optional[Callable[[PollDecision], None]]): called with every decision
+        _backoff (Optional[BackoffPolicy]): wait after failed polls, None leaves it to the policy
+        _circuit_breaker (Optional[CircuitBreaker]): circuit of the polled server, None polls regardless
+        _failures (int): polls failed in a row
+        _degraded_since (Optional[float]): monotonic time the link degraded, None while it is up
+        _link_degraded_callback (Optional[Callable[[int], None]]): called with the failures in a row when the
+            link degrades
+        _link_recovered_callback (Optional[Callable[[float], None]]): called with the seconds the link was
+            degraded when it recovers
+    """
+    _policy: PollPolicy
     _lock: Lock
-    _exit_event: Event
-    _task: Optional[Thread]
+    _last_decision: Optional[PollDecision]
+    _decision_callback: Optional[Callable[[PollDecision], None]]
+    _backoff: Optional[BackoffPolicy]
+    _circuit_breaker: Optional[CircuitBreaker]
+    _failures: int
+    _degraded_since: Optional[float]
+    _link_degraded_callback: Optional[Callable[[int], None]]
+    _link_recovered_callback: Optional[Callable[[float], None]]
 
-    def __init__(self, poll_function: Callable[[], None], min_interval: int = 15, max_interval: int = 30) -> None:
+    def __init__(self, min_interval: int = 15, max_interval: int = 30, policy: Optional[PollPolicy] = None) -> None:
         """
-        Constructor for Poller class
+        Constructor for PollerBase class
         Args:
-            poll_function (Callable[[], None]): Function to be executed at regular intervals
             min_interval (int): Minimum interval to poll
             max_interval (int): Maximum interval to poll
+            policy (Optional[PollPolicy]): poll scheduling policy, AdaptivePollPolicy when None
         """
         ...
 
-    def _polling_loop(self) -> None:
+    @property
+    def policy(self) -> PollPolicy: ...
+
+    @property
+    def last_decision(self) -> Optional[PollDecision]: ...
+
+    @property
+    def backoff(self) -> Optional[BackoffPolicy]: ...
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]: ...
+
+    @property
+    def failures(self) -> int: ...
+
+    @property
+    def degraded(self) -> bool: ...
+
+    def set_policy(self, policy: PollPolicy) -> None:
         """
-        Internal loop execution function
+        Replace poll scheduling policy, takes effect after the current wait
+        Args:
+            policy (PollPolicy): new policy
+        """
+        ...
+
+    def set_decision_callback(self, callback: Optional[Callable[[PollDecision], None]]) -> None:
+        """
+        Set callback called with every poll decision, None to remove it
+        Args:
+            callback (Optional[Callable[[PollDecision], None]]): callback
+        """
+        ...
+
+    def set_backoff(self, backoff: Optional[BackoffPolicy]) -> None:
+        """
+        Set wait after failed polls, None leaves it to the poll policy
+        Args:
+            backoff (Optional[BackoffPolicy]): backoff policy
+        """
+        ...
+
+    def set_circuit_breaker(self, circuit_breaker: Optional[CircuitBreaker]) -> None:
+        """
+        Set circuit of the polled server, usually shared with every session polling it, None polls regardless
+        Args:
+            circuit_breaker (Optional[CircuitBreaker]): circuit breaker
+        """
+        ...
+
+    def set_link_degraded_callback(self, callback: Optional[Callable[[int], None]]) -> None:
+        """
+        Set callback called with the failures in a row when the link degrades, None to remove it
+        Args:
+            callback (Optional[Callable[[int], None]]): callback
+        """
+        ...
+
+    def set_link_recovered_callback(self, callback: Optional[Callable[[float], None]]) -> None:
+        """
+        Set callback called with the seconds the link was degraded when it recovers, None to remove it
+        Args:
+            callback (Optional[Callable[[float], None]]): callback
         """
         ...
 
@@ -37,6 +133,76 @@ class Poller:
         """
         ...
 
+    def _hold(self) -> Optional[PollDecision]:
+        """
+        Decide whether the circuit lets the next poll through, for internal use only
+        Returns:
+            None to poll now, otherwise the decision to wait instead
+        """
+        ...
+
+    def _decide(self, state: Optional[PollState], error: Optional[BaseException] = None) -> PollDecision:
+        """
+        Decide the next interval after a poll and publish the decision, for internal use only
+        Only a poll which returned counts as a success, an error outside failure_on is left to the poll policy
+        without resetting the failures in a row or closing the circuit
+        Args:
+            state (Optional[PollState]): state returned by the poll
+            error (Optional[BaseException]): exception raised by the poll, None when it returned
+        """
+        ...
+
+    def _degrade(self) -> None:
+        """
+        Mark the link degraded and call the degraded callback once, for internal use only
+        """
+        ...
+
+    def _recover(self) -> None:
+        """
+        Mark the link up again and call the recovered callback, for internal use only
+        """
+        ...
+
+    def _publish(self, decision: PollDecision) -> PollDecision:
+        """
+        Record a decision and call the decision callback, for internal use only
+        """
+        ...
+
+
+class Poller(PollerBase):
+    """
+    Used to execute a function at regular intervals, the delay before each poll is decided by a PollPolicy
+    which receives the PollState returned by the poll function
+
+    Attributes:
+        _poll_function (Callable[[], Optional[PollState]]): Function to be executed at regular intervals
+        _exit_event (threading.Event): Thread exit event
+        _task (threading.Thread): Thread handler
+    """
+    _poll_function: Callable[[], Optional[PollState]]
+    _exit_event: Event
+    _task: Optional[Thread]
+
+    def __init__(self, poll_function: Callable[[], Optional[PollState]], min_interval: int = 15,
+                 max_interval: int = 30, policy: Optional[PollPolicy] = None) -> None:
+        """
+        Constructor for Poller class
+        Args:
+            poll_function (Callable[[], Optional[PollState]]): Function to be executed at regular intervals
+            min_interval (int): Minimum interval to poll
+            max_interval (int): Maximum interval to poll
+            policy (Optional[PollPolicy]): poll scheduling policy, AdaptivePollPolicy when None
+        """
+        ...
+
+    def _polling_loop(self) -> None:
+        """
+        Internal loop execution function
+        """
+        ...
+
     def start(self) -> None:
         """
         Start polling thread
@@ -48,3 +214,55 @@ class Poller:
         Stop polling thread
         """
         ...
+
+
+class AsyncPoller(PollerBase):
+    """
+    Asyncio version of Poller, runs the poll coroutine as a task on the current event loop
+    instead of a dedicated thread
+
+    Attributes:
+        _poll_function (Callable[[], Awaitable[Optional[PollState]]]): Coroutine function to be executed
+            at regular intervals
+        _exit_event (Optional[asyncio.Event]): Task exit event
+        _task (Optional[asyncio.Task]): Task handler
+    """
+    _poll_function: Callable[[], Awaitable[Optional[PollState]]]
+    _exit_event: Optional[AsyncEvent]
+    _task: Optional[Task]
+
+    def __init__(self, poll_function: Callable[[], Awaitable[Optional[PollState]]], min_interval: int = 15,
+                 max_interval: int = 30, policy: Optional[PollPolicy] = None) -> None:
+        """
+        Constructor for AsyncPoller class
+        Args:
+            poll_function (Callable[[], Awaitable[Optional[PollState]]]): Coroutine function to be executed
+                at regular intervals
+            min_interval (int): Minimum interval to poll
+            max_interval (int): Maximum interval to poll
+            policy (Optional[PollPolicy]): poll scheduling policy, AdaptivePollPolicy when None
+        """
+        ...
+
+    async def _polling_loop(self) -> None:
+        """
+        Internal loop execution coroutine
+        """
+        ...
+
+    @property
+    def running(self) -> bool: ...
+
+    def start(self) -> None:
+        """
+        Start polling task, must be called from a running event loop
+        Raises:
+            RuntimeError: When there is no running event loop
+        """
+        ...
+
+    async def stop(self) -> None:
+        """
+        Stop polling task and wait for it to finish
+        """
+        ...
@@ -0,0 +1,382 @@
+"""
+Replay recorded poll responses through a CPDLC session as fast as possible or on a scaled recorded clock
+
+Usage:
+    python -m python_cpdlc.replay capture.ndjson [--speed 10] [--callbacks 4] [--no-dedup] [--no-stages] [--json]
+"""
+from argparse import ArgumentParser
+from dataclasses import dataclass, field
+from json import JSONDecodeError, JSONEncoder, dumps, loads
+from pathlib import Path
+from threading import Lock
+from time import monotonic, perf_counter, sleep, time
+from typing import Iterable, Iterator, Optional, Union
+from urllib.parse import parse_qs
+
+from httpx import AsyncBaseTransport, BaseTransport, Request, Response
+from loguru import logger
+
+from .cpdlc import CPDLC
+from .cpdlc_base import CPDLCBase
+from .dedup import MessageDeduplicator
+from .enums import PacketType, TraceStage
+from .exception import ParameterError
+from .metrics import MetricsRegistry
+from .tracing import SpanContext, Tracer
+from .transport import MemoryTransport
+
+_ENCODER = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedResponse:
+    """
+    Body of one recorded poll response
+
+    Attributes:
+        body (bytes): raw response body as returned by connect.html
+        epoch (Optional[float]): epoch seconds the response was received, None when not recorded
+        encoding (str): encoding of the body
+    """
+    body: bytes
+    epoch: Optional[float] = None
+    encoding: str = "utf-8"
+
+
+def read_recording(path: Union[str, Path]) -> Iterator[RecordedResponse]:
+    """
+    Read a recording, one response per line
+    Lines written by RecordingTransport are JSON arrays [epoch, body, encoding] whose body holds the raw bytes
+    decoded as latin-1, so every byte survives the round trip. Arrays [epoch, body] of older recordings and any
+    other line are taken as UTF-8 text, the latter without timing
+    Args:
+        path (str | Path): recording file
+    Returns:
+        iterator of responses
+    """
+    with Path(path).open(encoding="utf-8") as file:
+        for line in file:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            if line.startswith("["):
+                try:
+                    fields = loads(line)
+                    if len(fields) == 3:
+                        epoch, body, encoding = fields
+                        response = RecordedResponse(body.encode("latin-1"), epoch, encoding)
+                    else:
+                        epoch, body = fields
+                        response = RecordedResponse(body.encode(), epoch)
+                except (JSONDecodeError, TypeError, ValueError, AttributeError):
+                    logger.warning("Skipping unreadable recording line: {!r}", line[:80])
+                    continue
+                yield response
+                continue
+            yield RecordedResponse(line.encode())
+
+
+def _encode(epoch: Optional[float], body: bytes, encoding: str) -> str:
+    """
+    Recording line of one response, for internal use only
+    """
+    return _ENCODER.encode([epoch, body.decode("latin-1"), encoding])
+
+
+def write_recording(path: Union[str, Path], responses: Iterable[RecordedResponse]) -> int:
+    """
+    Append responses to a recording
+    Args:
+        path (str | Path): recording file
+        responses (Iterable[RecordedResponse]): responses to write
+    Returns:
+        number of responses written
+    """
+    count = 0
+    with Path(path).open("a", encoding="utf-8") as file:
+        for response in responses:
+            file.write(f"{_encode(response.epoch, response.body, response.encoding)}\n")
+            count += 1
+    return count
+
+
+class RecordingTransport(BaseTransport, AsyncBaseTransport):
+    """
+    Transport appending the raw body of every successful poll response to a recording, other requests pass through
+
+    Examples:
+        transport = RecordingTransport("capture.ndjson", httpx.HTTPTransport())\n
+        cpdlc = CPDLC(transport=transport)\n
+
+    Attributes:
+        _transport (httpx.BaseTransport | httpx.AsyncBaseTransport): transport sending the requests
+        _file (TextIO): recording opened for appending
+        _lock (Lock): serializes writes of concurrent requests
+        _recorded (int): responses recorded
+    """
+
+    def __init__(self, path: Union[str, Path], transport: Union[BaseTransport, AsyncBaseTransport]):
+        """
+        Constructor for RecordingTransport class
+        Args:
+            path (str | Path): recording file, created or appended to
+            transport (httpx.BaseTransport | httpx.AsyncBaseTransport): transport sending the requests
+        """
+        self._transport = transport
+        self._file = Path(path).open("a", encoding="utf-8")
+        self._lock = Lock()
+        self._recorded = 0
+
+    @property
+    def recorded(self) -> int:
+        return self._recorded
+
+    def _record(self, request: Request, response: Response) -> None:
+        """
+        Append the body of a poll response, for internal use only
+        """
+        if response.status_code != 200 or parse_qs(request.content.decode()).get("type") != [PacketType.POLL.value]:
+            return
+        with self._lock:
+            self._file.write(f"{_encode(time(), response.content, response.encoding or 'utf-8')}\n")
+            self._file.flush()
+            self._recorded += 1
+
+    def handle_request(self, request: Request) -> Response:
+        request.read()
+        response = self._transport.handle_request(request)
+        response.read()
+        self._record(request, response)
+        return response
+
+    async def handle_async_request(self, request: Request) -> Response:
+        await request.aread()
+        response = await self._transport.handle_async_request(request)
+        await response.aread()
+        self._record(request, response)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+        self._file.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+        self._file.close()
+
+
+class _StageClock(Tracer):
+    """
+    Tracer summing the time spent per stage, for internal use only
+    """
+
+    def __init__(self):
+        self.seconds: dict[TraceStage, float] = dict.fromkeys(TraceStage, 0.0)
+
+    def start_span(self, context: SpanContext) -> float:
+        return perf_counter()
+
+    def end_span(self, context: SpanContext, token: float, error: Optional[BaseException]) -> None:
+        self.seconds[context.stage] += perf_counter() - token
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayReport:
+    """
+    Result of one replay
+
+    Attributes:
+        responses (int): responses replayed
+        messages (int): messages parsed
+        duplicates (int): parsed messages dropped as duplicates
+        errors (int): responses whose handling raised
+        elapsed (float): wall seconds of the replay, including the pauses of a paced replay
+        stage_seconds (dict[str, float]): seconds spent in parse, handle and callback, empty without stages
+        transitions (dict[str, int]): connection state transitions keyed by "FROM->TO"
+    """
+    responses: int
+    messages: int
+    duplicates: int
+    errors: int
+    elapsed: float
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    transitions: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "responses": self.responses,
+            "messages": self.messages,
+            "duplicates": self.duplicates,
+            "errors": self.errors,
+            "elapsed_s": self.elapsed,
+            "messages_per_second": self.messages_per_second,
+            "stage_seconds": dict(self.stage_seconds),
+            "transitions": dict(self.transitions)
+        }
+
+
+def replay_session(callsign: str = "REPLAY") -> CPDLC:
+    """
+    Create an initialized CPDLC session answered by a MemoryTransport, with its poller stopped
+    Args:
+        callsign (str): callsign of the session
+    Returns:
+        session ready for ReplayEngine
+    """
+    session = CPDLC(transport=MemoryTransport())
+    session.set_acars_url("http://replay.invalid/acars/system")
+    session.set_callsign(callsign)
+    session.set_logon_code("REPLAY")
+    session.initialize_service()
+    session.stop_poller()
+    return session
+
+
+class ReplayEngine:
+    """
+    Streams recorded poll responses through the inbound pipeline of a session, without poller sleeps or network
+
+    Every response runs through _process_poll_response with its raw body, so it is parsed, de-duplicated, handled
+    and delivered to the receiver callbacks exactly like a polled one. Without speed responses follow each other
+    immediately, with speed the recorded gaps between responses are replayed divided by speed. Either way the
+    de-duplication window and reply timers run on the recorded clock, so they expire as they did while recording.
+    While replaying, the session uses a MetricsRegistry of its own and, with stages, a tracer timing every stage;
+    its previous metrics and tracer are restored afterwards.
+
+    Examples:
+        engine = ReplayEngine()\n
+        engine.session.add_message_receiver_callback(on_message)\n
+        report = engine.run(read_recording("capture.ndjson"))\n
+        print(report.messages_per_second, report.transitions)\n
+
+    Attributes:
+        _session (CPDLCBase): session the responses are replayed through
+        _speed (Optional[float]): replay speed against the recorded clock, None replays as fast as possible
+        _stages (bool): whether the time per stage is measured
+    """
+
+    def __init__(self, session: Optional[CPDLCBase] = None, speed: Optional[float] = None, stages: bool = True):
+        """
+        Constructor for ReplayEngine class
+        Args:
+            session (Optional[CPDLCBase]): session replayed through, a replay_session when None
+            speed (Optional[float]): replay speed against the recorded clock, None replays as fast as possible
+            stages (bool): measure the time per stage, adds a span around every stage
+        Raises:
+            ParameterError: when speed is not positive
+        """
+        if speed is not None and speed <= 0:
+            raise ParameterError("speed must be positive")
+        self._session = session if session is not None else replay_session()
+        self._speed = speed
+        self._stages = stages
+
+    @property
+    def session(self) -> CPDLCBase:
+        return self._session
+
+    def _pause(self, response: RecordedResponse, begin: float, first_epoch: Optional[float]) -> None:
+        """
+        Sleep until a paced response is due, for internal use only
+        """
+        if self._speed is None or response.epoch is None or first_epoch is None:
+            return
+        delay = begin + (response.epoch - first_epoch) / self._speed - perf_counter()
+        if delay > 0:
+            sleep(delay)
+
+    def run(self, responses: Iterable[Union[RecordedResponse, str]]) -> ReplayReport:
+        """
+        Replay responses in order
+        Args:
+            responses (Iterable[RecordedResponse | str]): recorded responses or bare response bodies
+        Returns:
+            replay report
+        """
+        session = self._session
+        metrics, tracer = session.metrics, session.tracer
+        registry = MetricsRegistry()
+        clock = _StageClock() if self._stages else None
+        session.set_metrics(registry)
+        session.set_tracer(clock)
+        count = errors = 0
+        first_epoch = None
+        start = monotonic()
+        begin = perf_counter()
+        try:
+            for response in responses:
+                if isinstance(response, str):
+                    response = RecordedResponse(response.encode())
+                if first_epoch is None:
+                    first_epoch = response.epoch
+                self._pause(response, begin, first_epoch)
+                # recorded epochs are moved onto the monotonic clock the window and timers are kept on
+                now = None
+                if response.epoch is not None and first_epoch is not None:
+                    now = start + response.epoch - first_epoch
+                try:
+                    session._process_poll_response(response.body, response.encoding, now)
+                except Exception as e:
+                    errors += 1
+                    logger.warning("Replayed response {} raised: {}", count, e)
+                count += 1
+        finally:
+            elapsed = perf_counter() - begin
+            session.set_metrics(metrics)
+            session.set_tracer(tracer)
+        polls = registry.snapshot()
+        return ReplayReport(
+            responses=count,
+            messages=polls["polls"]["messages"],
+            duplicates=polls["polls"]["duplicates"],
+            errors=errors,
+            elapsed=elapsed,
+            stage_seconds={} if clock is None else {stage.value: seconds for stage, seconds in clock.seconds.items()
+                                                   if stage is not TraceStage.REQUEST},
+            transitions=polls["state_transitions"]
+        )
+
+    def run_file(self, path: Union[str, Path]) -> ReplayReport:
+        """
+        Replay every response of a recording
+        Args:
+            path (str | Path): recording file
+        Returns:
+            replay report
+        """
+        return self.run(read_recording(path))
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("recording", type=Path, help="recording written by RecordingTransport or one body per line")
+    parser.add_argument("--speed", type=float, help="replay the recorded clock this many times faster")
+    parser.add_argument("--callbacks", type=int, default=0, help="no-op receiver callbacks added to the session")
+    parser.add_argument("--no-dedup", action="store_true", help="handle duplicate messages again")
+    parser.add_argument("--no-stages", action="store_true", help="do not measure the time per stage")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args(argv)
+    logger.remove()
+    session = replay_session()
+    session.set_message_deduplicator(None if args.no_dedup else MessageDeduplicator())
+    for _ in range(args.callbacks):
+        session.add_message_receiver_callback(lambda message: None)
+    report = ReplayEngine(session, args.speed, not args.no_stages).run_file(args.recording)
+    if args.json:
+        print(dumps(report.to_dict(), indent=2))
+        return
+    print(f"responses {report.responses}  messages {report.messages}  duplicates {report.duplicates}  "
+          f"errors {report.errors}")
+    print(f"elapsed {report.elapsed:.3f} s  {report.messages_per_second:.0f} messages/s")
+    for stage, seconds in report.stage_seconds.items():
+        print(f"{stage:<10}{seconds * 1e3:10.2f} ms")
+    for transition, count in report.transitions.items():
+        print(f"{transition:<30}{count:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+from dataclasses import dataclass, field
+from json import JSONEncoder
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+from httpx import AsyncBaseTransport, BaseTransport, Request, Response
+
+from .cpdlc import CPDLC as CPDLC
+from .cpdlc_base import CPDLCBase as CPDLCBase
+from .dedup import MessageDeduplicator as MessageDeduplicator
+from .enums import PacketType as PacketType, TraceStage as TraceStage
+from .exception import ParameterError as ParameterError
+from .metrics import MetricsRegistry as MetricsRegistry
+from .tracing import SpanContext as SpanContext, Tracer as Tracer
+from .transport import MemoryTransport as MemoryTransport
+
+_ENCODER: JSONEncoder
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedResponse:
+    """
+    Body of one recorded poll response
+
+    Attributes:
+        body (bytes): raw response body as returned by connect.html
+        epoch (Optional[float]): epoch seconds the response was received, None when not recorded
+        encoding (str): encoding of the body
+    """
+    body: bytes
+    epoch: Optional[float] = None
+    encoding: str = "utf-8"
+
+
+def read_recording(path: Union[str, Path]) -> Iterator[RecordedResponse]:
+    """
+    Read a recording, one response per line
+    Lines written by RecordingTransport are JSON arrays [epoch, body, encoding] whose body holds the raw bytes
+    decoded as latin-1, so every byte survives the round trip. Arrays [epoch, body] of older recordings and any
+    other line are taken as UTF-8 text, the latter without timing
+    Args:
+        path (str | Path): recording file
+    Returns:
+        iterator of responses
+    """
+    ...
+
+
+def _encode(epoch: Optional[float], body: bytes, encoding: str) -> str:
+    """
+    Recording line of one response, for internal use only
+    """
+    ...
+
+
+def write_recording(path: Union[str, Path], responses: Iterable[RecordedResponse]) -> int:
+    """
+    Append responses to a recording
+    Args:
+        path (str | Path): recording file
+        responses (Iterable[RecordedResponse]): responses to write
+    Returns:
+        number of responses written
+    """
+    ...
+
+
+class RecordingTransport(BaseTransport, AsyncBaseTransport):
+    """
+    Transport appending the raw body of every successful poll response to a recording, other requests pass through
+
+    Examples:
+        transport = RecordingTransport("capture.ndjson", httpx.HTTPTransport())\n
+        cpdlc = CPDLC(transport=transport)\n
+
+    Attributes:
+        _transport (httpx.BaseTransport | httpx.AsyncBaseTransport): transport sending the requests
+        _file (TextIO): recording opened for appending
+        _lock (Lock): serializes writes of concurrent requests
+        _recorded (int): responses recorded
+    """
+    _transport: Union[BaseTransport, AsyncBaseTransport]
+    _file: TextIO
+    _lock: Lock
+    _recorded: int
+
+    def __init__(self, path: Union[str, Path], transport: Union[BaseTransport, AsyncBaseTransport]):
+        """
+        Constructor for RecordingTransport class
+        Args:
+            path (str | Path): recording file, created or appended to
+            transport (httpx.BaseTransport | httpx.AsyncBaseTransport): transport sending the requests
+        """
+        ...
+
+    @property
+    def recorded(self) -> int: ...
+
+    def _record(self, request: Request, response: Response) -> None:
+        """
+        Append the body of a poll response, for internal use only
+        """
+        ...
+
+    def handle_request(self, request: Request) -> Response: ...
+
+    async def handle_async_request(self, request: Request) -> Response: ...
+
+    def close(self) -> None: ...
+
+    async def aclose(self) -> None: ...
+
+
+class _StageClock(Tracer):
+    """
+    Tracer summing the time spent per stage, for internal use only
+    """
+    seconds: dict[TraceStage, float]
+
+    def __init__(self) -> None: ...
+
+    def start_span(self, context: SpanContext) -> float: ...
+
+    def end_span(self, context: SpanContext, token: float, error: Optional[BaseException]) -> None: ...
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayReport:
+    """
+    Result of one replay
+
+    Attributes:
+        responses (int): responses replayed
+        messages (int): messages parsed
+        duplicates (int): parsed messages dropped as duplicates
+        errors (int): responses whose handling raised
+        elapsed (float): wall seconds of the replay, including the pauses of a paced replay
+        stage_seconds (dict[str, float]): seconds spent in parse, handle and callback, empty without stages
+        transitions (dict[str, int]): connection state transitions keyed by "FROM->TO"
+    """
+    responses: int
+    messages: int
+    duplicates: int
+    errors: int
+    elapsed: float
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    transitions: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def messages_per_second(self) -> float: ...
+
+    def to_dict(self) -> dict: ...
+
+
+def replay_session(callsign: str = "REPLAY") -> CPDLC:
+    """
+    Create an initialized CPDLC session answered by a MemoryTransport, with its poller stopped
+    Args:
+        callsign (str): callsign of the session
+    Returns:
+        session ready for ReplayEngine
+    """
+    ...
+
+
+class ReplayEngine:
+    """
+    Streams recorded poll responses through the inbound pipeline of a session, without poller sleeps or network
+
+    Every response runs through _process_poll_response with its raw body, so it is parsed, de-duplicated, handled
+    and delivered to the receiver callbacks exactly like a polled one. Without speed responses follow each other
+    immediately, with speed the recorded gaps between responses are replayed divided by speed. Either way the
+    de-duplication window and reply timers run on the recorded clock, so they expire as they did while recording.
+    While replaying, the session uses a MetricsRegistry of its own and, with stages, a tracer timing every stage;
+    its previous metrics and tracer are restored afterwards.
+
+    Examples:
+        engine = ReplayEngine()\n
+        engine.session.add_message_receiver_callback(on_message)\n
+        report = engine.run(read_recording("capture.ndjson"))\n
+        print(report.messages_per_second, report.transitions)\n
+
+    Attributes:
+        _session (CPDLCBase): session the responses are replayed through
+        _speed (Optional[float]): replay speed against the recorded clock, None replays as fast as possible
+        _stages (bool): whether the time per stage is measured
+    """
+    _session: CPDLCBase
+    _speed: Optional[float]
+    _stages: bool
+
+    def __init__(self, session: Optional[CPDLCBase] = None, speed: Optional[float] = None, stages: bool = True):
+        """
+        Constructor for ReplayEngine class
+        Args:
+            session (Optional[CPDLCBase]): session replayed through, a replay_session when None
+            speed (Optional[float]): replay speed against the recorded clock, None replays as fast as possible
+            stages (bool): measure the time per stage, adds a span around every stage
+        Raises:
+            ParameterError: when speed is not positive
+        """
+        ...
+
+    @property
+    def session(self) -> CPDLCBase: ...
+
+    def _pause(self, response: RecordedResponse, begin: float, first_epoch: Optional[float]) -> None:
+        """
+        Sleep until a paced response is due, for internal use only
+        """
+        ...
+
+    def run(self, responses: Iterable[Union[RecordedResponse, str]]) -> ReplayReport:
+        """
+        Replay responses in order
+        Args:
+            responses (Iterable[RecordedResponse | str]): recorded responses or bare response bodies
+        Returns:
+            replay report
+        """
+        ...
+
+    def run_file(self, path: Union[str, Path]) -> ReplayReport:
+        """
+        Replay every response of a recording
+        Args:
+            path (str | Path): recording file
+        Returns:
+            replay report
+        """
+        ...
+
+
+def main(argv: Optional[list[str]] = None) -> None: ...
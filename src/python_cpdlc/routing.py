@@ -0,0 +1,166 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from .acars_message import AcarsMessage
+from .enums import PacketType, ReplyTag
+from .exception import ParameterError
+
+# station filter matching the ATC unit the session is connected to at delivery time
+CURRENT_ATC = "@CURRENT_ATC"
+
+_RouteKey = tuple[PacketType, str]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Subscription:
+    """
+    Receiver callback with declarative filters, a filter left None matches every message
+
+    Attributes:
+        callback (Callable[[AcarsMessage], None]): called with every matching message
+        packet_type (Optional[PacketType]): packet type of the message
+        station (Optional[str]): station the message was received from, upper case, CURRENT_ATC matches the
+            current ATC unit of the session
+        reply_type (Optional[ReplyTag]): reply type of a CPDLC message
+        prefix (Optional[str]): start of the message text
+    """
+    callback: Callable[[AcarsMessage], None]
+    packet_type: Optional[PacketType] = None
+    station: Optional[str] = None
+    reply_type: Optional[ReplyTag] = None
+    prefix: Optional[str] = None
+
+    def __post_init__(self):
+        if self.reply_type is not None:
+            if self.packet_type not in (None, PacketType.CPDLC):
+                raise ParameterError("reply_type only filters CPDLC messages")
+            object.__setattr__(self, "packet_type", PacketType.CPDLC)
+        if self.station is not None and self.station != CURRENT_ATC:
+            object.__setattr__(self, "station", self.station.upper())
+
+    @property
+    def checked(self) -> bool:
+        """
+        Whether a message of a matching packet type and station still has to pass accepts
+        """
+        return self.station == CURRENT_ATC or self.reply_type is not None or self.prefix is not None
+
+    def routes(self, packet_type: PacketType, station: str) -> bool:
+        """
+        Whether messages of packet_type from station may match, the part of the filters compiled into the table
+        """
+        return ((self.packet_type is None or self.packet_type is packet_type) and
+                (self.station is None or self.station == CURRENT_ATC or self.station == station.upper()))
+
+    def accepts(self, message: AcarsMessage, current_atc: Optional[str] = None) -> bool:
+        """
+        Whether a message which routes here matches the remaining filters
+        Args:
+            message (AcarsMessage): received message
+            current_atc (Optional[str]): ATC unit the session is connected to
+        """
+        if self.station == CURRENT_ATC and (current_atc is None or
+                                            message.target_station.upper() != current_atc.upper()):
+            return False
+        if self.reply_type is not None and message.reply_type is not self.reply_type:
+            return False
+        return self.prefix is None or message.message.startswith(self.prefix)
+
+    def matches(self, message: AcarsMessage, current_atc: Optional[str] = None) -> bool:
+        """
+        Whether message matches every filter
+        """
+        return self.routes(message.msg_type, message.target_station) and self.accepts(message, current_atc)
+
+
+class SubscriptionTable:
+    """
+    Subscriptions compiled into a dispatch table keyed by packet type and station
+
+    The subscriptions a (packet type, station) pair routes to are collected once, on the first message of that
+    pair, and kept in the table until the subscriptions change. Delivering a message is one dict lookup plus the
+    reply type, prefix and current ATC checks of the subscriptions it routes to, subscriptions of other packet types
+    and stations cost nothing. Subscribing and unsubscribing swap in a new table, so both are safe while messages
+    are delivered from the poller thread
+
+    Attributes:
+        _max_routes (int): pairs kept in the table, the table starts over beyond
+        _compiled (tuple[tuple[Subscription, ...], dict[tuple[PacketType, str], tuple[tuple[Subscription, bool],
+            ...]]]): subscriptions in order and the table compiled from them
+    """
+
+    def __init__(self, max_routes: int = 1024):
+        """
+        Constructor for SubscriptionTable class
+        Args:
+            max_routes (int): (packet type, station) pairs kept in the table
+        Raises:
+            ParameterError: when max_routes is not positive
+        """
+        if max_routes <= 0:
+            raise ParameterError("max_routes must be positive")
+        self._max_routes = max_routes
+        self._compiled: tuple[tuple[Subscription, ...], dict[_RouteKey, tuple[tuple[Subscription, bool], ...]]] = \
+            ((), {})
+
+    @property
+    def subscriptions(self) -> tuple[Subscription, ...]:
+        return self._compiled[0]
+
+    def __len__(self) -> int:
+        return len(self._compiled[0])
+
+    def __contains__(self, subscription: Subscription) -> bool:
+        return subscription in self._compiled[0]
+
+    def add(self, subscription: Subscription) -> Subscription:
+        """
+        Add a subscription, delivered after the subscriptions added before it
+        Returns:
+            the subscription, for remove
+        """
+        self._compiled = (self._compiled[0] + (subscription,), {})
+        return subscription
+
+    def remove(self, subscription: Subscription) -> bool:
+        """
+        Remove a subscription
+        Returns:
+            true if the subscription was added
+        """
+        subscriptions = self._compiled[0]
+        if subscription not in subscriptions:
+            return False
+        self._compiled = (tuple(item for item in subscriptions if item is not subscription), {})
+        return True
+
+    def clear(self) -> None:
+        self._compiled = ((), {})
+
+    def _route(self, subscriptions: tuple[Subscription, ...], key: _RouteKey) -> tuple[tuple[Subscription, bool], ...]:
+        """
+        Subscriptions a (packet type, station) pair routes to, for internal use only
+        """
+        return tuple((subscription, subscription.checked) for subscription in subscriptions
+                     if subscription.routes(*key))
+
+    def match(self, message: AcarsMessage, current_atc: Optional[str] = None) -> list[Callable[[AcarsMessage], Any]]:
+        """
+        Callbacks of the subscriptions message matches
+        Args:
+            message (AcarsMessage): received message
+            current_atc (Optional[str]): ATC unit the session is connected to, for CURRENT_ATC subscriptions
+        Returns:
+            callbacks in subscription order
+        """
+        subscriptions, table = self._compiled
+        if not subscriptions:
+            return []
+        key = (message.msg_type, message.target_station)
+        route = table.get(key)
+        if route is None:
+            if len(table) >= self._max_routes:
+                table.clear()
+            route = table[key] = self._route(subscriptions, key)
+        return [subscription.callback for subscription, checked in route
+                if not checked or subscription.accepts(message, current_atc)]
@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from .acars_message import AcarsMessage as AcarsMessage
+from .enums import PacketType as PacketType, ReplyTag as ReplyTag
+from .exception import ParameterError as ParameterError
+
+CURRENT_ATC: str
+
+_RouteKey = tuple[PacketType, str]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Subscription:
+    """
+    Receiver callback with declarative filters, a filter left None matches every message
+
+    Attributes:
+        callback (Callable[[AcarsMessage], None]): called with every matching message
+        packet_type (Optional[PacketType]): packet type of the message
+        station (Optional[str]): station the message was received from, upper case, CURRENT_ATC matches the
+            current ATC unit of the session
+        reply_type (Optional[ReplyTag]): reply type of a CPDLC message
+        prefix (Optional[str]): start of the message text
+    """
+    callback: Callable[[AcarsMessage], None]
+    packet_type: Optional[PacketType] = None
+    station: Optional[str] = None
+    reply_type: Optional[ReplyTag] = None
+    prefix: Optional[str] = None
+
+    def __post_init__(self): ...
+
+    @property
+    def checked(self) -> bool:
+        """
+        Whether a message of a matching packet type and station still has to pass accepts
+        """
+        ...
+
+    def routes(self, packet_type: PacketType, station: str) -> bool:
+        """
+        Whether messages of packet_type from station may match, the part of the filters compiled into the table
+        """
+        ...
+
+    def accepts(self, message: AcarsMessage, current_atc: Optional[str] = None) -> bool:
+        """
+        Whether a message which routes here matches the remaining filters
+        Args:
+            message (AcarsMessage): received message
+            current_atc (Optional[str]): ATC unit the session is connected to
+        """
+        ...
+
+    def matches(self, message: AcarsMessage, current_atc: Optional[str] = None) -> bool:
+        """
+        Whether message matches every filter
+        """
+        ...
+
+
+class SubscriptionTable:
+    """
+    Subscriptions compiled into a dispatch table keyed by packet type and station
+
+    The subscriptions a (packet type, station) pair routes to are collected once, on the first message of that
+    pair, and kept in the table until the subscriptions change. Delivering a message is one dict lookup plus the
+    reply type, prefix and current ATC checks of the subscriptions it routes to, subscriptions of other packet types
+    and stations cost nothing. Subscribing and unsubscribing swap in a new table, so both are safe while messages
+    are delivered from the poller thread
+
+    Attributes:
+        _max_routes (int): pairs kept in the table, the table starts over beyond
+        _compiled (tuple[tuple[Subscription, ...], dict[tuple[PacketType, str], tuple[tuple[Subscription, bool],
+            ...]]]): subscriptions in order and the table compiled from them
+    """
+    _max_routes: int
+    _compiled: tuple[tuple[Subscription, ...], dict[_RouteKey, tuple[tuple[Subscription, bool], ...]]]
+
+    def __init__(self, max_routes: int = 1024):
+        """
+        Constructor for SubscriptionTable class
+        Args:
+            max_routes (int): (packet type, station) pairs kept in the table
+        Raises:
+            ParameterError: when max_routes is not positive
+        """
+        ...
+
+    @property
+    def subscriptions(self) -> tuple[Subscription, ...]: ...
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, subscription: Subscription) -> bool: ...
+
+    def add(self, subscription: Subscription) -> Subscription:
+        """
+        Add a subscription, delivered after the subscriptions added before it
+        Returns:
+            the subscription, for remove
+        """
+        ...
+
+    def remove(self, subscription: Subscription) -> bool:
+        """
+        Remove a subscription
+        Returns:
+            true if the subscription was added
+        """
+        ...
+
+    def clear(self) -> None: ...
+
+    def _route(self, subscriptions: tuple[Subscription, ...], key: _RouteKey) -> tuple[tuple[Subscription, bool], ...]:
+        """
+        Subscriptions a (packet type, station) pair routes to, for internal use only
+        """
+        ...
+
+    def match(self, message: AcarsMessage, current_atc: Optional[str] = None) -> list[Callable[[AcarsMessage], Any]]:
+        """
+        Callbacks of the subscriptions message matches
+        Args:
+            message (AcarsMessage): received message
+            current_atc (Optional[str]): ATC unit the session is connected to, for CURRENT_ATC subscriptions
+        Returns:
+            callbacks in subscription order
+        """
+        ...
@@ -0,0 +1,513 @@
+from abc import ABC, abstractmethod
+from asyncio import AbstractEventLoop, Event as AsyncEvent, Future as AsyncFuture, Task, \
+    TimeoutError as AsyncTimeoutError, gather, get_running_loop, wait_for
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from inspect import isawaitable
+from itertools import count
+from random import uniform
+from threading import Condition, Lock, Thread
+from time import monotonic
+from typing import Any, Callable, Optional, Union
+
+from httpx import ConnectError, ConnectTimeout
+from loguru import logger
+
+from .exception import InvalidStateError, ParameterError
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """
+    How often and how late a failed send is retried
+
+    The n-th retry waits a random time between 0 and min(max_delay, base_delay * 2 ** n) seconds,
+    so senders failing together do not retry together.
+    Only failures before the request reached the server are retried by default, a read timeout may follow
+    a logon, telex or reply the server already accepted, and sending those again is not idempotent
+
+    Attributes:
+        attempts (int): maximum attempts per send, 1 disables retries
+        base_delay (float): upper bound of the first retry delay
+        max_delay (float): upper bound of every retry delay
+        retry_on (tuple[type[BaseException], ...]): exceptions worth a retry, others fail the send at once,
+            connection failures and connect timeouts by default
+    """
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8
+    retry_on: tuple[type[BaseException], ...] = field(default=(ConnectError, ConnectTimeout))
+
+    def __post_init__(self):
+        if self.attempts <= 0 or self.base_delay < 0 or self.max_delay < self.base_delay:
+            raise ParameterError("attempts must be positive and 0 <= base_delay <= max_delay")
+
+    def delay(self, retry: int) -> float:
+        """
+        Seconds to wait before the retry-th retry, counted from 0
+        """
+        return uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+
+class TokenBucket:
+    """
+    Token bucket limiting sends to rate per second on average and burst at once
+
+    Attributes:
+        _rate (float): tokens added per second
+        _burst (int): maximum tokens held
+        _tokens (float): tokens held
+        _updated (float): monotonic time tokens were last added
+        _lock (threading.Lock): guards tokens
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Constructor for TokenBucket class
+        Args:
+            rate (float): tokens added per second
+            burst (int): maximum tokens held, the bucket starts full
+        Raises:
+            ParameterError: when rate or burst is not positive
+        """
+        if rate <= 0 or burst <= 0:
+            raise ParameterError("rate and burst must be positive")
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._lock = Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        return self._burst
+
+    def take(self, limit: int) -> tuple[int, float]:
+        """
+        Take up to limit tokens without waiting
+        Args:
+            limit (int): maximum tokens to take
+        Returns:
+            tokens taken and, when none was available, seconds until the next token
+        """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            taken = min(limit, int(self._tokens))
+            if taken == 0:
+                return 0, (1 - self._tokens) / self._rate
+            self._tokens -= taken
+            return taken, 0
+
+
+@dataclass(frozen=True, slots=True)
+class SendQueueStats:
+    """
+    Snapshot of send queue counters
+
+    Attributes:
+        depth (int): sends waiting for a token or for their retry delay
+        max_depth (int): highest depth seen
+        sent (int): sends completed
+        retried (int): retries after a transient failure
+        failed (int): sends which failed after their last attempt
+    """
+    depth: int
+    max_depth: int
+    sent: int
+    retried: int
+    failed: int
+
+
+class _Send:
+    """
+    Queued send, for internal use only
+    """
+    __slots__ = ("func", "args", "future", "attempt")
+
+    def __init__(self, func: Callable[..., Any], args: tuple, future: Union[Future, AsyncFuture]):
+        self.func = func
+        self.args = args
+        self.future = future
+        self.attempt = 0
+
+
+class SendQueue(ABC):
+    """
+    Base class of send queues, workers drain queued sends in batches under a token bucket
+    and retry transient failures with jittered exponential backoff
+
+    A worker takes as many queued sends as there are tokens, at most batch_size, in one go,
+    so a burst goes out at the bucket rate without a wakeup per send.
+    A failed send waits for its retry delay in a heap instead of holding its worker,
+    it is queued again ahead of new sends once the delay passed
+
+    Attributes:
+        _workers (int): number of workers
+        _bucket (TokenBucket): rate limit of all workers
+        _retry (RetryPolicy): retry policy
+        _batch_size (int): maximum sends a worker takes at once
+        _queue (deque[_Send]): sends waiting for a token
+        _delayed (list[tuple[float, int, _Send]]): heap of retries by the monotonic time they may be sent
+        _sequence (itertools.count): tie breaker of retries due at the same time
+        _condition (threading.Condition): guards queue and counters
+        _max_depth (int): highest depth seen
+        _sent (int): sends completed
+        _retried (int): retries after a transient failure
+        _failed (int): sends which failed after their last attempt
+        _closed (bool): whether queue was closed
+    """
+
+    def __init__(self, workers: int, rate: float, burst: int, batch_size: int, retry: Optional[RetryPolicy]):
+        """
+        Constructor for SendQueue class
+        Args:
+            workers (int): number of workers
+            rate (float): sends per second on average
+            burst (int): sends at once after an idle period
+            batch_size (int): maximum sends a worker takes at once
+            retry (Optional[RetryPolicy]): retry policy, RetryPolicy() when None
+        Raises:
+            ParameterError: when workers, rate, burst or batch_size is not positive
+        """
+        if workers <= 0 or batch_size <= 0:
+            raise ParameterError("workers and batch_size must be positive")
+        self._workers = workers
+        self._bucket = TokenBucket(rate, burst)
+        self._retry = retry if retry is not None else RetryPolicy()
+        self._batch_size = batch_size
+        self._queue: deque[_Send] = deque()
+        self._delayed: list[tuple[float, int, _Send]] = []
+        self._sequence = count()
+        self._condition = Condition()
+        self._max_depth = 0
+        self._sent = 0
+        self._retried = 0
+        self._failed = 0
+        self._closed = False
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def bucket(self) -> TokenBucket:
+        return self._bucket
+
+    @property
+    def retry(self) -> RetryPolicy:
+        return self._retry
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def stats(self) -> SendQueueStats:
+        with self._condition:
+            return SendQueueStats(len(self._queue) + len(self._delayed), self._max_depth, self._sent, self._retried,
+                                  self._failed)
+
+    @abstractmethod
+    def _new_future(self) -> Union[Future, AsyncFuture]:
+        """
+        Future resolved with the result of a send, for internal use only
+        """
+
+    def _wakeup(self) -> None:
+        """
+        Wake the workers after a send was queued, must hold condition, for internal use only
+        """
+        self._condition.notify_all()
+
+    def _enqueue(self, send: _Send) -> None:
+        """
+        Queue send, for internal use only
+        """
+        with self._condition:
+            self._queue.append(send)
+            if len(self._queue) + len(self._delayed) > self._max_depth:
+                self._max_depth = len(self._queue) + len(self._delayed)
+            self._wakeup()
+
+    def _defer(self, send: _Send, delay: float) -> None:
+        """
+        Hold send until its retry delay passed, for internal use only
+        """
+        with self._condition:
+            heappush(self._delayed, (monotonic() + delay, next(self._sequence), send))
+            self._wakeup()
+
+    def _idle(self) -> bool:
+        """
+        Whether no send is queued or waiting for a retry, must hold condition, for internal use only
+        """
+        return not self._queue and not self._delayed
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Union[Future, AsyncFuture]:
+        """
+        Queue a send, func is called with args by a worker once a token is available
+        Args:
+            func (Callable[..., Any]): sends one request
+            *args (Any): arguments
+        Returns:
+            future resolved with the result of func, or its exception after the last attempt
+        Raises:
+            InvalidStateError: when queue is closed
+        """
+        if self._closed:
+            raise InvalidStateError("Send queue closed")
+        future = self._new_future()
+        self._enqueue(_Send(func, args, future))
+        return future
+
+    def _take_batch(self) -> tuple[list[_Send], float]:
+        """
+        Pop the sends a token is available for, retries whose delay passed first, must hold condition,
+        for internal use only
+        Returns:
+            sends taken and, when none was taken, seconds until the next token or the next retry
+        """
+        delayed = self._delayed
+        if delayed:
+            now = monotonic()
+            due = []
+            while delayed and delayed[0][0] <= now:
+                due.append(heappop(delayed)[2])
+            self._queue.extendleft(reversed(due))
+            if not self._queue:
+                return [], delayed[0][0] - now
+        taken, wait = self._bucket.take(min(self._batch_size, len(self._queue)))
+        return [self._queue.popleft() for _ in range(taken)], wait
+
+    def _should_retry(self, send: _Send, error: BaseException) -> Optional[float]:
+        """
+        Count a failed attempt, for internal use only
+        Returns:
+            seconds to wait before the retry, None when send failed for good
+        """
+        retry = self._retry
+        if not isinstance(error, retry.retry_on) or send.attempt + 1 >= retry.attempts or self._closed:
+            with self._condition:
+                self._failed += 1
+            return None
+        delay = retry.delay(send.attempt)
+        send.attempt += 1
+        with self._condition:
+            self._retried += 1
+        logger.warning("Send failed, retry {} in {:.2f}s: {}", send.attempt, delay, error)
+        return delay
+
+    def _count_sent(self) -> None:
+        """
+        Count a completed send, for internal use only
+        """
+        with self._condition:
+            self._sent += 1
+
+
+class ThreadPoolSendQueue(SendQueue):
+    """
+    Sends on a pool of daemon worker threads, futures are concurrent.futures.Future
+
+    Examples:
+        send_queue = ThreadPoolSendQueue(workers=4, rate=5, burst=10)\n
+        cpdlc.set_send_queue(send_queue)\n
+        ...\n
+        send_queue.close()\n
+
+    Attributes:
+        _threads (list[threading.Thread]): worker threads
+    """
+
+    def __init__(self, workers: int = 4, rate: float = 5, burst: int = 10, batch_size: int = 8,
+                 retry: Optional[RetryPolicy] = None):
+        """
+        Constructor for ThreadPoolSendQueue class
+        Args:
+            workers (int): number of worker threads
+            rate (float): sends per second on average
+            burst (int): sends at once after an idle period
+            batch_size (int): maximum sends a worker takes at once
+            retry (Optional[RetryPolicy]): retry policy, RetryPolicy() when None
+        Raises:
+            ParameterError: when workers, rate, burst or batch_size is not positive
+        """
+        super().__init__(workers, rate, burst, batch_size, retry)
+        self._threads = [Thread(target=self._work, name=f"SendQueue-{index}", daemon=True) for index in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _new_future(self) -> Future:
+        return Future()
+
+    def _work(self) -> None:
+        """
+        Worker thread loop, for internal use only
+        """
+        condition = self._condition
+        while True:
+            with condition:
+                while self._idle() and not self._closed:
+                    condition.wait()
+                if self._idle():
+                    return
+                batch, wait = self._take_batch()
+                if not batch:
+                    condition.wait(wait)
+                    continue
+            for send in batch:
+                self._send(send)
+
+    def _send(self, send: _Send) -> None:
+        """
+        Attempt send once, for internal use only
+        """
+        if send.attempt == 0 and not send.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = send.func(*send.args)
+        except Exception as e:
+            delay = self._should_retry(send, e)
+            if delay is None:
+                send.future.set_exception(e)
+                return
+            self._defer(send, delay)
+            return
+        self._count_sent()
+        send.future.set_result(result)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting sends, send the queued ones and stop the workers
+        Args:
+            timeout (Optional[float]): seconds to wait for every worker, wait forever when None
+        """
+        self._closed = True
+        with self._condition:
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+
+class AsyncioSendQueue(SendQueue):
+    """
+    Sends as tasks of an asyncio event loop, func may be a coroutine function and futures are asyncio.Future
+
+    Sends of one batch run concurrently, sends may be submitted from the event loop thread only
+
+    Examples:
+        send_queue = AsyncioSendQueue(workers=4, rate=5, burst=10)\n
+        send_queue.start()\n
+        cpdlc.set_send_queue(send_queue)\n
+        ...\n
+        await send_queue.aclose()\n
+
+    Attributes:
+        _loop (Optional[asyncio.AbstractEventLoop]): event loop running the workers
+        _ready (Optional[asyncio.Event]): set when a send was queued
+        _tasks (list[asyncio.Task]): worker tasks
+    """
+
+    def __init__(self, workers: int = 4, rate: float = 5, burst: int = 10, batch_size: int = 8,
+                 retry: Optional[RetryPolicy] = None):
+        """
+        Constructor for AsyncioSendQueue class
+        Args:
+            workers (int): number of worker tasks
+            rate (float): sends per second on average
+            burst (int): sends at once after an idle period
+            batch_size (int): maximum sends a worker takes at once
+            retry (Optional[RetryPolicy]): retry policy, RetryPolicy() when None
+        Raises:
+            ParameterError: when workers, rate, burst or batch_size is not positive
+        """
+        super().__init__(workers, rate, burst, batch_size, retry)
+        self._loop: Optional[AbstractEventLoop] = None
+        self._ready: Optional[AsyncEvent] = None
+        self._tasks: list[Task] = []
+
+    def start(self) -> None:
+        """
+        Start worker tasks, must be called from a running event loop
+        """
+        if self._tasks:
+            return
+        self._loop = get_running_loop()
+        self._ready = AsyncEvent()
+        self._tasks = [self._loop.create_task(self._work()) for _ in range(self._workers)]
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> AsyncFuture:
+        if not self._tasks and not self._closed:
+            raise InvalidStateError("Send queue not started")
+        return super().submit(func, *args)
+
+    def _new_future(self) -> AsyncFuture:
+        return self._loop.create_future()
+
+    def _wakeup(self) -> None:
+        self._ready.set()
+
+    async def _work(self) -> None:
+        """
+        Worker task loop, for internal use only
+        """
+        while True:
+            while self._idle():
+                if self._closed:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+            with self._condition:
+                batch, wait = self._take_batch()
+            if not batch:
+                self._ready.clear()
+                try:
+                    await wait_for(self._ready.wait(), wait)
+                except AsyncTimeoutError:
+                    pass
+                continue
+            await gather(*(self._send(send) for send in batch))
+
+    async def _send(self, send: _Send) -> None:
+        """
+        Attempt send once, for internal use only
+        """
+        if send.future.cancelled():
+            return
+        try:
+            result = send.func(*send.args)
+            if isawaitable(result):
+                result = await result
+        except Exception as e:
+            delay = self._should_retry(send, e)
+            if delay is None:
+                if not send.future.cancelled():
+                    send.future.set_exception(e)
+                return
+            self._defer(send, delay)
+            return
+        self._count_sent()
+        if not send.future.cancelled():
+            send.future.set_result(result)
+
+    async def aclose(self) -> None:
+        """
+        Stop accepting sends, send the queued ones and stop the workers
+        """
+        self._closed = True
+        if self._ready is not None:
+            self._ready.set()
+        await gather(*self._tasks)
+        self._tasks = []
@@ -0,0 +1,381 @@
+from abc import ABC, abstractmethod
+from asyncio import AbstractEventLoop, Event as AsyncEvent, Future as AsyncFuture, Task
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from itertools import count
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, Optional, Union
+
+from httpx import ConnectError, ConnectTimeout
+
+from .exception import InvalidStateError as InvalidStateError, ParameterError as ParameterError
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """
+    How often and how late a failed send is retried
+
+    The n-th retry waits a random time between 0 and min(max_delay, base_delay * 2 ** n) seconds,
+    so senders failing together do not retry together.
+    Only failures before the request reached the server are retried by default, a read timeout may follow
+    a logon, telex or reply the server already accepted, and sending those again is not idempotent
+
+    Attributes:
+        attempts (int): maximum attempts per send, 1 disables retries
+        base_delay (float): upper bound of the first retry delay
+        max_delay (float): upper bound of every retry delay
+        retry_on (tuple[type[BaseException], ...]): exceptions worth a retry, others fail the send at once,
+            connection failures and connect timeouts by default
+    """
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8
+    retry_on: tuple[type[BaseException], ...] = field(default=(ConnectError, ConnectTimeout))
+
+    def __post_init__(self) -> None: ...
+
+    def delay(self, retry: int) -> float:
+        """
+        Seconds to wait before the retry-th retry, counted from 0
+        """
+        ...
+
+
+class TokenBucket:
+    """
+    Token bucket limiting sends to rate per second on average and burst at once
+
+    Attributes:
+        _rate (float): tokens added per second
+        _burst (int): maximum tokens held
+        _tokens (float): tokens held
+        _updated (float): monotonic time tokens were last added
+        _lock (threading.Lock): guards tokens
+    """
+    _rate: float
+    _burst: int
+    _tokens: float
+    _updated: float
+    _lock: Lock
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """
+        Constructor for TokenBucket class
+        Args:
+            rate (float): tokens added per second
+            burst (int): maximum tokens held, the bucket starts full
+        Raises:
+            ParameterError: when rate or burst is not positive
+        """
+        ...
+
+    @property
+    def rate(self) -> float: ...
+
+    @property
+    def burst(self) -> int: ...
+
+    def take(self, limit: int) -> tuple[int, float]:
+        """
+        Take up to limit tokens without waiting
+        Args:
+            limit (int): maximum tokens to take
+        Returns:
+            tokens taken and, when none was available, seconds until the next token
+        """
+        ...
+
+
+@dataclass(frozen=True, slots=True)
+class SendQueueStats:
+    """
+    Snapshot of send queue counters
+
+    Attributes:
+        depth (int): sends waiting for a token or for their retry delay
+        max_depth (int): highest depth seen
+        sent (int): sends completed
+        retried (int): retries after a transient failure
+        failed (int): sends which failed after their last attempt
+    """
+    depth: int
+    max_depth: int
+    sent: int
+    retried: int
+    failed: int
+
+
+class _Send:
+    """
+    Queued send, for internal use only
+    """
+    func: Callable[..., Any]
+    args: tuple
+    future: Union[Future, AsyncFuture]
+    attempt: int
+
+    def __init__(self, func: Callable[..., Any], args: tuple, future: Union[Future, AsyncFuture]) -> None: ...
+
+
+class SendQueue(ABC):
+    """
+    Base class of send queues, workers drain queued sends in batches under a token bucket
+    and retry transient failures with jittered exponential backoff
+
+    A worker takes as many queued sends as there are tokens, at most batch_size, in one go,
+    so a burst goes out at the bucket rate without a wakeup per send.
+    A failed send waits for its retry delay in a heap instead of holding its worker,
+    it is queued again ahead of new sends once the delay passed
+
+    Attributes:
+        _workers (int): number of workers
+        _bucket (TokenBucket): rate limit of all workers
+        _retry (RetryPolicy): retry policy
+        _batch_size (int): maximum sends a worker takes at once
+        _queue (deque[_Send]): sends waiting for a token
+        _delayed (list[tuple[float, int, _Send]]): heap of retries by the monotonic time they may be sent
+        _sequence (itertools.count): tie breaker of retries due at the same time
+        _condition (threading.Condition): guards queue and counters
+        _max_depth (int): highest depth seen
+        _sent (int): sends completed
+        _retried (int): retries after a transient failure
+        _failed (int): sends which failed after their last attempt
+        _closed (bool): whether queue was closed
+    """
+    _workers: int
+    _bucket: TokenBucket
+    _retry: RetryPolicy
+    _batch_size: int
+    _queue: deque[_Send]
+    _delayed: list[tuple[float, int, _Send]]
+    _sequence: count
+    _condition: Condition
+    _max_depth: int
+    _sent: int
+    _retried: int
+    _failed: int
+    _closed: bool
+
+    def __init__(self, workers: int, rate: float, burst: int, batch_size: int, retry: Optional[RetryPolicy]) -> None:
+        """
+        Constructor for SendQueue class
+        Args:
+            workers (int): number of workers
+            rate (float): sends per second on average
+            burst (int): sends at once after an idle period
+            batch_size (int): maximum sends a worker takes at once
+            retry (Optional[RetryPolicy]): retry policy, RetryPolicy() when None
+        Raises:
+            ParameterError: when workers, rate, burst or batch_size is not positive
+        """
+        ...
+
+    @property
+    def workers(self) -> int: ...
+
+    @property
+    def bucket(self) -> TokenBucket: ...
+
+    @property
+    def retry(self) -> RetryPolicy: ...
+
+    @property
+    def batch_size(self) -> int: ...
+
+    @property
+    def closed(self) -> bool: ...
+
+    @property
+    def stats(self) -> SendQueueStats: ...
+
+    @abstractmethod
+    def _new_future(self) -> Union[Future, AsyncFuture]:
+        """
+        Future resolved with the result of a send, for internal use only
+        """
+        ...
+
+    def _wakeup(self) -> None:
+        """
+        Wake the workers after a send was queued, must hold condition, for internal use only
+        """
+        ...
+
+    def _enqueue(self, send: _Send) -> None:
+        """
+        Queue send, for internal use only
+        """
+        ...
+
+    def _defer(self, send: _Send, delay: float) -> None:
+        """
+        Hold send until its retry delay passed, for internal use only
+        """
+        ...
+
+    def _idle(self) -> bool:
+        """
+        Whether no send is queued or waiting for a retry, must hold condition, for internal use only
+        """
+        ...
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Union[Future, AsyncFuture]:
+        """
+        Queue a send, func is called with args by a worker once a token is available
+        Args:
+            func (Callable[..., Any]): sends one request
+            *args (Any): arguments
+        Returns:
+            future resolved with the result of func, or its exception after the last attempt
+        Raises:
+            InvalidStateError: when queue is closed
+        """
+        ...
+
+    def _take_batch(self) -> tuple[list[_Send], float]:
+        """
+        Pop the sends a token is available for, retries whose delay passed first, must hold condition,
+        for internal use only
+        Returns:
+            sends taken and, when none was taken, seconds until the next token or the next retry
+        """
+        ...
+
+    def _should_retry(self, send: _Send, error: BaseException) -> Optional[float]:
+        """
+        Count a failed attempt, for internal use only
+        Returns:
+            seconds to wait before the retry, None when send failed for good
+        """
+        ...
+
+    def _count_sent(self) -> None:
+        """
+        Count a completed send, for internal use only
+        """
+        ...
+
+
+class ThreadPoolSendQueue(SendQueue):
+    """
+    Sends on a pool of daemon worker threads, futures are concurrent.futures.Future
+
+    Examples:
+        send_queue = ThreadPoolSendQueue(workers=4, rate=5, burst=10)\n
+        cpdlc.set_send_queue(send_queue)\n
+        ...\n
+        send_queue.close()\n
+
+
+    Attributes:
+        _threads (list[threading.Thread]): worker threads
+    """
+    _threads: list[Thread]
+
+    def __init__(self, workers: int = 4, rate: float = 5, burst: int = 10, batch_size: int = 8,
+                 retry: Optional[RetryPolicy] = None) -> None:
+        """
+        Constructor for ThreadPoolSendQueue class
+        Args:
+            workers (int): number of worker threads
+            rate (float): sends per second on average
+            burst (int): sends at once after an idle period
+            batch_size (int): maximum sends a worker takes at once
+            retry (Optional[RetryPolicy]): retry policy, RetryPolicy() when None
+        Raises:
+            ParameterError: when workers, rate, burst or batch_size is not positive
+        """
+        ...
+
+    def _new_future(self) -> Future: ...
+
+    def _work(self) -> None:
+        """
+        Worker thread loop, for internal use only
+        """
+        ...
+
+    def _send(self, send: _Send) -> None:
+        """
+        Attempt send once, for internal use only
+        """
+        ...
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting sends, send the queued ones and stop the workers
+        Args:
+            timeout (Optional[float]): seconds to wait for every worker, wait forever when None
+        """
+        ...
+
+
+class AsyncioSendQueue(SendQueue):
+    """
+    Sends as tasks of an asyncio event loop, func may be a coroutine function and futures are asyncio.Future
+
+    Sends of one batch run concurrently, sends may be submitted from the event loop thread only
+
+    Examples:
+        send_queue = AsyncioSendQueue(workers=4, rate=5, burst=10)\n
+        send_queue.start()\n
+        cpdlc.set_send_queue(send_queue)\n
+        ...\n
+        await send_queue.aclose()\n
+
+
+    Attributes:
+        _loop (Optional[asyncio.AbstractEventLoop]): event loop running the workers
+        _ready (Optional[asyncio.Event]): set when a send was queued
+        _tasks (list[asyncio.Task]): worker tasks
+    """
+    _loop: Optional[AbstractEventLoop]
+    _ready: Optional[AsyncEvent]
+    _tasks: list[Task]
+
+    def __init__(self, workers: int = 4, rate: float = 5, burst: int = 10, batch_size: int = 8,
+                 retry: Optional[RetryPolicy] = None) -> None:
+        """
+        Constructor for AsyncioSendQueue class
+        Args:
+            workers (int): number of worker tasks
+            rate (float): sends per second on average
+            burst (int): sends at once after an idle period
+            batch_size (int): maximum sends a worker takes at once
+            retry (Optional[RetryPolicy]): retry policy, RetryPolicy() when None
+        Raises:
+            ParameterError: when workers, rate, burst or batch_size is not positive
+        """
+        ...
+
+    def start(self) -> None:
+        """
+        Start worker tasks, must be called from a running event loop
+        """
+        ...
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> AsyncFuture: ...
+
+    def _new_future(self) -> AsyncFuture: ...
+
+    def _wakeup(self) -> None: ...
+
+    async def _work(self) -> None:
+        """
+        Worker task loop, for internal use only
+        """
+        ...
+
+    async def _send(self, send: _Send) -> None:
+        """
+        Attempt send once, for internal use only
+        """
+        ...
+
+    async def aclose(self) -> None:
+        """
+        Stop accepting sends, send the queued ones and stop the workers
+        """
+        ...
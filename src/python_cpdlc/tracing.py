@@ -0,0 +1,137 @@
+from collections import deque
+from dataclasses import dataclass
+from heapq import nlargest
+from time import perf_counter
+from typing import Any, Optional
+
+from .enums import PacketType, TraceStage
+from .exception import ParameterError
+
+
+@dataclass(frozen=True, slots=True)
+class SpanContext:
+    """
+    What a traced operation works on
+
+    Attributes:
+        stage (TraceStage): traced stage
+        callsign (Optional[str]): callsign of the session
+        packet_type (Optional[PacketType]): packet type of the request or message, None when parsing
+        message_id (Optional[int]): CPDLC message id of the message, None for other stages and packets
+        detail (Optional[str]): endpoint of a request, name of a callback
+    """
+    stage: TraceStage
+    callsign: Optional[str] = None
+    packet_type: Optional[PacketType] = None
+    message_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class Tracer:
+    """
+    Receives the start and end of every traced operation of a session, the base class does nothing
+
+    Spans wrap _send_request, AcarsMessageFactory.parser_message, _handle_message and every message receiver
+    callback. Hooks run inline on the traced thread or task, so they should return quickly and never raise.
+    Without a tracer no span is created at all
+
+    Examples:
+        class PrintTracer(Tracer):\n
+            def start_span(self, context):\n
+                return perf_counter()\n
+            def end_span(self, context, token, error):\n
+                print(context.stage, context.detail, perf_counter() - token)\n
+        cpdlc.set_tracer(PrintTracer())\n
+    """
+
+    def start_span(self, context: SpanContext) -> Any:
+        """
+        Called before a traced operation
+        Args:
+            context (SpanContext): traced operation
+        Returns:
+            token handed back to end_span, e.g. a start time or a span of a tracing library
+        """
+        return None
+
+    def end_span(self, context: SpanContext, token: Any, error: Optional[BaseException]) -> None:
+        """
+        Called after a traced operation, also when it raised
+        Args:
+            context (SpanContext): traced operation
+            token (Any): value returned by start_span
+            error (Optional[BaseException]): exception raised by the operation, None on success
+        """
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+    """
+    Finished operation recorded by SpanRecorder
+
+    Attributes:
+        context (SpanContext): traced operation
+        start (float): perf_counter time the operation started
+        duration (float): seconds the operation took
+        error (Optional[BaseException]): exception raised by the operation, None on success
+    """
+    context: SpanContext
+    start: float
+    duration: float
+    error: Optional[BaseException] = None
+
+
+class SpanRecorder(Tracer):
+    """
+    Tracer keeping the most recent finished spans, to look for slow operations
+
+    Examples:
+        recorder = SpanRecorder(max_spans=4096)\n
+        cpdlc.set_tracer(recorder)\n
+        ...\n
+        for span in recorder.slowest(5, TraceStage.CALLBACK):\n
+            print(span.context.detail, span.duration)\n
+
+    Attributes:
+        _spans (deque[Span]): finished spans, oldest first
+    """
+
+    def __init__(self, max_spans: int = 1024):
+        """
+        Constructor for SpanRecorder class
+        Args:
+            max_spans (int): number of most recent spans kept
+        Raises:
+            ParameterError: when max_spans is not positive
+        """
+        if max_spans <= 0:
+            raise ParameterError("max_spans must be positive")
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+
+    @property
+    def spans(self) -> list[Span]:
+        return list(self._spans)
+
+    def start_span(self, context: SpanContext) -> float:
+        return perf_counter()
+
+    def end_span(self, context: SpanContext, token: float, error: Optional[BaseException]) -> None:
+        self._spans.append(Span(context, token, perf_counter() - token, error))
+
+    def slowest(self, count: int = 10, stage: Optional[TraceStage] = None) -> list[Span]:
+        """
+        Slowest recorded spans
+        Args:
+            count (int): number of spans returned
+            stage (Optional[TraceStage]): only spans of this stage, every stage when None
+        Returns:
+            spans by descending duration
+        """
+        spans = self._spans if stage is None else (span for span in self._spans if span.context.stage is stage)
+        return nlargest(count, spans, key=lambda span: span.duration)
+
+    def clear(self) -> None:
+        """
+        Drop every recorded span
+        """
+        self._spans.clear()
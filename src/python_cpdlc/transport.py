@@ -0,0 +1,88 @@
+from typing import Callable, Optional, Union
+
+from httpx import AsyncBaseTransport, AsyncClient, BaseTransport, Client, Limits, Request, Response, Timeout
+
+# Keep idle connections longer than the default poll interval, so a poll reuses the connection of the previous one
+DEFAULT_LIMITS = Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60)
+DEFAULT_TIMEOUT = Timeout(10)
+
+
+def create_client(transport: Optional[BaseTransport] = None, limits: Optional[Limits] = None,
+                  timeout: Union[float, Timeout, None] = None) -> Client:
+    """
+    Create the httpx client of a CPDLC instance
+    Args:
+        transport (Optional[httpx.BaseTransport]): transport, default network transport
+        limits (Optional[httpx.Limits]): connection pool limits, DEFAULT_LIMITS when None
+        timeout (Union[float, httpx.Timeout, None]): request timeout, DEFAULT_TIMEOUT when None
+    Returns:
+        httpx client
+    """
+    return Client(transport=transport, limits=limits or DEFAULT_LIMITS,
+                  timeout=timeout if timeout is not None else DEFAULT_TIMEOUT)
+
+
+def create_async_client(transport: Optional[AsyncBaseTransport] = None, limits: Optional[Limits] = None,
+                        timeout: Union[float, Timeout, None] = None) -> AsyncClient:
+    """
+    Create the httpx async client of an AsyncCPDLC instance or a fleet
+    Args:
+        transport (Optional[httpx.AsyncBaseTransport]): transport, default network transport
+        limits (Optional[httpx.Limits]): connection pool limits, DEFAULT_LIMITS when None
+        timeout (Union[float, httpx.Timeout, None]): request timeout, DEFAULT_TIMEOUT when None
+    Returns:
+        httpx async client
+    """
+    return AsyncClient(transport=transport, limits=limits or DEFAULT_LIMITS,
+                       timeout=timeout if timeout is not None else DEFAULT_TIMEOUT)
+
+
+class MemoryTransport(BaseTransport, AsyncBaseTransport):
+    """
+    In-memory transport for tests and benchmarks, usable by both httpx.Client and httpx.AsyncClient
+
+    Every request is answered by responder without touching the network, by default with "ok"
+
+    Attributes:
+        _responder (Callable[[httpx.Request], Union[httpx.Response, str]]): builds the response of a request,
+            a str becomes the text of a 200 response
+        _requests (int): requests handled
+
+    Examples:
+        transport = MemoryTransport(lambda request: "ok {server info {hello}}")\n
+        cpdlc = CPDLC(transport=transport)\n
+    """
+
+    def __init__(self, responder: Optional[Callable[[Request], Union[Response, str]]] = None):
+        """
+        Constructor for MemoryTransport class
+        Args:
+            responder (Optional[Callable[[httpx.Request], Union[httpx.Response, str]]]): builds the response
+                of a request, a str becomes the text of a 200 response, answers "ok" when None
+        """
+        self._responder = responder
+        self._requests = 0
+
+    @property
+    def requests(self) -> int:
+        return self._requests
+
+    def _respond(self, request: Request) -> Response:
+        """
+        Build the response of request, its body must have been read, for internal use only
+        """
+        self._requests += 1
+        if self._responder is None:
+            return Response(200, text="ok")
+        response = self._responder(request)
+        if isinstance(response, str):
+            return Response(200, text=response)
+        return response
+
+    def handle_request(self, request: Request) -> Response:
+        request.read()
+        return self._respond(request)
+
+    async def handle_async_request(self, request: Request) -> Response:
+        await request.aread()
+        return self._respond(request)
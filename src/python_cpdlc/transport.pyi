@@ -0,0 +1,75 @@
+from typing import Callable, Optional, Union
+
+from httpx import AsyncBaseTransport, AsyncClient, BaseTransport, Client, Limits, Request, Response, Timeout
+
+DEFAULT_LIMITS: Limits
+DEFAULT_TIMEOUT: Timeout
+
+
+def create_client(transport: Optional[BaseTransport] = None, limits: Optional[Limits] = None,
+                  timeout: Union[float, Timeout, None] = None) -> Client:
+    """
+    Create the httpx client of a CPDLC instance
+    Args:
+        transport (Optional[httpx.BaseTransport]): transport, default network transport
+        limits (Optional[httpx.Limits]): connection pool limits, DEFAULT_LIMITS when None
+        timeout (Union[float, httpx.Timeout, None]): request timeout, DEFAULT_TIMEOUT when None
+    Returns:
+        httpx client
+    """
+    ...
+
+
+def create_async_client(transport: Optional[AsyncBaseTransport] = None, limits: Optional[Limits] = None,
+                        timeout: Union[float, Timeout, None] = None) -> AsyncClient:
+    """
+    Create the httpx async client of an AsyncCPDLC instance or a fleet
+    Args:
+        transport (Optional[httpx.AsyncBaseTransport]): transport, default network transport
+        limits (Optional[httpx.Limits]): connection pool limits, DEFAULT_LIMITS when None
+        timeout (Union[float, httpx.Timeout, None]): request timeout, DEFAULT_TIMEOUT when None
+    Returns:
+        httpx async client
+    """
+    ...
+
+
+class MemoryTransport(BaseTransport, AsyncBaseTransport):
+    """
+    In-memory transport for tests and benchmarks, usable by both httpx.Client and httpx.AsyncClient
+
+    Every request is answered by responder without touching the network, by default with "ok"
+
+    Attributes:
+        _responder (Callable[[httpx.Request], Union[httpx.Response, str]]): builds the response of a request,
+            a str becomes the text of a 200 response
+        _requests (int): requests handled
+
+    Examples:
+        transport = MemoryTransport(lambda request: "ok {server info {hello}}")\n
+        cpdlc = CPDLC(transport=transport)\n
+    """
+    _responder: Optional[Callable[[Request], Union[Response, str]]]
+    _requests: int
+
+    def __init__(self, responder: Optional[Callable[[Request], Union[Response, str]]] = None) -> None:
+        """
+        Constructor for MemoryTransport class
+        Args:
+            responder (Optional[Callable[[httpx.Request], Union[httpx.Response, str]]]): builds the response
+                of a request, a str becomes the text of a 200 response, answers "ok" when None
+        """
+        ...
+
+    @property
+    def requests(self) -> int: ...
+
+    def _respond(self, request: Request) -> Response:
+        """
+        Build the response of request, its body must have been read, for internal use only
+        """
+        ...
+
+    def handle_request(self, request: Request) -> Response: ...
+
+    async def handle_async_request(self, request: Request) -> Response: ...